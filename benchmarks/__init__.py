@@ -0,0 +1 @@
+"""Benchmarks - Performance-Messungen für Repositories, Services und Reports"""
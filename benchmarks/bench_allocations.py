@@ -0,0 +1,91 @@
+"""
+Benchmark: Allokationen von load_all_products/load_movements (vorher) gegen
+iter_products/iter_movements/count_* (nachher), gemessen mit tracemalloc
+
+Aufruf aus dem Projektverzeichnis:
+    python -m benchmarks.bench_allocations --products 200000 --movements 500000
+"""
+
+import argparse
+import gc
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable
+
+from src.adapters.report import ConsoleReportAdapter
+from src.adapters.repository import RepositoryFactory
+from src.ports import RepositoryPort
+
+from .common import NullSink, make_movements, make_products
+
+
+def allocation(label: str, operation: Callable[[], object]) -> None:
+    """Spitzenallokation und Laufzeit einer Operation ausgeben"""
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    operation()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<50} {peak / 1024 / 1024:>9.2f} MiB {elapsed * 1000:>10.1f} ms")
+
+
+def run(repository: RepositoryPort, label: str) -> None:
+    print(f"--- {label} ---")
+    allocation(
+        "vorher:  sum(load_all_products().values())",
+        lambda: sum(p.quantity for p in repository.load_all_products().values()),
+    )
+    allocation(
+        "nachher: sum(iter_products())",
+        lambda: sum(p.quantity for p in repository.iter_products()),
+    )
+    allocation(
+        "vorher:  sum(load_movements())",
+        lambda: sum(m.quantity_change for m in repository.load_movements()),
+    )
+    allocation(
+        "nachher: sum(iter_movements())",
+        lambda: sum(m.quantity_change for m in repository.iter_movements()),
+    )
+    allocation("vorher:  len(load_all_products())", lambda: len(repository.load_all_products()))
+    allocation("nachher: count_products()", repository.count_products)
+    allocation("vorher:  len(load_movements())", lambda: len(repository.load_movements()))
+    allocation("nachher: count_movements()", repository.count_movements)
+    allocation(
+        "vorher:  Bestandsbericht aus load_all_products()",
+        lambda: ConsoleReportAdapter(repository.load_all_products()).write_inventory_report(
+            NullSink()
+        ),
+    )
+    allocation(
+        "nachher: Bestandsbericht aus iter_products()",
+        lambda: ConsoleReportAdapter(repository.iter_products()).write_inventory_report(NullSink()),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=200_000)
+    parser.add_argument("--movements", type=int, default=500_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for repository_type, options in (
+            ("memory", {}),
+            ("columnar", {}),
+            ("sqlite", {"db_path": str(Path(directory) / "bench.db")}),
+        ):
+            repository = RepositoryFactory.create_repository(repository_type, **options)
+            repository.save_products(make_products(args.products))
+            repository.save_movements(make_movements(args.movements, args.products))
+            run(repository, f"{repository_type} ({args.products} Produkte, {args.movements} Bew.)")
+            if hasattr(repository, "close"):
+                repository.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Benchmark: NumPy-Analyse-Engine
+
+Aufruf aus dem Projektverzeichnis (benötigt numpy):
+    python -m benchmarks.bench_analytics --products 1000000 --movements 5000000
+"""
+
+import argparse
+from datetime import datetime, timedelta
+
+from src.adapters.repository import InMemoryRepository
+from src.services.analytics import InventoryAnalytics
+
+from .common import make_movements, make_products, measure
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=1_000_000)
+    parser.add_argument("--movements", type=int, default=2_000_000)
+    args = parser.parse_args()
+
+    repository = InMemoryRepository()
+    repository.save_products(make_products(args.products))
+    repository.save_movements(make_movements(args.movements, args.products))
+    end = datetime(2025, 1, 1) + timedelta(seconds=args.movements)
+
+    analytics = InventoryAnalytics(repository)
+    measure("refresh (erster, vollständiger Snapshot)", analytics.refresh)
+    repository.save_movements(make_movements(1000, args.products, start=end))
+    now = end + timedelta(hours=1)
+    measure("refresh (inkrementell)", analytics.refresh)
+    measure("category_values", analytics.category_values, repeat=3)
+    measure("abc_classification", analytics.abc_classification, repeat=3)
+    measure("turnover_rates (30 Tage)", lambda: analytics.turnover_rates(now=now), repeat=3)
+    measure("days_of_cover (30 Tage)", lambda: analytics.days_of_cover(now=now), repeat=3)
+    measure("top_movers (n=50)", lambda: analytics.top_movers(50, now=now), repeat=3)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Benchmark: Buchungsdurchsatz des thread-sicheren WarehouseService nach Thread-Anzahl
+
+Aufruf aus dem Projektverzeichnis:
+    python -m benchmarks.bench_concurrency --bookings 20000 --repository sqlite
+"""
+
+import argparse
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from src.adapters.repository import RepositoryFactory
+from src.services import WarehouseService
+
+
+def run(repository_type: str, threads: int, bookings: int, products: int, directory: str) -> None:
+    """`bookings` Buchungen gleichmäßig auf `threads` Threads verteilt ausführen"""
+    options = {"db_path": str(Path(directory) / f"bench_{threads}.db")}
+    repository = RepositoryFactory.create_repository(
+        repository_type, **(options if repository_type == "sqlite" else {})
+    )
+    service = WarehouseService(repository, thread_safe=True)
+    for i in range(products):
+        service.create_product(f"SKU-{i:05d}", f"Artikel {i}", "", 1.0, initial_quantity=10**6)
+
+    per_thread = bookings // threads
+
+    def worker(index: int) -> None:
+        for step in range(per_thread):
+            product_id = f"SKU-{(index * 7919 + step) % products:05d}"
+            if step % 2:
+                service.add_to_stock(product_id, 1)
+            else:
+                service.remove_from_stock(product_id, 1)
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    rate = per_thread * threads / elapsed
+    print(f"{repository_type:<8} {threads:>3} Threads: {rate:>10.0f} Buchungen/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--bookings", type=int, default=20_000)
+    parser.add_argument("--products", type=int, default=1_000)
+    parser.add_argument("--repository", default="memory", choices=["memory", "sqlite"])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for threads in (1, 2, 4, 8, 16):
+            run(args.repository, threads, args.bookings, args.products, directory)
+
+
+if __name__ == "__main__":
+    main()
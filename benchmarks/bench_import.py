@@ -0,0 +1,87 @@
+"""
+Benchmark: Katalogimport - create_product pro Zeile gegen blockweisen Import
+(CSV, Parquet, Arrow) in ein SQLite-Repository, dazu der Export
+
+Aufruf aus dem Projektverzeichnis:
+    python -m benchmarks.bench_import --products 1000000
+"""
+
+import argparse
+import resource
+import tempfile
+from itertools import islice
+from pathlib import Path
+
+from src.adapters.sqlite_repository import SQLiteRepository
+from src.adapters.tabular import TableWriter, detect_format
+from src.services import WarehouseService
+from src.services.bulk import PRODUCT_SCHEMA, export_products, import_products
+
+from .common import make_products, measure
+
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def write_source(path: Path, count: int) -> None:
+    products = make_products(count)
+    with TableWriter(path, PRODUCT_SCHEMA) as writer:
+        while True:
+            block = list(islice(products, 50_000))
+            if not block:
+                break
+            writer.write({name: [getattr(p, name) for p in block] for name, _ in PRODUCT_SCHEMA})
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=1_000_000)
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    parser.add_argument("--row-by-row", type=int, default=20_000, help="Zeilen für den Vergleich")
+    args = parser.parse_args()
+
+    formats = ["csv"]
+    try:
+        detect_format("x.parquet")
+        formats += ["parquet", "arrow"]
+    except ValueError:
+        print("pyarrow nicht installiert - nur CSV")
+
+    with tempfile.TemporaryDirectory() as directory:
+        directory = Path(directory)
+        service = WarehouseService(SQLiteRepository(str(directory / "zeilen.db")))
+        products = list(make_products(args.row_by_row))
+
+        def row_by_row():
+            for p in products:
+                service.create_product(p.id, p.name, p.description, p.price, p.category, p.quantity)
+
+        elapsed = measure(f"vorher:  create_product x{args.row_by_row}", row_by_row)
+        estimate = elapsed / args.row_by_row * args.products
+        print(f"{'  hochgerechnet auf ' + str(args.products):<50} {estimate:>10.2f} s")
+        service.repository.close()
+
+        for format in formats:
+            source = directory / f"katalog.{format}"
+            write_source(source, args.products)
+            service = WarehouseService(SQLiteRepository(str(directory / f"{format}.db")))
+            before = peak_rss_mb()
+            reports = []
+
+            def bulk_import():
+                reports.append(import_products(service, source, chunk_size=args.chunk_size))
+
+            measure(f"nachher: Import {format} x{args.products}", bulk_import)
+            report, after = reports[0], peak_rss_mb()
+            print(f"{'  importiert / abgelehnt':<50} {report.imported:>10} / {report.rejected}")
+            print(f"{'  Spitzen-RSS vorher / nachher (MB)':<50} {before:>10.0f} / {after:.0f}")
+            measure(
+                f"Export {format} x{args.products}",
+                lambda: export_products(service, directory / f"export.{format}"),
+            )
+            service.repository.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Benchmark: Buchungsdurchsatz - ein WarehouseService im eigenen Prozess gegen
+N Worker-Prozesse, die über den BookingLedger (Single Writer, Micro-Batches)
+in dieselbe SQLite-Datei buchen
+
+Aufruf aus dem Projektverzeichnis:
+    python -m benchmarks.bench_ledger --workers 1,2,4,8,16 --requests 2000
+"""
+
+import argparse
+import multiprocessing
+import tempfile
+import time
+from dataclasses import replace
+from functools import partial
+from pathlib import Path
+
+from src.adapters.sqlite_repository import SQLiteRepository
+from src.domain.warehouse import Booking
+from src.services import WarehouseService
+from src.services.ledger import BookingLedger
+
+from .common import make_products
+
+
+def requests_for(worker: int, count: int, products: int):
+    """Abwechselnd Zu- und Abgänge, über den Katalog verteilt"""
+    for i in range(count):
+        product_id = f"SKU-{(worker * 7919 + i * 104_729) % products:07d}"
+        if i % 2:
+            yield [Booking(product_id, 1, movement_type="OUT", reason="Verkauf")]
+        else:
+            yield [Booking(product_id, 2, reason="Wareneingang")]
+
+
+def worker(client, count: int, products: int, start, done) -> None:
+    batches = list(requests_for(client.index, count, products))
+    start.wait()
+    for bookings in batches:
+        client.book(bookings)
+    client.close()
+    done.put(client.index)
+
+
+def create_database(path: Path, products: int) -> None:
+    repository = SQLiteRepository(str(path))
+    repository.save_products(
+        replace(product, quantity=1_000_000) for product in make_products(products)
+    )
+    repository.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", default="1,2,4,8,16")
+    parser.add_argument("--requests", type=int, default=2_000, help="Anfragen pro Worker")
+    parser.add_argument("--products", type=int, default=10_000)
+    parser.add_argument("--max-batch", type=int, default=256)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "direkt.db"
+        create_database(path, args.products)
+        repository = SQLiteRepository(str(path))
+        service = WarehouseService(repository)
+        batches = list(requests_for(0, args.requests, args.products))
+        started = time.perf_counter()
+        for bookings in batches:
+            service.book_movements(bookings)
+        elapsed = time.perf_counter() - started
+        repository.close()
+        print(
+            f"{'vorher:  ein Prozess, book_movements':<50} "
+            f"{args.requests / elapsed:>10.0f} Buchungen/s"
+        )
+
+        for count in (int(value) for value in args.workers.split(",")):
+            path = Path(directory) / f"ledger-{count}.db"
+            create_database(path, args.products)
+            ledger = BookingLedger(
+                partial(SQLiteRepository, str(path)), clients=count, max_batch=args.max_batch
+            )
+            ledger.start()
+            start, done = multiprocessing.Event(), multiprocessing.Queue()
+            processes = [
+                multiprocessing.Process(
+                    target=worker,
+                    args=(ledger.client(i), args.requests, args.products, start, done),
+                )
+                for i in range(count)
+            ]
+            for process in processes:
+                process.start()
+            started = time.perf_counter()
+            start.set()
+            for _ in processes:
+                done.get()
+            elapsed = time.perf_counter() - started
+            for process in processes:
+                process.join()
+            stats = ledger.stop()
+            label = f"nachher: {count} Worker über Ledger"
+            print(
+                f"{label:<50} {count * args.requests / elapsed:>10.0f} Buchungen/s"
+                f"  (Batch Ø {stats.mean_batch_size:.1f})"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark: LotLedger - FEFO-Entnahme und Ablaufabfrage gegen Durchlauf über alle Chargen
+
+Aufruf aus dem Projektverzeichnis:
+    python -m benchmarks.bench_lots --products 100000 --lots 10
+"""
+
+import argparse
+from datetime import date, timedelta
+
+from src.domain.lots import Lot, LotLedger
+
+from .common import measure
+
+TODAY = date(2025, 1, 1)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=100_000)
+    parser.add_argument("--lots", type=int, default=10, help="Chargen pro Produkt")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    lots = [
+        Lot(
+            f"L{product}-{number}",
+            f"SKU-{product:07d}",
+            10,
+            TODAY + timedelta(days=(product * 7 + number * 13) % 60),
+        )
+        for product in range(args.products)
+        for number in range(args.lots)
+    ]
+    ledger = LotLedger()
+    measure(f"Chargen einbuchen ({len(lots)})", lambda: [ledger.add(lot) for lot in lots])
+
+    until = TODAY + timedelta(days=3)
+    measure(
+        "vorher:  Ablaufabfrage als Durchlauf über alle Chargen",
+        lambda: sorted(
+            (lot for lot in lots if lot.quantity and lot.expires_at <= until),
+            key=lambda lot: lot.expires_at,
+        ),
+        args.repeat,
+    )
+    measure("nachher: Ablaufabfrage über den Ablaufindex", lambda: ledger.expiring(until))
+    print(f"{'  Treffer':<50} {len(ledger.expiring(until)):>10}")
+
+    picks = [f"SKU-{(i * 7919) % args.products:07d}" for i in range(100_000)]
+    elapsed = measure(
+        "100.000 FEFO-Entnahmen à 15 Stück",
+        lambda: [ledger.consume(product_id, 15) for product_id in picks],
+    )
+    print(f"{'  pro Entnahme':<50} {elapsed / len(picks) * 1e6:>10.2f} µs")
+    measure("Ablaufabfrage nach den Entnahmen", lambda: ledger.expiring(until), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
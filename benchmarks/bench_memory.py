@@ -0,0 +1,44 @@
+"""
+Benchmark: Speicherbedarf pro Produkt (tracemalloc)
+
+Aufruf aus dem Projektverzeichnis:
+    python -m benchmarks.bench_memory --products 1000000
+"""
+
+import argparse
+import gc
+import tracemalloc
+
+from src.adapters.repository import RepositoryFactory
+
+from .common import make_products
+
+
+def measure_repository(repository_type: str, count: int) -> None:
+    """Dauerhaft belegten Speicher nach dem Befüllen eines Repositories messen"""
+    gc.collect()
+    tracemalloc.start()
+    repository = RepositoryFactory.create_repository(repository_type)
+    for product in make_products(count):
+        repository.save_product(product)
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{repository_type:<10} {count} Produkte: {current / 1024 / 1024:>8.1f} MiB "
+        f"({current / count:>6.0f} Byte/SKU, Spitze {peak / 1024 / 1024:.1f} MiB)"
+    )
+    del repository
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    for repository_type in ("memory", "columnar"):
+        measure_repository(repository_type, args.products)
+
+
+if __name__ == "__main__":
+    main()
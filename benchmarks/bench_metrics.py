@@ -0,0 +1,70 @@
+"""
+Benchmark: Messaufwand der Instrumentierung - Buchungen ohne Metriken, mit
+Service-Metriken und mit zusätzlich gemessenem Repository
+
+Aufruf aus dem Projektverzeichnis:
+    python -m benchmarks.bench_metrics --products 10000 --operations 100000
+"""
+
+import argparse
+
+from src.adapters.instrumented_repository import InstrumentedRepository
+from src.adapters.metrics import MetricsRegistry
+from src.adapters.profiler import SamplingProfiler
+from src.adapters.repository import InMemoryRepository
+from src.services import WarehouseService
+
+from .common import make_products, measure
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=10_000)
+    parser.add_argument("--operations", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    product_ids = [f"SKU-{(i * 7919) % args.products:07d}" for i in range(args.operations)]
+
+    def bookings(service: WarehouseService):
+        def run():
+            for product_id in product_ids:
+                service.add_to_stock(product_id, 1, "Lieferung")
+
+        return run
+
+    def setup(metrics=None, instrument_repository=False) -> WarehouseService:
+        repository = InMemoryRepository()
+        repository.save_products(make_products(args.products))
+        if instrument_repository:
+            repository = InstrumentedRepository(repository, metrics, name="memory")
+        return WarehouseService(repository, thread_safe=True, metrics=metrics)
+
+    label = f"{args.operations} Buchungen"
+    baseline = measure(f"ohne Metriken: {label}", bookings(setup()), args.repeat)
+
+    registry = MetricsRegistry()
+    service_only = measure(f"Service-Metriken: {label}", bookings(setup(registry)), args.repeat)
+    full = measure(
+        f"Service + Repository: {label}",
+        bookings(setup(MetricsRegistry(), instrument_repository=True)),
+        args.repeat,
+    )
+    with SamplingProfiler(interval=0.005):
+        profiled = measure(f"ohne Metriken, Profiler 5 ms: {label}", bookings(setup()), args.repeat)
+
+    for name, seconds in (
+        ("Service-Metriken", service_only),
+        ("Service + Repository", full),
+        ("Profiler", profiled),
+    ):
+        extra = (seconds - baseline) / args.operations * 1e6
+        print(f"{'  Mehraufwand ' + name:<50} {extra:>10.2f} µs/Buchung")
+
+    histogram = registry.histogram("warehouse_service_call_seconds", {"method": "add_to_stock"})
+    print(f"{'  add_to_stock p50 / p99 (Bucket-Obergrenze)':<50} ", end="")
+    print(f"{histogram.quantile(0.5) * 1e6:>6.0f} / {histogram.quantile(0.99) * 1e6:.0f} µs")
+
+
+if __name__ == "__main__":
+    main()
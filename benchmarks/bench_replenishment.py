@@ -0,0 +1,47 @@
+"""
+Benchmark: ReplenishmentEngine - Nachfrage einlesen und Bestelllauf über alle Artikel
+
+Aufruf aus dem Projektverzeichnis:
+    python -m benchmarks.bench_replenishment --products 200000 --movements 2000000
+"""
+
+import argparse
+from datetime import datetime, timedelta
+
+from src.adapters.repository import InMemoryRepository
+from src.services.replenishment import ReplenishmentEngine
+
+from .common import make_movements, make_products, measure
+
+START = datetime(2025, 1, 1)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=200_000)
+    parser.add_argument("--movements", type=int, default=2_000_000)
+    args = parser.parse_args()
+
+    repository = InMemoryRepository()
+    repository.save_products(make_products(args.products))
+    # Eine Bewegung pro Sekunde -> bei 2 Mio. Bewegungen rund 23 Tage Historie
+    repository.save_movements(make_movements(args.movements, args.products, START))
+    engine = ReplenishmentEngine(repository)
+    elapsed = measure(f"Historie einlesen ({args.movements} Bewegungen)", engine.refresh)
+    print(f"{'  pro Bewegung':<50} {elapsed / args.movements * 1e6:>10.2f} µs")
+
+    end = repository.movements[-1].timestamp + timedelta(days=1)
+    proposals = []
+    measure(
+        f"Bestelllauf ({args.products} Artikel)",
+        lambda: proposals.extend(engine.propose(now=end)),
+    )
+    print(f"{'  Vorschläge':<50} {len(proposals):>10}")
+
+    # Laufender Betrieb: neue Abgänge nachlesen, dann erneuter Bestelllauf
+    repository.save_movements(make_movements(10_000, args.products, end))
+    measure("10.000 neue Bewegungen + Bestelllauf", lambda: engine.propose(now=end))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Benchmark: Bewegungsprotokoll als String vs. gestreamt in eine Datei
+
+Aufruf aus dem Projektverzeichnis:
+    python -m benchmarks.bench_report --movements 1000000
+"""
+
+import argparse
+import os
+import tracemalloc
+
+from src.adapters.report import ConsoleReportAdapter
+
+from .common import make_movements, measure
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--movements", type=int, default=1_000_000)
+    parser.add_argument("--products", type=int, default=10_000)
+    args = parser.parse_args()
+
+    def as_string():
+        adapter = ConsoleReportAdapter(movements=make_movements(args.movements, args.products))
+        adapter.generate_movement_report()
+
+    def streamed():
+        adapter = ConsoleReportAdapter(
+            movements=make_movements(args.movements, args.products), movements_sorted=True
+        )
+        with open(os.devnull, "w", encoding="utf-8") as sink:
+            adapter.write_movement_report(sink)
+
+    cases = (("generate_movement_report", as_string), ("write_movement_report", streamed))
+    for label, operation in cases:
+        measure(f"{label} ({args.movements} Bewegungen)", operation)
+        # Zweiter Lauf nur für den Speicher - tracemalloc verfälscht die Laufzeit
+        tracemalloc.start()
+        operation()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{'  Spitzenspeicher':<50} {peak / 1024 / 1024:>10.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Benchmark: SQLiteRepository (auch mit CachingRepository) und JSONRepository vs. InMemoryRepository
+
+Aufruf aus dem Projektverzeichnis:
+    python -m benchmarks.bench_repository --products 50000 --movements 200000
+"""
+
+import argparse
+import random
+import tempfile
+from pathlib import Path
+
+from src.adapters.caching_repository import CachingRepository
+from src.adapters.json_repository import JSONRepository
+from src.adapters.repository import InMemoryRepository
+from src.adapters.sqlite_repository import SQLiteRepository
+from src.ports import RepositoryPort
+
+from .common import make_movements, make_products, measure
+
+
+def run(repository: RepositoryPort, label: str, products: int, movements: int) -> None:
+    """Punktzugriffe, Full Scans und Movement-Appends für ein Repository messen"""
+    print(f"--- {label} ---")
+    catalogue = list(make_products(products))
+    journal = list(make_movements(movements, products))
+
+    def insert_products():
+        for product in catalogue:
+            repository.save_product(product)
+
+    def append_movements():
+        for movement in journal:
+            repository.save_movement(movement)
+
+    lookup_ids = [random.choice(catalogue).id for _ in range(10_000)]
+
+    def point_lookups():
+        for product_id in lookup_ids:
+            repository.load_product(product_id)
+
+    measure(f"save_product x{products}", insert_products)
+    measure(f"save_movement x{movements}", append_movements)
+    measure("load_product x10000", point_lookups, repeat=3)
+    measure("load_all_products", repository.load_all_products, repeat=3)
+    measure("load_movements", repository.load_movements, repeat=3)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=20_000)
+    parser.add_argument("--movements", type=int, default=100_000)
+    args = parser.parse_args()
+
+    run(InMemoryRepository(), "InMemoryRepository", args.products, args.movements)
+    with tempfile.TemporaryDirectory() as directory:
+        repository = SQLiteRepository(str(Path(directory) / "bench.db"))
+        run(repository, "SQLiteRepository (WAL)", args.products, args.movements)
+        repository.close()
+
+        repository = CachingRepository(
+            SQLiteRepository(str(Path(directory) / "cached.db")), max_size=args.products
+        )
+        run(repository, "SQLiteRepository + CachingRepository", args.products, args.movements)
+        stats = repository.stats
+        print(f"Cache: {stats.hits} Treffer, {stats.misses} Fehlgriffe, {stats.hit_rate:.1%}")
+        repository.close()
+
+        repository = JSONRepository(str(Path(directory) / "json"))
+        run(repository, "JSONRepository (Write-Behind)", args.products, args.movements)
+        measure("close (letzter Flush)", repository.close)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Benchmark: InMemorySearchIndex - Aufbau und Antwortzeiten der Suche während der Eingabe
+
+Aufruf aus dem Projektverzeichnis:
+    python -m benchmarks.bench_search --products 500000
+"""
+
+import argparse
+import time
+
+from src.adapters.search_index import InMemorySearchIndex
+from src.domain.product import Product
+
+from .common import make_products, measure
+
+# Eingaben wie an der Kasse: Buchstabe für Buchstabe, dann SKU/ID und Kombinationen
+QUERIES = [
+    "a",
+    "art",
+    "artikel 4",
+    "artikel 4242",
+    "artikel 424242",
+    "4000000424",
+    "sku-04242",
+    "molkerei artikel 1234",
+    "beschreibung artikel 99999",
+    "gibtesnicht",
+]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=500_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    products = list(make_products(args.products))
+    index = InMemorySearchIndex()
+    measure(f"Index aufbauen ({args.products} Produkte)", lambda: index.index_products(products))
+    # Erste Suche sortiert Vokabular und Trefferlisten häufiger Wörter einmalig
+    measure("Erste Suche (Vokabular/Trefferlisten sortieren)", lambda: index.search("artikel"))
+
+    for query in QUERIES:
+        measure(f"search({query!r})", lambda q=query: index.search(q, limit=20), args.repeat)
+    measure("suggest('artik')", lambda: index.suggest("artik"), args.repeat)
+
+    # Pflege: Umbenennen eines Produkts und sofortige Suche danach
+    renamed = Product(id="SKU-0000042", name="Bio Hafermilch", description="", price=1.99)
+    started = time.perf_counter()
+    for _ in range(args.repeat):
+        index.index_product(renamed)
+        index.search("hafermil")
+    elapsed = (time.perf_counter() - started) / args.repeat
+    print(f"{'index_product + search (Mittel)':<50} {elapsed * 1000:>10.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmark: Einzelbuchungen vs. Sammelbuchung (Wareneingang)
+
+Aufruf aus dem Projektverzeichnis:
+    python -m benchmarks.bench_service --lines 2000
+"""
+
+import argparse
+import tempfile
+from pathlib import Path
+
+from src.adapters.repository import InMemoryRepository
+from src.adapters.sqlite_repository import SQLiteRepository
+from src.domain.warehouse import Booking
+from src.services import WarehouseService
+
+from .common import make_products, measure
+
+
+def run(label: str, make_repository, lines: int) -> None:
+    """Wareneingang mit `lines` Positionen einzeln und als Sammelbuchung buchen"""
+    print(f"--- {label} ---")
+    results = {}
+    for mode in ("einzeln", "sammel"):
+        repository = make_repository()
+        service = WarehouseService(repository)
+        repository.save_products(make_products(lines))
+        receipt = [Booking(f"SKU-{i:07d}", 24, reason="Lieferung") for i in range(lines)]
+
+        if mode == "einzeln":
+
+            def book():
+                for booking in receipt:
+                    service.add_to_stock(booking.product_id, booking.quantity, booking.reason)
+
+        else:
+
+            def book():
+                service.book_movements(receipt)
+
+        results[mode] = measure(f"Wareneingang {lines} Positionen ({mode})", book)
+    print(f"Faktor: {results['einzeln'] / results['sammel']:.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lines", type=int, default=2000)
+    args = parser.parse_args()
+
+    run("InMemoryRepository", InMemoryRepository, args.lines)
+    with tempfile.TemporaryDirectory() as directory:
+        counter = iter(range(1_000_000))
+
+        def make_sqlite():
+            return SQLiteRepository(str(Path(directory) / f"bench_{next(counter)}.db"))
+
+        run("SQLiteRepository", make_sqlite, args.lines)
+
+
+if __name__ == "__main__":
+    main()
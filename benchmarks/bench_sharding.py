@@ -0,0 +1,106 @@
+"""
+Benchmark: Filialkette auf SQLite-Shards - kettenweiter Bestand und Lagerwert
+seriell gegen parallel über alle Shards, dazu Umlagerungen
+
+Mit --latency-ms bekommt jede Bestandsabfrage eine künstliche Netzwerk-Rundreise,
+wie bei Filial-Datenbanken auf eigenen Servern; erst dann überlappen die Shards
+wirklich (lokale SQLite-Abfragen sind zu kurz und hängen am GIL).
+
+Aufruf aus dem Projektverzeichnis:
+    python -m benchmarks.bench_sharding --warehouses 30 --products 20000
+    python -m benchmarks.bench_sharding --latency-ms 2
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from src.adapters.shard_router import ShardRouter
+from src.adapters.sqlite_repository import SQLiteRepository
+from src.services.multi_warehouse import MultiWarehouseService
+
+from .common import make_products, measure
+
+
+class RemoteSQLiteRepository(SQLiteRepository):
+    """SQLite mit fester Verzögerung pro Bestandsabfrage (simulierter Server)"""
+
+    latency = 0.0
+
+    def load_product(self, product_id):
+        if self.latency:
+            time.sleep(self.latency)
+        return super().load_product(product_id)
+
+    def load_quantities(self, product_ids):
+        if self.latency:
+            time.sleep(self.latency)
+        return super().load_quantities(product_ids)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--warehouses", type=int, default=30)
+    parser.add_argument("--products", type=int, default=20_000, help="Produkte pro Lager")
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    args = parser.parse_args()
+    RemoteSQLiteRepository.latency = args.latency_ms / 1000
+
+    with tempfile.TemporaryDirectory() as directory:
+        router = ShardRouter(
+            factory=lambda warehouse_id: RemoteSQLiteRepository(
+                str(Path(directory) / f"{warehouse_id}.db")
+            ),
+            max_workers=args.workers,
+        )
+        warehouse_ids = [f"filiale-{i:03d}" for i in range(args.warehouses)]
+        for warehouse_id in warehouse_ids:
+            router.shard(warehouse_id).save_products(make_products(args.products))
+        chain = MultiWarehouseService(router, thread_safe=True)
+        skus = [f"SKU-{(i * 7919) % args.products:07d}" for i in range(args.queries)]
+
+        def sequential_stock():
+            for sku in skus:
+                sum(
+                    product.quantity
+                    for product in (router.shard(w).load_product(sku) for w in warehouse_ids)
+                    if product is not None
+                )
+
+        def parallel_stock():
+            for sku in skus:
+                chain.total_stock(sku)
+
+        def batched_stock():
+            stock = chain.chain_stock(skus)
+            return {sku: sum(quantities.values()) for sku, quantities in stock.items()}
+
+        measure(f"vorher:  Kettenbestand seriell x{args.queries}", sequential_stock)
+        measure(f"nachher: Kettenbestand parallel x{args.queries}", parallel_stock)
+        measure(f"nachher: chain_stock (ein Aufruf) x{args.queries}", batched_stock, repeat=3)
+
+        def sequential_value():
+            sequential = MultiWarehouseService(router)
+            return sum(sequential.warehouse(w).get_total_inventory_value() for w in warehouse_ids)
+
+        measure(f"vorher:  Lagerwert seriell (Start) x{args.warehouses}", sequential_value)
+        measure(
+            f"nachher: Lagerwert parallel (Start) x{args.warehouses}", chain.chain_inventory_value
+        )
+        measure("nachher: Lagerwert parallel (warm)", chain.chain_inventory_value, repeat=5)
+
+        stocked = [sku for sku in skus if int(sku[4:]) % 200]  # make_products: Bestand i % 200
+
+        def transfers():
+            for i, sku in enumerate(stocked):
+                chain.transfer(sku, 1, "filiale-000", warehouse_ids[1 + i % (args.warehouses - 1)])
+
+        measure(f"Umlagerungen x{len(stocked)}", transfers)
+        chain.close()
+
+
+if __name__ == "__main__":
+    main()
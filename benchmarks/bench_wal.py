@@ -0,0 +1,82 @@
+"""
+Benchmark: WALRepository - Commits pro Sekunde je Group-Commit-Fenster und Wiederherstellungszeit
+
+Aufruf aus dem Projektverzeichnis:
+    python -m benchmarks.bench_wal --commits 2000 --products 50000 --movements 200000
+"""
+
+import argparse
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from src.adapters.wal_repository import WALRepository
+
+from .common import make_movements, make_products, measure
+
+
+def commit_rate(directory: Path, window: float, threads: int, commits: int) -> float:
+    """`commits` einzelne save_product-Aufrufe auf `threads` Threads; liefert Commits/s"""
+    repository = WALRepository(str(directory), group_commit_window=window, snapshot_every=None)
+    catalogue = list(make_products(commits))
+    per_thread = commits // threads
+
+    def worker(index: int) -> None:
+        for product in catalogue[index * per_thread : (index + 1) * per_thread]:
+            repository.save_product(product)
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    repository.close()
+    return per_thread * threads / elapsed
+
+
+def fill(directory: Path, products: int, movements: int, snapshot: bool) -> None:
+    """Repository mit Produkten und Bewegungen füllen, optional mit abschließendem Snapshot"""
+    repository = WALRepository(str(directory), group_commit_window=0, snapshot_every=None)
+    repository.save_products(make_products(products))
+    repository.save_movements(make_movements(movements, products))
+    if snapshot:
+        repository.snapshot()
+        # Kurzes Log-Ende nach dem Snapshot
+        repository.save_products(make_products(products // 100))
+    repository.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--commits", type=int, default=2_000)
+    parser.add_argument("--products", type=int, default=50_000)
+    parser.add_argument("--movements", type=int, default=200_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        root = Path(root)
+        print("--- Commits/s (save_product, jeder Aufruf dauerhaft) ---")
+        for window in (0.0, 0.0005, 0.002, 0.005):
+            for threads in (1, 8):
+                directory = root / f"commits-{window}-{threads}"
+                rate = commit_rate(directory, window, threads, args.commits)
+                label = f"Fenster {window * 1000:.1f} ms, {threads} Threads"
+                print(f"{label:<50} {rate:>10.0f} Commits/s")
+
+        print("--- Wiederherstellung ---")
+        for snapshot in (False, True):
+            directory = root / f"recovery-{snapshot}"
+            fill(directory, args.products, args.movements, snapshot)
+            label = "Snapshot + Log-Ende" if snapshot else "nur Log"
+            measure(
+                f"{label} ({args.products} Produkte, {args.movements} Bewegungen)",
+                lambda: WALRepository(str(directory), snapshot_every=None).close(),
+                repeat=3,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Gemeinsame Hilfsfunktionen für die Benchmarks"""
+
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Iterator, List
+
+from src.domain.product import Product
+from src.domain.warehouse import Movement
+
+CATEGORIES = ["Obst", "Gemüse", "Molkerei", "Backwaren", "Getränke", "Tiefkühl", "Drogerie"]
+
+
+def make_products(count: int) -> Iterator[Product]:
+    """Synthetische Supermarkt-Produkte erzeugen"""
+    for i in range(count):
+        yield Product(
+            id=f"SKU-{i:07d}",
+            name=f"Artikel {i}",
+            description=f"Beschreibung für Artikel {i}",
+            price=0.49 + (i % 500) / 10,
+            quantity=i % 200,
+            sku=f"400{i:010d}",
+            category=CATEGORIES[i % len(CATEGORIES)],
+        )
+
+
+def make_movements(
+    count: int, product_count: int, start: datetime = datetime(2025, 1, 1)
+) -> Iterator[Movement]:
+    """Synthetische, zeitlich aufsteigende Lagerbewegungen (eine pro Sekunde) erzeugen"""
+    for i in range(count):
+        product_index = (i * 7919) % product_count
+        change = (i % 9) + 1
+        yield Movement(
+            id=f"mov_{i:010d}",
+            product_id=f"SKU-{product_index:07d}",
+            product_name=f"Artikel {product_index}",
+            quantity_change=change if i % 3 else -change,
+            movement_type="IN" if i % 3 else "OUT",
+            reason="Benchmark",
+            timestamp=start + timedelta(seconds=i),
+            performed_by=f"kasse-{i % 12}",
+        )
+
+
+def measure(label: str, operation: Callable[[], object], repeat: int = 1) -> float:
+    """
+    Operation ausführen, beste Laufzeit ausgeben und zurückgeben
+
+    Args:
+        label: Bezeichnung für die Ausgabe
+        operation: auszuführende Funktion
+        repeat: Anzahl der Wiederholungen (gemeldet wird das Minimum)
+
+    Returns:
+        Beste Laufzeit in Sekunden
+    """
+    timings: List[float] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        operation()
+        timings.append(time.perf_counter() - started)
+    best = min(timings)
+    print(f"{label:<50} {best * 1000:>10.2f} ms")
+    return best
+
+
+class NullSink:
+    """Verwirft geschriebenen Text (misst nur die Berichtserzeugung)"""
+
+    def write(self, text: str) -> int:
+        return len(text)
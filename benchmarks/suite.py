@@ -0,0 +1,234 @@
+"""
+Benchmark-Suite: Service, Repositories und Reports auf synthetischen Supermarkt-Daten
+
+Misst für jedes Backend der RepositoryFactory dieselben Hot Paths, schreibt
+die Ergebnisse als JSON und vergleicht sie optional mit einer Baseline.
+Liegt ein Fall um mehr als `--threshold` über der Baseline, endet der Lauf
+mit Exit-Code 1.
+
+Aufruf aus dem Projektverzeichnis:
+    python -m benchmarks.suite --scale small --output baseline.json
+    python -m benchmarks.suite --scale small --baseline baseline.json --output aktuell.json
+    python -m benchmarks.suite --scale large --backends memory,sqlite
+"""
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.adapters.report import ConsoleReportAdapter
+from src.adapters.repository import RepositoryFactory
+from src.ports import RepositoryPort
+from src.services import WarehouseService
+
+from .common import NullSink, make_movements, make_products, measure
+
+# Datensatzgrößen: (Produkte, Bewegungen)
+SCALES: Dict[str, Tuple[int, int]] = {
+    "small": (10_000, 100_000),
+    "medium": (200_000, 2_000_000),
+    "large": (1_000_000, 10_000_000),
+}
+
+# Backend -> (Typ der RepositoryFactory, Optionen; "{dir}" wird durch ein Temp-Verzeichnis ersetzt)
+BACKENDS: Dict[str, Tuple[str, Dict[str, object]]] = {
+    "memory": ("memory", {}),
+    "columnar": ("columnar", {}),
+    "sqlite": ("sqlite", {"db_path": "{dir}/bench.db"}),
+    "sqlite-cached": ("sqlite", {"db_path": "{dir}/bench.db", "cache_size": 50_000}),
+    "json": ("json", {"directory": "{dir}/json"}),
+    "wal": ("wal", {"directory": "{dir}/wal"}),
+}
+
+# Ergebnis eines Falls: Sekunden (bestes Ergebnis) und Anzahl Operationen darin
+Result = Dict[str, float]
+
+
+def create_backend(name: str, directory: str) -> RepositoryPort:
+    repository_type, options = BACKENDS[name]
+    options = {
+        key: value.format(dir=directory) if isinstance(value, str) else value
+        for key, value in options.items()
+    }
+    return RepositoryFactory.create_repository(repository_type, **options)
+
+
+def run_backend(
+    name: str, products: int, movements: int, operations: int, repeat: int
+) -> Dict[str, Result]:
+    """Alle Fälle für ein Backend messen; liefert {Fall: Ergebnis}"""
+    print(f"--- {name} ({products} Produkte, {movements} Bewegungen) ---")
+    results: Dict[str, Result] = {}
+
+    def case(label: str, operation: Callable[[], object], ops: int = 1, runs: int = 1) -> None:
+        seconds = measure(f"{label} x{ops}" if ops > 1 else label, operation, runs)
+        results[label] = {"seconds": seconds, "ops": ops}
+
+    with tempfile.TemporaryDirectory() as directory:
+        repository = create_backend(name, directory)
+        try:
+            case(
+                "save_products",
+                lambda: repository.save_products(make_products(products)),
+                products,
+            )
+            case(
+                "save_movements",
+                lambda: repository.save_movements(make_movements(movements, products)),
+                movements,
+            )
+            services: List[WarehouseService] = []
+            case("service_init", lambda: services.append(WarehouseService(repository)))
+            service = services[-1]
+
+            # Buchungen verteilt über den Katalog (wie an der Kasse, nicht sequentiell)
+            product_ids = [f"SKU-{(i * 7919) % products:07d}" for i in range(operations)]
+
+            def create_products():
+                for i in range(operations):
+                    service.create_product(f"NEU-{i:07d}", f"Neu {i}", "", 1.99, "Obst", 10)
+
+            def add_to_stock():
+                for product_id in product_ids:
+                    service.add_to_stock(product_id, 5, "Lieferung")
+
+            def remove_from_stock():
+                for product_id in product_ids:
+                    service.remove_from_stock(product_id, 1, "Verkauf")
+
+            def total_value():
+                for _ in range(operations):
+                    service.get_total_inventory_value()
+
+            case("create_product", create_products, operations)
+            case("add_to_stock", add_to_stock, operations)
+            case("remove_from_stock", remove_from_stock, operations)
+            case("get_total_inventory_value", total_value, operations, repeat)
+            case("get_all_products", service.get_all_products, runs=repeat)
+            case(
+                "inventory_report",
+                lambda: ConsoleReportAdapter(service.iter_products()).write_inventory_report(
+                    NullSink()
+                ),
+            )
+            case(
+                "movement_report",
+                lambda: ConsoleReportAdapter(
+                    movements=service.iter_movements(), movements_sorted=True
+                ).write_movement_report(NullSink()),
+            )
+        finally:
+            if hasattr(repository, "close"):
+                repository.close()
+    return results
+
+
+def compare(
+    current: dict, baseline: dict, threshold: float, min_delta: float
+) -> List[Tuple[str, float, float]]:
+    """
+    Ergebnisse mit einer Baseline vergleichen
+
+    Args:
+        current: Ergebnisdokument dieses Laufs
+        baseline: Ergebnisdokument der Baseline
+        threshold: zulässige relative Verschlechterung (0.25 = 25 %)
+        min_delta: Unterschiede unter so vielen Sekunden gelten als Rauschen
+
+    Returns:
+        Verschlechterte Fälle als (Backend/Fall, Baseline-Sekunden, aktuelle Sekunden)
+
+    Raises:
+        ValueError: wenn die Läufe mit unterschiedlichen Datengrößen gemessen wurden
+    """
+    for key in ("products", "movements", "operations"):
+        if current["meta"][key] != baseline["meta"][key]:
+            raise ValueError(
+                f"Baseline mit {key}={baseline['meta'][key]} gemessen, "
+                f"dieser Lauf mit {current['meta'][key]}"
+            )
+    regressions = []
+    for backend, cases in current["results"].items():
+        for label, result in cases.items():
+            before = baseline["results"].get(backend, {}).get(label)
+            if before is None:
+                continue
+            seconds, base = result["seconds"], before["seconds"]
+            if seconds > base * (1 + threshold) and seconds - base > min_delta:
+                regressions.append((f"{backend}/{label}", base, seconds))
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--products", type=int, help="überschreibt die Produktanzahl der Stufe")
+    parser.add_argument("--movements", type=int, help="überschreibt die Bewegungsanzahl")
+    parser.add_argument("--operations", type=int, default=2_000, help="Buchungen pro Fall")
+    parser.add_argument("--repeat", type=int, default=3, help="Läufe für Lesefälle (Minimum)")
+    parser.add_argument(
+        "--backends", default=",".join(BACKENDS), help="kommagetrennt, z.B. memory,sqlite"
+    )
+    parser.add_argument("--output", type=Path, help="Ergebnisse als JSON schreiben")
+    parser.add_argument("--baseline", type=Path, help="mit diesem Ergebnis-JSON vergleichen")
+    parser.add_argument("--threshold", type=float, default=0.25, help="zulässige Verschlechterung")
+    parser.add_argument(
+        "--min-delta", type=float, default=0.005, help="Rauschgrenze in Sekunden pro Fall"
+    )
+    args = parser.parse_args(argv)
+
+    products, movements = SCALES[args.scale]
+    products = args.products or products
+    movements = args.movements or movements
+    backends = [name.strip() for name in args.backends.split(",") if name.strip()]
+    unknown = set(backends) - set(BACKENDS)
+    if unknown:
+        parser.error(f"Unbekannte Backends: {', '.join(sorted(unknown))}")
+
+    document = {
+        "meta": {
+            "scale": args.scale,
+            "products": products,
+            "movements": movements,
+            "operations": args.operations,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+        },
+        "results": {
+            name: run_backend(name, products, movements, args.operations, args.repeat)
+            for name in backends
+        },
+    }
+    if args.output:
+        args.output.write_text(json.dumps(document, indent=2), encoding="utf-8")
+        print(f"Ergebnisse: {args.output}")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        try:
+            regressions = compare(document, baseline, args.threshold, args.min_delta)
+        except ValueError as error:
+            print(f"Vergleich nicht möglich: {error}", file=sys.stderr)
+            return 2
+        for case_name, before, after in regressions:
+            print(
+                f"REGRESSION {case_name:<40} {before * 1000:>10.2f} ms -> {after * 1000:>10.2f} ms "
+                f"({after / before - 1:+.0%})",
+                file=sys.stderr,
+            )
+        if regressions:
+            return 1
+        print(f"Keine Verschlechterung über {args.threshold:.0%} gegenüber {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
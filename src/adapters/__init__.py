@@ -1,6 +1,35 @@
 """Adapters - Konkrete Implementierungen der Ports"""
 
 from .repository import InMemoryRepository, RepositoryFactory
+from .columnar_repository import ColumnarRepository
+from .sqlite_repository import SQLiteRepository
+from .json_repository import JSONRepository
+from .wal_repository import WALRepository
+from .caching_repository import CachingRepository
+from .instrumented_repository import InstrumentedRepository
+from .metrics import MetricsRegistry, PrometheusExporter
+from .profiler import SamplingProfiler
+from .shard_router import ShardRouter
+from .shared_snapshot import StockSnapshot
+from .async_repository import ThreadPoolRepositoryAdapter
+from .search_index import InMemorySearchIndex
 from .report import ConsoleReportAdapter
 
-__all__ = ["InMemoryRepository", "RepositoryFactory", "ConsoleReportAdapter"]
+__all__ = [
+    "InMemoryRepository",
+    "ColumnarRepository",
+    "SQLiteRepository",
+    "JSONRepository",
+    "WALRepository",
+    "CachingRepository",
+    "ShardRouter",
+    "StockSnapshot",
+    "InstrumentedRepository",
+    "RepositoryFactory",
+    "ThreadPoolRepositoryAdapter",
+    "InMemorySearchIndex",
+    "ConsoleReportAdapter",
+    "MetricsRegistry",
+    "PrometheusExporter",
+    "SamplingProfiler",
+]
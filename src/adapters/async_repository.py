@@ -0,0 +1,118 @@
+"""Async Repository Adapter - synchrone Repositories aus asyncio-Code nutzen"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, TypeVar
+
+from ..domain.product import Product
+from ..domain.warehouse import Movement
+from ..ports import AsyncRepositoryPort, MovementPage, RepositoryPort
+
+T = TypeVar("T")
+
+
+class ThreadPoolRepositoryAdapter(AsyncRepositoryPort):
+    """
+    Führt ein beliebiges synchrones RepositoryPort auf einem begrenzten
+    Thread-Pool aus, damit Festplatten- oder SQLite-Zugriffe den Event-Loop
+    nicht blockieren.
+
+    Gleichzeitige load_product-Aufrufe für dieselbe ID teilen sich einen
+    einzigen Ladevorgang (Request Coalescing); alle Aufrufer erhalten dasselbe
+    Objekt. Das Repository muss Aufrufe aus mehreren Threads vertragen
+    (InMemoryRepository, SQLiteRepository).
+    """
+
+    def __init__(self, repository: RepositoryPort, max_workers: int = 4):
+        """
+        Args:
+            repository: Synchrones Repository
+            max_workers: Maximale Anzahl gleichzeitiger Repository-Aufrufe
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers muss mindestens 1 sein")
+        self.repository = repository
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="repository")
+        self._pending_loads: Dict[str, "asyncio.Future[Optional[Product]]"] = {}
+
+    async def run(self, function: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Synchrone Funktion auf dem Thread-Pool ausführen und das Ergebnis abwarten"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(function, *args, **kwargs)
+        )
+
+    def close(self) -> None:
+        """Thread-Pool beenden (laufende Aufrufe werden noch abgeschlossen)"""
+        self._executor.shutdown(wait=True)
+
+    async def save_product(self, product: Product) -> None:
+        """Produkt speichern"""
+        await self.run(self.repository.save_product, product)
+
+    async def load_product(self, product_id: str) -> Optional[Product]:
+        """Produkt laden; parallele Anfragen derselben ID teilen sich einen Ladevorgang"""
+        pending = self._pending_loads.get(product_id)
+        if pending is None:
+            loop = asyncio.get_running_loop()
+            pending = loop.run_in_executor(self._executor, self.repository.load_product, product_id)
+            self._pending_loads[product_id] = pending
+            pending.add_done_callback(functools.partial(self._forget_load, product_id))
+        # shield: ein abgebrochener Aufrufer bricht den Ladevorgang der anderen nicht ab
+        return await asyncio.shield(pending)
+
+    def _forget_load(self, product_id: str, finished: "asyncio.Future") -> None:
+        if self._pending_loads.get(product_id) is finished:
+            del self._pending_loads[product_id]
+
+    async def load_all_products(self) -> Dict[str, Product]:
+        """Alle Produkte laden"""
+        return await self.run(self.repository.load_all_products)
+
+    async def load_products(self, product_ids: Iterable[str]) -> Dict[str, Product]:
+        """Mehrere Produkte mit einem Repository-Aufruf laden"""
+        return await self.run(self.repository.load_products, list(product_ids))
+
+    async def save_products(self, products: Iterable[Product]) -> None:
+        """Mehrere Produkte mit einem Repository-Aufruf speichern"""
+        await self.run(self.repository.save_products, list(products))
+
+    async def delete_product(self, product_id: str) -> None:
+        """Produkt löschen"""
+        await self.run(self.repository.delete_product, product_id)
+
+    async def save_movement(self, movement: Movement) -> None:
+        """Lagerbewegung speichern"""
+        await self.run(self.repository.save_movement, movement)
+
+    async def save_movements(self, movements: Iterable[Movement]) -> None:
+        """Mehrere Lagerbewegungen mit einem Repository-Aufruf speichern"""
+        await self.run(self.repository.save_movements, list(movements))
+
+    async def load_movements(self) -> List[Movement]:
+        """Alle Lagerbewegungen laden"""
+        return await self.run(self.repository.load_movements)
+
+    async def query_movements(
+        self,
+        product_id: Optional[str] = None,
+        movement_type: Optional[str] = None,
+        performed_by: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> MovementPage:
+        """Lagerbewegungen gefiltert und seitenweise abfragen (siehe RepositoryPort)"""
+        return await self.run(
+            self.repository.query_movements,
+            product_id=product_id,
+            movement_type=movement_type,
+            performed_by=performed_by,
+            start=start,
+            end=end,
+            limit=limit,
+            cursor=cursor,
+        )
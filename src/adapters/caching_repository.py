@@ -0,0 +1,347 @@
+"""Caching Repository - LRU/TTL-Cache vor einem beliebigen RepositoryPort"""
+
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from types import MappingProxyType
+from typing import (
+    Callable,
+    ContextManager,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from ..domain.lots import Lot
+from ..domain.product import Product
+from ..domain.warehouse import Movement
+from ..ports import MovementPage, RepositoryPort
+
+
+@dataclass
+class CacheStats:
+    """Zähler eines CachingRepository"""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0  # wegen max_size verdrängt
+    expirations: int = 0  # wegen ttl verworfen
+
+    @property
+    def hit_rate(self) -> float:
+        """Anteil der Zugriffe, die aus dem Cache bedient wurden (0.0 ohne Zugriffe)"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class CachingRepository(RepositoryPort):
+    """
+    Read-Through-Cache für Produkte vor einem anderen Repository (Decorator).
+
+    - load_product/load_products lesen aus einem LRU-Cache mit höchstens
+      `max_size` Produkten; Einträge älter als `ttl` Sekunden werden neu gelesen.
+    - save/delete schreiben sofort durch (Write-Through) und halten den Cache aktuell.
+    - load_all_products liest den Katalog einmal und liefert danach eine
+      schreibgeschützte Live-Ansicht (MappingProxyType) statt einer Kopie.
+      iter_products und count_products fragen die Datenquelle, damit reines
+      Durchlaufen keinen ganzen Katalog im Speicher aufbaut.
+    - Bewegungen werden unverändert durchgereicht.
+
+    Schreiben andere Prozesse in dieselbe Datenquelle, muss der Aufrufer
+    betroffene Produkte mit invalidate() bzw. invalidate_all() verwerfen.
+    Schlägt ein Schreibvorgang fehl, werden die betroffenen Einträge verworfen,
+    damit keine nur im Speicher geänderten Produkte ausgeliefert werden.
+    """
+
+    def __init__(
+        self,
+        repository: RepositoryPort,
+        max_size: int = 10_000,
+        ttl: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            repository: Eigentliche Datenquelle
+            max_size: maximale Anzahl gecachter Produkte (LRU-Verdrängung)
+            ttl: Lebensdauer eines Eintrags in Sekunden (None: unbegrenzt)
+            clock: Zeitquelle in Sekunden (für Tests austauschbar)
+
+        Raises:
+            ValueError: bei max_size < 1 oder ttl <= 0
+        """
+        if max_size < 1:
+            raise ValueError("max_size muss mindestens 1 sein")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl muss positiv sein")
+        self.repository = repository
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.RLock()
+        # Produkt-ID -> (Produkt, Ablaufzeitpunkt)
+        self._entries: "OrderedDict[str, Tuple[Product, float]]" = OrderedDict()
+        self._stats = CacheStats()
+        # Vollständiger Katalog für load_all_products, erst bei Bedarf geladen
+        self._catalogue: Optional[Dict[str, Product]] = None
+        self._catalogue_expires = 0.0
+        self._stale_in_catalogue: Set[str] = set()
+        # Während einer Transaktion geschriebene Produkt-IDs (pro Thread)
+        self._local = threading.local()
+
+    def __getattr__(self, name: str):
+        # Adapterspezifisches wie close() oder flush() an die Datenquelle weiterreichen
+        if name == "repository":
+            raise AttributeError(name)
+        return getattr(self.repository, name)
+
+    # ------------------------------------------------------------------
+    # Cache-Verwaltung
+    # ------------------------------------------------------------------
+
+    @property
+    def stats(self) -> CacheStats:
+        """Momentaufnahme der Zähler"""
+        with self._lock:
+            return CacheStats(**vars(self._stats))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def invalidate(self, product_id: str) -> None:
+        """Ein Produkt verwerfen, z.B. nach einer Änderung durch einen anderen Prozess"""
+        with self._lock:
+            self._entries.pop(product_id, None)
+            if self._catalogue is not None:
+                self._stale_in_catalogue.add(product_id)
+
+    def invalidate_all(self) -> None:
+        """Gesamten Cache einschließlich des Katalogs verwerfen"""
+        with self._lock:
+            self._entries.clear()
+            self._catalogue = None
+            self._stale_in_catalogue.clear()
+
+    def _expires_at(self) -> float:
+        return self._clock() + self.ttl if self.ttl is not None else float("inf")
+
+    def _lookup(self, product_id: str) -> Optional[Product]:
+        """Produkt aus dem Cache (Aufrufer hält das Lock); zählt Treffer und Fehlgriffe"""
+        entry = self._entries.get(product_id)
+        if entry is not None:
+            product, expires_at = entry
+            if expires_at > self._clock():
+                self._entries.move_to_end(product_id)
+                self._stats.hits += 1
+                return product
+            del self._entries[product_id]
+            self._stats.expirations += 1
+        self._stats.misses += 1
+        return None
+
+    def _remember(self, product: Product) -> None:
+        """Produkt einlagern und ggf. das am längsten ungenutzte verdrängen"""
+        entries = self._entries
+        entries[product.id] = (product, self._expires_at())
+        entries.move_to_end(product.id)
+        while len(entries) > self.max_size:
+            entries.popitem(last=False)
+            self._stats.evictions += 1
+        if self._catalogue is not None:
+            self._catalogue[product.id] = product
+            self._stale_in_catalogue.discard(product.id)
+
+    def _forget(self, product_ids: Iterable[str]) -> None:
+        for product_id in product_ids:
+            self.invalidate(product_id)
+
+    def _track_writes(self, product_ids: Iterable[str]) -> None:
+        written = getattr(self._local, "written", None)
+        if written is not None:
+            written.update(product_ids)
+
+    # ------------------------------------------------------------------
+    # Produkte
+    # ------------------------------------------------------------------
+
+    def save_product(self, product: Product) -> None:
+        """Produkt speichern (Write-Through)"""
+        try:
+            self.repository.save_product(product)
+        except Exception:
+            self.invalidate(product.id)
+            raise
+        with self._lock:
+            self._remember(product)
+        self._track_writes([product.id])
+
+    def save_products(self, products: Iterable[Product]) -> None:
+        """Mehrere Produkte speichern (Write-Through)"""
+        products = list(products)
+        try:
+            self.repository.save_products(products)
+        except Exception:
+            self._forget(product.id for product in products)
+            raise
+        with self._lock:
+            for product in products:
+                self._remember(product)
+        self._track_writes(product.id for product in products)
+
+    def load_product(self, product_id: str) -> Optional[Product]:
+        """Produkt aus dem Cache, sonst aus der Datenquelle laden"""
+        with self._lock:
+            product = self._lookup(product_id)
+        if product is not None:
+            return product
+        product = self.repository.load_product(product_id)
+        if product is not None:
+            with self._lock:
+                self._remember(product)
+        return product
+
+    def load_products(self, product_ids: Iterable[str]) -> Dict[str, Product]:
+        """Mehrere Produkte laden; nur die nicht gecachten gehen an die Datenquelle"""
+        found: Dict[str, Product] = {}
+        missing: List[str] = []
+        with self._lock:
+            for product_id in product_ids:
+                product = self._lookup(product_id)
+                if product is not None:
+                    found[product_id] = product
+                else:
+                    missing.append(product_id)
+        if missing:
+            loaded = self.repository.load_products(missing)
+            with self._lock:
+                for product in loaded.values():
+                    self._remember(product)
+            found.update(loaded)
+        return found
+
+    def load_all_products(self) -> Mapping[str, Product]:
+        """
+        Alle Produkte als schreibgeschützte Live-Ansicht
+
+        Der Katalog wird einmal (bzw. nach Ablauf von ttl) aus der Datenquelle
+        gelesen und danach über Write-Through aktuell gehalten. Wer parallel zu
+        Schreibzugriffen iteriert, kopiert die Ansicht vorher mit dict(...).
+        """
+        with self._lock:
+            if self._catalogue is not None and self._catalogue_expires <= self._clock():
+                self._catalogue = None
+                self._stale_in_catalogue.clear()
+            catalogue = self._catalogue
+            stale = list(self._stale_in_catalogue)
+            self._stale_in_catalogue.clear()
+        if catalogue is None:
+            catalogue = dict(self.repository.load_all_products())
+            with self._lock:
+                self._catalogue = catalogue
+                self._catalogue_expires = self._expires_at()
+        elif stale:
+            # Einzeln verworfene Produkte gezielt nachlesen statt alles neu zu laden
+            reloaded = self.repository.load_products(stale)
+            with self._lock:
+                for product_id in stale:
+                    if product_id in reloaded:
+                        catalogue[product_id] = reloaded[product_id]
+                    else:
+                        catalogue.pop(product_id, None)
+        return MappingProxyType(catalogue)
+
+    def iter_products(self) -> Iterator[Product]:
+        """Produkte aus der Datenquelle streamen (ohne Katalog, ohne Cache)"""
+        return self.repository.iter_products()
+
+    def count_products(self) -> int:
+        return self.repository.count_products()
+
+    def delete_product(self, product_id: str) -> None:
+        """Produkt löschen (Write-Through)"""
+        try:
+            self.repository.delete_product(product_id)
+        except Exception:
+            self.invalidate(product_id)
+            raise
+        with self._lock:
+            self._entries.pop(product_id, None)
+            if self._catalogue is not None:
+                self._catalogue.pop(product_id, None)
+        self._track_writes([product_id])
+
+    # ------------------------------------------------------------------
+    # Bewegungen, Chargen und Transaktionen (unverändert durchgereicht)
+    # ------------------------------------------------------------------
+
+    def save_movement(self, movement: Movement) -> None:
+        self.repository.save_movement(movement)
+
+    def save_movements(self, movements: Iterable[Movement]) -> None:
+        self.repository.save_movements(movements)
+
+    def load_movements(self) -> List[Movement]:
+        return self.repository.load_movements()
+
+    def iter_movements(self, start: int = 0) -> Iterator[Movement]:
+        return self.repository.iter_movements(start)
+
+    def count_movements(self) -> int:
+        return self.repository.count_movements()
+
+    def query_movements(
+        self,
+        product_id: Optional[str] = None,
+        movement_type: Optional[str] = None,
+        performed_by: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> MovementPage:
+        return self.repository.query_movements(
+            product_id=product_id,
+            movement_type=movement_type,
+            performed_by=performed_by,
+            start=start,
+            end=end,
+            limit=limit,
+            cursor=cursor,
+        )
+
+    def save_lots(self, lots: Iterable[Lot]) -> None:
+        self.repository.save_lots(lots)
+
+    def load_lots(self) -> List[Lot]:
+        return self.repository.load_lots()
+
+    def transaction(self) -> ContextManager:
+        """
+        Transaktion der Datenquelle; scheitert sie, werden alle darin
+        geschriebenen Produkte aus dem Cache verworfen (die Datenquelle rollt zurück)
+        """
+        return self._transaction()
+
+    @contextmanager
+    def _transaction(self):
+        outer = getattr(self._local, "written", None)
+        written: Set[str] = set()
+        self._local.written = written
+        try:
+            with self.repository.transaction():
+                yield
+        except BaseException:
+            self._forget(written)
+            raise
+        finally:
+            self._local.written = outer
+            if outer is not None:
+                outer.update(written)
@@ -0,0 +1,362 @@
+"""Columnar Repository Adapter - speichersparende Produktablage in typisierten Arrays"""
+
+import threading
+from array import array
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from ..domain.lots import Lot
+from ..domain.product import Product
+from ..domain.warehouse import Movement
+from ..ports import MovementPage, RepositoryPort
+from .repository import InMemoryRepository
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _to_micros(value: datetime) -> int:
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def _from_micros(value: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=value)
+
+
+class ProductColumns:
+    """
+    Spaltenspeicher für Produkte.
+
+    Preise, Bestände und Zeitstempel liegen in typisierten Arrays (8 Byte pro
+    Wert statt eines Python-Objekts), Kategorien werden einmalig abgelegt und
+    pro Zeile nur als Code gespeichert. Gelöschte Zeilen werden wiederverwendet.
+    Die Generation einer Zeile steigt beim Löschen (ungerade: frei) und beim
+    Wiederbelegen (gerade: belegt), damit alte Sichten nicht unbemerkt das
+    Nachfolgeprodukt lesen oder ändern.
+
+    Einfügen, Löschen und Schreiben über Sichten laufen unter `lock`, damit
+    parallele Threads (WarehouseService mit thread_safe=True) die Spalten
+    nicht gegeneinander verschieben.
+    """
+
+    def __init__(self):
+        self.rows: Dict[str, int] = {}
+        self.ids: List[Optional[str]] = []
+        self.names: List[str] = []
+        self.descriptions: List[str] = []
+        self.skus: List[str] = []
+        self.notes: List[Optional[str]] = []
+        self.prices = array("d")
+        self.quantities = array("q")
+        self.created_at = array("q")  # Mikrosekunden seit 1970-01-01
+        self.updated_at = array("q")
+        self.category_codes = array("L")
+        self.generations = array("L")  # gerade: belegt, ungerade: frei
+        self.categories: List[str] = []
+        self._category_lookup: Dict[str, int] = {}
+        self._free_rows: List[int] = []
+        self.lock = threading.Lock()
+
+    def category_code(self, category: str) -> int:
+        """Code einer Kategorie (neue Kategorien werden angelegt)"""
+        code = self._category_lookup.get(category)
+        if code is None:
+            with self.lock:
+                code = self._category_code(category)
+        return code
+
+    def _category_code(self, category: str) -> int:
+        # Aufrufer hält lock
+        code = self._category_lookup.get(category)
+        if code is None:
+            code = len(self.categories)
+            self.categories.append(category)
+            self._category_lookup[category] = code
+        return code
+
+    def write(self, product: Product) -> int:
+        """Produkt einfügen oder überschreiben; liefert die Zeilennummer"""
+        with self.lock:
+            return self._write(product)
+
+    def _write(self, product: Product) -> int:
+        values = (
+            product.name,
+            product.description,
+            product.sku,
+            product.notes,
+            product.price,
+            product.quantity,
+            _to_micros(product.created_at),
+            _to_micros(product.updated_at),
+            self._category_code(product.category),
+        )
+        row = self.rows.get(product.id)
+        if row is None and self._free_rows:
+            row = self._free_rows.pop()
+            self.ids[row] = product.id
+            self.generations[row] += 1
+        if row is None:
+            row = len(self.ids)
+            self.ids.append(product.id)
+            self.generations.append(0)
+            for column, value in zip(self._columns(), values):
+                column.append(value)
+        else:
+            for column, value in zip(self._columns(), values):
+                column[row] = value
+        self.rows[product.id] = row
+        return row
+
+    def delete(self, product_id: str) -> None:
+        """Zeile freigeben (unbekannte IDs werden ignoriert)"""
+        with self.lock:
+            row = self.rows.pop(product_id, None)
+            if row is None:
+                return
+            # Werte bleiben bis zur Wiederbelegung lesbar (Sichten des gelöschten Produkts)
+            self.generations[row] += 1
+            self._free_rows.append(row)
+
+    def view(self, product_id: str) -> Optional["ProductView"]:
+        """Sicht auf die aktuelle Zeile eines Produkts (None, wenn unbekannt)"""
+        row = self.rows.get(product_id)
+        if row is None:
+            return None
+        view = ProductView(self, row)
+        if view._generation & 1 or self.ids[row] != product_id:
+            # Zeile wurde parallel freigegeben oder neu belegt - unter dem Lock neu auflösen
+            with self.lock:
+                row = self.rows.get(product_id)
+                return ProductView(self, row) if row is not None else None
+        return view
+
+    def _columns(self) -> tuple:
+        return (
+            self.names,
+            self.descriptions,
+            self.skus,
+            self.notes,
+            self.prices,
+            self.quantities,
+            self.created_at,
+            self.updated_at,
+            self.category_codes,
+        )
+
+
+def _check_readable(view: "ProductView") -> None:
+    # Generationen steigen nur: nach dem Lesen geprüft, stammt der Wert aus der eigenen
+    # Zeile; gelöscht (eine Generation weiter) bleibt sie bis zur Wiederbelegung lesbar
+    if view._columns.generations[view._row] - view._generation > 1:
+        raise ValueError("Zeile der Sicht wurde von einem anderen Produkt übernommen")
+
+
+def _check_writable(view: "ProductView") -> None:
+    # Aufrufer hält columns.lock
+    if view._columns.generations[view._row] != view._generation:
+        raise ValueError("Produkt der Sicht wurde gelöscht")
+
+
+def _column_property(column: str, doc: str) -> property:
+    def getter(view: "ProductView"):
+        columns, row = view._columns, view._row
+        value = getattr(columns, column)[row]
+        if columns.generations[row] - view._generation > 1:
+            _check_readable(view)
+        return value
+
+    def setter(view: "ProductView", value) -> None:
+        columns, row = view._columns, view._row
+        with columns.lock:
+            if columns.generations[row] != view._generation:
+                _check_writable(view)
+            getattr(columns, column)[row] = value
+
+    return property(getter, setter, doc=doc)
+
+
+class ProductView(Product):
+    """
+    Leichtgewichtige Product-Sicht auf eine Zeile von ProductColumns.
+
+    Verhält sich wie ein Product (inkl. update_quantity/get_total_value),
+    liest und schreibt aber direkt in die Spalten. Die Sicht merkt sich die
+    Generation ihrer Zeile: Nach dem Löschen liefert sie noch die letzten
+    Werte, Schreiben löst ValueError aus; ist die Zeile neu belegt, auch
+    Lesen - eine Sicht trifft nie das Nachfolgeprodukt.
+    """
+
+    __slots__ = ("_columns", "_row", "_generation")
+
+    def __init__(self, columns: ProductColumns, row: int):
+        self._columns = columns
+        self._row = row
+        self._generation = columns.generations[row]
+
+    @property
+    def is_deleted(self) -> bool:
+        """True, wenn das Produkt der Sicht gelöscht wurde"""
+        return self._columns.generations[self._row] != self._generation
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Product):
+            return NotImplemented
+        return all(
+            getattr(self, name) == getattr(other, name) for name in Product.__dataclass_fields__
+        )
+
+    __hash__ = None
+
+    @property
+    def id(self) -> str:
+        """Produkt-ID (nur lesbar)"""
+        product_id = self._columns.ids[self._row]
+        _check_readable(self)
+        return product_id
+
+    name = _column_property("names", "Produktname")
+    description = _column_property("descriptions", "Beschreibung")
+    sku = _column_property("skus", "Stock Keeping Unit")
+    notes = _column_property("notes", "Anmerkungen")
+    price = _column_property("prices", "Preis pro Einheit")
+    quantity = _column_property("quantities", "Bestand")
+
+    @property
+    def category(self) -> str:
+        code = self._columns.category_codes[self._row]
+        _check_readable(self)
+        return self._columns.categories[code]
+
+    @category.setter
+    def category(self, value: str) -> None:
+        columns = self._columns
+        with columns.lock:
+            _check_writable(self)
+            columns.category_codes[self._row] = columns._category_code(value)
+
+    @property
+    def created_at(self) -> datetime:
+        micros = self._columns.created_at[self._row]
+        _check_readable(self)
+        return _from_micros(micros)
+
+    @created_at.setter
+    def created_at(self, value: datetime) -> None:
+        with self._columns.lock:
+            _check_writable(self)
+            self._columns.created_at[self._row] = _to_micros(value)
+
+    @property
+    def updated_at(self) -> datetime:
+        micros = self._columns.updated_at[self._row]
+        _check_readable(self)
+        return _from_micros(micros)
+
+    @updated_at.setter
+    def updated_at(self, value: datetime) -> None:
+        with self._columns.lock:
+            _check_writable(self)
+            self._columns.updated_at[self._row] = _to_micros(value)
+
+
+class ColumnarRepository(RepositoryPort):
+    """
+    Repository mit spaltenorientierter Produktablage für sehr große Kataloge.
+
+    Produkte liegen in ProductColumns und werden als ProductView herausgegeben;
+    Änderungen an einer Sicht landen sofort im Speicher. Bewegungen werden wie
+    im InMemoryRepository (inkl. Indizes) verwaltet. Thread-sicher wie das
+    InMemoryRepository: iter_products läuft über eine Kopie der ID-Liste und
+    verträgt paralleles Anlegen und Löschen.
+    """
+
+    def __init__(self):
+        self.columns = ProductColumns()
+        self._movements = InMemoryRepository()
+
+    def save_product(self, product: Product) -> None:
+        """
+        Produkt in die Spalten schreiben (Sichten auf diese Ablage sind schon aktuell)
+
+        Raises:
+            ValueError: bei einer Sicht auf ein inzwischen gelöschtes Produkt
+        """
+        if isinstance(product, ProductView) and product._columns is self.columns:
+            if product.is_deleted:
+                raise ValueError("Produkt der Sicht wurde gelöscht")
+            return
+        self.columns.write(product)
+
+    def load_product(self, product_id: str) -> Optional[Product]:
+        """Sicht auf ein Produkt liefern"""
+        return self.columns.view(product_id)
+
+    def load_all_products(self) -> Dict[str, Product]:
+        """Sichten auf alle Produkte liefern"""
+        columns = self.columns
+        with columns.lock:
+            return {pid: ProductView(columns, row) for pid, row in columns.rows.items()}
+
+    def iter_products(self) -> Iterator[Product]:
+        """
+        Sichten auf die Produkte zum Aufrufzeitpunkt (ohne Dictionary aller Sichten)
+
+        Kopiert wird nur die ID-Liste; jede Sicht wird erst beim Weiterlaufen
+        aufgelöst. Inzwischen gelöschte Produkte werden übersprungen.
+        """
+        columns = self.columns
+        with columns.lock:
+            product_ids = list(columns.rows)
+        for product_id in product_ids:
+            view = columns.view(product_id)
+            if view is not None:
+                yield view
+
+    def count_products(self) -> int:
+        return len(self.columns.rows)
+
+    def load_products(self, product_ids: Iterable[str]) -> Dict[str, Product]:
+        """Sichten auf mehrere Produkte liefern"""
+        columns = self.columns
+        rows = columns.rows
+        with columns.lock:
+            return {pid: ProductView(columns, rows[pid]) for pid in product_ids if pid in rows}
+
+    def save_products(self, products: Iterable[Product]) -> None:
+        """Mehrere Produkte in die Spalten schreiben"""
+        for product in products:
+            self.save_product(product)
+
+    def delete_product(self, product_id: str) -> None:
+        """Produkt löschen (unbekannte IDs werden ignoriert)"""
+        self.columns.delete(product_id)
+
+    def save_movement(self, movement: Movement) -> None:
+        """Bewegung speichern"""
+        self._movements.save_movement(movement)
+
+    def save_movements(self, movements: Iterable[Movement]) -> None:
+        """Mehrere Bewegungen speichern"""
+        self._movements.save_movements(movements)
+
+    def load_movements(self) -> List[Movement]:
+        """Alle Bewegungen laden"""
+        return self._movements.load_movements()
+
+    def iter_movements(self, start: int = 0) -> Iterator[Movement]:
+        return self._movements.iter_movements(start)
+
+    def count_movements(self) -> int:
+        return self._movements.count_movements()
+
+    def query_movements(self, *args, **kwargs) -> MovementPage:
+        """Bewegungen über die Indizes abfragen (siehe RepositoryPort)"""
+        return self._movements.query_movements(*args, **kwargs)
+
+    def save_lots(self, lots: Iterable[Lot]) -> None:
+        """Chargen speichern (wie im InMemoryRepository)"""
+        self._movements.save_lots(lots)
+
+    def load_lots(self) -> List[Lot]:
+        return self._movements.load_lots()
@@ -0,0 +1,165 @@
+"""Instrumented Repository - Laufzeit- und Fehlermetriken für jeden RepositoryPort-Aufruf"""
+
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, ContextManager, Dict, Iterator, List, Optional, TypeVar
+
+from ..domain.product import Product
+from ..domain.warehouse import Movement
+from ..ports import MetricsPort, RepositoryPort
+from .caching_repository import CachingRepository
+
+T = TypeVar("T")
+
+# Öffentliche Methoden des Ports; neue Port-Methoden werden automatisch gemessen
+_PORT_METHODS = tuple(
+    name
+    for name, value in vars(RepositoryPort).items()
+    if callable(value) and not name.startswith("_") and name != "transaction"
+)
+
+
+class InstrumentedRepository(RepositoryPort):
+    """
+    Misst jeden Aufruf eines anderen Repositories (Decorator).
+
+    - repository_call_seconds{repository, method}: Dauer pro Aufruf; bei
+      iter_* die Zeit, die das Repository beim Liefern verbraucht (ohne die
+      Verarbeitung beim Aufrufer), bei transaction() die Dauer des Blocks.
+    - repository_errors_total{repository, method}: fehlgeschlagene Aufrufe.
+    - Liegt ein CachingRepository darunter, meldet ein Collector dessen
+      Statistik als repository_cache_* (Treffer, Fehlgriffe, Verdrängungen,
+      Größe, Trefferquote) - erst beim Export, nicht bei jedem Zugriff.
+
+    Ohne InstrumentedRepository entsteht kein Messaufwand; die
+    RepositoryFactory legt ihn nur mit der Option `metrics` davor.
+    """
+
+    def __init__(self, repository: RepositoryPort, metrics: MetricsPort, name: str = ""):
+        """
+        Args:
+            repository: gemessenes Repository
+            metrics: Ziel der Messwerte
+            name: Wert des Labels "repository" (Standard: Klassenname)
+        """
+        self.repository = repository
+        self.metrics = metrics
+        self.name = name or type(repository).__name__
+        for method in _PORT_METHODS:
+            target = getattr(repository, method)
+            if method.startswith("iter_"):
+                setattr(self, method, self._timed_iterator_factory(method, target))
+            else:
+                setattr(self, method, self._timed(method, target))
+        self._observe_transaction = metrics.observer(
+            "repository_call_seconds", self._labels("transaction")
+        )
+        if isinstance(repository, CachingRepository):
+            metrics.register_collector(self._collect_cache_stats)
+
+    def __getattr__(self, name: str):
+        # Adapterspezifisches wie close() oder flush() an das Repository weiterreichen
+        if name == "repository":
+            raise AttributeError(name)
+        return getattr(self.repository, name)
+
+    def _labels(self, method: str) -> dict:
+        return {"repository": self.name, "method": method}
+
+    def _timed(self, method: str, target: Callable[..., T]) -> Callable[..., T]:
+        metrics, labels, clock = self.metrics, self._labels(method), time.perf_counter
+        observe = metrics.observer("repository_call_seconds", labels)
+
+        @wraps(target)
+        def timed(*args, **kwargs):
+            started = clock()
+            try:
+                return target(*args, **kwargs)
+            except BaseException:
+                metrics.increment("repository_errors_total", labels=labels)
+                raise
+            finally:
+                observe(clock() - started)
+
+        return timed
+
+    def _timed_iterator_factory(
+        self, method: str, target: Callable[..., Iterator[T]]
+    ) -> Callable[..., Iterator[T]]:
+        metrics, labels, clock = self.metrics, self._labels(method), time.perf_counter
+        observe = metrics.observer("repository_call_seconds", labels)
+
+        @wraps(target)
+        def timed_iterator(*args, **kwargs) -> Iterator[T]:
+            # Nur die Zeit in next() zählt; gemeldet wird beim Ende oder Abbruch der Iteration
+            spent = 0.0
+            started = clock()
+            try:
+                iterator = iter(target(*args, **kwargs))
+                spent += clock() - started
+                while True:
+                    started = clock()
+                    try:
+                        item = next(iterator)
+                    except StopIteration:
+                        spent += clock() - started
+                        return
+                    spent += clock() - started
+                    yield item
+            except GeneratorExit:
+                raise
+            except BaseException:
+                metrics.increment("repository_errors_total", labels=labels)
+                raise
+            finally:
+                observe(spent)
+
+        return timed_iterator
+
+    # Die Instanz überschreibt alle Port-Methoden im Konstruktor mit gemessenen
+    # Varianten; die Delegationen hier erfüllen nur die abstrakte Schnittstelle
+
+    def save_product(self, product: Product) -> None:
+        self.repository.save_product(product)
+
+    def load_product(self, product_id: str) -> Optional[Product]:
+        return self.repository.load_product(product_id)
+
+    def load_all_products(self) -> Dict[str, Product]:
+        return self.repository.load_all_products()
+
+    def delete_product(self, product_id: str) -> None:
+        self.repository.delete_product(product_id)
+
+    def save_movement(self, movement: Movement) -> None:
+        self.repository.save_movement(movement)
+
+    def load_movements(self) -> List[Movement]:
+        return self.repository.load_movements()
+
+    def transaction(self) -> ContextManager:
+        """Transaktion des Repositories; gemessen wird die Dauer des ganzen Blocks"""
+        return self._transaction()
+
+    @contextmanager
+    def _transaction(self):
+        started = time.perf_counter()
+        try:
+            with self.repository.transaction():
+                yield
+        except BaseException:
+            self.metrics.increment("repository_errors_total", labels=self._labels("transaction"))
+            raise
+        finally:
+            self._observe_transaction(time.perf_counter() - started)
+
+    def _collect_cache_stats(self, metrics: MetricsPort) -> None:
+        stats = self.repository.stats
+        labels = {"repository": self.name}
+        metrics.set_gauge("repository_cache_hits", stats.hits, labels)
+        metrics.set_gauge("repository_cache_misses", stats.misses, labels)
+        metrics.set_gauge("repository_cache_evictions", stats.evictions, labels)
+        metrics.set_gauge("repository_cache_expirations", stats.expirations, labels)
+        metrics.set_gauge("repository_cache_hit_ratio", stats.hit_rate, labels)
+        metrics.set_gauge("repository_cache_entries", len(self.repository), labels)
@@ -0,0 +1,433 @@
+"""JSON Repository Adapter - TinyDB-Dokumente mit Write-Behind-Puffer und Bewegungssegmenten"""
+
+import os
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
+
+from tinydb import TinyDB
+from tinydb.storages import Storage
+
+from ..domain.lots import Lot
+from ..domain.product import Product
+from ..domain.warehouse import Movement
+from .repository import InMemoryRepository
+from .serialization import (
+    document_to_lot,
+    document_to_movement,
+    document_to_product,
+    dumps,
+    fsync_directory,
+    loads,
+    lot_to_document,
+    movement_to_document,
+    product_to_document,
+    write_atomic,
+)
+
+
+class AtomicJSONStorage(Storage):
+    """
+    TinyDB-Storage, der die Datei atomar ersetzt statt sie an Ort und Stelle
+    zu überschreiben - ein Absturz hinterlässt immer den alten oder den neuen
+    Stand.
+    """
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = Path(path)
+
+    def read(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        try:
+            data = self.path.read_bytes()
+        except FileNotFoundError:
+            return None
+        return loads(data) if data else None
+
+    def write(self, data: Dict[str, Dict[str, Any]]) -> None:
+        write_atomic(self.path, dumps(data))
+
+
+@dataclass
+class _Segment:
+    """Bewegungssegment: JSON-Lines-Datei, benannt nach der Nummer der ersten Bewegung"""
+
+    path: Path
+    first: int
+    count: int
+
+    @property
+    def size(self) -> int:
+        return self.path.stat().st_size
+
+
+class JSONRepository(InMemoryRepository):
+    """
+    Persistentes Repository auf Basis von JSON-Dateien.
+
+    Gelesen wird aus dem Speicher (wie InMemoryRepository). Änderungen landen
+    zunächst in einem Write-Behind-Puffer und werden geschrieben, sobald
+    `flush_size` Änderungen anstehen oder spätestens nach `flush_interval`
+    Sekunden (Hintergrund-Thread):
+
+    - Produkte als TinyDB-Dokument `products.json`, atomar ersetzt
+      (temporäre Datei, fsync, os.replace)
+    - Chargen als Liste in `lots.json`, ebenso atomar ersetzt
+    - Bewegungen nur angehängt an JSON-Lines-Segmente in `movements/`; jeder
+      Start beginnt ein neues Segment, volle Segmente werden abgeschlossen
+    - kleine abgeschlossene Segmente werden im Hintergrund zu größeren
+      zusammengeführt (Compaction)
+
+    Bei einem Absturz gehen höchstens die Änderungen seit dem letzten Flush
+    verloren. Bewegungen werden vor den Produkten geschrieben. Sammelaufrufe
+    (save_products, save_movements) und transaction() lösen höchstens einen
+    Flush am Ende aus, da jeder Flush die ganze Produktdatei schreibt.
+    Solange eine Transaktion (in irgendeinem Thread) offen ist, warten
+    Flushes nach Größe oder Intervall bis zum Ende der letzten.
+    """
+
+    PRODUCTS_TABLE = "products"
+
+    def __init__(
+        self,
+        directory: str,
+        flush_size: int = 1000,
+        flush_interval: Optional[float] = 1.0,
+        segment_size: int = 4 * 1024 * 1024,
+        compact_threshold: int = 8,
+    ):
+        """
+        Args:
+            directory: Datenverzeichnis (wird angelegt)
+            flush_size: Anzahl gepufferter Änderungen, ab der sofort geschrieben wird
+            flush_interval: Sekunden bis zum Schreiben im Hintergrund (None: nur
+                über flush_size, flush() und close())
+            segment_size: Bytes, ab denen ein Bewegungssegment abgeschlossen wird
+            compact_threshold: Anzahl kleiner Segmente, ab der zusammengeführt wird
+        """
+        super().__init__()
+        self.directory = Path(directory)
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.segment_size = segment_size
+        self.compact_threshold = compact_threshold
+
+        self._lock = threading.RLock()
+        self._compact_lock = threading.Lock()
+        self._dirty_products: Set[str] = set()
+        self._deleted_products: Set[str] = set()
+        self._pending_movements: List[Movement] = []
+        self._dirty_lots: Set[str] = set()
+        self._local = threading.local()
+        # Offene Transaktionen aller Threads; Flushes warten, bis keine mehr offen ist
+        self._open_transactions = 0
+        self._flush_deferred = False
+        self._transactions_idle = threading.Condition(self._lock)
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._segment_directory = self.directory / "movements"
+        self._segment_directory.mkdir(exist_ok=True)
+
+        self._db = TinyDB(str(self.directory / "products.json"), storage=AtomicJSONStorage)
+        self._table: Dict[str, Dict[str, Any]] = {}
+        self._doc_ids: Dict[str, str] = {}
+        self._next_doc_id = 1
+        self._load_products()
+        self._lots_path = self.directory / "lots.json"
+        self._load_lots()
+
+        self._sealed: List[_Segment] = []
+        self._load_movements()
+        self._active: Optional[_Segment] = None
+        self._active_handle = None
+
+        self._stop = threading.Event()
+        self._background: Optional[threading.Thread] = None
+        if flush_interval is not None:
+            self._background = threading.Thread(
+                target=self._run_background, name="json-repository", daemon=True
+            )
+            self._background.start()
+
+    # ------------------------------------------------------------------
+    # Laden
+    # ------------------------------------------------------------------
+
+    def _load_products(self) -> None:
+        for document in self._db.table(self.PRODUCTS_TABLE).all():
+            doc_id = str(document.doc_id)
+            self._table[doc_id] = dict(document)
+            self._doc_ids[document["id"]] = doc_id
+            self.products[document["id"]] = document_to_product(document)
+            self._next_doc_id = max(self._next_doc_id, document.doc_id + 1)
+
+    def _load_lots(self) -> None:
+        try:
+            data = self._lots_path.read_bytes()
+        except FileNotFoundError:
+            return
+        super().save_lots(document_to_lot(document) for document in loads(data))
+
+    def _load_movements(self) -> None:
+        """Segmente in Reihenfolge einlesen; von Compaction überholte Segmente verwerfen"""
+        loaded = 0
+        for path in sorted(self._segment_directory.glob("segment-*.jsonl")):
+            first = int(path.stem.split("-")[1])
+            if first < loaded:
+                # Bereits in einem zusammengeführten Segment enthalten
+                path.unlink()
+                continue
+            data = path.read_bytes()
+            complete = data.rfind(b"\n") + 1
+            if complete < len(data):
+                # Unvollständig geschriebene letzte Zeile (Absturz) abschneiden
+                with open(path, "r+b") as handle:
+                    handle.truncate(complete)
+            lines = data[:complete].splitlines()
+            if not lines:
+                path.unlink()
+                continue
+            for line in lines:
+                super().save_movement(document_to_movement(loads(line)))
+            count = len(lines)
+            self._sealed.append(_Segment(path, first, count))
+            loaded = first + count
+        self._next_sequence = loaded
+
+    # ------------------------------------------------------------------
+    # Schreiben (gepuffert)
+    # ------------------------------------------------------------------
+
+    def save_product(self, product: Product) -> None:
+        """Produkt speichern (persistiert beim nächsten Flush)"""
+        super().save_product(product)
+        with self._lock:
+            self._dirty_products.add(product.id)
+            self._deleted_products.discard(product.id)
+            self._flush_if_full()
+
+    def save_products(self, products: Iterable[Product]) -> None:
+        """Mehrere Produkte speichern (persistiert beim nächsten Flush)"""
+        products = list(products)
+        super().save_products(products)
+        with self._lock:
+            for product in products:
+                self._dirty_products.add(product.id)
+                self._deleted_products.discard(product.id)
+            self._flush_if_full()
+
+    def delete_product(self, product_id: str) -> None:
+        """Produkt löschen (persistiert beim nächsten Flush)"""
+        super().delete_product(product_id)
+        with self._lock:
+            self._dirty_products.discard(product_id)
+            self._deleted_products.add(product_id)
+            self._flush_if_full()
+
+    def save_movement(self, movement: Movement) -> None:
+        """Bewegung speichern (persistiert beim nächsten Flush)"""
+        super().save_movement(movement)
+        with self._lock:
+            self._pending_movements.append(movement)
+            self._flush_if_full()
+
+    def save_movements(self, movements: Iterable[Movement]) -> None:
+        """Mehrere Bewegungen speichern (persistiert beim nächsten Flush)"""
+        movements = list(movements)
+        for movement in movements:
+            super().save_movement(movement)
+        with self._lock:
+            self._pending_movements.extend(movements)
+            self._flush_if_full()
+
+    def save_lots(self, lots: Iterable[Lot]) -> None:
+        """Chargen speichern bzw. aufgebrauchte löschen (persistiert beim nächsten Flush)"""
+        lots = list(lots)
+        super().save_lots(lots)
+        with self._lock:
+            self._dirty_lots.update(lot.id for lot in lots)
+            self._flush_if_full()
+
+    @property
+    def pending_changes(self) -> int:
+        """Anzahl noch nicht geschriebener Änderungen"""
+        with self._lock:
+            return (
+                len(self._dirty_products)
+                + len(self._deleted_products)
+                + len(self._pending_movements)
+                + len(self._dirty_lots)
+            )
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """
+        Schreibvorgänge dieses Threads bündeln: ein voller Puffer wird erst am
+        Ende geschrieben
+
+        Kein Rollback - wie im InMemoryRepository bleiben Änderungen vor
+        einer Ausnahme bestehen und werden mit geschrieben. Fällige Flushes
+        anderer Threads und des Hintergrund-Threads werden bis zum Ende der
+        letzten offenen Transaktion zurückgestellt.
+        """
+        depth = getattr(self._local, "depth", 0)
+        if not depth:
+            with self._lock:
+                self._open_transactions += 1
+        self._local.depth = depth + 1
+        try:
+            yield
+        finally:
+            self._local.depth -= 1
+            if not self._local.depth:
+                with self._lock:
+                    self._open_transactions -= 1
+                    self._transactions_idle.notify_all()
+                    if self._flush_deferred:
+                        self._flush_when_idle()
+                    else:
+                        self._flush_if_full()
+
+    def _flush_if_full(self) -> None:
+        if getattr(self._local, "depth", 0):
+            return  # am Ende der Transaktion
+        if self.pending_changes >= self.flush_size:
+            self._flush_when_idle()
+
+    def _flush_when_idle(self) -> None:
+        # Aufrufer hält _lock; die letzte offene Transaktion holt den Flush nach
+        if self._open_transactions:
+            self._flush_deferred = True
+        else:
+            self.flush()
+
+    def flush(self) -> None:
+        """Gepufferte Änderungen sofort schreiben (auch während offener Transaktionen)"""
+        with self._lock:
+            self._flush_deferred = False
+            if self._pending_movements:
+                self._append_movements(self._pending_movements)
+                self._pending_movements = []
+            if self._dirty_products or self._deleted_products:
+                self._write_products()
+            if self._dirty_lots:
+                write_atomic(
+                    self._lots_path, dumps([lot_to_document(lot) for lot in self.lots.values()])
+                )
+                self._dirty_lots.clear()
+
+    def _write_products(self) -> None:
+        for product_id in self._deleted_products:
+            doc_id = self._doc_ids.pop(product_id, None)
+            if doc_id is not None:
+                del self._table[doc_id]
+        for product_id in self._dirty_products:
+            product = self.products.get(product_id)
+            if product is None:
+                continue
+            doc_id = self._doc_ids.get(product_id)
+            if doc_id is None:
+                doc_id = str(self._next_doc_id)
+                self._next_doc_id += 1
+                self._doc_ids[product_id] = doc_id
+            self._table[doc_id] = product_to_document(product)
+        self._db.storage.write({self.PRODUCTS_TABLE: self._table})
+        self._db.table(self.PRODUCTS_TABLE).clear_cache()
+        self._dirty_products.clear()
+        self._deleted_products.clear()
+
+    def _append_movements(self, movements: List[Movement]) -> None:
+        if self._active is None:
+            path = self._segment_directory / f"segment-{self._next_sequence:012d}.jsonl"
+            self._active = _Segment(path, self._next_sequence, 0)
+            self._active_handle = open(path, "ab")
+            fsync_directory(self._segment_directory)
+        handle = self._active_handle
+        handle.write(b"".join(dumps(movement_to_document(m)) + b"\n" for m in movements))
+        handle.flush()
+        os.fsync(handle.fileno())
+        self._active.count += len(movements)
+        self._next_sequence += len(movements)
+        if handle.tell() >= self.segment_size:
+            self._seal_active()
+
+    def _seal_active(self) -> None:
+        if self._active is None:
+            return
+        self._active_handle.close()
+        self._sealed.append(self._active)
+        self._active = self._active_handle = None
+
+    # ------------------------------------------------------------------
+    # Compaction und Hintergrund-Thread
+    # ------------------------------------------------------------------
+
+    def compact(self) -> int:
+        """
+        Benachbarte kleine abgeschlossene Segmente zu Segmenten bis
+        `segment_size` zusammenführen
+
+        Das zusammengeführte Segment ersetzt atomar das erste der Gruppe; die
+        übrigen werden danach gelöscht (bleiben sie nach einem Absturz liegen,
+        verwirft sie der nächste Start).
+
+        Returns:
+            Anzahl der eingesparten Segmentdateien
+        """
+        with self._compact_lock:
+            with self._lock:
+                sealed = list(self._sealed)
+            saved = 0
+            for group in self._compaction_groups(sealed):
+                merged = _Segment(group[0].path, group[0].first, sum(s.count for s in group))
+                data = b"".join(segment.path.read_bytes() for segment in group)
+                write_atomic(merged.path, data)
+                for segment in group[1:]:
+                    segment.path.unlink()
+                with self._lock:
+                    position = self._sealed.index(group[0])
+                    self._sealed[position : position + len(group)] = [merged]
+                saved += len(group) - 1
+            return saved
+
+    def _compaction_groups(self, sealed: List[_Segment]) -> List[List[_Segment]]:
+        groups: List[List[_Segment]] = []
+        current: List[_Segment] = []
+        current_size = 0
+        for segment in sealed:
+            size = segment.size
+            if current and current_size + size > self.segment_size:
+                groups.append(current)
+                current, current_size = [], 0
+            current.append(segment)
+            current_size += size
+        groups.append(current)
+        return [group for group in groups if len(group) > 1]
+
+    def _small_segments(self) -> int:
+        with self._lock:
+            return sum(1 for segment in self._sealed if segment.size < self.segment_size // 2)
+
+    def _run_background(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            with self._lock:
+                self._flush_when_idle()
+            if self._small_segments() >= self.compact_threshold:
+                self.compact()
+
+    def close(self) -> None:
+        """
+        Hintergrund-Thread beenden, auf offene Transaktionen anderer Threads
+        warten, alles schreiben und das aktive Segment abschließen
+        """
+        self._stop.set()
+        if self._background is not None:
+            self._background.join()
+        with self._lock:
+            own = 1 if getattr(self._local, "depth", 0) else 0
+            while self._open_transactions > own:
+                self._transactions_idle.wait()
+            self.flush()
+            self._seal_active()
@@ -0,0 +1,329 @@
+"""Metrics - In-Process-Registry mit Prometheus-Textformat und JSON-Export"""
+
+import json
+import threading
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from ..ports import MetricsPort
+
+# Standard-Grenzen für Dauern in Sekunden (10 µs bis 10 s)
+TIME_BUCKETS: Tuple[float, ...] = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)  # fmt: skip
+# Standard-Grenzen für Größen (z.B. Positionen pro Sammelbuchung)
+SIZE_BUCKETS: Tuple[float, ...] = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1_000, 5_000, 10_000)
+
+# Labels als sortierte (Name, Wert)-Paare, damit sie als Dictionary-Schlüssel taugen
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Optional[Dict[str, str]]) -> LabelKey:
+    return tuple(sorted(labels.items())) if labels else ()
+
+
+class Histogram:
+    """
+    Verteilung von Messwerten über feste Obergrenzen (plus Summe und Anzahl)
+
+    Mit eigenem Lock, damit gebundene observe-Methoden (MetricsRegistry.observer)
+    ohne das Lock der Registry auskommen.
+    """
+
+    __slots__ = ("buckets", "counts", "sum", "count", "_lock")
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # letzter Eintrag: über allen Grenzen
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        # Obergrenzen sind inklusive (Prometheus "le")
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def snapshot(self) -> Tuple[List[Tuple[float, int]], float, int]:
+        """Konsistente Momentaufnahme: (cumulative(), Summe, Anzahl)"""
+        with self._lock:
+            counts, total_sum, total_count = list(self.counts), self.sum, self.count
+        result, total = [], 0
+        for bound, amount in zip(self.buckets + (float("inf"),), counts):
+            total += amount
+            result.append((bound, total))
+        return result, total_sum, total_count
+
+    def cumulative(self) -> List[Tuple[float, int]]:
+        """(Obergrenze, Anzahl Werte <= Obergrenze), zuletzt (inf, Gesamtanzahl)"""
+        return self.snapshot()[0]
+
+    def quantile(self, q: float) -> float:
+        """Näherung des Quantils q (0..1): Obergrenze des Buckets, in dem es liegt"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        for bound, total in self.cumulative():
+            if total >= rank:
+                return bound
+        return float("inf")
+
+
+class MetricsRegistry(MetricsPort):
+    """
+    Metriken im Prozess sammeln
+
+    - Histogramme mit festen Grenzen: Namen auf "_seconds" nutzen TIME_BUCKETS,
+      alle anderen SIZE_BUCKETS (pro Name über `buckets` überschreibbar).
+    - Zähler und Momentwerte pro Name und Label-Kombination.
+    - Collectors werden vor jedem Export aufgerufen und melden dann aktuelle
+      Werte (z.B. Cache-Statistiken), statt bei jedem Zugriff zu messen.
+
+    Alle Operationen sind thread-sicher.
+    """
+
+    def __init__(self, buckets: Optional[Dict[str, Sequence[float]]] = None):
+        """
+        Args:
+            buckets: Histogramm-Grenzen pro Metrikname (überschreibt die Standards)
+        """
+        self._buckets = dict(buckets or {})
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._gauges: Dict[str, Dict[LabelKey, float]] = {}
+        self._collectors: List[Callable[[MetricsPort], None]] = []
+
+    def _buckets_for(self, name: str) -> Sequence[float]:
+        if name in self._buckets:
+            return self._buckets[name]
+        return TIME_BUCKETS if name.endswith("_seconds") else SIZE_BUCKETS
+
+    def _histogram(self, name: str, labels: Optional[Dict[str, str]]) -> Histogram:
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(self._buckets_for(name))
+            return histogram
+
+    def observe(self, name: str, value: float, labels: Optional[Dict[str, str]] = None) -> None:
+        self._histogram(name, labels).observe(value)
+
+    def observer(
+        self, name: str, labels: Optional[Dict[str, str]] = None
+    ) -> Callable[[float], None]:
+        # Das Histogramm erscheint damit schon vor dem ersten Messwert im Export
+        return self._histogram(name, labels).observe
+
+    def increment(
+        self, name: str, amount: float = 1.0, labels: Optional[Dict[str, str]] = None
+    ) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + amount
+
+    def set_gauge(self, name: str, value: float, labels: Optional[Dict[str, str]] = None) -> None:
+        with self._lock:
+            self._gauges.setdefault(name, {})[_label_key(labels)] = value
+
+    def register_collector(self, collector: Callable[[MetricsPort], None]) -> None:
+        with self._lock:
+            self._collectors.append(collector)
+
+    def histogram(self, name: str, labels: Optional[Dict[str, str]] = None) -> Optional[Histogram]:
+        """Histogramm einer Label-Kombination (None, solange nichts gemessen wurde)"""
+        with self._lock:
+            return self._histograms.get(name, {}).get(_label_key(labels))
+
+    def counter(self, name: str, labels: Optional[Dict[str, str]] = None) -> float:
+        """Aktueller Zählerstand (0.0, solange nichts gezählt wurde)"""
+        with self._lock:
+            return self._counters.get(name, {}).get(_label_key(labels), 0.0)
+
+    def gauge(self, name: str, labels: Optional[Dict[str, str]] = None) -> Optional[float]:
+        """Aktueller Momentwert (None, solange keiner gesetzt wurde)"""
+        with self._lock:
+            return self._gauges.get(name, {}).get(_label_key(labels))
+
+    def reset(self) -> None:
+        """Alle Messwerte verwerfen (Collectors bleiben registriert)"""
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self._gauges.clear()
+
+    def collect(self) -> dict:
+        """
+        Collectors ausführen und alle Metriken als Momentaufnahme liefern
+
+        Returns:
+            {"histograms": {Name: [{"labels", "buckets", "sum", "count"}, ...]},
+             "counters": {Name: [{"labels", "value"}, ...]},
+             "gauges": {Name: [{"labels", "value"}, ...]}}
+        """
+        with self._lock:
+            collectors = list(self._collectors)
+        for collector in collectors:
+            collector(self)
+        with self._lock:
+            histograms: Dict[str, List[dict]] = {}
+            for name, series in sorted(self._histograms.items()):
+                histograms[name] = []
+                for key, histogram in sorted(series.items(), key=lambda item: item[0]):
+                    buckets, total_sum, total_count = histogram.snapshot()
+                    histograms[name].append(
+                        {
+                            "labels": dict(key),
+                            "buckets": buckets,
+                            "sum": total_sum,
+                            "count": total_count,
+                        }
+                    )
+            return {
+                "histograms": histograms,
+                "counters": _series(self._counters),
+                "gauges": _series(self._gauges),
+            }
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        """Momentaufnahme als JSON ("+Inf" statt unendlicher Obergrenze)"""
+        snapshot = self.collect()
+        for series in snapshot["histograms"].values():
+            for entry in series:
+                entry["buckets"] = [
+                    [_format_bound(bound), total] for bound, total in entry["buckets"]
+                ]
+        return json.dumps(snapshot, indent=indent)
+
+    def dump_json(self, path: Union[str, Path]) -> None:
+        """Momentaufnahme als JSON-Datei schreiben"""
+        Path(path).write_text(self.to_json(), encoding="utf-8")
+
+    def render_prometheus(self) -> str:
+        """Momentaufnahme im Prometheus-Textformat (Version 0.0.4)"""
+        snapshot = self.collect()
+        lines: List[str] = []
+        for kind in ("counter", "gauge"):
+            for name, series in snapshot[kind + "s"].items():
+                lines.append(f"# TYPE {name} {kind}")
+                for entry in series:
+                    labels, value = _format_labels(entry["labels"]), _format_value(entry["value"])
+                    lines.append(f"{name}{labels} {value}")
+        for name, series in snapshot["histograms"].items():
+            lines.append(f"# TYPE {name} histogram")
+            for entry in series:
+                labels = entry["labels"]
+                for bound, total in entry["buckets"]:
+                    bucket_labels = _format_labels({**labels, "le": _format_bound(bound)})
+                    lines.append(f"{name}_bucket{bucket_labels} {total}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(entry['sum'])}")
+                lines.append(f"{name}_count{_format_labels(labels)} {entry['count']}")
+        return "\n".join(lines) + "\n"
+
+
+def _series(metrics: Dict[str, Dict[LabelKey, float]]) -> Dict[str, List[dict]]:
+    return {
+        name: [{"labels": dict(key), "value": value} for key, value in sorted(series.items())]
+        for name, series in sorted(metrics.items())
+    }
+
+
+def _format_bound(bound: float) -> str:
+    return "+Inf" if bound == float("inf") else repr(float(bound))
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+class PrometheusExporter:
+    """
+    Stellt eine MetricsRegistry per HTTP im Prometheus-Textformat bereit (GET /metrics)
+
+    Läuft in einem Daemon-Thread und lauscht standardmäßig nur lokal.
+    Port 0 wählt einen freien Port (siehe `address`).
+    """
+
+    def __init__(self, registry: MetricsRegistry, host: str = "127.0.0.1", port: int = 9464):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        """(Host, Port), auf dem der Exporter lauscht"""
+        if self._server is None:
+            return self.host, self.port
+        host, port = self._server.server_address[:2]
+        return host, port
+
+    def start(self) -> "PrometheusExporter":
+        """
+        Server starten
+
+        Raises:
+            ValueError: wenn der Exporter bereits läuft
+        """
+        if self._server is not None:
+            raise ValueError("Exporter läuft bereits")
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = registry.render_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Scrapes nicht auf stderr protokollieren
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="prometheus-exporter", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Server anhalten (ohne Wirkung, wenn er nicht läuft)"""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        self._server = self._thread = None
+
+    def __enter__(self) -> "PrometheusExporter":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
@@ -0,0 +1,155 @@
+"""Profiler - Stichproben-Profiler für laufende Prozesse (Flamegraph-Format)"""
+
+import os
+import sys
+import threading
+from collections import Counter
+from pathlib import Path
+from types import FrameType
+from typing import Iterable, List, Optional, Tuple, Union
+
+from ..ports import MetricsPort
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """
+    Stichproben-Profiler: liest alle `interval` Sekunden die Aufrufstapel der
+    laufenden Threads (sys._current_frames) und zählt, wie oft jeder Stapel
+    gesehen wurde.
+
+    Der gemessene Code wird nicht verändert; der Aufwand entsteht nur im
+    Profiler-Thread und ist über `interval` steuerbar. Das Ergebnis liegt im
+    "collapsed stack"-Format vor (flamegraph.pl, speedscope). Mit `metrics`
+    meldet ein Collector zusätzlich profiler_samples_total{function} für die
+    jeweils oberste Funktion - die "heißen" Funktionen erscheinen dann direkt
+    neben den übrigen Metriken.
+
+    Verwendung:
+        with SamplingProfiler(interval=0.005) as profiler:
+            service.book_movements(bookings)
+        profiler.write_collapsed("buchung.folded")
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.005,
+        thread_ids: Optional[Iterable[int]] = None,
+        max_depth: int = 64,
+        metrics: Optional[MetricsPort] = None,
+    ):
+        """
+        Args:
+            interval: Abstand der Stichproben in Sekunden
+            thread_ids: nur diese Threads beobachten (threading.get_ident();
+                None: alle außer dem Profiler selbst)
+            max_depth: höchstens so viele Ebenen pro Stapel (die innersten)
+            metrics: Ziel für profiler_samples_total (None: nur collapsed())
+
+        Raises:
+            ValueError: bei interval <= 0 oder max_depth < 1
+        """
+        if interval <= 0:
+            raise ValueError("interval muss positiv sein")
+        if max_depth < 1:
+            raise ValueError("max_depth muss mindestens 1 sein")
+        self.interval = interval
+        self.thread_ids = set(thread_ids) if thread_ids is not None else None
+        self.max_depth = max_depth
+        self.samples: Counter = Counter()  # collapsed Stapel -> Anzahl
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # Oberste Funktion -> Anzahl seit dem letzten Collector-Aufruf
+        self._pending: Counter = Counter()
+        if metrics is not None:
+            metrics.register_collector(self._collect)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self) -> "SamplingProfiler":
+        """
+        Stichproben im Hintergrund starten
+
+        Raises:
+            ValueError: wenn der Profiler bereits läuft
+        """
+        if self._thread is not None:
+            raise ValueError("Profiler läuft bereits")
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stichproben beenden (ohne Wirkung, wenn der Profiler nicht läuft)"""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def __enter__(self) -> "SamplingProfiler":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            self.sample(exclude=own_id)
+
+    def sample(self, exclude: Optional[int] = None) -> None:
+        """Eine Stichprobe aller beobachteten Threads nehmen (auch ohne Hintergrund-Thread)"""
+        stacks: List[Tuple[str, str]] = []
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == exclude or (
+                self.thread_ids is not None and thread_id not in self.thread_ids
+            ):
+                continue
+            labels = []
+            while frame is not None and len(labels) < self.max_depth:
+                labels.append(_frame_label(frame))
+                frame = frame.f_back
+            if labels:
+                stacks.append((";".join(reversed(labels)), labels[0]))
+        with self._lock:
+            for stack, leaf in stacks:
+                self.samples[stack] += 1
+                self._pending[leaf] += 1
+
+    def _collect(self, metrics: MetricsPort) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+        for function, count in pending.items():
+            metrics.increment("profiler_samples_total", count, {"function": function})
+
+    def top(self, limit: int = 20) -> List[Tuple[str, int]]:
+        """Funktionen mit den meisten Stichproben als oberster Rahmen (Eigenzeit)"""
+        leaves: Counter = Counter()
+        with self._lock:
+            for stack, count in self.samples.items():
+                leaves[stack.rpartition(";")[2]] += count
+        return leaves.most_common(limit)
+
+    def collapsed(self) -> str:
+        """Stapel im collapsed-Format: "äußere;...;innere Anzahl" pro Zeile"""
+        with self._lock:
+            return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+    def write_collapsed(self, path: Union[str, Path]) -> None:
+        """collapsed() in eine Datei schreiben (Eingabe für flamegraph.pl/speedscope)"""
+        Path(path).write_text(self.collapsed(), encoding="utf-8")
+
+    def reset(self) -> None:
+        """Gesammelte Stichproben verwerfen"""
+        with self._lock:
+            self.samples.clear()
+            self._pending.clear()
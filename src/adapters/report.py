@@ -1,16 +1,106 @@
 """Report Adapter - Report-Generierung"""
 
-from typing import Dict
+from itertools import chain
+from typing import Iterable, Iterator, Mapping, TextIO, Union
 
+from ..domain.product import Product
+from ..domain.warehouse import Movement
 from ..ports import ReportPort
 
 
 class ConsoleReportAdapter(ReportPort):
-    """Report-Adapter für Konsolenausgabe"""
+    """
+    Report-Adapter für Konsolenausgabe
+
+    Die Berichte werden als Generatoren von Textblöcken erzeugt (iter_*) und
+    können direkt in eine Datei o.ä. geschrieben werden (write_*), ohne den
+    Gesamttext im Speicher aufzubauen. generate_* liefert wie bisher einen String.
+    """
+
+    def __init__(
+        self,
+        products: Union[Mapping[str, Product], Iterable[Product]] = None,
+        movements: Iterable[Movement] = None,
+        movements_sorted: bool = False,
+    ):
+        """
+        Args:
+            products: Produkte nach ID oder als (einmal lesbarer) Iterator,
+                z.B. aus RepositoryPort.iter_products()
+            movements: Lagerbewegungen (Liste oder einmal lesbarer Iterator)
+            movements_sorted: True, wenn movements bereits zeitlich sortiert sind;
+                dann wird nicht im Speicher sortiert und der Speicherbedarf bleibt konstant
+        """
+        self.products = products if products is not None else {}
+        self.movements = movements if movements is not None else []
+        self.movements_sorted = movements_sorted
+
+    def iter_inventory_report(self) -> Iterator[str]:
+        """Lagerbestandsbericht blockweise (ein Block pro Produkt) erzeugen"""
+        products = self.products
+        if isinstance(products, Mapping):
+            products = products.values()
+        products = iter(products)
+        first = next(products, None)
+        if first is None:
+            yield "Lager ist leer.\n"
+            return
+
+        yield "=" * 60 + "\nLAGERBESTANDSBERICHT\n" + "=" * 60 + "\n\n"
 
-    def __init__(self, products: Dict = None, movements: list = None):
-        self.products = products or {}
-        self.movements = movements or []
+        total_value = 0
+        for product in chain((first,), products):
+            value = product.get_total_value()
+            total_value += value
+            yield (
+                f"ID: {product.id}\n"
+                f"  Name: {product.name}\n"
+                f"  Kategorie: {product.category}\n"
+                f"  Bestand: {product.quantity}\n"
+                f"  Preis: {product.price:.2f} €\n"
+                f"  Gesamtwert: {value:.2f} €\n\n"
+            )
+
+        yield "-" * 60 + f"\nGesamtwert Lager: {total_value:.2f} €\n" + "=" * 60 + "\n"
+
+    def iter_movement_report(self) -> Iterator[str]:
+        """Bewegungsprotokoll blockweise (ein Block pro Bewegung) erzeugen"""
+        if self.movements_sorted:
+            movements = iter(self.movements)
+        else:
+            movements = iter(sorted(self.movements, key=lambda m: m.timestamp))
+
+        first = next(movements, None)
+        if first is None:
+            yield "Keine Lagerbewegungen vorhanden.\n"
+            return
+
+        yield "=" * 80 + "\nBEWEGUNGSPROTOKOLL\n" + "=" * 80 + "\n\n"
+
+        count = 0
+        for movement in chain((first,), movements):
+            count += 1
+            reason = f"  Grund: {movement.reason}\n" if movement.reason else ""
+            yield (
+                f"[{movement.timestamp.strftime('%Y-%m-%d %H:%M:%S')}]\n"
+                f"  Produkt: {movement.product_name} (ID: {movement.product_id})\n"
+                f"  Typ: {movement.movement_type}\n"
+                f"  Menge: {movement.quantity_change:+d}\n"
+                f"{reason}"
+                f"  Durchgeführt von: {movement.performed_by}\n\n"
+            )
+
+        yield "=" * 80 + f"\nGesamtbewegungen: {count}\n" + "=" * 80 + "\n"
+
+    def write_inventory_report(self, sink: TextIO) -> None:
+        """Lagerbestandsbericht direkt in einen Datei-ähnlichen Empfänger schreiben"""
+        for chunk in self.iter_inventory_report():
+            sink.write(chunk)
+
+    def write_movement_report(self, sink: TextIO) -> None:
+        """Bewegungsprotokoll direkt in einen Datei-ähnlichen Empfänger schreiben"""
+        for chunk in self.iter_movement_report():
+            sink.write(chunk)
 
     def generate_inventory_report(self) -> str:
         """
@@ -19,29 +109,7 @@ class ConsoleReportAdapter(ReportPort):
         Returns:
             Formatierter Bericht
         """
-        if not self.products:
-            return "Lager ist leer.\n"
-
-        report = "=" * 60 + "\n"
-        report += "LAGERBESTANDSBERICHT\n"
-        report += "=" * 60 + "\n\n"
-
-        total_value = 0
-        for product_id, product in self.products.items():
-            value = product.get_total_value()
-            total_value += value
-            report += f"ID: {product_id}\n"
-            report += f"  Name: {product.name}\n"
-            report += f"  Kategorie: {product.category}\n"
-            report += f"  Bestand: {product.quantity}\n"
-            report += f"  Preis: {product.price:.2f} €\n"
-            report += f"  Gesamtwert: {value:.2f} €\n\n"
-
-        report += "-" * 60 + "\n"
-        report += f"Gesamtwert Lager: {total_value:.2f} €\n"
-        report += "=" * 60 + "\n"
-
-        return report
+        return "".join(self.iter_inventory_report())
 
     def generate_movement_report(self) -> str:
         """
@@ -50,24 +118,4 @@ class ConsoleReportAdapter(ReportPort):
         Returns:
             Formatierter Bericht
         """
-        if not self.movements:
-            return "Keine Lagerbewegungen vorhanden.\n"
-
-        report = "=" * 80 + "\n"
-        report += "BEWEGUNGSPROTOKOLL\n"
-        report += "=" * 80 + "\n\n"
-
-        for movement in sorted(self.movements, key=lambda m: m.timestamp):
-            report += f"[{movement.timestamp.strftime('%Y-%m-%d %H:%M:%S')}]\n"
-            report += f"  Produkt: {movement.product_name} (ID: {movement.product_id})\n"
-            report += f"  Typ: {movement.movement_type}\n"
-            report += f"  Menge: {movement.quantity_change:+d}\n"
-            if movement.reason:
-                report += f"  Grund: {movement.reason}\n"
-            report += f"  Durchgeführt von: {movement.performed_by}\n\n"
-
-        report += "=" * 80 + "\n"
-        report += f"Gesamtbewegungen: {len(self.movements)}\n"
-        report += "=" * 80 + "\n"
-
-        return report
+        return "".join(self.iter_movement_report())
@@ -1,10 +1,28 @@
 """Repository Adapter - In-Memory und persistente Implementierungen"""
 
-from typing import Dict, List, Optional
+import threading
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
+from ..domain.lots import Lot
 from ..domain.product import Product
 from ..domain.warehouse import Movement
-from ..ports import RepositoryPort
+from ..ports import (
+    MovementPage,
+    RepositoryPort,
+    check_page_limit,
+    decode_movement_cursor,
+    encode_movement_cursor,
+)
+from .sqlite_repository import SQLiteRepository
+
+# Sortierschlüssel einer Bewegung: (Zeitstempel, Position in movements)
+_MovementKey = Tuple[datetime, int]
+
+# Felder, für die InMemoryRepository einen Sekundärindex führt
+_INDEXED_FIELDS = ("product_id", "movement_type", "performed_by")
 
 
 class InMemoryRepository(RepositoryPort):
@@ -13,6 +31,15 @@ class InMemoryRepository(RepositoryPort):
     def __init__(self):
         self.products: Dict[str, Product] = {}
         self.movements: List[Movement] = []
+        self.lots: Dict[str, Lot] = {}
+        # Zeitlich sortierte Schlüssel aller Bewegungen und je Feldwert
+        # (z.B. pro Produkt), damit Abfragen per bisect statt Full Scan laufen
+        self._timeline: List[_MovementKey] = []
+        self._indexes: Dict[str, Dict[str, List[_MovementKey]]] = {
+            field_name: {} for field_name in _INDEXED_FIELDS
+        }
+        # Schützt Liste und Indizes, wenn mehrere Threads gleichzeitig buchen
+        self._movement_lock = threading.Lock()
 
     def save_product(self, product: Product) -> None:
         """Produkt im Memory speichern"""
@@ -26,35 +53,173 @@ class InMemoryRepository(RepositoryPort):
         """Alle Produkte aus Memory laden"""
         return self.products.copy()
 
+    def load_products(self, product_ids: Iterable[str]) -> Dict[str, Product]:
+        """Mehrere Produkte aus Memory laden"""
+        products = self.products
+        return {pid: products[pid] for pid in product_ids if pid in products}
+
+    def save_products(self, products: Iterable[Product]) -> None:
+        """Mehrere Produkte im Memory speichern"""
+        self.products.update((product.id, product) for product in products)
+
     def delete_product(self, product_id: str) -> None:
         """Produkt aus Memory löschen"""
         if product_id in self.products:
             del self.products[product_id]
 
+    def iter_products(self) -> Iterator[Product]:
+        """Produkte zum Aufrufzeitpunkt (Liste der Referenzen, keine Produktkopien)"""
+        # list() über ein dict läuft unter dem GIL ohne Unterbrechung - paralleles
+        # Anlegen oder Löschen stört den Durchlauf nicht
+        return iter(list(self.products.values()))
+
+    def count_products(self) -> int:
+        return len(self.products)
+
+    @staticmethod
+    def _insert_key(keys: List[_MovementKey], key: _MovementKey) -> None:
+        # Bewegungen kommen fast immer in Zeitreihenfolge - dann reicht append
+        if not keys or keys[-1] <= key:
+            keys.append(key)
+        else:
+            insort(keys, key)
+
     def save_movement(self, movement: Movement) -> None:
-        """Bewegung im Memory speichern"""
-        self.movements.append(movement)
+        """Bewegung im Memory speichern und indizieren"""
+        with self._movement_lock:
+            key = (movement.timestamp, len(self.movements))
+            self.movements.append(movement)
+            self._insert_key(self._timeline, key)
+            for field_name, index in self._indexes.items():
+                self._insert_key(index.setdefault(getattr(movement, field_name), []), key)
+
+    def save_movements(self, movements: Iterable[Movement]) -> None:
+        """Mehrere Bewegungen im Memory speichern"""
+        for movement in movements:
+            self.save_movement(movement)
+
+    def query_movements(
+        self,
+        product_id: Optional[str] = None,
+        movement_type: Optional[str] = None,
+        performed_by: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> MovementPage:
+        """Bewegungen über die Sekundärindizes abfragen (siehe RepositoryPort)"""
+        check_page_limit(limit)
+        filters = {
+            name: value
+            for name, value in (
+                ("product_id", product_id),
+                ("movement_type", movement_type),
+                ("performed_by", performed_by),
+            )
+            if value is not None
+        }
+        # Kleinste passende Indexliste durchlaufen, restliche Filter prüfen
+        candidates = self._timeline
+        driving = None
+        for name, value in filters.items():
+            keys = self._indexes[name].get(value, [])
+            if driving is None or len(keys) < len(candidates):
+                candidates, driving = keys, name
+        remaining = [(name, value) for name, value in filters.items() if name != driving]
+
+        low = bisect_left(candidates, (start, -1)) if start is not None else 0
+        if cursor:
+            low = max(low, bisect_right(candidates, decode_movement_cursor(cursor)))
+        high = bisect_left(candidates, (end, -1)) if end is not None else len(candidates)
+
+        found: List[Movement] = []
+        for position in range(low, high):
+            key = candidates[position]
+            movement = self.movements[key[1]]
+            if all(getattr(movement, name) == value for name, value in remaining):
+                found.append(movement)
+                if limit is not None and len(found) == limit:
+                    if position + 1 < high:
+                        return MovementPage(found, encode_movement_cursor(*key))
+                    break
+        return MovementPage(found)
 
     def load_movements(self) -> List[Movement]:
         """Alle Bewegungen aus Memory laden"""
         return self.movements.copy()
 
+    def iter_movements(self, start: int = 0) -> Iterator[Movement]:
+        """Bewegungen ab start bis zum Aufrufzeitpunkt, ohne Kopie (später angehängte fehlen)"""
+        return islice(self.movements, start, len(self.movements))
+
+    def count_movements(self) -> int:
+        return len(self.movements)
+
+    def save_lots(self, lots: Iterable[Lot]) -> None:
+        """Chargen im Memory speichern; aufgebrauchte (Menge 0) entfernen"""
+        for lot in lots:
+            if lot.quantity:
+                self.lots[lot.id] = lot
+            else:
+                self.lots.pop(lot.id, None)
+
+    def load_lots(self) -> List[Lot]:
+        """Alle Chargen aus Memory laden"""
+        return list(self.lots.values())
+
 
 class RepositoryFactory:
     """Factory für Repository-Instanzen"""
 
     @staticmethod
-    def create_repository(repository_type: str = "memory") -> RepositoryPort:
+    def create_repository(repository_type: str = "memory", **options) -> RepositoryPort:
         """
         Repository basierend auf Typ erstellen
 
         Args:
-            repository_type: "memory" oder andere (z.B. "sqlite", "json")
+            repository_type: "memory", "columnar", "sqlite", "json" oder "wal"
+            **options: Konstruktor-Parameter des Adapters (z.B. db_path für "sqlite",
+                directory für "json" und "wal"); cache_size und cache_ttl legen
+                zusätzlich einen CachingRepository davor, metrics (ein MetricsPort)
+                ganz außen einen InstrumentedRepository
 
         Returns:
             RepositoryPort Instanz
         """
+        cache_size = options.pop("cache_size", None)
+        cache_ttl = options.pop("cache_ttl", None)
+        metrics = options.pop("metrics", None)
+        repository = RepositoryFactory._create_adapter(repository_type, options)
+        if cache_size is not None or cache_ttl is not None:
+            from .caching_repository import CachingRepository
+
+            repository = CachingRepository(repository, max_size=cache_size or 10_000, ttl=cache_ttl)
+        if metrics is not None:
+            from .instrumented_repository import InstrumentedRepository
+
+            repository = InstrumentedRepository(repository, metrics, name=repository_type)
+        return repository
+
+    @staticmethod
+    def _create_adapter(repository_type: str, options: dict) -> RepositoryPort:
         if repository_type == "memory":
             return InMemoryRepository()
+        elif repository_type == "columnar":
+            # Import hier, da columnar_repository selbst InMemoryRepository importiert
+            from .columnar_repository import ColumnarRepository
+
+            return ColumnarRepository(**options)
+        elif repository_type == "sqlite":
+            return SQLiteRepository(**options)
+        elif repository_type == "json":
+            # Import hier aus demselben Grund wie bei "columnar" (gilt auch für "wal")
+            from .json_repository import JSONRepository
+
+            return JSONRepository(**options)
+        elif repository_type == "wal":
+            from .wal_repository import WALRepository
+
+            return WALRepository(**options)
         else:
             raise ValueError(f"Unbekannter Repository-Typ: {repository_type}")
@@ -0,0 +1,291 @@
+"""Search Index - Volltext- und Präfixsuche über Produkte im Speicher"""
+
+import heapq
+import re
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ..domain.product import Product
+from ..ports import SearchHit, SearchPort
+
+_TOKEN = re.compile(r"\w+")
+
+# Gewicht eines Treffers je Feld: eine passende SKU zählt mehr als die Beschreibung
+FIELD_WEIGHTS = (
+    ("id", 4.0),
+    ("sku", 4.0),
+    ("name", 3.0),
+    ("category", 2.0),
+    ("description", 1.0),
+)
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Text in kleingeschriebene Wörter zerlegen ("SKU-0001 Milch" -> sku, 0001, milch)"""
+    return _TOKEN.findall(text.casefold()) if text else []
+
+
+class InMemorySearchIndex(SearchPort):
+    """
+    Invertierter Index plus Präfixindex für die Suche während der Eingabe.
+
+    - Invertierter Index: Wort -> {Produkt-ID: Gewicht}; das Gewicht summiert
+      die Feldgewichte (FIELD_WEIGHTS) aller Felder, in denen das Wort vorkommt.
+    - Präfixindex: das Vokabular als sortierte Liste. Alle Wörter mit einem
+      Präfix liegen darin zusammenhängend und werden per Binärsuche gefunden -
+      ein abgeflachter Trie ohne ein Objekt pro Zeichen.
+
+    Ein Präfix wird auf höchstens `max_expansions` Wörter erweitert, damit
+    sehr kurze Eingaben ("4") die Antwortzeit nicht sprengen. Präfixtreffer
+    zählen `prefix_weight`-fach, exakte Wörter voll.
+
+    Häufige Wörter (ab RANKED_MIN Produkten) bekommen zusätzlich eine nach
+    Gewicht sortierte Trefferliste. Passen sehr viele Produkte, wird diese
+    Liste der Reihe nach gelesen und abgebrochen, sobald kein weiteres
+    Produkt mehr unter die besten `limit` kommen kann - statt alle zu bewerten.
+
+    Nicht threadsicher - der WarehouseService synchronisiert die Zugriffe.
+    """
+
+    RANKED_MIN = 1_000  # ab so vielen Produkten pro Wort: sortierte Trefferliste
+    EXHAUSTIVE_MAX = 5_000  # bis zu so vielen Kandidaten: alle bewerten
+
+    def __init__(self, max_expansions: int = 200, prefix_weight: float = 0.5):
+        """
+        Args:
+            max_expansions: maximale Anzahl Wörter, auf die ein Präfix erweitert wird
+            prefix_weight: Faktor für Treffer über ein Präfix statt ein ganzes Wort
+        """
+        if max_expansions < 1:
+            raise ValueError("max_expansions muss mindestens 1 sein")
+        self.max_expansions = max_expansions
+        self.prefix_weight = prefix_weight
+        # Leere Einträge bleiben stehen, solange das Wort noch im Vokabular liegt
+        self._postings: Dict[str, Dict[str, float]] = {}
+        self._documents: Dict[str, Tuple[str, ...]] = {}
+        self._vocabulary: List[str] = []
+        self._new_tokens: List[str] = []
+        self._empty_tokens = 0
+        # Häufige Wörter: Produkt-IDs nach (-Gewicht, ID) sortiert, bei Bedarf aufgebaut
+        self._ranked: Dict[str, List[str]] = {}
+        self._bulk = False
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    # ------------------------------------------------------------------
+    # Pflege
+    # ------------------------------------------------------------------
+
+    def index_product(self, product: Product) -> None:
+        if product.id in self._documents:
+            self.remove_product(product.id)
+
+        weights: Dict[str, float] = {}
+        for field, weight in FIELD_WEIGHTS:
+            for token in tokenize(getattr(product, field)):
+                weights[token] = weights.get(token, 0.0) + weight
+
+        postings = self._postings
+        for token, weight in weights.items():
+            posting = postings.get(token)
+            if posting is None:
+                posting = postings[token] = {}
+                self._new_tokens.append(token)
+            elif not posting:
+                self._empty_tokens -= 1
+            posting[product.id] = weight
+            ranked = self._ranked.get(token)
+            if ranked is not None:
+                if self._bulk:
+                    del self._ranked[token]  # nach dem Massenimport neu sortieren
+                else:
+                    insort(ranked, product.id, key=self._rank_key(posting))
+        self._documents[product.id] = tuple(weights)
+
+    def index_products(self, products: Iterable[Product]) -> None:
+        self._bulk = True
+        try:
+            for product in products:
+                self.index_product(product)
+        finally:
+            self._bulk = False
+
+    def remove_product(self, product_id: str) -> None:
+        for token in self._documents.pop(product_id, ()):
+            posting = self._postings[token]
+            ranked = self._ranked.get(token)
+            if ranked is not None:
+                key = self._rank_key(posting)
+                del ranked[bisect_left(ranked, key(product_id), key=key)]
+            del posting[product_id]
+            if not posting:
+                self._empty_tokens += 1
+                self._ranked.pop(token, None)
+
+    @staticmethod
+    def _rank_key(posting: Dict[str, float]):
+        return lambda product_id: (-posting[product_id], product_id)
+
+    def _ranked_ids(self, token: str) -> List[str]:
+        """Produkt-IDs eines Wortes nach (-Gewicht, ID) sortiert"""
+        ranked = self._ranked.get(token)
+        if ranked is None:
+            posting = self._postings[token]
+            ranked = sorted(posting, key=self._rank_key(posting))
+            if len(posting) >= self.RANKED_MIN:
+                self._ranked[token] = ranked
+        return ranked
+
+    def _sorted_vocabulary(self) -> List[str]:
+        """Vokabular sortiert halten; neue Wörter werden erst bei Bedarf einsortiert"""
+        if self._empty_tokens > max(1024, len(self._postings) // 2):
+            # Viele verwaiste Wörter - Vokabular neu aufbauen
+            self._postings = {token: p for token, p in self._postings.items() if p}
+            self._ranked = {token: r for token, r in self._ranked.items() if r}
+            self._vocabulary = sorted(self._postings)
+            self._new_tokens = []
+            self._empty_tokens = 0
+        elif self._new_tokens:
+            if len(self._new_tokens) <= 64:
+                for token in self._new_tokens:
+                    insort(self._vocabulary, token)
+            else:
+                self._vocabulary.extend(self._new_tokens)
+                self._vocabulary.sort()
+            self._new_tokens = []
+        return self._vocabulary
+
+    # ------------------------------------------------------------------
+    # Abfragen
+    # ------------------------------------------------------------------
+
+    def _expand(self, prefix: str) -> List[str]:
+        """Wörter des Vokabulars mit diesem Präfix (höchstens max_expansions)"""
+        vocabulary = self._sorted_vocabulary()
+        postings = self._postings
+        found = []
+        position = bisect_left(vocabulary, prefix)
+        while position < len(vocabulary) and len(found) < self.max_expansions:
+            token = vocabulary[position]
+            if not token.startswith(prefix):
+                break
+            if postings[token]:
+                found.append(token)
+            position += 1
+        return found
+
+    def search(self, query: str, limit: int = 20) -> List[SearchHit]:
+        terms = tokenize(query)
+        if not terms or limit <= 0:
+            return []
+
+        # Pro Suchbegriff die passenden Wörter mit ihrem Faktor
+        groups: List[List[Tuple[str, float]]] = []
+        for term in terms[:-1]:
+            if not self._postings.get(term):
+                return []
+            groups.append([(term, 1.0)])
+        last = terms[-1]
+        expanded = self._expand(last)
+        if not expanded:
+            return []
+        groups.append([(token, 1.0 if token == last else self.prefix_weight) for token in expanded])
+
+        # Mit dem seltensten Begriff beginnen, die übrigen nur noch nachschlagen
+        groups.sort(key=self._group_size)
+        if self._group_size(groups[0]) <= self.EXHAUSTIVE_MAX:
+            scores = self._score_all(groups[0], groups[1:])
+        else:
+            scores = self._score_ranked(groups[0], groups[1:], limit)
+        best_hits = heapq.nsmallest(limit, scores.items(), key=lambda hit: (-hit[1], hit[0]))
+        return [SearchHit(product_id, score) for product_id, score in best_hits]
+
+    def _group_size(self, group: List[Tuple[str, float]]) -> int:
+        return sum(len(self._postings[token]) for token, _ in group)
+
+    def _score_rest(self, product_id: str, rest: List[List[Tuple[str, float]]]) -> float:
+        """Beitrag der übrigen Begriffe; 0, wenn einer davon nicht passt"""
+        postings = self._postings
+        total = 0.0
+        for group in rest:
+            best = max(postings[token].get(product_id, 0.0) * factor for token, factor in group)
+            if not best:
+                return 0.0
+            total += best
+        return total
+
+    def _score_all(
+        self, first: List[Tuple[str, float]], rest: List[List[Tuple[str, float]]]
+    ) -> Dict[str, float]:
+        """Alle Kandidaten des seltensten Begriffs bewerten"""
+        scores: Dict[str, float] = {}
+        for token, factor in first:
+            for product_id, weight in self._postings[token].items():
+                score = weight * factor
+                if score > scores.get(product_id, 0.0):
+                    scores[product_id] = score
+        if not rest:
+            return scores
+        narrowed = {}
+        for product_id, score in scores.items():
+            added = self._score_rest(product_id, rest)
+            if added:
+                narrowed[product_id] = score + added
+        return narrowed
+
+    def _score_ranked(
+        self, first: List[Tuple[str, float]], rest: List[List[Tuple[str, float]]], limit: int
+    ) -> Dict[str, float]:
+        """
+        Kandidaten nach absteigendem Gewicht lesen, bis keiner mehr unter die
+        besten `limit` kommen kann (obere Schranke: Gewicht + Höchstgewicht der übrigen)
+        """
+        rest_max = sum(
+            max(self._max_weight(token) * factor for token, factor in group) for group in rest
+        )
+        candidates = heapq.merge(*(self._ranked_scores(token, factor) for token, factor in first))
+        scores: Dict[str, float] = {}
+        best: List[float] = []  # Min-Heap der besten `limit` Gesamtwerte
+        for negative_score, product_id in candidates:
+            score = -negative_score
+            if len(best) == limit:
+                bound = score + rest_max
+                # Gleichstand: ohne weitere Begriffe gewinnt die frühere (kleinere) ID
+                if bound < best[0] or (not rest and bound == best[0]):
+                    break
+            if product_id in scores:
+                continue  # über ein anderes Wort des Präfixes schon höher bewertet
+            total = score
+            if rest:
+                added = self._score_rest(product_id, rest)
+                if not added:
+                    continue
+                total += added
+            scores[product_id] = total
+            if len(best) < limit:
+                heapq.heappush(best, total)
+            elif total > best[0]:
+                heapq.heapreplace(best, total)
+        return scores
+
+    def _ranked_scores(self, token: str, factor: float) -> Iterator[Tuple[float, str]]:
+        posting = self._postings[token]
+        for product_id in self._ranked_ids(token):
+            yield -posting[product_id] * factor, product_id
+
+    def _max_weight(self, token: str) -> float:
+        posting = self._postings[token]
+        ranked = self._ranked.get(token)
+        if ranked is not None:
+            return posting[ranked[0]]
+        return max(posting.values())
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[str]:
+        terms = tokenize(prefix)
+        if not terms or limit <= 0:
+            return []
+        postings = self._postings
+        return heapq.nsmallest(
+            limit, self._expand(terms[-1]), key=lambda token: (-len(postings[token]), token)
+        )
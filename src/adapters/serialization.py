@@ -0,0 +1,137 @@
+"""Serialisierung - JSON-Codec, Dokumentformat und atomares Schreiben für dateibasierte Adapter"""
+
+import json
+import os
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict
+
+from ..domain.lots import Lot
+from ..domain.product import Product
+from ..domain.warehouse import Movement
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - abhängig von der Installation
+    orjson = None
+
+
+def dumps(data: Any) -> bytes:
+    """JSON kodieren - mit orjson, falls installiert, sonst mit der Standardbibliothek"""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def loads(data: bytes) -> Any:
+    """JSON dekodieren (Gegenstück zu dumps)"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def fsync_directory(directory: Path) -> None:
+    """Verzeichniseintrag (z.B. nach os.replace) dauerhaft machen"""
+    try:
+        handle = os.open(directory, os.O_RDONLY)
+    except OSError:  # pragma: no cover - z.B. Windows
+        return
+    try:
+        os.fsync(handle)
+    except OSError:  # pragma: no cover
+        pass
+    finally:
+        os.close(handle)
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """Datei über temporäre Datei, fsync und os.replace ersetzen (nie halb geschrieben)"""
+    temporary = path.with_name(path.name + ".tmp")
+    with open(temporary, "wb") as handle:
+        handle.write(data)
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(temporary, path)
+    fsync_directory(path.parent)
+
+
+def product_to_document(product: Product) -> Dict[str, Any]:
+    """Produkt als JSON-taugliches Dokument (Zeitstempel als ISO-String)"""
+    return {
+        "id": product.id,
+        "name": product.name,
+        "description": product.description,
+        "price": product.price,
+        "quantity": product.quantity,
+        "sku": product.sku,
+        "category": product.category,
+        "created_at": product.created_at.isoformat(),
+        "updated_at": product.updated_at.isoformat(),
+        "notes": product.notes,
+    }
+
+
+def document_to_product(document: Dict[str, Any]) -> Product:
+    """Gegenstück zu product_to_document"""
+    return Product(
+        id=document["id"],
+        name=document["name"],
+        description=document["description"],
+        price=document["price"],
+        quantity=document["quantity"],
+        sku=document["sku"],
+        category=document["category"],
+        created_at=datetime.fromisoformat(document["created_at"]),
+        updated_at=datetime.fromisoformat(document["updated_at"]),
+        notes=document["notes"],
+    )
+
+
+def movement_to_document(movement: Movement) -> Dict[str, Any]:
+    """Bewegung als JSON-taugliches Dokument (Zeitstempel als ISO-String)"""
+    return {
+        "id": movement.id,
+        "product_id": movement.product_id,
+        "product_name": movement.product_name,
+        "quantity_change": movement.quantity_change,
+        "movement_type": movement.movement_type,
+        "reason": movement.reason,
+        "timestamp": movement.timestamp.isoformat(),
+        "performed_by": movement.performed_by,
+    }
+
+
+def document_to_movement(document: Dict[str, Any]) -> Movement:
+    """Gegenstück zu movement_to_document"""
+    return Movement(
+        id=document["id"],
+        product_id=document["product_id"],
+        product_name=document["product_name"],
+        quantity_change=document["quantity_change"],
+        movement_type=document["movement_type"],
+        reason=document["reason"],
+        timestamp=datetime.fromisoformat(document["timestamp"]),
+        performed_by=document["performed_by"],
+    )
+
+
+def lot_to_document(lot: Lot) -> Dict[str, Any]:
+    """Charge als JSON-taugliches Dokument (Datum und Zeitstempel als ISO-String)"""
+    return {
+        "id": lot.id,
+        "product_id": lot.product_id,
+        "quantity": lot.quantity,
+        "expires_at": lot.expires_at.isoformat(),
+        "received_at": lot.received_at.isoformat(),
+    }
+
+
+def document_to_lot(document: Dict[str, Any]) -> Lot:
+    """Gegenstück zu lot_to_document"""
+    return Lot(
+        id=document["id"],
+        product_id=document["product_id"],
+        quantity=document["quantity"],
+        expires_at=date.fromisoformat(document["expires_at"]),
+        received_at=datetime.fromisoformat(document["received_at"]),
+    )
@@ -0,0 +1,117 @@
+"""Shard Router - Daten einer Filialkette pro Lager auf getrennte Repositories verteilen"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, TypeVar
+
+from ..ports import RepositoryPort
+
+T = TypeVar("T")
+
+
+class ShardRouter:
+    """
+    Ordnet jedem Lager ein eigenes Repository (Shard) zu.
+
+    Ein Shard enthält Produkte, Bewegungen und Chargen genau eines Lagers;
+    der Lagerschlüssel steckt also in der Zuordnung, nicht in den Datensätzen.
+    Unbekannte Lager legt die optionale factory an (z.B. eine SQLite-Datei
+    pro Filiale). Lagerübergreifende Auswertungen laufen mit map parallel
+    über alle Shards.
+
+    Verwendung:
+        router = ShardRouter(
+            factory=lambda lager: RepositoryFactory.create_repository(
+                "sqlite", db_path=f"daten/{lager}.db"
+            )
+        )
+        bestand = router.map(lambda lager, repo: repo.load_product("P1"))
+    """
+
+    def __init__(
+        self,
+        shards: Optional[Mapping[str, RepositoryPort]] = None,
+        factory: Optional[Callable[[str], RepositoryPort]] = None,
+        max_workers: int = 8,
+    ):
+        """
+        Args:
+            shards: Bereits geöffnete Repositories pro Lager-ID
+            factory: Legt das Repository für ein noch unbekanntes Lager an;
+                ohne factory sind nur die Lager aus shards erreichbar
+            max_workers: Threads für map (Abfragen über alle Shards)
+        """
+        self._shards: Dict[str, RepositoryPort] = dict(shards or {})
+        self._factory = factory
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="shard")
+
+    def shard(self, warehouse_id: str) -> RepositoryPort:
+        """
+        Repository eines Lagers (legt es bei Bedarf über die factory an)
+
+        Raises:
+            ValueError: bei unbekanntem Lager ohne factory
+        """
+        repository = self._shards.get(warehouse_id)
+        if repository is not None:
+            return repository
+        with self._lock:
+            repository = self._shards.get(warehouse_id)
+            if repository is None:
+                if self._factory is None:
+                    raise ValueError(f"Lager {warehouse_id} nicht gefunden")
+                repository = self._shards[warehouse_id] = self._factory(warehouse_id)
+        return repository
+
+    def add_shard(self, warehouse_id: str, repository: RepositoryPort) -> None:
+        """
+        Repository für ein neues Lager eintragen
+
+        Raises:
+            ValueError: wenn das Lager bereits einen Shard hat
+        """
+        with self._lock:
+            if warehouse_id in self._shards:
+                raise ValueError(f"Lager {warehouse_id} existiert bereits")
+            self._shards[warehouse_id] = repository
+
+    def warehouse_ids(self) -> List[str]:
+        """Alle bekannten Lager, sortiert"""
+        return sorted(self._shards)
+
+    def map(
+        self,
+        operation: Callable[[str, RepositoryPort], T],
+        warehouse_ids: Optional[Iterable[str]] = None,
+    ) -> Dict[str, T]:
+        """
+        operation(Lager-ID, Repository) parallel auf mehreren Shards ausführen
+
+        Args:
+            operation: Abfrage pro Shard; läuft in einem Worker-Thread
+            warehouse_ids: Ziel-Lager (Standard: alle bekannten)
+
+        Returns:
+            {Lager-ID: Ergebnis} in der Reihenfolge von warehouse_ids
+
+        Raises:
+            Die erste Ausnahme eines Shards (in Lagerreihenfolge); die übrigen
+            Abfragen laufen trotzdem zu Ende
+        """
+        targets = self.warehouse_ids() if warehouse_ids is None else list(warehouse_ids)
+        futures = {
+            warehouse_id: self._executor.submit(operation, warehouse_id, self.shard(warehouse_id))
+            for warehouse_id in targets
+        }
+        return {warehouse_id: future.result() for warehouse_id, future in futures.items()}
+
+    def close(self) -> None:
+        """Worker beenden und alle Repositories mit close() schließen"""
+        self._executor.shutdown(wait=True)
+        with self._lock:
+            repositories = list(self._shards.values())
+        for repository in repositories:
+            close = getattr(repository, "close", None)
+            if close is not None:
+                close()
@@ -0,0 +1,136 @@
+"""Shared Snapshot - Bestände im Shared Memory: ein Prozess schreibt, beliebig viele lesen"""
+
+import platform
+from multiprocessing import shared_memory
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+# Der Seqlock ohne Sperre verlässt sich auf die Speicherordnung von x86/x86-64:
+# Schreib- und Lesezugriffe werden nicht umsortiert. Python selbst garantiert
+# keine Speicherbarrieren; auf anderen Architekturen (z.B. ARM) braucht es lock.
+ORDERED_STORES = platform.machine().lower() in {"x86_64", "amd64", "i386", "i686", "x86"}
+
+
+class StockSnapshot:
+    """
+    Lesekopie der Bestände für andere Prozesse, ohne Nachricht pro Abfrage.
+
+    Aufbau des Speichers (int64): [Sequenznummer, Bestand Slot 1, Bestand Slot 2, ...].
+    Die Slots folgen der Reihenfolge von product_ids, die Lesern beim Anbinden
+    mitgegeben wird. Der Schreiber setzt die Sequenznummer vor einer Änderung
+    auf ungerade und danach wieder auf gerade (Seqlock); Leser wiederholen,
+    wenn sie eine ungerade oder geänderte Nummer sehen, und lesen so nie einen
+    halb geschriebenen Stand. Das gilt nur bei der Speicherordnung von
+    x86/x86-64 (ORDERED_STORES); sonst müssen Schreiber und Leser dasselbe
+    multiprocessing.Lock übergeben, das dann jeden Zugriff schützt.
+
+    Nur ein Prozess darf schreiben (apply); die Produktliste ist fest.
+    """
+
+    def __init__(
+        self, memory: shared_memory.SharedMemory, product_ids: List[str], lock: Any = None
+    ):
+        """
+        Raises:
+            ValueError: ohne lock auf einer Architektur ohne geordnete Speicherzugriffe
+        """
+        if lock is None and not ORDERED_STORES:
+            raise ValueError(f"Snapshot ohne lock nur auf x86/x86-64 (hier: {platform.machine()})")
+        self._memory = memory
+        self._values = memory.buf.cast("q")
+        self._lock = lock
+        self.product_ids = product_ids
+        self._slots = {product_id: slot for slot, product_id in enumerate(product_ids, start=1)}
+
+    @classmethod
+    def create(cls, quantities: Mapping[str, int], lock: Any = None) -> "StockSnapshot":
+        """Neuen Speicherbereich mit den Anfangsbeständen anlegen (Schreiber)"""
+        product_ids = list(quantities)
+        memory = shared_memory.SharedMemory(create=True, size=8 * (len(product_ids) + 1))
+        try:
+            snapshot = cls(memory, product_ids, lock)
+        except ValueError:
+            memory.close()
+            memory.unlink()
+            raise
+        values = snapshot._values
+        values[0] = 0
+        for slot, product_id in enumerate(product_ids, start=1):
+            values[slot] = quantities[product_id]
+        return snapshot
+
+    @classmethod
+    def attach(cls, name: str, product_ids: List[str], lock: Any = None) -> "StockSnapshot":
+        """An einen bestehenden Speicherbereich anbinden (Leser, mit dem lock des Schreibers)"""
+        memory = shared_memory.SharedMemory(name=name)
+        try:
+            return cls(memory, product_ids, lock)
+        except ValueError:
+            memory.close()
+            raise
+
+    @property
+    def name(self) -> str:
+        """Name des Speicherbereichs für attach"""
+        return self._memory.name
+
+    @property
+    def version(self) -> int:
+        """Anzahl veröffentlichter Änderungen"""
+        return self._values[0] // 2
+
+    def apply(self, changes: Mapping[str, int]) -> None:
+        """Bestandsänderungen {Produkt-ID: Differenz} veröffentlichen; unbekannte IDs fehlen"""
+        if not changes:
+            return
+        if self._lock is not None:
+            with self._lock:
+                self._apply(changes)
+        else:
+            self._apply(changes)
+
+    def _apply(self, changes: Mapping[str, int]) -> None:
+        values, slots = self._values, self._slots
+        values[0] += 1
+        for product_id, change in changes.items():
+            slot = slots.get(product_id)
+            if slot is not None:
+                values[slot] += change
+        values[0] += 1
+
+    def get(self, product_id: str) -> Optional[int]:
+        """Bestand eines Produkts (None, wenn es nicht im Snapshot ist)"""
+        slot = self._slots.get(product_id)
+        if slot is None:
+            return None
+        values = self._values
+        if self._lock is not None:
+            with self._lock:
+                return values[slot]
+        while True:
+            before = values[0]
+            quantity = values[slot]
+            if not before & 1 and values[0] == before:
+                return quantity
+
+    def get_many(self, product_ids: Iterable[str]) -> Dict[str, int]:
+        """Bestände mehrerer Produkte aus demselben Stand"""
+        slots = [(product_id, self._slots.get(product_id)) for product_id in product_ids]
+        slots = [(product_id, slot) for product_id, slot in slots if slot is not None]
+        values = self._values
+        if self._lock is not None:
+            with self._lock:
+                return {product_id: values[slot] for product_id, slot in slots}
+        while True:
+            before = values[0]
+            quantities = {product_id: values[slot] for product_id, slot in slots}
+            if not before & 1 and values[0] == before:
+                return quantities
+
+    def close(self) -> None:
+        """Anbindung lösen (der Speicher bleibt bis unlink bestehen)"""
+        self._values.release()
+        self._memory.close()
+
+    def unlink(self) -> None:
+        """Speicherbereich freigeben (nur der Schreiber, nach close)"""
+        self._memory.unlink()
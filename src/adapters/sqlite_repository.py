@@ -0,0 +1,458 @@
+"""SQLite Repository Adapter - persistente Speicherung in einer SQLite-Datenbank"""
+
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from ..domain.lots import Lot
+from ..domain.product import Product
+from ..domain.warehouse import Movement
+from ..ports import (
+    MovementPage,
+    RepositoryPort,
+    check_page_limit,
+    decode_movement_cursor,
+    encode_movement_cursor,
+)
+
+
+class SQLiteRepository(RepositoryPort):
+    """
+    Repository auf Basis von SQLite.
+
+    - WAL-Journal, damit lesende Verbindungen den Schreiber nicht blockieren
+    - eine Schreibverbindung (serialisiert über ein Lock) und ein kleiner
+      Pool von Leseverbindungen
+    - feste SQL-Texte, die vom Statement-Cache jeder Verbindung wiederverwendet
+      werden (Prepared Statements)
+    """
+
+    _SCHEMA = (
+        """
+        CREATE TABLE IF NOT EXISTS products (
+            id TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            description TEXT NOT NULL,
+            price REAL NOT NULL,
+            quantity INTEGER NOT NULL,
+            sku TEXT NOT NULL DEFAULT '',
+            category TEXT NOT NULL DEFAULT '',
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL,
+            notes TEXT
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_products_category ON products (category)",
+        "CREATE INDEX IF NOT EXISTS idx_products_sku ON products (sku)",
+        """
+        CREATE TABLE IF NOT EXISTS movements (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            id TEXT NOT NULL,
+            product_id TEXT NOT NULL,
+            product_name TEXT NOT NULL,
+            quantity_change INTEGER NOT NULL,
+            movement_type TEXT NOT NULL,
+            reason TEXT,
+            timestamp TEXT NOT NULL,
+            performed_by TEXT NOT NULL
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_movements_id ON movements (id)",
+        "CREATE INDEX IF NOT EXISTS idx_movements_product ON movements (product_id, timestamp)",
+        "CREATE INDEX IF NOT EXISTS idx_movements_timestamp ON movements (timestamp)",
+        "CREATE INDEX IF NOT EXISTS idx_movements_type ON movements (movement_type, timestamp)",
+        "CREATE INDEX IF NOT EXISTS idx_movements_user ON movements (performed_by, timestamp)",
+        """
+        CREATE TABLE IF NOT EXISTS lots (
+            id TEXT PRIMARY KEY,
+            product_id TEXT NOT NULL,
+            quantity INTEGER NOT NULL,
+            expires_at TEXT NOT NULL,
+            received_at TEXT NOT NULL
+        )
+        """,
+    )
+
+    _PRODUCT_COLUMNS = (
+        "id, name, description, price, quantity, sku, category, created_at, updated_at, notes"
+    )
+    _MOVEMENT_COLUMNS = (
+        "id, product_id, product_name, quantity_change, movement_type, reason, timestamp, "
+        "performed_by"
+    )
+
+    _LOT_COLUMNS = "id, product_id, quantity, expires_at, received_at"
+
+    # Obergrenze für Platzhalter pro IN-Abfrage (SQLite-Limit: 999 bei alten Versionen)
+    _IN_CHUNK_SIZE = 500
+
+    _SQL_UPSERT_PRODUCT = (
+        f"INSERT OR REPLACE INTO products ({_PRODUCT_COLUMNS}) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+    )
+    _SQL_SELECT_PRODUCT = f"SELECT {_PRODUCT_COLUMNS} FROM products WHERE id = ?"
+    _SQL_SELECT_PRODUCTS_IN = f"SELECT {_PRODUCT_COLUMNS} FROM products WHERE id IN ({{}})"
+    _SQL_SELECT_QUANTITIES_IN = "SELECT id, quantity FROM products WHERE id IN ({})"
+    _SQL_SELECT_ALL_PRODUCTS = f"SELECT {_PRODUCT_COLUMNS} FROM products"
+    _SQL_PRODUCTS_AFTER = (
+        f"SELECT {_PRODUCT_COLUMNS} FROM products WHERE id > ? ORDER BY id LIMIT ?"
+    )
+    _SQL_COUNT_PRODUCTS = "SELECT COUNT(*) FROM products"
+    _SQL_DELETE_PRODUCT = "DELETE FROM products WHERE id = ?"
+    _SQL_INSERT_MOVEMENT = (
+        f"INSERT INTO movements ({_MOVEMENT_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+    )
+    _SQL_SELECT_MOVEMENTS = f"SELECT {_MOVEMENT_COLUMNS} FROM movements ORDER BY seq"
+    _SQL_MOVEMENTS_AFTER = (
+        f"SELECT {_MOVEMENT_COLUMNS}, seq FROM movements WHERE seq > ? ORDER BY seq LIMIT ?"
+    )
+    _SQL_SEQ_AT = "SELECT seq FROM movements ORDER BY seq LIMIT 1 OFFSET ?"
+    _SQL_COUNT_MOVEMENTS = "SELECT COUNT(*) FROM movements"
+    _SQL_QUERY_MOVEMENTS = (
+        f"SELECT {_MOVEMENT_COLUMNS}, seq FROM movements WHERE {{}} ORDER BY timestamp, seq"
+    )
+
+    _SQL_UPSERT_LOT = f"INSERT OR REPLACE INTO lots ({_LOT_COLUMNS}) VALUES (?, ?, ?, ?, ?)"
+    _SQL_DELETE_LOT = "DELETE FROM lots WHERE id = ?"
+    _SQL_SELECT_LOTS = f"SELECT {_LOT_COLUMNS} FROM lots"
+
+    # Zeilen pro Seite in iter_products/iter_movements
+    _PAGE_SIZE = 1_000
+
+    def __init__(self, db_path: str = ":memory:", pool_size: int = 4, timeout: float = 30.0):
+        """
+        Args:
+            db_path: Pfad zur Datenbankdatei (":memory:" für eine flüchtige Datenbank)
+            pool_size: Anzahl der Leseverbindungen im Pool
+            timeout: Wartezeit in Sekunden, falls die Datenbank gesperrt ist
+        """
+        self.db_path = db_path
+        self._timeout = timeout
+        self._write_lock = threading.RLock()
+        self._transaction_depth = 0
+        self._writer = self._connect()
+        self._writer.execute("PRAGMA journal_mode=WAL")
+        self._writer.execute("PRAGMA synchronous=NORMAL")
+        with self._writer:
+            for statement in self._SCHEMA:
+                self._writer.execute(statement)
+
+        # Eine ":memory:"-Datenbank existiert nur innerhalb einer Verbindung,
+        # daher lesen dort alle über die Schreibverbindung.
+        self._readers: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        if db_path != ":memory:":
+            for _ in range(max(1, pool_size)):
+                self._readers.put(self._connect(read_only=True))
+
+    def _connect(self, read_only: bool = False) -> sqlite3.Connection:
+        """Neue Verbindung mit Statement-Cache öffnen"""
+        connection = sqlite3.connect(
+            self.db_path,
+            timeout=self._timeout,
+            check_same_thread=False,
+            cached_statements=256,
+        )
+        if read_only:
+            connection.execute("PRAGMA query_only=ON")
+        return connection
+
+    @contextmanager
+    def _reader(self) -> Iterator[sqlite3.Connection]:
+        """Leseverbindung aus dem Pool ausleihen"""
+        if self.db_path == ":memory:":
+            with self._write_lock:
+                yield self._writer
+            return
+        connection = self._readers.get()
+        try:
+            yield connection
+        finally:
+            self._readers.put(connection)
+
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        """Schreibverbindung exklusiv nutzen; Commit nur außerhalb von transaction()"""
+        with self._write_lock:
+            if self._transaction_depth:
+                yield self._writer
+            else:
+                with self._writer:
+                    yield self._writer
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Alle Schreiboperationen im Block gemeinsam committen oder zurückrollen"""
+        with self._write_lock:
+            self._transaction_depth += 1
+            try:
+                if self._transaction_depth == 1:
+                    with self._writer:
+                        yield
+                else:
+                    yield
+            finally:
+                self._transaction_depth -= 1
+
+    @staticmethod
+    def _product_to_row(product: Product) -> tuple:
+        return (
+            product.id,
+            product.name,
+            product.description,
+            product.price,
+            product.quantity,
+            product.sku,
+            product.category,
+            product.created_at.isoformat(),
+            product.updated_at.isoformat(),
+            product.notes,
+        )
+
+    @staticmethod
+    def _row_to_product(row: tuple) -> Product:
+        return Product(
+            id=row[0],
+            name=row[1],
+            description=row[2],
+            price=row[3],
+            quantity=row[4],
+            sku=row[5],
+            category=row[6],
+            created_at=datetime.fromisoformat(row[7]),
+            updated_at=datetime.fromisoformat(row[8]),
+            notes=row[9],
+        )
+
+    @staticmethod
+    def _movement_to_row(movement: Movement) -> tuple:
+        return (
+            movement.id,
+            movement.product_id,
+            movement.product_name,
+            movement.quantity_change,
+            movement.movement_type,
+            movement.reason,
+            movement.timestamp.isoformat(),
+            movement.performed_by,
+        )
+
+    @staticmethod
+    def _row_to_movement(row: tuple) -> Movement:
+        return Movement(
+            id=row[0],
+            product_id=row[1],
+            product_name=row[2],
+            quantity_change=row[3],
+            movement_type=row[4],
+            reason=row[5],
+            timestamp=datetime.fromisoformat(row[6]),
+            performed_by=row[7],
+        )
+
+    def save_product(self, product: Product) -> None:
+        """Produkt einfügen oder aktualisieren"""
+        with self._write() as connection:
+            connection.execute(self._SQL_UPSERT_PRODUCT, self._product_to_row(product))
+
+    def load_product(self, product_id: str) -> Optional[Product]:
+        """Produkt über den Primärschlüssel laden"""
+        with self._reader() as connection:
+            row = connection.execute(self._SQL_SELECT_PRODUCT, (product_id,)).fetchone()
+        return self._row_to_product(row) if row else None
+
+    def load_all_products(self) -> Dict[str, Product]:
+        """Alle Produkte laden"""
+        with self._reader() as connection:
+            rows = connection.execute(self._SQL_SELECT_ALL_PRODUCTS).fetchall()
+        return {row[0]: self._row_to_product(row) for row in rows}
+
+    def iter_products(self) -> Iterator[Product]:
+        """
+        Produkte seitenweise nach ID lesen (Keyset-Paging)
+
+        Jede Seite leiht sich nur kurz eine Leseverbindung; der Speicherbedarf
+        bleibt bei _PAGE_SIZE Produkten, unabhängig von der Größe des Katalogs.
+        """
+        last_id = ""
+        while True:
+            with self._reader() as connection:
+                rows = connection.execute(
+                    self._SQL_PRODUCTS_AFTER, (last_id, self._PAGE_SIZE)
+                ).fetchall()
+            for row in rows:
+                yield self._row_to_product(row)
+            if len(rows) < self._PAGE_SIZE:
+                return
+            last_id = rows[-1][0]
+
+    def count_products(self) -> int:
+        with self._reader() as connection:
+            return connection.execute(self._SQL_COUNT_PRODUCTS).fetchone()[0]
+
+    def load_products(self, product_ids: Iterable[str]) -> Dict[str, Product]:
+        """Mehrere Produkte mit wenigen IN-Abfragen laden"""
+        ids = list(dict.fromkeys(product_ids))
+        products = {}
+        with self._reader() as connection:
+            for start in range(0, len(ids), self._IN_CHUNK_SIZE):
+                chunk = ids[start : start + self._IN_CHUNK_SIZE]
+                sql = self._SQL_SELECT_PRODUCTS_IN.format(", ".join("?" * len(chunk)))
+                for row in connection.execute(sql, chunk):
+                    products[row[0]] = self._row_to_product(row)
+        return products
+
+    def load_quantities(self, product_ids: Iterable[str]) -> Dict[str, int]:
+        """Bestände mehrerer Produkte mit IN-Abfragen lesen, ohne Produkte aufzubauen"""
+        ids = list(dict.fromkeys(product_ids))
+        quantities: Dict[str, int] = {}
+        with self._reader() as connection:
+            for start in range(0, len(ids), self._IN_CHUNK_SIZE):
+                chunk = ids[start : start + self._IN_CHUNK_SIZE]
+                sql = self._SQL_SELECT_QUANTITIES_IN.format(", ".join("?" * len(chunk)))
+                quantities.update(connection.execute(sql, chunk).fetchall())
+        return quantities
+
+    def save_products(self, products: Iterable[Product]) -> None:
+        """Mehrere Produkte mit executemany in einer Transaktion speichern"""
+        with self._write() as connection:
+            connection.executemany(
+                self._SQL_UPSERT_PRODUCT, (self._product_to_row(p) for p in products)
+            )
+
+    def delete_product(self, product_id: str) -> None:
+        """Produkt löschen (unbekannte IDs werden ignoriert)"""
+        with self._write() as connection:
+            connection.execute(self._SQL_DELETE_PRODUCT, (product_id,))
+
+    def save_movement(self, movement: Movement) -> None:
+        """Bewegung anhängen"""
+        with self._write() as connection:
+            connection.execute(self._SQL_INSERT_MOVEMENT, self._movement_to_row(movement))
+
+    def save_movements(self, movements: Iterable[Movement]) -> None:
+        """Mehrere Bewegungen mit executemany in einer Transaktion anhängen"""
+        with self._write() as connection:
+            connection.executemany(
+                self._SQL_INSERT_MOVEMENT, (self._movement_to_row(m) for m in movements)
+            )
+
+    def load_movements(self) -> List[Movement]:
+        """Alle Bewegungen in Einfügereihenfolge laden"""
+        with self._reader() as connection:
+            rows = connection.execute(self._SQL_SELECT_MOVEMENTS).fetchall()
+        return [self._row_to_movement(row) for row in rows]
+
+    def iter_movements(self, start: int = 0) -> Iterator[Movement]:
+        """Bewegungen seitenweise in Einfügereihenfolge lesen (Keyset-Paging über seq)"""
+        last_seq = 0
+        if start:
+            # Nur die Einstiegsstelle per OFFSET suchen, danach weiter über seq
+            with self._reader() as connection:
+                row = connection.execute(self._SQL_SEQ_AT, (start - 1,)).fetchone()
+            if row is None:
+                return
+            last_seq = row[0]
+        while True:
+            with self._reader() as connection:
+                rows = connection.execute(
+                    self._SQL_MOVEMENTS_AFTER, (last_seq, self._PAGE_SIZE)
+                ).fetchall()
+            for row in rows:
+                yield self._row_to_movement(row)
+            if len(rows) < self._PAGE_SIZE:
+                return
+            last_seq = rows[-1][-1]
+
+    def count_movements(self) -> int:
+        with self._reader() as connection:
+            return connection.execute(self._SQL_COUNT_MOVEMENTS).fetchone()[0]
+
+    def query_movements(
+        self,
+        product_id: Optional[str] = None,
+        movement_type: Optional[str] = None,
+        performed_by: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> MovementPage:
+        """Bewegungen über die Tabellenindizes abfragen (siehe RepositoryPort)"""
+        check_page_limit(limit)
+        conditions = ["1 = 1"]
+        params: list = []
+        for column, value in (
+            ("product_id", product_id),
+            ("movement_type", movement_type),
+            ("performed_by", performed_by),
+        ):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        if start is not None:
+            conditions.append("timestamp >= ?")
+            params.append(start.isoformat())
+        if end is not None:
+            conditions.append("timestamp < ?")
+            params.append(end.isoformat())
+        if cursor:
+            after_timestamp, after_seq = decode_movement_cursor(cursor)
+            conditions.append("(timestamp > ? OR (timestamp = ? AND seq > ?))")
+            params.extend([after_timestamp.isoformat(), after_timestamp.isoformat(), after_seq])
+
+        sql = self._SQL_QUERY_MOVEMENTS.format(" AND ".join(conditions))
+        if limit is not None:
+            # Ein Datensatz mehr, um zu erkennen, ob es eine weitere Seite gibt
+            sql += " LIMIT ?"
+            params.append(limit + 1)
+        with self._reader() as connection:
+            rows = connection.execute(sql, params).fetchall()
+
+        next_cursor = None
+        if limit is not None and len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_movement_cursor(datetime.fromisoformat(rows[-1][6]), rows[-1][8])
+        return MovementPage([self._row_to_movement(row) for row in rows], next_cursor)
+
+    def save_lots(self, lots: Iterable[Lot]) -> None:
+        """Chargen einfügen bzw. aktualisieren, aufgebrauchte (Menge 0) löschen"""
+        with self._write() as connection:
+            for lot in lots:
+                if lot.quantity:
+                    connection.execute(
+                        self._SQL_UPSERT_LOT,
+                        (
+                            lot.id,
+                            lot.product_id,
+                            lot.quantity,
+                            lot.expires_at.isoformat(),
+                            lot.received_at.isoformat(),
+                        ),
+                    )
+                else:
+                    connection.execute(self._SQL_DELETE_LOT, (lot.id,))
+
+    def load_lots(self) -> List[Lot]:
+        """Alle Chargen laden"""
+        with self._reader() as connection:
+            rows = connection.execute(self._SQL_SELECT_LOTS).fetchall()
+        return [
+            Lot(
+                id=row[0],
+                product_id=row[1],
+                quantity=row[2],
+                expires_at=date.fromisoformat(row[3]),
+                received_at=datetime.fromisoformat(row[4]),
+            )
+            for row in rows
+        ]
+
+    def close(self) -> None:
+        """Alle Verbindungen schließen"""
+        while not self._readers.empty():
+            self._readers.get_nowait().close()
+        with self._write_lock:
+            self._writer.close()
@@ -0,0 +1,179 @@
+"""Tabular - CSV, Parquet und Arrow IPC blockweise und spaltenweise lesen und schreiben
+
+Parquet und Arrow IPC benötigen das optionale Paket pyarrow (pip install -e ".[io]");
+CSV geht immer über die Standardbibliothek.
+"""
+
+import csv
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - abhängig von der Installation
+    pa = pa_ipc = pq = None
+
+# Block einer Tabelle: Spaltenname -> Werte, alle Spalten gleich lang. CSV liefert
+# Strings, Parquet/Arrow bereits typisierte Werte (None für fehlende)
+Chunk = Dict[str, List[Any]]
+
+# Spaltenschema für den Export: (Name, Typ) mit Typ "string", "float", "int" oder "timestamp"
+Schema = Sequence[Tuple[str, str]]
+
+FORMATS = ("csv", "parquet", "arrow")
+_SUFFIXES = {
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+    ".ipc": "arrow",
+}
+
+
+def detect_format(path: Union[str, Path], format: Optional[str] = None) -> str:
+    """
+    Format aus dem Argument oder der Dateiendung bestimmen
+
+    Raises:
+        ValueError: bei unbekanntem Format oder fehlendem pyarrow für Parquet/Arrow
+    """
+    format = format or _SUFFIXES.get(Path(path).suffix.lower())
+    if format not in FORMATS:
+        raise ValueError(f"Unbekanntes Tabellenformat für {path} (möglich: {', '.join(FORMATS)})")
+    if format != "csv" and pa is None:
+        raise ValueError(f'Format "{format}" benötigt pyarrow (pip install -e ".[io]")')
+    return format
+
+
+def read_chunks(
+    path: Union[str, Path], chunk_size: int = 50_000, format: Optional[str] = None
+) -> Iterator[Chunk]:
+    """
+    Tabelle blockweise lesen; im Speicher liegt immer nur ein Block
+
+    CSV braucht eine Kopfzeile; zu kurze Zeilen werden mit "" aufgefüllt,
+    überzählige Felder ignoriert.
+
+    Args:
+        path: Quelldatei
+        chunk_size: Zeilen pro Block
+        format: "csv", "parquet" oder "arrow" (Standard: aus der Dateiendung)
+
+    Raises:
+        ValueError: bei unbekanntem Format oder chunk_size < 1
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size muss mindestens 1 sein")
+    format = detect_format(path, format)
+    if format == "csv":
+        yield from _read_csv(Path(path), chunk_size)
+    elif format == "parquet":
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield _batch_to_chunk(batch)
+    else:
+        with pa.memory_map(str(path)) as source:
+            reader = pa_ipc.open_file(source)
+            for index in range(reader.num_record_batches):
+                batch = reader.get_batch(index)
+                for offset in range(0, batch.num_rows, chunk_size):
+                    yield _batch_to_chunk(batch.slice(offset, chunk_size))
+
+
+def _read_csv(path: Path, chunk_size: int) -> Iterator[Chunk]:
+    with open(path, newline="", encoding="utf-8-sig") as handle:
+        reader = csv.reader(handle)
+        header = [name.strip() for name in next(reader, [])]
+        width = len(header)
+        while True:
+            rows = list(islice(reader, chunk_size))
+            if not rows:
+                return
+            rows = [row if len(row) == width else (row + [""] * width)[:width] for row in rows]
+            yield {name: list(values) for name, values in zip(header, zip(*rows))}
+
+
+def _batch_to_chunk(batch) -> Chunk:
+    return {name: column.to_pylist() for name, column in zip(batch.schema.names, batch.columns)}
+
+
+def _isoformat(value: Optional[datetime]) -> str:
+    return value.isoformat() if value is not None else ""
+
+
+class TableWriter:
+    """
+    Tabelle blockweise schreiben (CSV mit Kopfzeile, Parquet/Arrow mit festem Schema)
+
+    Verwendung:
+        with TableWriter("produkte.parquet", [("id", "string"), ("price", "float")]) as writer:
+            writer.write({"id": [...], "price": [...]})
+    """
+
+    def __init__(self, path: Union[str, Path], schema: Schema, format: Optional[str] = None):
+        """
+        Raises:
+            ValueError: bei unbekanntem Format oder fehlendem pyarrow
+        """
+        self.path = Path(path)
+        self.schema = list(schema)
+        self.format = detect_format(path, format)
+        self.rows = 0
+        self._handle = None
+        self._writer = None
+        if self.format == "csv":
+            self._handle = open(self.path, "w", newline="", encoding="utf-8")
+            self._writer = csv.writer(self._handle)
+            self._writer.writerow([name for name, _ in self.schema])
+        else:
+            types = {
+                "string": pa.string(),
+                "float": pa.float64(),
+                "int": pa.int64(),
+                "timestamp": pa.timestamp("us"),
+            }
+            self._arrow_schema = pa.schema([(name, types[kind]) for name, kind in self.schema])
+            if self.format == "parquet":
+                self._writer = pq.ParquetWriter(self.path, self._arrow_schema)
+            else:
+                self._handle = pa.OSFile(str(self.path), "wb")
+                self._writer = pa_ipc.new_file(self._handle, self._arrow_schema)
+
+    def write(self, chunk: Chunk) -> None:
+        """Block anhängen; fehlende Spalten werden leer geschrieben"""
+        length = len(next(iter(chunk.values()), []))
+        if not length:
+            return
+        columns = [chunk.get(name) or [None] * length for name, _ in self.schema]
+        if self.format == "csv":
+            # None schreibt csv als leeres Feld; nur Zeitstempel brauchen eine Umwandlung
+            columns = [
+                [_isoformat(value) for value in column] if kind == "timestamp" else column
+                for column, (_, kind) in zip(columns, self.schema)
+            ]
+            self._writer.writerows(zip(*columns))
+        else:
+            arrays = [
+                pa.array(column, type=field.type)
+                for column, field in zip(columns, self._arrow_schema)
+            ]
+            self._writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=self._arrow_schema))
+        self.rows += length
+
+    def close(self) -> None:
+        """Datei abschließen (Parquet-Footer, Arrow-Dateiende)"""
+        if self.format != "csv" and self._writer is not None:
+            self._writer.close()
+        if self._handle is not None:
+            self._handle.close()
+        self._handle = self._writer = None
+
+    def __enter__(self) -> "TableWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,443 @@
+"""WAL Repository Adapter - InMemoryRepository mit Write-Ahead-Log und Snapshots"""
+
+import os
+import struct
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
+
+from ..domain.lots import Lot
+from ..domain.product import Product
+from ..domain.warehouse import Movement
+from .repository import InMemoryRepository
+from .serialization import (
+    document_to_lot,
+    document_to_movement,
+    document_to_product,
+    dumps,
+    fsync_directory,
+    loads,
+    lot_to_document,
+    movement_to_document,
+    product_to_document,
+    write_atomic,
+)
+
+# Satzkopf: Länge der Nutzdaten, CRC32 der Nutzdaten, Satztyp
+_HEADER = struct.Struct("<IIB")
+
+RECORD_PUT_PRODUCT = 1
+RECORD_DELETE_PRODUCT = 2
+RECORD_MOVEMENT = 3
+RECORD_BATCH = 4  # mehrere Sätze einer Transaktion, nur gemeinsam gültig
+RECORD_SNAPSHOT = 5  # alle Produkte (nur in Snapshot-Dateien)
+RECORD_PUT_LOT = 6  # Charge mit Menge 0: gelöscht
+RECORD_SNAPSHOT_LOTS = 7  # alle Chargen (nur in Snapshot-Dateien, nach den Produkten)
+
+
+def encode_record(record_type: int, payload: bytes) -> bytes:
+    """Satz mit Kopf (Länge, CRC32, Typ) kodieren"""
+    return _HEADER.pack(len(payload), zlib.crc32(payload), record_type) + payload
+
+
+def decode_records(data: bytes) -> Tuple[List[Tuple[int, bytes]], int]:
+    """
+    Sätze aus einem Log-Abschnitt lesen
+
+    Returns:
+        (Liste von (Typ, Nutzdaten), Länge des gültigen Anfangsstücks) - Lesen
+        endet beim ersten unvollständigen oder beschädigten Satz
+    """
+    records = []
+    position = 0
+    while position + _HEADER.size <= len(data):
+        length, checksum, record_type = _HEADER.unpack_from(data, position)
+        start = position + _HEADER.size
+        payload = data[start : start + length]
+        if len(payload) < length or zlib.crc32(payload) != checksum:
+            break
+        records.append((record_type, payload))
+        position = start + length
+    return records, position
+
+
+class WALRepository(InMemoryRepository):
+    """
+    InMemoryRepository mit Haltbarkeit über ein binäres Write-Ahead-Log.
+
+    Jede Änderung wird als Satz (Kopf mit Länge und CRC32, JSON-Nutzdaten) an
+    das Log angehängt; der Aufruf kehrt erst zurück, wenn der Satz per fsync
+    auf der Platte ist. Group Commit: Aufrufe, die innerhalb von
+    `group_commit_window` Sekunden eintreffen, teilen sich ein fsync.
+    Innerhalb von transaction() gesammelte Änderungen werden als ein Satz
+    geschrieben (alles oder nichts beim Wiederherstellen).
+
+    Snapshots sichern Produkte und Chargen; beim Start werden der neueste
+    Snapshot geladen und nur die Log-Segmente danach nachgespielt. Bewegungen
+    älterer Segmente werden beim Snapshot in Bewegungsarchive übernommen.
+
+    Dateien im Verzeichnis:
+        wal-<n>.log        Log-Segment n
+        snapshot-<n>.bin   Produkte und Chargen vor Segment n
+        movements-<n>.log  Bewegungen aus Segment n (archiviert)
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        group_commit_window: float = 0.0,
+        snapshot_every: Optional[int] = 100_000,
+    ):
+        """
+        Args:
+            directory: Datenverzeichnis (wird angelegt)
+            group_commit_window: Sekunden, die ein Commit auf weitere wartet
+                (0: sofort schreiben - gleichzeitig Wartende teilen sich trotzdem
+                das nächste fsync; größere Fenster lohnen bei langsamen Platten)
+            snapshot_every: Anzahl Log-Sätze, nach der im Hintergrund ein
+                Snapshot geschrieben wird (None: nur über snapshot())
+        """
+        super().__init__()
+        self.directory = Path(directory)
+        self.group_commit_window = group_commit_window
+        self.snapshot_every = snapshot_every
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._committed = threading.Condition(self._lock)
+        self._buffer = bytearray()
+        self._appended = 0  # laufende Nummer des letzten angehängten Satzes
+        self._durable = 0  # laufende Nummer des letzten per fsync gesicherten Satzes
+        self._committing = False
+        self._records_since_snapshot = 0
+        self._snapshot_lock = threading.Lock()
+        self._local = threading.local()
+        # Snapshots nur zwischen Transaktionen: offene zählen, neue warten lassen
+        self._open_transactions = 0
+        self._snapshot_pending = False
+        self._transactions_idle = threading.Condition(self._lock)
+
+        self._segment = self._recover() + 1
+        self._log = open(self._segment_path(self._segment), "ab")
+        fsync_directory(self.directory)
+
+        self._snapshot_requested = threading.Event()
+        self._closed = False
+        self._snapshotter: Optional[threading.Thread] = None
+        if snapshot_every is not None:
+            self._snapshotter = threading.Thread(
+                target=self._run_snapshots, name="wal-snapshot", daemon=True
+            )
+            self._snapshotter.start()
+
+    # ------------------------------------------------------------------
+    # Dateien
+    # ------------------------------------------------------------------
+
+    def _segment_path(self, number: int) -> Path:
+        return self.directory / f"wal-{number:08d}.log"
+
+    def _snapshot_path(self, number: int) -> Path:
+        return self.directory / f"snapshot-{number:08d}.bin"
+
+    def _archive_path(self, number: int) -> Path:
+        return self.directory / f"movements-{number:08d}.log"
+
+    def _numbered(self, prefix: str) -> List[int]:
+        return sorted(
+            int(path.stem.split("-")[1])
+            for path in self.directory.glob(f"{prefix}-*")
+            if not path.name.endswith(".tmp")
+        )
+
+    # ------------------------------------------------------------------
+    # Wiederherstellung
+    # ------------------------------------------------------------------
+
+    def _recover(self) -> int:
+        """Snapshot laden, Archive und Log-Segmente nachspielen; liefert höchste Segmentnummer"""
+        snapshot = 0
+        for number in reversed(self._numbered("snapshot")):
+            data = self._snapshot_path(number).read_bytes()
+            records, _ = decode_records(data)
+            if records and records[0][0] == RECORD_SNAPSHOT:
+                for document in loads(records[0][1]):
+                    self.products[document["id"]] = document_to_product(document)
+                if len(records) > 1 and records[1][0] == RECORD_SNAPSHOT_LOTS:
+                    super().save_lots(document_to_lot(d) for d in loads(records[1][1]))
+                snapshot = number
+                break
+
+        for number in self._numbered("movements"):
+            if number < snapshot:
+                self._replay(self._archive_path(number).read_bytes(), movements_only=True)
+
+        segments = self._numbered("wal")
+        archived = set(self._numbered("movements"))
+        for number in segments:
+            path = self._segment_path(number)
+            data = path.read_bytes()
+            if number < snapshot:
+                # Snapshot geschrieben, Archivierung aber unterbrochen
+                if number not in archived:
+                    self._replay(data, movements_only=True)
+                    self._archive_segment(number)
+                path.unlink()
+                continue
+            valid = self._replay(data)
+            if valid < len(data):
+                # Unvollständiger Satz am Ende (Absturz beim Schreiben) abschneiden
+                with open(path, "r+b") as handle:
+                    handle.truncate(valid)
+        return max(segments + [snapshot - 1, 0])
+
+    def _replay(self, data: bytes, movements_only: bool = False) -> int:
+        records, valid = decode_records(data)
+        for record_type, payload in records:
+            if record_type == RECORD_BATCH:
+                self._replay(payload, movements_only)
+            elif record_type == RECORD_MOVEMENT:
+                super().save_movement(document_to_movement(loads(payload)))
+            elif movements_only:
+                continue
+            elif record_type == RECORD_PUT_PRODUCT:
+                super().save_product(document_to_product(loads(payload)))
+            elif record_type == RECORD_DELETE_PRODUCT:
+                super().delete_product(payload.decode("utf-8"))
+            elif record_type == RECORD_PUT_LOT:
+                super().save_lots([document_to_lot(loads(payload))])
+        return valid
+
+    # ------------------------------------------------------------------
+    # Schreiben
+    # ------------------------------------------------------------------
+
+    def save_product(self, product: Product) -> None:
+        """Produkt speichern und im Log sichern"""
+        record = encode_record(RECORD_PUT_PRODUCT, dumps(product_to_document(product)))
+        self._apply(super().save_product, product, record)
+
+    def save_products(self, products: Iterable[Product]) -> None:
+        """Mehrere Produkte speichern (ein Commit für alle)"""
+        with self.transaction():
+            for product in products:
+                self.save_product(product)
+
+    def delete_product(self, product_id: str) -> None:
+        """Produkt löschen und im Log sichern"""
+        record = encode_record(RECORD_DELETE_PRODUCT, product_id.encode("utf-8"))
+        self._apply(super().delete_product, product_id, record)
+
+    def save_movement(self, movement: Movement) -> None:
+        """Bewegung speichern und im Log sichern"""
+        record = encode_record(RECORD_MOVEMENT, dumps(movement_to_document(movement)))
+        self._apply(super().save_movement, movement, record)
+
+    def save_movements(self, movements: Iterable[Movement]) -> None:
+        """Mehrere Bewegungen speichern (ein Commit für alle)"""
+        with self.transaction():
+            for movement in movements:
+                self.save_movement(movement)
+
+    def save_lots(self, lots: Iterable[Lot]) -> None:
+        """Chargen speichern bzw. aufgebrauchte löschen (ein Commit für alle)"""
+        with self.transaction():
+            for lot in lots:
+                record = encode_record(RECORD_PUT_LOT, dumps(lot_to_document(lot)))
+                self._apply(super().save_lots, [lot], record)
+
+    def _apply(self, change: Callable[[Any], None], argument: Any, record: bytes) -> None:
+        """Änderung im Speicher ausführen und Satz anhängen - bzw. in der Transaktion sammeln"""
+        batch = getattr(self._local, "batch", None)
+        with self._lock:
+            change(argument)
+            if batch is not None:
+                batch.append(record)
+                return
+            sequence = self._enqueue(record)
+        self._wait_durable(sequence)
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """
+        Änderungen dieses Threads sammeln und am Ende als ein Satz mit einem
+        fsync schreiben
+
+        Der Speicher wird sofort geändert (kein Rollback wie im
+        InMemoryRepository); auch bei einer Ausnahme wird das Gesammelte
+        geschrieben, damit Log und Speicher übereinstimmen. Ein anstehender
+        Snapshot wartet auf das Ende offener Transaktionen, neue warten auf
+        den Snapshot.
+        """
+        if getattr(self._local, "batch", None) is not None:
+            yield  # verschachtelt: äußere Transaktion schreibt
+            return
+        with self._lock:
+            while self._snapshot_pending:
+                self._transactions_idle.wait()
+            self._open_transactions += 1
+        self._local.batch = batch = []
+        sequence = None
+        try:
+            yield
+        finally:
+            self._local.batch = None
+            with self._lock:
+                if batch:
+                    sequence = self._enqueue(encode_record(RECORD_BATCH, b"".join(batch)))
+                self._open_transactions -= 1
+                self._transactions_idle.notify_all()
+            if sequence is not None:
+                self._wait_durable(sequence)
+
+    def _enqueue(self, record: bytes) -> int:
+        """Satz anhängen (Lock gehalten); liefert seine laufende Nummer"""
+        self._buffer += record
+        self._appended += 1
+        self._records_since_snapshot += 1
+        if self.snapshot_every is not None and self._records_since_snapshot >= self.snapshot_every:
+            self._snapshot_requested.set()
+        return self._appended
+
+    def _wait_durable(self, sequence: int) -> None:
+        """
+        Warten, bis der Satz gesichert ist (Group Commit)
+
+        Der erste Wartende wird Anführer: er wartet das Commit-Fenster ab,
+        schreibt alle bis dahin angehängten Sätze mit einem fsync und weckt
+        die übrigen.
+        """
+        with self._committed:
+            while self._durable < sequence:
+                if self._committing:
+                    self._committed.wait()
+                    continue
+                self._committing = True
+                try:
+                    if self.group_commit_window > 0:
+                        deadline = time.monotonic() + self.group_commit_window
+                        while (remaining := deadline - time.monotonic()) > 0:
+                            self._committed.wait(remaining)
+                    data, target = bytes(self._buffer), self._appended
+                    self._buffer.clear()
+                    self._lock.release()
+                    try:
+                        self._log.write(data)
+                        self._log.flush()
+                        os.fsync(self._log.fileno())
+                    except BaseException:
+                        self._lock.acquire()
+                        # Nicht gesichert - der nächste Anführer versucht es erneut
+                        self._buffer[0:0] = data
+                        raise
+                    self._lock.acquire()
+                    self._durable = target
+                finally:
+                    self._committing = False
+                    self._committed.notify_all()
+
+    def flush(self) -> None:
+        """Alle angehängten Sätze sofort sichern"""
+        with self._lock:
+            sequence = self._appended
+        self._wait_durable(sequence)
+
+    # ------------------------------------------------------------------
+    # Snapshots
+    # ------------------------------------------------------------------
+
+    def snapshot(self) -> None:
+        """
+        Produkte und Chargen sichern und das Log kürzen
+
+        Das aktuelle Segment wird abgeschlossen; der Snapshot beschreibt den
+        Stand davor. Die Bewegungen der abgeschlossenen Segmente wandern in
+        Bewegungsarchive, danach werden die Segmente und ältere Snapshots
+        gelöscht.
+
+        Erfasst wird nur ein Stand zwischen Transaktionen - nie Änderungen,
+        deren Satz noch nicht im Log steht. Nicht innerhalb von transaction()
+        aufrufen (wartet sonst auf sich selbst).
+        """
+        with self._snapshot_lock:
+            self.flush()
+            with self._lock:
+                self._snapshot_pending = True
+                try:
+                    while self._open_transactions:
+                        self._transactions_idle.wait()
+                    # Segment wechseln und Produkte unter demselben Lock erfassen,
+                    # damit der Snapshot genau zum Segmentwechsel passt
+                    self._buffer_to_log()
+                    self._log.close()
+                    closed = self._segment
+                    self._segment += 1
+                    self._log = open(self._segment_path(self._segment), "ab")
+                    documents = [product_to_document(p) for p in self.products.values()]
+                    lots = [lot_to_document(lot) for lot in self.lots.values()]
+                    self._records_since_snapshot = 0
+                finally:
+                    self._snapshot_pending = False
+                    self._transactions_idle.notify_all()
+
+            fsync_directory(self.directory)
+            write_atomic(
+                self._snapshot_path(self._segment),
+                encode_record(RECORD_SNAPSHOT, dumps(documents))
+                + encode_record(RECORD_SNAPSHOT_LOTS, dumps(lots)),
+            )
+            archived = set(self._numbered("movements"))
+            for number in self._numbered("wal"):
+                if number > closed:
+                    break
+                if number not in archived:
+                    self._archive_segment(number)
+                self._segment_path(number).unlink()
+            for number in self._numbered("snapshot"):
+                if number < self._segment:
+                    self._snapshot_path(number).unlink()
+
+    def _buffer_to_log(self) -> None:
+        """Noch nicht gesicherte Sätze vor dem Segmentwechsel schreiben (Lock gehalten)"""
+        while self._committing:
+            self._committed.wait()
+        if self._buffer:
+            self._log.write(bytes(self._buffer))
+            self._buffer.clear()
+        self._log.flush()
+        os.fsync(self._log.fileno())
+        self._durable = self._appended
+        self._committed.notify_all()
+
+    def _archive_segment(self, number: int) -> None:
+        """Bewegungssätze eines Log-Segments in ein Bewegungsarchiv übernehmen"""
+        records, _ = decode_records(self._segment_path(number).read_bytes())
+        movements = bytearray()
+        for record_type, payload in records:
+            if record_type == RECORD_BATCH:
+                inner, _ = decode_records(payload)
+                movements += b"".join(encode_record(t, p) for t, p in inner if t == RECORD_MOVEMENT)
+            elif record_type == RECORD_MOVEMENT:
+                movements += encode_record(record_type, payload)
+        write_atomic(self._archive_path(number), bytes(movements))
+
+    def _run_snapshots(self) -> None:
+        while True:
+            self._snapshot_requested.wait()
+            self._snapshot_requested.clear()
+            if self._closed:
+                return
+            self.snapshot()
+
+    def close(self) -> None:
+        """Alles sichern, Snapshot-Thread beenden und das Log schließen"""
+        self.flush()
+        self._closed = True
+        self._snapshot_requested.set()
+        if self._snapshotter is not None:
+            self._snapshotter.join()
+        with self._lock:
+            self._log.close()
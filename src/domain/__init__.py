@@ -1,6 +1,7 @@
 """Domain Layer - Geschäftslogik und Entity-Modelle"""
 
+from .lots import Lot, LotLedger
 from .product import Product
-from .warehouse import Warehouse
+from .warehouse import Booking, Movement, Warehouse
 
-__all__ = ["Product", "Warehouse"]
+__all__ = ["Product", "Warehouse", "Movement", "Booking", "Lot", "LotLedger"]
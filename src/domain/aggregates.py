@@ -0,0 +1,115 @@
+"""Inventory Aggregates - laufend gepflegte Lagerkennzahlen"""
+
+import math
+from typing import Dict, Iterable, Tuple
+
+from .product import Product
+
+
+class InventoryAggregates:
+    """
+    Kennzahlen des Lagerbestands, die bei jeder Änderung inkrementell
+    nachgeführt werden, damit Abfragen O(1) bleiben (kein Full Scan).
+
+    Gepflegt werden Gesamtwert, Gesamtmenge und Anzahl Produkte (SKUs),
+    jeweils auch pro Kategorie.
+    """
+
+    def __init__(self):
+        self.total_value: float = 0.0
+        self.total_units: int = 0
+        self.sku_count: int = 0
+        self.category_values: Dict[str, float] = {}
+        self.category_units: Dict[str, int] = {}
+        self.category_skus: Dict[str, int] = {}
+
+    @classmethod
+    def from_products(cls, products: Iterable[Product]) -> "InventoryAggregates":
+        """Kennzahlen einmalig aus einer Produktmenge berechnen"""
+        aggregates = cls()
+        for product in products:
+            aggregates.add_product(product)
+        return aggregates
+
+    def add_product(self, product: Product) -> None:
+        """Neues Produkt mit seinem aktuellen Bestand einrechnen"""
+        value = product.get_total_value()
+        category = product.category
+        self.total_value += value
+        self.total_units += product.quantity
+        self.sku_count += 1
+        self.category_values[category] = self.category_values.get(category, 0.0) + value
+        self.category_units[category] = self.category_units.get(category, 0) + product.quantity
+        self.category_skus[category] = self.category_skus.get(category, 0) + 1
+
+    def remove_product(self, product: Product) -> None:
+        """Gelöschtes Produkt mit seinem aktuellen Bestand herausrechnen"""
+        value = product.get_total_value()
+        category = product.category
+        self.total_value -= value
+        self.total_units -= product.quantity
+        self.sku_count -= 1
+        self.category_values[category] = self.category_values.get(category, 0.0) - value
+        self.category_units[category] = self.category_units.get(category, 0) - product.quantity
+        self.category_skus[category] = self.category_skus.get(category, 0) - 1
+        if self.category_skus[category] <= 0:
+            del self.category_values[category]
+            del self.category_units[category]
+            del self.category_skus[category]
+
+    def apply_quantity_change(self, product: Product, amount: int) -> None:
+        """
+        Bestandsänderung eines bereits erfassten Produkts einrechnen
+
+        Args:
+            product: Betroffenes Produkt (für Preis und Kategorie)
+            amount: Mengenänderung (negativ bei Entnahme)
+        """
+        value = product.price * amount
+        category = product.category
+        self.total_value += value
+        self.total_units += amount
+        self.category_values[category] = self.category_values.get(category, 0.0) + value
+        self.category_units[category] = self.category_units.get(category, 0) + amount
+
+    def check_consistency(
+        self, products: Iterable[Product], tolerance: float = 1e-6
+    ) -> Dict[str, Tuple[float, float]]:
+        """
+        Kennzahlen von Grund auf neu berechnen und mit den gepflegten vergleichen
+
+        Args:
+            products: Aktueller Produktbestand (z.B. aus dem Repository)
+            tolerance: Erlaubte absolute Abweichung bei Geldbeträgen
+
+        Returns:
+            Abweichungen als {Kennzahl: (gepflegt, neu berechnet)};
+            leer, wenn alles übereinstimmt
+        """
+        expected = InventoryAggregates.from_products(products)
+        drift: Dict[str, Tuple[float, float]] = {}
+
+        def compare(name: str, maintained: float, recomputed: float) -> None:
+            if not math.isclose(maintained, recomputed, rel_tol=1e-9, abs_tol=tolerance):
+                drift[name] = (maintained, recomputed)
+
+        compare("total_value", self.total_value, expected.total_value)
+        compare("total_units", self.total_units, expected.total_units)
+        compare("sku_count", self.sku_count, expected.sku_count)
+        for category in self.category_skus.keys() | expected.category_skus.keys():
+            compare(
+                f"category_value:{category}",
+                self.category_values.get(category, 0.0),
+                expected.category_values.get(category, 0.0),
+            )
+            compare(
+                f"category_units:{category}",
+                self.category_units.get(category, 0),
+                expected.category_units.get(category, 0),
+            )
+            compare(
+                f"category_skus:{category}",
+                self.category_skus.get(category, 0),
+                expected.category_skus.get(category, 0),
+            )
+        return drift
@@ -0,0 +1,123 @@
+"""ID-Generierung - eindeutige, zeitlich sortierbare IDs für Lagerbewegungen"""
+
+import os
+import threading
+import time
+import weakref
+from datetime import datetime
+from typing import Callable, Tuple
+
+# Crockford-Base32: sortiert lexikographisch in derselben Reihenfolge wie der Zahlenwert
+_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+_DECODE = {char: index for index, char in enumerate(_ALPHABET)}
+# Zwei Zeichen (10 Bit) pro Tabellenzugriff halbieren die Schleifendurchläufe
+_PAIRS = [a + b for a in _ALPHABET for b in _ALPHABET]
+
+_RANDOM_BITS = 80
+_RANDOM_LIMIT = 1 << _RANDOM_BITS
+_ENCODED_LENGTH = 26
+
+
+def _encode(value: int) -> str:
+    """128-Bit-Wert als 26 Zeichen Crockford-Base32 kodieren"""
+    pairs = []
+    for _ in range(13):
+        pairs.append(_PAIRS[value & 0x3FF])
+        value >>= 10
+    return "".join(reversed(pairs))
+
+
+def _fresh_random() -> int:
+    # os.urandom statt random: nach fork() erzeugen Kindprozesse andere Werte.
+    # Das oberste Bit bleibt frei, damit Inkremente innerhalb einer Millisekunde
+    # praktisch nie überlaufen.
+    return int.from_bytes(os.urandom(10), "big") >> 1
+
+
+class MonotonicIdGenerator:
+    """
+    ULID-artige IDs: 48 Bit Millisekunden-Zeitstempel + 80 Bit Zufall.
+
+    - innerhalb eines Prozesses streng monoton: in derselben Millisekunde
+      (oder wenn die Uhr zurückspringt) wird der Zufallsteil hochgezählt
+    - prozessübergreifend k-sortierbar: IDs sortieren nach Erzeugungszeit
+    - thread-sicher
+    - fork-sicher: Kindprozesse ziehen nach fork() neuen Zufall, statt
+      denselben Zähler wie der Elternprozess fortzusetzen
+
+    Da IDs lexikographisch nach Zeit sortieren, können Repositories sie als
+    (geclusterten) Schlüssel für Zeitbereichsabfragen verwenden (siehe id_range).
+    """
+
+    def __init__(self, prefix: str = "mov_", clock: Callable[[], float] = time.time):
+        """
+        Args:
+            prefix: Präfix jeder ID
+            clock: Zeitquelle in Sekunden seit Epoch (austauschbar für Tests)
+        """
+        self.prefix = prefix
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._last_ms = -1
+        self._last_random = 0
+        _generators.add(self)
+
+    def _reseed(self) -> None:
+        """Nach fork() im Kind: frisches Lock, Zufallsteil neu ziehen (Zeitstempel bleibt)"""
+        self._lock = threading.Lock()
+        self._last_random = _fresh_random()
+
+    def __call__(self) -> str:
+        """Nächste ID erzeugen"""
+        ms = int(self._clock() * 1000)
+        with self._lock:
+            if ms <= self._last_ms:
+                ms = self._last_ms
+                random_part = self._last_random + 1
+                if random_part >= _RANDOM_LIMIT:
+                    ms += 1
+                    random_part = _fresh_random()
+            else:
+                random_part = _fresh_random()
+            self._last_ms = ms
+            self._last_random = random_part
+        return self.prefix + _encode((ms << _RANDOM_BITS) | random_part)
+
+    def id_range(self, start: datetime, end: datetime) -> Tuple[str, str]:
+        """
+        Schlüsselbereich für alle IDs, die im Zeitraum [start, end) erzeugt wurden
+
+        Returns:
+            (untere Grenze inklusive, obere Grenze exklusive)
+        """
+        return (
+            self.prefix + _encode(int(start.timestamp() * 1000) << _RANDOM_BITS),
+            self.prefix + _encode(int(end.timestamp() * 1000) << _RANDOM_BITS),
+        )
+
+
+def id_timestamp(generated_id: str, prefix: str = "mov_") -> datetime:
+    """Erzeugungszeitpunkt aus einer ID von MonotonicIdGenerator ablesen"""
+    encoded = generated_id[len(prefix) :]
+    if len(encoded) != _ENCODED_LENGTH:
+        raise ValueError(f"Ungültige ID: {generated_id}")
+    value = 0
+    for char in encoded:
+        value = (value << 5) | _DECODE[char]
+    return datetime.fromtimestamp((value >> _RANDOM_BITS) / 1000)
+
+
+# Alle Generatoren des Prozesses, damit Kindprozesse sie nach fork() neu ansetzen
+_generators: "weakref.WeakSet[MonotonicIdGenerator]" = weakref.WeakSet()
+
+
+def _reseed_after_fork() -> None:
+    for generator in list(_generators):
+        generator._reseed()
+
+
+if hasattr(os, "register_at_fork"):  # nicht unter Windows
+    os.register_at_fork(after_in_child=_reseed_after_fork)
+
+# Prozessweiter Standard-Generator für Bewegungs-IDs
+movement_ids = MonotonicIdGenerator()
@@ -0,0 +1,189 @@
+"""Lots Domain Model - Chargen mit Mindesthaltbarkeit und FEFO-Entnahme"""
+
+import heapq
+from bisect import bisect_left, bisect_right, insort
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from itertools import count
+from typing import Dict, Iterable, List, Tuple
+
+# Heap-Eintrag: (Ablaufdatum, Eingang, laufende Nummer, Chargen-ID); gleiches
+# Datum wird in Eingangsreihenfolge entnommen, die Nummer erkennt veraltete Einträge
+_Entry = Tuple[date, datetime, int, str]
+
+
+@dataclass(slots=True)
+class Lot:
+    """Charge eines Produkts mit Mindesthaltbarkeitsdatum"""
+
+    id: str
+    product_id: str
+    quantity: int
+    expires_at: date
+    received_at: datetime = field(default_factory=datetime.now)
+
+    def __post_init__(self):
+        if not self.id:
+            raise ValueError("Chargen-ID kann nicht leer sein")
+        if self.quantity < 0:
+            raise ValueError("Chargenmenge kann nicht negativ sein")
+
+
+class LotLedger:
+    """
+    Chargenbestände aller Produkte für die Entnahme nach FEFO
+    (First Expired, First Out).
+
+    - Pro Produkt ein Min-Heap nach Ablaufdatum: die nächste zu entnehmende
+      Charge liegt oben, Entnahme kostet O(log n) pro angebrochener Charge.
+      Entfernte Chargen bleiben als veraltete Einträge stehen, bis sie oben
+      ankommen (Lazy Deletion).
+    - Ein globaler Ablaufindex: pro Ablaufdatum die Chargen, dazu die Daten
+      sortiert. "Was läuft bis zum Datum X ab" kostet O(log d + k) (d =
+      verschiedene Daten, k = Treffer), ohne die übrigen Chargen anzufassen.
+    """
+
+    def __init__(self, lots: Iterable[Lot] = ()):
+        self._lots: Dict[str, Lot] = {}
+        self._entry_numbers: Dict[str, int] = {}  # Chargen-ID -> Nummer des gültigen Eintrags
+        self._by_product: Dict[str, List[_Entry]] = {}
+        self._by_expiry: Dict[date, Dict[str, Lot]] = {}
+        self._expiry_dates: List[date] = []  # Schlüssel von _by_expiry, sortiert
+        self._totals: Dict[str, int] = {}
+        self._numbers = count()
+        for lot in lots:
+            self.add(lot)
+
+    def __len__(self) -> int:
+        return len(self._lots)
+
+    def __contains__(self, lot_id: str) -> bool:
+        return lot_id in self._lots
+
+    def add(self, lot: Lot) -> None:
+        """
+        Charge einbuchen
+
+        Raises:
+            ValueError: bei doppelter Chargen-ID oder Menge 0
+        """
+        if lot.id in self._lots:
+            raise ValueError(f"Charge {lot.id} existiert bereits")
+        if lot.quantity <= 0:
+            raise ValueError("Chargenmenge muss positiv sein")
+        self._push(lot)
+        self._totals[lot.product_id] = self._totals.get(lot.product_id, 0) + lot.quantity
+
+    def _push(self, lot: Lot) -> None:
+        entry = (lot.expires_at, lot.received_at, next(self._numbers), lot.id)
+        self._lots[lot.id] = lot
+        self._entry_numbers[lot.id] = entry[2]
+        heapq.heappush(self._by_product.setdefault(lot.product_id, []), entry)
+        bucket = self._by_expiry.get(lot.expires_at)
+        if bucket is None:
+            bucket = self._by_expiry[lot.expires_at] = {}
+            insort(self._expiry_dates, lot.expires_at)
+        bucket[lot.id] = lot
+
+    def _is_live(self, entry: _Entry) -> bool:
+        return self._entry_numbers.get(entry[3]) == entry[2]
+
+    def _drop(self, lot_id: str) -> None:
+        lot = self._lots.pop(lot_id)
+        del self._entry_numbers[lot_id]
+        bucket = self._by_expiry[lot.expires_at]
+        del bucket[lot_id]
+        if not bucket:
+            del self._by_expiry[lot.expires_at]
+            dates = self._expiry_dates
+            del dates[bisect_left(dates, lot.expires_at)]
+
+    def remove(self, lot_id: str) -> Lot:
+        """
+        Charge vollständig entfernen (z.B. Wareneingang zurücknehmen)
+
+        Raises:
+            ValueError: bei unbekannter Chargen-ID
+        """
+        lot = self._lots.get(lot_id)
+        if lot is None:
+            raise ValueError(f"Charge {lot_id} nicht gefunden")
+        self._drop(lot_id)
+        self._totals[lot.product_id] -= lot.quantity
+        if not self._totals[lot.product_id]:
+            del self._totals[lot.product_id]
+        return lot
+
+    def tracked_quantity(self, product_id: str) -> int:
+        """Summe aller Chargen eines Produkts"""
+        return self._totals.get(product_id, 0)
+
+    def lots(self, product_id: str) -> List[Lot]:
+        """Chargen eines Produkts in Entnahmereihenfolge"""
+        heap = self._by_product.get(product_id, [])
+        return [self._lots[entry[3]] for entry in sorted(heap) if self._is_live(entry)]
+
+    def consume(self, product_id: str, quantity: int) -> List[Tuple[Lot, int]]:
+        """
+        Menge nach FEFO aus den Chargen eines Produkts entnehmen
+
+        Reichen die Chargen nicht, wird so viel wie möglich entnommen; den Rest
+        deckt der Aufrufer aus chargenlosem Bestand.
+
+        Returns:
+            [(Charge, entnommene Menge), ...] in Entnahmereihenfolge
+        """
+        heap = self._by_product.get(product_id)
+        taken: List[Tuple[Lot, int]] = []
+        remaining = quantity
+        while remaining > 0 and heap:
+            entry = heap[0]
+            if not self._is_live(entry):
+                heapq.heappop(heap)
+                continue
+            lot = self._lots[entry[3]]
+            amount = min(lot.quantity, remaining)
+            lot.quantity -= amount
+            remaining -= amount
+            taken.append((lot, amount))
+            if lot.quantity == 0:
+                heapq.heappop(heap)
+                self._drop(lot.id)
+        if heap is not None and not heap:
+            del self._by_product[product_id]
+        consumed = quantity - remaining
+        if consumed:
+            self._totals[product_id] -= consumed
+            if not self._totals[product_id]:
+                del self._totals[product_id]
+        return taken
+
+    def restore(self, taken: Iterable[Tuple[Lot, int]]) -> None:
+        """Entnahme rückgängig machen (z.B. wenn das Speichern fehlschlägt)"""
+        for lot, amount in taken:
+            lot.quantity += amount
+            if lot.id not in self._lots:
+                self._push(lot)
+            self._totals[lot.product_id] = self._totals.get(lot.product_id, 0) + amount
+
+    def remove_product(self, product_id: str) -> List[Lot]:
+        """Alle Chargen eines Produkts entfernen und zurückgeben"""
+        removed = [
+            self._lots[entry[3]]
+            for entry in self._by_product.pop(product_id, [])
+            if self._is_live(entry)
+        ]
+        for lot in removed:
+            self._drop(lot.id)
+        self._totals.pop(product_id, None)
+        return removed
+
+    def expiring(self, until: date) -> List[Lot]:
+        """Alle Chargen, die spätestens am Datum `until` ablaufen, nach Ablaufdatum sortiert"""
+        dates = self._expiry_dates
+        by_expiry = self._by_expiry
+        return [
+            lot
+            for expires_at in dates[: bisect_right(dates, until)]
+            for lot in by_expiry[expires_at].values()
+        ]
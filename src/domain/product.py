@@ -5,11 +5,12 @@ from datetime import datetime
 from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class Product:
     """
     Basis-Produktklasse für die Lagerverwaltung.
     Siehe docs/DATACLASS_ERKLAERT.md für Erklärung der @dataclass.
+    slots=True: kein __dict__ pro Instanz, spart Speicher bei großen Katalogen.
     """
 
     id: str
@@ -1,13 +1,14 @@
 """Warehouse Domain Model"""
 
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import date, datetime
 from typing import Dict, Optional
 
+from .aggregates import InventoryAggregates
 from .product import Product
 
 
-@dataclass
+@dataclass(slots=True)
 class Movement:
     """Bewegungsprotokoll-Eintrag für Lagerbestände"""
 
@@ -21,6 +22,19 @@ class Movement:
     performed_by: str = "system"
 
 
+@dataclass
+class Booking:
+    """Einzelne Position einer Sammelbuchung (z.B. eine Zeile eines Wareneingangs)"""
+
+    product_id: str
+    quantity: int
+    movement_type: str = "IN"  # "IN" oder "OUT"
+    reason: Optional[str] = None
+    performed_by: str = "system"
+    expires_at: Optional[date] = None  # nur Zugänge: als Charge mit diesem Ablaufdatum führen
+    lot_id: Optional[str] = None  # Chargennummer (Standard: ID der Zugangsbewegung)
+
+
 class Warehouse:
     """Verwaltungsklasse für das Lager"""
 
@@ -28,12 +42,34 @@ class Warehouse:
         self.name = name
         self.products: Dict[str, Product] = {}
         self.movements: list[Movement] = []
+        self.aggregates = InventoryAggregates()
 
     def add_product(self, product: Product) -> None:
         """Produkt zum Lager hinzufügen"""
         if product.id in self.products:
             raise ValueError(f"Produkt mit ID {product.id} existiert bereits")
         self.products[product.id] = product
+        self.aggregates.add_product(product)
+
+    def remove_product(self, product_id: str) -> Optional[Product]:
+        """Produkt aus dem Lager entfernen (unbekannte IDs werden ignoriert)"""
+        product = self.products.pop(product_id, None)
+        if product is not None:
+            self.aggregates.remove_product(product)
+        return product
+
+    def update_stock(self, product_id: str, amount: int) -> None:
+        """
+        Bestand eines Produkts ändern und Kennzahlen nachführen
+
+        Raises:
+            ValueError: wenn das Produkt fehlt oder der Bestand negativ würde
+        """
+        product = self.products.get(product_id)
+        if product is None:
+            raise ValueError(f"Produkt mit ID {product_id} existiert nicht")
+        product.update_quantity(amount)
+        self.aggregates.apply_quantity_change(product, amount)
 
     def get_product(self, product_id: str) -> Optional[Product]:
         """Produkt nach ID abrufen"""
@@ -42,14 +78,16 @@ class Warehouse:
     def record_movement(self, movement: Movement) -> None:
         """Lagerbewegung protokollieren"""
         if movement.product_id not in self.products:
-            raise ValueError(
-                f"Produkt mit ID {movement.product_id} existiert nicht"
-            )
+            raise ValueError(f"Produkt mit ID {movement.product_id} existiert nicht")
         self.movements.append(movement)
 
     def get_total_inventory_value(self) -> float:
-        """Gesamtwert aller Bestände berechnen"""
-        return sum(product.get_total_value() for product in self.products.values())
+        """Gesamtwert aller Bestände (inkrementell gepflegt, O(1))"""
+        return self.aggregates.total_value
+
+    def check_consistency(self) -> Dict[str, tuple]:
+        """Gepflegte Kennzahlen gegen eine Neuberechnung prüfen (siehe InventoryAggregates)"""
+        return self.aggregates.check_consistency(self.products.values())
 
     def get_inventory_report(self) -> Dict[str, dict]:
         """
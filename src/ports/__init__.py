@@ -1,12 +1,52 @@
 """Ports - Schnittstellen für externe Abhängigkeiten (Abstraktion)"""
 
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional
+from contextlib import nullcontext
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import islice
+from typing import Callable, ContextManager, Dict, Iterable, Iterator, List, Optional, Tuple
 
+from ..domain.lots import Lot
 from ..domain.product import Product
 from ..domain.warehouse import Movement
 
 
+@dataclass
+class MovementPage:
+    """Eine Seite eines Bewegungs-Abfrageergebnisses"""
+
+    movements: List[Movement]
+    next_cursor: Optional[str] = None  # None: keine weiteren Treffer
+
+
+def encode_movement_cursor(timestamp: datetime, seq: int) -> str:
+    """Position (Zeitstempel, laufende Nummer) als undurchsichtigen Cursor kodieren"""
+    return f"{timestamp.isoformat()}|{seq}"
+
+
+def decode_movement_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Cursor aus encode_movement_cursor wieder in (Zeitstempel, Nummer) zerlegen
+
+    Raises:
+        ValueError: bei ungültigem Cursor
+    """
+    timestamp, _, seq = cursor.rpartition("|")
+    return datetime.fromisoformat(timestamp), int(seq)
+
+
+def check_page_limit(limit: Optional[int]) -> None:
+    """
+    Seitengröße für query_movements prüfen (None: ohne Begrenzung)
+
+    Raises:
+        ValueError: bei einer Seitengröße kleiner als 1
+    """
+    if limit is not None and limit < 1:
+        raise ValueError(f"limit muss mindestens 1 sein (erhalten: {limit})")
+
+
 class RepositoryPort(ABC):
     """Port für Datenpersistenz"""
 
@@ -40,6 +80,274 @@ class RepositoryPort(ABC):
         """Alle Lagerbewegungen laden"""
         pass
 
+    def query_movements(
+        self,
+        product_id: Optional[str] = None,
+        movement_type: Optional[str] = None,
+        performed_by: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> MovementPage:
+        """
+        Lagerbewegungen gefiltert und zeitlich sortiert abfragen
+
+        Standardimplementierung filtert load_movements(); Adapter mit Indizes
+        überschreiben das.
+
+        Args:
+            product_id: nur Bewegungen dieses Produkts
+            movement_type: nur Bewegungen dieses Typs (z.B. "IN")
+            performed_by: nur Bewegungen dieses Benutzers
+            start: Zeitfenster ab (inklusive)
+            end: Zeitfenster bis (exklusive)
+            limit: maximale Anzahl Treffer pro Seite (None: alle)
+            cursor: next_cursor der vorherigen Seite
+
+        Returns:
+            MovementPage mit Treffern und Cursor für die nächste Seite
+
+        Raises:
+            ValueError: bei limit kleiner als 1 (siehe check_page_limit)
+        """
+        check_page_limit(limit)
+        after = decode_movement_cursor(cursor) if cursor else None
+        keyed = sorted(
+            ((movement.timestamp, seq), movement)
+            for seq, movement in enumerate(self.load_movements())
+            if (product_id is None or movement.product_id == product_id)
+            and (movement_type is None or movement.movement_type == movement_type)
+            and (performed_by is None or movement.performed_by == performed_by)
+            and (start is None or movement.timestamp >= start)
+            and (end is None or movement.timestamp < end)
+        )
+        if after is not None:
+            keyed = [(key, movement) for key, movement in keyed if key > after]
+        if limit is not None and len(keyed) > limit:
+            last_key = keyed[limit - 1][0]
+            return MovementPage(
+                [movement for _, movement in keyed[:limit]], encode_movement_cursor(*last_key)
+            )
+        return MovementPage([movement for _, movement in keyed])
+
+    def load_products(self, product_ids: Iterable[str]) -> Dict[str, Product]:
+        """
+        Mehrere Produkte auf einmal laden
+
+        Standardimplementierung über load_product; Adapter können das nativ
+        (z.B. mit einer einzigen Abfrage) umsetzen.
+
+        Returns:
+            Dictionary der gefundenen Produkte (unbekannte IDs fehlen)
+        """
+        products = {}
+        for product_id in product_ids:
+            product = self.load_product(product_id)
+            if product is not None:
+                products[product_id] = product
+        return products
+
+    def load_quantities(self, product_ids: Iterable[str]) -> Dict[str, int]:
+        """
+        Nur die Bestände mehrerer Produkte laden (z.B. für kettenweite Summen)
+
+        Standardimplementierung über load_products; Adapter können das ohne
+        Aufbau ganzer Produkte umsetzen.
+
+        Returns:
+            {Produkt-ID: Bestand} der gefundenen Produkte
+        """
+        return {
+            product_id: product.quantity
+            for product_id, product in self.load_products(product_ids).items()
+        }
+
+    def save_products(self, products: Iterable[Product]) -> None:
+        """Mehrere Produkte speichern (Standard: einzeln über save_product)"""
+        for product in products:
+            self.save_product(product)
+
+    def save_movements(self, movements: Iterable[Movement]) -> None:
+        """Mehrere Lagerbewegungen speichern (Standard: einzeln über save_movement)"""
+        for movement in movements:
+            self.save_movement(movement)
+
+    def iter_products(self) -> Iterator[Product]:
+        """
+        Alle Produkte nacheinander liefern, ohne den Bestand zu kopieren
+
+        Adapter kopieren höchstens die Referenzen bzw. lesen seitenweise;
+        paralleles Anlegen oder Löschen darf die Iteration nicht abbrechen.
+        Wer einen stabilen Schnappschuss der Werte braucht, nutzt
+        load_all_products(). Standard: über load_all_products().
+        """
+        return iter(self.load_all_products().values())
+
+    def iter_movements(self, start: int = 0) -> Iterator[Movement]:
+        """
+        Lagerbewegungen in Einfügereihenfolge liefern (Standard: über load_movements)
+
+        Args:
+            start: Anzahl der zu überspringenden ersten Bewegungen (Position im
+                Strom, z.B. für inkrementelles Nachlesen)
+        """
+        return islice(self.load_movements(), start, None)
+
+    def count_products(self) -> int:
+        """Anzahl Produkte (Standard: über load_all_products)"""
+        return len(self.load_all_products())
+
+    def count_movements(self) -> int:
+        """Anzahl Lagerbewegungen (Standard: über load_movements)"""
+        return len(self.load_movements())
+
+    def save_lots(self, lots: Iterable[Lot]) -> None:
+        """
+        Chargen speichern bzw. aktualisieren; Chargen mit Menge 0 werden gelöscht
+
+        Standardmäßig nicht unterstützt - Adapter ohne Chargenablage lehnen ab.
+        """
+        raise NotImplementedError(f"{type(self).__name__} speichert keine Chargen")
+
+    def load_lots(self) -> List[Lot]:
+        """Alle gespeicherten Chargen laden (Standard: keine)"""
+        return []
+
+    def transaction(self) -> ContextManager:
+        """
+        Klammer für zusammengehörige Schreiboperationen (alles oder nichts)
+
+        Standardmäßig ohne Wirkung; transaktionsfähige Adapter überschreiben das.
+        """
+        return nullcontext()
+
+
+class AsyncRepositoryPort(ABC):
+    """
+    Port für Datenpersistenz aus asyncio-Code
+
+    Gleiche Operationen wie RepositoryPort, aber awaitable, damit Zugriffe den
+    Event-Loop nicht blockieren.
+    """
+
+    @abstractmethod
+    async def save_product(self, product: Product) -> None:
+        """Produkt speichern"""
+        pass
+
+    @abstractmethod
+    async def load_product(self, product_id: str) -> Optional[Product]:
+        """Produkt laden"""
+        pass
+
+    @abstractmethod
+    async def load_all_products(self) -> Dict[str, Product]:
+        """Alle Produkte laden"""
+        pass
+
+    @abstractmethod
+    async def delete_product(self, product_id: str) -> None:
+        """Produkt löschen"""
+        pass
+
+    @abstractmethod
+    async def save_movement(self, movement: Movement) -> None:
+        """Lagerbewegung speichern"""
+        pass
+
+    @abstractmethod
+    async def load_movements(self) -> List[Movement]:
+        """Alle Lagerbewegungen laden"""
+        pass
+
+    @abstractmethod
+    async def query_movements(
+        self,
+        product_id: Optional[str] = None,
+        movement_type: Optional[str] = None,
+        performed_by: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> MovementPage:
+        """Lagerbewegungen gefiltert und seitenweise abfragen (siehe RepositoryPort)"""
+        pass
+
+    async def load_products(self, product_ids: Iterable[str]) -> Dict[str, Product]:
+        """Mehrere Produkte auf einmal laden (Standard: einzeln über load_product)"""
+        products = {}
+        for product_id in product_ids:
+            product = await self.load_product(product_id)
+            if product is not None:
+                products[product_id] = product
+        return products
+
+    async def save_products(self, products: Iterable[Product]) -> None:
+        """Mehrere Produkte speichern (Standard: einzeln über save_product)"""
+        for product in products:
+            await self.save_product(product)
+
+    async def save_movements(self, movements: Iterable[Movement]) -> None:
+        """Mehrere Lagerbewegungen speichern (Standard: einzeln über save_movement)"""
+        for movement in movements:
+            await self.save_movement(movement)
+
+
+@dataclass
+class SearchHit:
+    """Ein Treffer der Produktsuche"""
+
+    product_id: str
+    score: float
+
+
+class SearchPort(ABC):
+    """
+    Port für die Produktsuche (Volltext und Präfix)
+
+    Der Index wird inkrementell gepflegt: der WarehouseService meldet neue,
+    geänderte und gelöschte Produkte.
+    """
+
+    @abstractmethod
+    def index_product(self, product: Product) -> None:
+        """Produkt aufnehmen bzw. nach einer Änderung neu indexieren"""
+        pass
+
+    @abstractmethod
+    def remove_product(self, product_id: str) -> None:
+        """Produkt aus dem Index entfernen (unbekannte IDs werden ignoriert)"""
+        pass
+
+    @abstractmethod
+    def search(self, query: str, limit: int = 20) -> List[SearchHit]:
+        """
+        Produkte suchen
+
+        Alle Suchbegriffe müssen vorkommen; der letzte gilt als Präfix, damit
+        schon während der Eingabe Treffer erscheinen.
+
+        Args:
+            query: Suchtext (z.B. "milch 1l" oder "SKU-00")
+            limit: maximale Anzahl Treffer
+
+        Returns:
+            Treffer, nach Relevanz absteigend sortiert
+        """
+        pass
+
+    @abstractmethod
+    def suggest(self, prefix: str, limit: int = 10) -> List[str]:
+        """Vervollständigungen für einen angefangenen Suchbegriff (häufigste zuerst)"""
+        pass
+
+    def index_products(self, products: Iterable[Product]) -> None:
+        """Mehrere Produkte indexieren (Standard: einzeln über index_product)"""
+        for product in products:
+            self.index_product(product)
+
 
 class ReportPort(ABC):
     """Port für Report-Generierung"""
@@ -53,3 +361,47 @@ class ReportPort(ABC):
     def generate_movement_report(self) -> str:
         """Bewegungsprotokoll generieren"""
         pass
+
+
+class MetricsPort(ABC):
+    """
+    Port für Metriken: Histogramme (Dauer, Größen), Zähler und Momentwerte
+
+    Namen folgen den Prometheus-Konventionen (Einheit als Suffix, z.B.
+    "_seconds", Zähler mit "_total"). Wer keine Metriken übergibt, hat auch
+    keinen Messaufwand - Service und Repositories messen nur mit MetricsPort.
+    """
+
+    @abstractmethod
+    def observe(self, name: str, value: float, labels: Optional[Dict[str, str]] = None) -> None:
+        """Messwert in ein Histogramm eintragen (z.B. Dauer in Sekunden)"""
+        pass
+
+    @abstractmethod
+    def increment(
+        self, name: str, amount: float = 1.0, labels: Optional[Dict[str, str]] = None
+    ) -> None:
+        """Zähler erhöhen"""
+        pass
+
+    @abstractmethod
+    def set_gauge(self, name: str, value: float, labels: Optional[Dict[str, str]] = None) -> None:
+        """Momentwert setzen (z.B. Cache-Größe)"""
+        pass
+
+    def observer(
+        self, name: str, labels: Optional[Dict[str, str]] = None
+    ) -> Callable[[float], None]:
+        """
+        Funktion, die Messwerte in ein festes Histogramm einträgt
+
+        Für Hot Paths: Name und Labels werden nur einmal aufgelöst.
+        Standard: ruft observe() auf.
+        """
+        return lambda value: self.observe(name, value, labels)
+
+    def register_collector(self, collector: Callable[["MetricsPort"], None]) -> None:
+        """
+        Callback registrieren, der vor jedem Export aktuelle Werte meldet
+        (z.B. Cache-Statistiken); Standard: ignoriert
+        """
@@ -1,19 +1,146 @@
 """Services - Business Logic Layer"""
 
-from datetime import datetime
-from typing import Dict, List, Optional
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import date, datetime, timedelta
+from typing import (
+    Callable,
+    ContextManager,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+)
 
+from ..domain.aggregates import InventoryAggregates
+from ..domain.ids import movement_ids
+from ..domain.lots import Lot, LotLedger
 from ..domain.product import Product
-from ..domain.warehouse import Movement, Warehouse
-from ..ports import RepositoryPort
+from ..domain.warehouse import Booking, Movement, Warehouse
+from ..ports import MetricsPort, MovementPage, RepositoryPort, SearchPort
+from .locking import StripedLock, TimedLock, WaitCallback
+from .projection import StockProjection
+from .replenishment import PurchaseProposal, ReplenishmentEngine
+
+# Methoden, deren Dauer mit Metriken gemessen wird (iter_* liefern nur Iteratoren
+# des Repositories - die misst der InstrumentedRepository)
+_INSTRUMENTED_METHODS = (
+    "create_product",
+    "create_products",
+    "update_product",
+    "delete_product",
+    "add_to_stock",
+    "remove_from_stock",
+    "transfer_out",
+    "transfer_in",
+    "book_movements",
+    "get_product",
+    "get_all_products",
+    "get_movements",
+    "count_products",
+    "count_movements",
+    "query_movements",
+    "search_products",
+    "get_lots",
+    "get_expiring_lots",
+    "get_total_inventory_value",
+    "get_category_values",
+    "get_stock_at",
+    "check_stock_against_movements",
+    "propose_purchases",
+    "check_inventory_consistency",
+)
+
+
+def _timed_call(metrics: MetricsPort, name: str, method: Callable) -> Callable:
+    observe = metrics.observer("warehouse_service_call_seconds", {"method": name})
+    clock = time.perf_counter
+
+    def timed(*args, **kwargs):
+        started = clock()
+        try:
+            return method(*args, **kwargs)
+        except Exception as error:
+            metrics.increment(
+                "warehouse_service_errors_total",
+                labels={"method": name, "error": type(error).__name__},
+            )
+            raise
+        finally:
+            observe(clock() - started)
+
+    timed.__name__ = timed.__qualname__ = name
+    timed.__doc__ = method.__doc__
+    timed.__wrapped__ = method
+    return timed
 
 
 class WarehouseService:
     """Service für Lagerverwaltung"""
 
-    def __init__(self, repository: RepositoryPort):
+    def __init__(
+        self,
+        repository: RepositoryPort,
+        id_generator: Optional[Callable[[], str]] = None,
+        thread_safe: bool = False,
+        lock_stripes: int = 64,
+        search_index: Optional[SearchPort] = None,
+        metrics: Optional[MetricsPort] = None,
+        warehouse_id: str = "Hauptlager",
+    ):
+        """
+        Args:
+            repository: Persistenz-Adapter (Bestand genau eines Lagers)
+            id_generator: Erzeugt Bewegungs-IDs (Standard: prozessweiter
+                MonotonicIdGenerator mit zeitlich sortierbaren IDs)
+            thread_safe: Buchungen pro Produkt sperren, damit mehrere Threads
+                den Service gemeinsam nutzen können (kein Überverkauf)
+            lock_stripes: Anzahl der gestreiften Produkt-Locks im thread-sicheren Modus
+            search_index: Suchindex für search_products; wird beim Start mit dem
+                Repository-Bestand gefüllt und danach inkrementell gepflegt
+            metrics: Ziel für Laufzeiten der öffentlichen Methoden, Lock-Wartezeiten
+                und Stapelgrößen; ohne Metriken wird nichts gemessen
+            warehouse_id: Lager, dessen Bestand der Service führt (mehrere Lager:
+                MultiWarehouseService)
+        """
         self.repository = repository
-        self.warehouse = Warehouse("Hauptlager")
+        self.new_movement_id = id_generator or movement_ids
+        self.metrics = metrics
+        self._locks: Optional[StripedLock] = None
+        self._aggregates_lock: ContextManager = nullcontext()
+        if thread_safe:
+            self._locks = StripedLock(lock_stripes, on_wait=self._lock_wait_recorder("products"))
+            aggregates_wait = self._lock_wait_recorder("aggregates")
+            self._aggregates_lock = (
+                threading.Lock() if aggregates_wait is None else TimedLock(aggregates_wait)
+            )
+        self.warehouse = Warehouse(warehouse_id)
+        # Kennzahlen über den gesamten Repository-Bestand, einmalig beim Start berechnet
+        self.aggregates = InventoryAggregates.from_products(repository.iter_products())
+        self.search_index = search_index
+        if search_index is not None:
+            search_index.index_products(repository.iter_products())
+        # Bestandsprojektion aus dem Bewegungsstrom, erst bei Bedarf aufgebaut
+        self._projection: Optional[StockProjection] = None
+        # Chargen mit Ablaufdatum (FEFO), aus dem Repository geladen
+        self.lots = LotLedger(repository.load_lots())
+        # Disposition aus dem Bewegungsstrom, ebenfalls erst bei Bedarf aufgebaut
+        self._replenishment: Optional[ReplenishmentEngine] = None
+        if metrics is not None:
+            # Nur diese Instanz wird umhüllt; ohne Metriken bleiben die Methoden unverändert
+            for name in _INSTRUMENTED_METHODS:
+                setattr(self, name, _timed_call(metrics, name, getattr(self, name)))
+
+    def _lock_wait_recorder(self, lock: str) -> Optional[WaitCallback]:
+        """Callback, der Lock-Wartezeiten als Histogramm meldet (None ohne Metriken)"""
+        if self.metrics is None:
+            return None
+        return self.metrics.observer("warehouse_lock_wait_seconds", {"lock": lock})
 
     def create_product(
         self,
@@ -33,50 +160,222 @@ class WarehouseService:
             quantity=initial_quantity,
             category=category,
         )
-        self.repository.save_product(product)
-        self.warehouse.add_product(product)
+        with self._lock_products([product_id]):
+            if self.repository.load_product(product_id) is not None:
+                raise ValueError(f"Produkt mit ID {product_id} existiert bereits")
+            self.repository.save_product(product)
+            self.warehouse.add_product(product)
+            with self._aggregates_lock:
+                self.aggregates.add_product(product)
+                if self._projection is not None:
+                    self._projection.open_product(product.id, product.quantity, product.created_at)
+                if self.search_index is not None:
+                    self.search_index.index_product(product)
         return product
 
+    def create_products(self, products: Iterable[Product]) -> List[Product]:
+        """
+        Viele Produkte auf einmal anlegen (z.B. Katalog einer neuen Filiale)
+
+        Eine Existenzprüfung über load_products, ein save_products in einer
+        Repository-Transaktion, Kennzahlen und Suchindex in einem Durchgang.
+        Die Produkte werden wie beim Start aus dem Repository geladene nicht
+        zusätzlich im Warehouse-Objekt geführt, damit große Importe nicht den
+        ganzen Katalog im Speicher halten.
+
+        Args:
+            products: bereits validierte Produkte (Product prüft Preis und Bestand)
+
+        Returns:
+            Die angelegten Produkte
+
+        Raises:
+            ValueError: bei doppelter ID im Stapel oder bereits vorhandenem
+                Produkt; es wird dann nichts angelegt
+        """
+        batch = list(products)
+        product_ids: Set[str] = set()
+        for product in batch:
+            if product.id in product_ids:
+                raise ValueError(f"Produkt mit ID {product.id} mehrfach im Stapel")
+            product_ids.add(product.id)
+        if self.metrics is not None:
+            self.metrics.observe("warehouse_import_batch_size", len(batch))
+        with self._lock_products(product_ids):
+            existing = self.repository.load_products(product_ids)
+            if existing:
+                raise ValueError(f"Produkt mit ID {min(existing)} existiert bereits")
+            with self.repository.transaction():
+                self.repository.save_products(batch)
+            with self._aggregates_lock:
+                for product in batch:
+                    self.aggregates.add_product(product)
+                if self._projection is not None:
+                    for product in batch:
+                        self._projection.open_product(
+                            product.id, product.quantity, product.created_at
+                        )
+                if self.search_index is not None:
+                    self.search_index.index_products(batch)
+        return batch
+
+    def update_product(
+        self,
+        product_id: str,
+        name: Optional[str] = None,
+        description: Optional[str] = None,
+        price: Optional[float] = None,
+        category: Optional[str] = None,
+        sku: Optional[str] = None,
+    ) -> Product:
+        """
+        Stammdaten eines Produkts ändern (None: Feld unverändert)
+
+        Bestände ändern sich nur über Buchungen (add_to_stock/remove_from_stock).
+
+        Returns:
+            Das geänderte Produkt
+
+        Raises:
+            ValueError: bei unbekanntem Produkt oder negativem Preis
+        """
+        if price is not None and price < 0:
+            raise ValueError("Preis kann nicht negativ sein")
+        with self._lock_products([product_id]):
+            product = self.repository.load_product(product_id)
+            if product is None:
+                raise ValueError(f"Produkt {product_id} nicht gefunden")
+            with self._aggregates_lock:
+                # Wert und Kategorie können sich ändern - alt heraus-, neu einrechnen
+                self.aggregates.remove_product(product)
+                tracked = self.warehouse.remove_product(product_id)
+                for field, value in (
+                    ("name", name),
+                    ("description", description),
+                    ("price", price),
+                    ("category", category),
+                    ("sku", sku),
+                ):
+                    if value is not None:
+                        setattr(product, field, value)
+                product.updated_at = datetime.now()
+                self.aggregates.add_product(product)
+                if tracked is not None:
+                    if tracked is not product:
+                        # Adapter wie SQLite liefern Kopien - Spiegel angleichen
+                        tracked.name, tracked.description = product.name, product.description
+                        tracked.price, tracked.category = product.price, product.category
+                        tracked.sku, tracked.updated_at = product.sku, product.updated_at
+                    self.warehouse.add_product(tracked)
+                self.repository.save_product(product)
+                if self.search_index is not None:
+                    self.search_index.index_product(product)
+        return product
+
+    def delete_product(self, product_id: str) -> None:
+        """Produkt löschen (unbekannte IDs werden ignoriert)"""
+        with self._lock_products([product_id]):
+            product = self.repository.load_product(product_id)
+            if product is None:
+                return
+            self.repository.delete_product(product_id)
+            self.warehouse.remove_product(product_id)
+            with self._aggregates_lock:
+                self.aggregates.remove_product(product)
+                if self.search_index is not None:
+                    self.search_index.remove_product(product_id)
+                removed_lots = self.lots.remove_product(product_id)
+            if removed_lots:
+                for lot in removed_lots:
+                    lot.quantity = 0
+                self.repository.save_lots(removed_lots)
+
     def add_to_stock(
-        self, product_id: str, quantity: int, reason: str = "", user: str = "system"
+        self,
+        product_id: str,
+        quantity: int,
+        reason: str = "",
+        user: str = "system",
+        expires_at: Optional[date] = None,
+        lot_id: Optional[str] = None,
     ) -> None:
-        """Bestand erhöhen"""
-        product = self.repository.load_product(product_id)
-        if not product:
-            raise ValueError(f"Produkt {product_id} nicht gefunden")
+        """
+        Bestand erhöhen
 
-        product.update_quantity(quantity)
-        self.repository.save_product(product)
+        Args:
+            expires_at: Mindesthaltbarkeitsdatum - die Menge wird als Charge
+                geführt (FEFO-Entnahme, get_expiring_lots); None: chargenlos
+            lot_id: Chargennummer (Standard: ID der Zugangsbewegung)
 
-        movement = Movement(
-            id=f"mov_{datetime.now().timestamp()}",
-            product_id=product_id,
-            product_name=product.name,
-            quantity_change=quantity,
-            movement_type="IN",
-            reason=reason,
-            performed_by=user,
-        )
-        self.repository.save_movement(movement)
+        Raises:
+            ValueError: bei unbekanntem Produkt, Chargennummer ohne Ablaufdatum
+                oder bereits vorhandener Chargennummer
+        """
+        if lot_id is not None and expires_at is None:
+            raise ValueError("Chargennummer ohne Ablaufdatum")
+        with self._lock_products([product_id]):
+            product = self.repository.load_product(product_id)
+            if not product:
+                raise ValueError(f"Produkt {product_id} nicht gefunden")
+
+            movement = Movement(
+                id=self.new_movement_id(),
+                product_id=product_id,
+                product_name=product.name,
+                quantity_change=quantity,
+                movement_type="IN",
+                reason=reason,
+                performed_by=user,
+            )
+            received: List[Lot] = []
+            if expires_at is not None:
+                received.append(Lot(lot_id or movement.id, product_id, quantity, expires_at))
+                with self._aggregates_lock:
+                    self.lots.add(received[0])
+            previous = [(product, product.quantity, product.updated_at)]
+            with self._undo_on_error(received, [], previous), self.repository.transaction():
+                product.update_quantity(quantity)
+                if received:
+                    self.repository.save_lots(received)
+                self.repository.save_product(product)
+                self.repository.save_movement(movement)
+            self._track_stock_change(product, quantity)
 
     def remove_from_stock(
         self, product_id: str, quantity: int, reason: str = "", user: str = "system"
-    ) -> None:
-        """Bestand verringern"""
+    ) -> List[Tuple[str, int]]:
+        """
+        Bestand verringern
+
+        Chargen werden nach FEFO entnommen (frühestes Ablaufdatum zuerst);
+        chargenloser Bestand kommt zuletzt an die Reihe.
+
+        Returns:
+            Entnahmeliste [(Chargennummer, Menge), ...]; leer ohne Chargen
+
+        Raises:
+            ValueError: bei unbekanntem Produkt oder unzureichendem Bestand
+        """
+        with self._lock_products([product_id]):
+            _, taken = self._remove_locked(product_id, quantity, reason, user)
+        return [(lot.id, amount) for lot, amount in taken]
+
+    def _remove_locked(
+        self, product_id: str, quantity: int, reason: str, user: str
+    ) -> Tuple[Movement, List[Tuple[Lot, int]]]:
+        """Abgang buchen (Produkt-Lock gehalten); liefert Bewegung und entnommene Chargen"""
         product = self.repository.load_product(product_id)
         if not product:
             raise ValueError(f"Produkt {product_id} nicht gefunden")
 
         if product.quantity < quantity:
             raise ValueError(
-                f"Unzureichender Bestand. Verfügbar: {product.quantity}, Angefordert: {quantity}"
+                f"Unzureichender Bestand. Verfügbar: {product.quantity}, "
+                f"Angefordert: {quantity}"
             )
 
-        product.update_quantity(-quantity)
-        self.repository.save_product(product)
-
         movement = Movement(
-            id=f"mov_{datetime.now().timestamp()}",
+            id=self.new_movement_id(),
             product_id=product_id,
             product_name=product.name,
             quantity_change=-quantity,
@@ -84,7 +383,296 @@ class WarehouseService:
             reason=reason,
             performed_by=user,
         )
-        self.repository.save_movement(movement)
+        with self._aggregates_lock:
+            taken = self.lots.consume(product_id, quantity)
+        previous = [(product, product.quantity, product.updated_at)]
+        with self._undo_on_error([], taken, previous), self.repository.transaction():
+            product.update_quantity(-quantity)
+            if taken:
+                self.repository.save_lots([lot for lot, _ in taken])
+            self.repository.save_product(product)
+            self.repository.save_movement(movement)
+        self._track_stock_change(product, -quantity)
+        return movement, taken
+
+    def transfer_out(
+        self, product_id: str, quantity: int, reason: str = "", user: str = "system"
+    ) -> Tuple[Movement, List[Tuple[date, int]]]:
+        """
+        Umlagerung ausbuchen: Abgang wie remove_from_stock (FEFO)
+
+        Returns:
+            (Abgangsbewegung, [(Ablaufdatum, Menge), ...] der entnommenen Chargen),
+            damit das Ziellager die Chargen mit ihrem Ablaufdatum übernehmen kann
+
+        Raises:
+            ValueError: bei unbekanntem Produkt oder unzureichendem Bestand
+        """
+        if quantity <= 0:
+            raise ValueError("Menge muss positiv sein")
+        with self._lock_products([product_id]):
+            movement, taken = self._remove_locked(product_id, quantity, reason, user)
+        return movement, [(lot.expires_at, amount) for lot, amount in taken]
+
+    def transfer_in(
+        self,
+        product: Product,
+        quantity: int,
+        lots: Iterable[Tuple[date, int]] = (),
+        reason: str = "",
+        user: str = "system",
+    ) -> List[Movement]:
+        """
+        Umlagerung einbuchen: ein Zugang pro Charge, der Rest chargenlos
+
+        Fehlt das Produkt in diesem Lager, wird es mit den Stammdaten von
+        product (Bestand 0) angelegt. Die Zugänge werden als Sammelbuchung
+        gespeichert (alles oder nichts). Kann das Repository keine Chargen
+        speichern, wird die Gesamtmenge chargenlos eingebucht.
+
+        Args:
+            product: Stammdaten aus dem Quelllager
+            quantity: Gesamtmenge
+            lots: [(Ablaufdatum, Menge), ...] aus transfer_out
+
+        Returns:
+            Die erzeugten Zugangsbewegungen
+
+        Raises:
+            ValueError: bei ungültiger Menge oder Chargen über der Gesamtmenge
+        """
+        bookings = [
+            Booking(product.id, amount, "IN", reason, user, expires_at=expires_at)
+            for expires_at, amount in lots
+        ]
+        untracked = quantity - sum(booking.quantity for booking in bookings)
+        if untracked < 0:
+            raise ValueError("Chargenmengen übersteigen die Umlagerungsmenge")
+        if untracked:
+            bookings.append(Booking(product.id, untracked, "IN", reason, user))
+        if not bookings:
+            raise ValueError("Menge muss positiv sein")
+        if self.repository.load_product(product.id) is None:
+            now = datetime.now()
+            try:
+                # Felder einzeln kopieren - product kann eine Sicht (ProductView) sein
+                self.create_products(
+                    [
+                        Product(
+                            id=product.id,
+                            name=product.name,
+                            description=product.description,
+                            price=product.price,
+                            quantity=0,
+                            sku=product.sku,
+                            category=product.category,
+                            created_at=now,
+                            updated_at=now,
+                            notes=product.notes,
+                        )
+                    ]
+                )
+            except ValueError:
+                # Gleichzeitig von einer anderen Umlagerung angelegt
+                if self.repository.load_product(product.id) is None:
+                    raise
+        try:
+            return self.book_movements(bookings)
+        except NotImplementedError:
+            if untracked == quantity:
+                raise
+        # Gescheiterte Sammelbuchung hat nichts hinterlassen - chargenlos wiederholen
+        return self.book_movements([Booking(product.id, quantity, "IN", reason, user)])
+
+    def book_movements(self, batch: Iterable[Booking]) -> List[Movement]:
+        """
+        Sammelbuchung (z.B. Wareneingang mit vielen Positionen) ausführen
+
+        Der gesamte Stapel wird vorab validiert - auch mehrfach vorkommende
+        Produkte, deren Bestand erst durch frühere Positionen ausreicht. Erst
+        danach werden Bestände und Bewegungen gesammelt und in einer
+        Repository-Transaktion gespeichert (alles oder nichts).
+
+        Args:
+            batch: Buchungspositionen in Buchungsreihenfolge
+
+        Returns:
+            Die erzeugten Lagerbewegungen
+
+        Raises:
+            ValueError: bei unbekanntem Produkt, ungültiger Menge/Typ oder
+                unzureichendem Bestand; es wird dann nichts gebucht
+        """
+        bookings = list(batch)
+        if self.metrics is not None:
+            self.metrics.observe("warehouse_booking_batch_size", len(bookings))
+        product_ids = {booking.product_id for booking in bookings}
+        with self._lock_products(product_ids):
+            return self._book_movements_locked(bookings, product_ids)
+
+    def _book_movements_locked(
+        self, bookings: List[Booking], product_ids: Set[str]
+    ) -> List[Movement]:
+        """book_movements ohne eigene Sperre; Aufrufer hält die Produkt-Locks"""
+        products = self.repository.load_products(product_ids)
+
+        running: Dict[str, int] = {}
+        lot_ids: Set[str] = set()
+        for position, booking in enumerate(bookings, start=1):
+            product = products.get(booking.product_id)
+            if product is None:
+                raise ValueError(
+                    f"Position {position}: Produkt {booking.product_id} nicht gefunden"
+                )
+            if booking.quantity <= 0:
+                raise ValueError(f"Position {position}: Menge muss positiv sein")
+            if booking.movement_type == "IN":
+                change = booking.quantity
+            elif booking.movement_type == "OUT":
+                change = -booking.quantity
+            else:
+                raise ValueError(
+                    f"Position {position}: Unbekannter Bewegungstyp {booking.movement_type}"
+                )
+            if booking.expires_at is not None or booking.lot_id is not None:
+                if booking.movement_type != "IN" or booking.expires_at is None:
+                    raise ValueError(
+                        f"Position {position}: Chargen nur bei Zugängen mit Ablaufdatum"
+                    )
+                if booking.lot_id is not None:
+                    if booking.lot_id in self.lots or booking.lot_id in lot_ids:
+                        raise ValueError(
+                            f"Position {position}: Charge {booking.lot_id} existiert bereits"
+                        )
+                    lot_ids.add(booking.lot_id)
+            available = running.get(booking.product_id, product.quantity)
+            if available + change < 0:
+                raise ValueError(
+                    f"Position {position}: Unzureichender Bestand für {booking.product_id}. "
+                    f"Verfügbar: {available}, Angefordert: {booking.quantity}"
+                )
+            running[booking.product_id] = available + change
+
+        booked_at = datetime.now()
+        movements = []
+        for booking in bookings:
+            product = products[booking.product_id]
+            sign = 1 if booking.movement_type == "IN" else -1
+            movements.append(
+                Movement(
+                    id=self.new_movement_id(),
+                    product_id=booking.product_id,
+                    product_name=product.name,
+                    quantity_change=sign * booking.quantity,
+                    movement_type=booking.movement_type,
+                    reason=booking.reason,
+                    timestamp=booked_at,
+                    performed_by=booking.performed_by,
+                )
+            )
+
+        changes = {pid: running[pid] - products[pid].quantity for pid in running}
+        changed = [products[product_id] for product_id in running]
+
+        received, taken = self._book_lots(bookings, movements)
+        # Manche Adapter liefern ihre gespeicherten Objekte selbst: Bestände erst im
+        # geschützten Block ändern, damit ein Fehler beim Speichern sie zurücksetzt
+        previous = [(product, product.quantity, product.updated_at) for product in changed]
+        with self._undo_on_error(received, taken, previous), self.repository.transaction():
+            for product in changed:
+                product.update_quantity(changes[product.id])
+            if received or taken:
+                changed_lots = {lot.id: lot for lot in received}
+                changed_lots.update((lot.id, lot) for lot, _ in taken)
+                self.repository.save_lots(changed_lots.values())
+            self.repository.save_products(changed)
+            self.repository.save_movements(movements)
+        for product in changed:
+            self._track_stock_change(product, changes[product.id])
+        return movements
+
+    def _book_lots(
+        self, bookings: List[Booking], movements: List[Movement]
+    ) -> Tuple[List[Lot], List[Tuple[Lot, int]]]:
+        """Chargen einer Sammelbuchung in Buchungsreihenfolge im LotLedger zu- und abbuchen"""
+        received: List[Lot] = []
+        taken: List[Tuple[Lot, int]] = []
+        with self._aggregates_lock:
+            for booking, movement in zip(bookings, movements):
+                if booking.expires_at is not None:
+                    lot = Lot(
+                        booking.lot_id or movement.id,
+                        booking.product_id,
+                        booking.quantity,
+                        booking.expires_at,
+                        movement.timestamp,
+                    )
+                    self.lots.add(lot)
+                    received.append(lot)
+                elif booking.movement_type == "OUT":
+                    taken.extend(self.lots.consume(booking.product_id, booking.quantity))
+        return received, taken
+
+    @contextmanager
+    def _undo_on_error(
+        self,
+        received: List[Lot],
+        taken: List[Tuple[Lot, int]],
+        products: Iterable[Tuple[Product, int, datetime]] = (),
+    ):
+        """
+        Schlägt das Speichern fehl, Entnahmen zurück- und neue Chargen wieder ausbuchen
+        sowie Produkte auf (Bestand, updated_at) von vorher zurücksetzen
+
+        Kennt der Adapter keinen Rollback, wurden Chargen womöglich schon
+        gespeichert: Entnommene werden mit ihrer alten Menge, neue mit Menge 0
+        (gelöscht) erneut gespeichert.
+        """
+        try:
+            yield
+        except BaseException:
+            for product, quantity, updated_at in products:
+                product.quantity = quantity
+                product.updated_at = updated_at
+            with self._aggregates_lock:
+                self.lots.restore(taken)
+                for lot in received:
+                    if lot.id in self.lots:
+                        self.lots.remove(lot.id)
+            if received or taken:
+                lots = {lot.id: lot for lot, _ in taken}
+                lots.update(
+                    (lot.id, Lot(lot.id, lot.product_id, 0, lot.expires_at, lot.received_at))
+                    for lot in received
+                )
+                try:
+                    self.repository.save_lots(lots.values())
+                except Exception:
+                    pass  # der ursprüngliche Fehler wird weitergereicht
+            raise
+
+    def _track_stock_change(self, product: Product, amount: int) -> None:
+        """Kennzahlen und Warehouse-Spiegel nach einer Bestandsänderung nachführen"""
+        with self._aggregates_lock:
+            self.aggregates.apply_quantity_change(product, amount)
+            tracked = self.warehouse.get_product(product.id)
+            if tracked is not None:
+                if tracked is not product:
+                    # Adapter wie SQLite liefern Kopien - Spiegel angleichen
+                    tracked.quantity = product.quantity
+                self.warehouse.aggregates.apply_quantity_change(tracked, amount)
+
+    def _lock_products(self, product_ids: Iterable[str]) -> ContextManager:
+        """Produkt-Locks halten (nur im thread-sicheren Modus)"""
+        if self._locks is None:
+            return nullcontext()
+        return self._locks.hold(product_ids)
+
+    def _lock_all_products(self) -> ContextManager:
+        """Alle Produkt-Locks halten (nur im thread-sicheren Modus)"""
+        if self._locks is None:
+            return nullcontext()
+        return self._locks.hold_all()
 
     def get_product(self, product_id: str) -> Optional[Product]:
         """Produkt abrufen"""
@@ -98,7 +686,174 @@ class WarehouseService:
         """Alle Lagerbewegungen abrufen"""
         return self.repository.load_movements()
 
+    def iter_products(self) -> Iterator[Product]:
+        """Alle Produkte nacheinander, ohne Kopie des Bestands (siehe RepositoryPort)"""
+        return self.repository.iter_products()
+
+    def iter_movements(self) -> Iterator[Movement]:
+        """Alle Lagerbewegungen nacheinander, ohne Kopie der Liste (siehe RepositoryPort)"""
+        return self.repository.iter_movements()
+
+    def count_products(self) -> int:
+        """Anzahl Produkte"""
+        return self.repository.count_products()
+
+    def count_movements(self) -> int:
+        """Anzahl Lagerbewegungen"""
+        return self.repository.count_movements()
+
+    def query_movements(
+        self,
+        product_id: Optional[str] = None,
+        movement_type: Optional[str] = None,
+        performed_by: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> MovementPage:
+        """Lagerbewegungen gefiltert und seitenweise abrufen (siehe RepositoryPort)"""
+        return self.repository.query_movements(
+            product_id=product_id,
+            movement_type=movement_type,
+            performed_by=performed_by,
+            start=start,
+            end=end,
+            limit=limit,
+            cursor=cursor,
+        )
+
+    def search_products(self, query: str, limit: int = 20) -> List[Product]:
+        """
+        Produkte über den Suchindex finden (Name, SKU, ID, Kategorie, Beschreibung)
+
+        Args:
+            query: Suchtext; der letzte Begriff darf unvollständig sein
+            limit: maximale Anzahl Treffer
+
+        Returns:
+            Gefundene Produkte, relevanteste zuerst
+
+        Raises:
+            ValueError: wenn der Service ohne Suchindex erstellt wurde
+        """
+        if self.search_index is None:
+            raise ValueError("Kein Suchindex konfiguriert")
+        with self._aggregates_lock:
+            hits = self.search_index.search(query, limit)
+        products = self.repository.load_products(hit.product_id for hit in hits)
+        return [products[hit.product_id] for hit in hits if hit.product_id in products]
+
+    def get_lots(self, product_id: str) -> List[Lot]:
+        """Chargen eines Produkts in Entnahmereihenfolge (FEFO)"""
+        with self._aggregates_lock:
+            return self.lots.lots(product_id)
+
+    def get_expiring_lots(self, days: int = 3, today: Optional[date] = None) -> List[Lot]:
+        """
+        Chargen, die in den nächsten `days` Tagen ablaufen (einschließlich bereits abgelaufener)
+
+        Args:
+            days: Zeitraum in Tagen ab `today`
+            today: Stichtag (Standard: heute)
+
+        Returns:
+            Chargen nach Ablaufdatum sortiert
+        """
+        until = (today or date.today()) + timedelta(days=days)
+        with self._aggregates_lock:
+            return self.lots.expiring(until)
+
     def get_total_inventory_value(self) -> float:
-        """Gesamtwert des Lagerbestands berechnen"""
-        products = self.repository.load_all_products()
-        return sum(p.get_total_value() for p in products.values())
+        """Gesamtwert des Lagerbestands (inkrementell gepflegt, O(1))"""
+        return self.aggregates.total_value
+
+    def get_category_values(self) -> Dict[str, float]:
+        """Lagerwert pro Kategorie (inkrementell gepflegt)"""
+        return dict(self.aggregates.category_values)
+
+    def stock_projection(self) -> StockProjection:
+        """
+        Bestandsprojektion aus dem Bewegungsstrom
+
+        Beim ersten Aufruf aufgebaut, danach inkrementell nachgelesen. Neue
+        Produkte meldet der Service selbst mit ihrem Anfangsbestand.
+        """
+        with self._aggregates_lock:
+            return self._refreshed_projection()
+
+    def _refreshed_projection(self) -> StockProjection:
+        """Projektion anlegen bzw. nachlesen (Aufrufer hält das Kennzahlen-Lock)"""
+        if self._projection is None:
+            self._projection = StockProjection(self.repository)
+        self._projection.refresh()
+        return self._projection
+
+    def get_stock_at(self, product_id: str, when: datetime) -> int:
+        """Bestand eines Produkts zu einem Zeitpunkt, rekonstruiert aus den Bewegungen"""
+        with self._aggregates_lock:
+            return self._refreshed_projection().quantity_at(product_id, when)
+
+    def check_stock_against_movements(self) -> Dict[str, Tuple[int, int]]:
+        """
+        Gespeicherte Bestände gegen Anfangsbestand plus Bewegungen prüfen
+
+        Findet Bestandsänderungen ohne Bewegung seit dem Aufbau der Projektion
+        bzw. seit dem Anlegen des Produkts in diesem Service. Ältere
+        Abweichungen (z.B. vor einem Neustart) sind nicht erkennbar, da der
+        Anfangsbestand nicht gespeichert, sondern aus dem Bestand abgeleitet wird.
+
+        Returns:
+            {Produkt-ID: (Product.quantity, projizierter Bestand)}; leer wenn konsistent
+        """
+        with self._aggregates_lock:
+            return self._refreshed_projection().discrepancies()
+
+    def replenishment(self) -> ReplenishmentEngine:
+        """
+        Dispositionsmodul (Nachfrageprognose, Meldebestände)
+
+        Beim ersten Aufruf angelegt; Parameter pro Artikel über set_policy().
+        """
+        with self._aggregates_lock:
+            if self._replenishment is None:
+                self._replenishment = ReplenishmentEngine(self.repository)
+            return self._replenishment
+
+    def propose_purchases(
+        self,
+        now: Optional[datetime] = None,
+        on_order: Optional[Mapping[str, int]] = None,
+    ) -> List[PurchaseProposal]:
+        """
+        Bestellvorschläge für alle Artikel, deren Bestand den Meldebestand erreicht hat
+
+        Neue Bewegungen werden inkrementell nachgelesen (O(1) pro Bewegung).
+
+        Args:
+            now: Stichtag (Standard: jetzt)
+            on_order: offene Bestellmengen pro Produkt-ID
+
+        Returns:
+            Bestellvorschläge, dringendste (geringste Reichweite) zuerst
+        """
+        engine = self.replenishment()
+        with self._aggregates_lock:
+            return engine.propose(now, on_order)
+
+    def check_inventory_consistency(self, repair: bool = False) -> Dict[str, tuple]:
+        """
+        Gepflegte Kennzahlen gegen eine Neuberechnung aus dem Repository prüfen
+
+        Args:
+            repair: bei Abweichungen die Kennzahlen neu aufbauen
+
+        Returns:
+            Abweichungen als {Kennzahl: (gepflegt, neu berechnet)}; leer wenn konsistent
+        """
+        # Alle Produkt-Locks: keine Buchung steht zwischen Bestand und Kennzahlen
+        with self._lock_all_products(), self._aggregates_lock:
+            drift = self.aggregates.check_consistency(self.repository.iter_products())
+            if drift and repair:
+                self.aggregates = InventoryAggregates.from_products(self.repository.iter_products())
+        return drift
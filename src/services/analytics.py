@@ -0,0 +1,279 @@
+"""Analytics - vektorisierte Lagerkennzahlen auf NumPy-Snapshots
+
+Benötigt das optionale Paket numpy (pip install -e ".[analytics]").
+"""
+
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from ..domain.product import Product
+from ..domain.warehouse import Movement
+from ..ports import RepositoryPort
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _to_micros(value: datetime) -> int:
+    return (value - _EPOCH) // _MICROSECOND
+
+
+class InventoryAnalytics:
+    """
+    Analyse-Engine über einen Snapshot von Produkten und Bewegungen.
+
+    Produkte liegen als Spalten-Arrays vor (Index = stabiler Produktcode),
+    Bewegungen als drei parallele Arrays (Produktcode, Mengenänderung,
+    Zeitstempel in Mikrosekunden). Alle Kennzahlen werden vektorisiert
+    berechnet statt mit einer Python-Schleife pro Produkt.
+
+    refresh() liest inkrementell über den RepositoryPort nach: nur neue
+    Bewegungen (query_movements ab dem zuletzt gesehenen Zeitstempel) und nur
+    die davon betroffenen Produkte. refresh(full=True) liest zusätzlich den
+    ganzen Katalog neu (z.B. nach Preisänderungen oder neuen Produkten ohne
+    Bewegung). Bewegungen werden in Zeitreihenfolge erwartet, wie sie der
+    Service mit fortlaufenden Zeitstempeln erzeugt.
+    """
+
+    def __init__(self, repository: RepositoryPort, page_size: int = 100_000):
+        """
+        Args:
+            repository: Datenquelle
+            page_size: Bewegungen pro query_movements-Seite beim Nachlesen
+        """
+        self.repository = repository
+        self.page_size = page_size
+
+        self.product_ids: List[str] = []
+        self._codes: Dict[str, int] = {}
+        self.categories: List[str] = []
+        self._category_lookup: Dict[str, int] = {}
+        self.prices = np.zeros(0, dtype=np.float64)
+        self.quantities = np.zeros(0, dtype=np.int64)
+        self.category_codes = np.zeros(0, dtype=np.int32)
+        self.alive = np.zeros(0, dtype=bool)
+
+        self._movement_chunks: List[Tuple[np.ndarray, np.ndarray, np.ndarray]] = []
+        self._movements: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+        self._last_timestamp: Optional[datetime] = None
+        self._ids_at_last_timestamp: Set[str] = set()
+        self._loaded = False
+
+    # ------------------------------------------------------------------
+    # Snapshot
+    # ------------------------------------------------------------------
+
+    def refresh(self, full: bool = False) -> None:
+        """
+        Snapshot aktualisieren
+
+        Args:
+            full: zusätzlich alle Produkte neu lesen (beim ersten Aufruf immer)
+        """
+        reload_all = full or not self._loaded
+        touched = self._load_new_movements()
+        if reload_all:
+            self._load_all_products()
+            self._loaded = True
+        elif touched:
+            products = self.repository.load_products(touched)
+            self._update_products(products.values())
+            # Nicht mehr vorhandene Produkte als gelöscht markieren
+            for product_id in touched.difference(products):
+                self.alive[self._codes[product_id]] = False
+
+    def _code(self, product_id: str) -> int:
+        code = self._codes.get(product_id)
+        if code is None:
+            code = len(self.product_ids)
+            self._codes[product_id] = code
+            self.product_ids.append(product_id)
+        return code
+
+    def _category_code(self, category: str) -> int:
+        code = self._category_lookup.get(category)
+        if code is None:
+            code = len(self.categories)
+            self._category_lookup[category] = code
+            self.categories.append(category)
+        return code
+
+    def _grow(self) -> None:
+        """Produkt-Arrays auf die Anzahl bekannter Codes vergrößern"""
+        missing = len(self.product_ids) - len(self.prices)
+        if missing <= 0:
+            return
+        self.prices = np.concatenate([self.prices, np.zeros(missing, dtype=np.float64)])
+        self.quantities = np.concatenate([self.quantities, np.zeros(missing, dtype=np.int64)])
+        self.category_codes = np.concatenate(
+            [self.category_codes, np.zeros(missing, dtype=np.int32)]
+        )
+        self.alive = np.concatenate([self.alive, np.zeros(missing, dtype=bool)])
+
+    def _load_all_products(self) -> None:
+        self.alive[:] = False
+        self._update_products(self.repository.iter_products())
+
+    def _update_products(self, products: Iterable[Product]) -> None:
+        products = list(products)
+        count = len(products)
+        index = np.fromiter((self._code(p.id) for p in products), np.int64, count)
+        self._grow()
+        self.prices[index] = np.fromiter((p.price for p in products), np.float64, count)
+        self.quantities[index] = np.fromiter((p.quantity for p in products), np.int64, count)
+        self.category_codes[index] = np.fromiter(
+            (self._category_code(p.category) for p in products), np.int32, count
+        )
+        self.alive[index] = True
+
+    def _load_new_movements(self) -> Set[str]:
+        """Neue Bewegungen seit dem letzten Refresh anhängen; liefert betroffene Produkt-IDs"""
+        touched: Set[str] = set()
+        cursor = None
+        while True:
+            page = self.repository.query_movements(
+                start=self._last_timestamp, limit=self.page_size, cursor=cursor
+            )
+            fresh = [m for m in page.movements if not self._already_seen(m)]
+            if fresh:
+                self._append_movements(fresh)
+                touched.update(m.product_id for m in fresh)
+            if page.next_cursor is None:
+                return touched
+            cursor = page.next_cursor
+
+    def _already_seen(self, movement: Movement) -> bool:
+        return (
+            movement.timestamp == self._last_timestamp
+            and movement.id in self._ids_at_last_timestamp
+        )
+
+    def _append_movements(self, movements: List[Movement]) -> None:
+        count = len(movements)
+        codes = np.fromiter((self._code(m.product_id) for m in movements), np.int64, count)
+        changes = np.fromiter((m.quantity_change for m in movements), np.int64, count)
+        times = np.fromiter((_to_micros(m.timestamp) for m in movements), np.int64, count)
+        self._movement_chunks.append((codes, changes, times))
+        self._movements = None
+
+        last = movements[-1].timestamp
+        if last != self._last_timestamp:
+            self._last_timestamp = last
+            self._ids_at_last_timestamp = set()
+        self._ids_at_last_timestamp.update(m.id for m in movements if m.timestamp == last)
+
+    def _movement_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Alle Bewegungen als (Codes, Änderungen, Zeitstempel), zeitlich sortiert"""
+        if self._movements is None:
+            if self._movement_chunks:
+                codes, changes, times = (
+                    np.concatenate(part) for part in zip(*self._movement_chunks)
+                )
+                self._movement_chunks = [(codes, changes, times)]
+            else:
+                codes = changes = times = np.zeros(0, dtype=np.int64)
+            self._movements = (codes, changes, times)
+        return self._movements
+
+    def _window_flows(self, days: int, now: Optional[datetime]) -> Tuple[np.ndarray, np.ndarray]:
+        """Abgänge und Zugänge pro Produktcode im Zeitfenster der letzten `days` Tage"""
+        codes, changes, times = self._movement_arrays()
+        cutoff = _to_micros((now or datetime.now()) - timedelta(days=days))
+        start = int(np.searchsorted(times, cutoff, side="left"))
+        codes, changes = codes[start:], changes[start:]
+        size = len(self.product_ids)
+        outgoing = changes < 0
+        outflow = np.bincount(codes[outgoing], weights=-changes[outgoing], minlength=size)
+        inflow = np.bincount(codes[~outgoing], weights=changes[~outgoing], minlength=size)
+        return outflow[:size], inflow[:size]
+
+    # ------------------------------------------------------------------
+    # Kennzahlen
+    # ------------------------------------------------------------------
+
+    def stock_values(self) -> np.ndarray:
+        """Lagerwert pro Produktcode (gelöschte Produkte: 0)"""
+        return np.where(self.alive, self.prices * self.quantities, 0.0)
+
+    def category_values(self) -> Dict[str, float]:
+        """Lagerwert pro Kategorie"""
+        size = len(self.categories)
+        totals = np.bincount(self.category_codes, weights=self.stock_values(), minlength=size)
+        present = np.bincount(self.category_codes[self.alive], minlength=size)
+        return {
+            category: float(totals[code])
+            for code, category in enumerate(self.categories)
+            if present[code]
+        }
+
+    def abc_classification(self, a_share: float = 0.8, b_share: float = 0.95) -> Dict[str, str]:
+        """
+        ABC-Analyse nach Lagerwert
+
+        Produkte werden absteigend nach Wert sortiert; A umfasst die Produkte,
+        die zusammen die ersten `a_share` des Gesamtwerts ausmachen, B die bis
+        `b_share`, der Rest ist C.
+
+        Returns:
+            {Produkt-ID: "A" | "B" | "C"} für alle vorhandenen Produkte
+        """
+        values = self.stock_values()
+        total = values.sum()
+        order = np.argsort(-values, kind="stable")
+        if total > 0:
+            cumulative_before = (np.cumsum(values[order]) - values[order]) / total
+        else:
+            cumulative_before = np.ones(len(order))
+        classes = np.where(
+            cumulative_before < a_share, "A", np.where(cumulative_before < b_share, "B", "C")
+        )
+        alive = self.alive[order]
+        ids = self.product_ids
+        return {ids[code]: cls for code, cls in zip(order[alive].tolist(), classes[alive].tolist())}
+
+    def turnover_rates(self, days: int = 30, now: Optional[datetime] = None) -> Dict[str, float]:
+        """
+        Lagerumschlag im Zeitfenster: Abgang / durchschnittlicher Bestand
+
+        Der Durchschnittsbestand wird aus aktuellem Bestand und dem Bestand zu
+        Fensterbeginn (aktueller Bestand minus Nettoveränderung) gemittelt.
+        """
+        outflow, inflow = self._window_flows(days, now)
+        opening = self.quantities - (inflow - outflow)
+        average = (opening + self.quantities) / 2
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rates = np.where(average > 0, outflow / average, 0.0)
+        return self._per_product(rates)
+
+    def days_of_cover(self, days: int = 30, now: Optional[datetime] = None) -> Dict[str, float]:
+        """
+        Reichweite in Tagen: Bestand / durchschnittlicher Tagesabgang im Fenster
+
+        Produkte ohne Abgang im Fenster haben unendliche Reichweite (inf).
+        """
+        outflow, _ = self._window_flows(days, now)
+        daily = outflow / days
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cover = np.where(daily > 0, self.quantities / daily, np.inf)
+        return self._per_product(cover)
+
+    def top_movers(
+        self, n: int = 10, days: int = 30, now: Optional[datetime] = None
+    ) -> List[Tuple[str, int]]:
+        """Die n Produkte mit dem größten Abgang im Zeitfenster, absteigend"""
+        outflow, _ = self._window_flows(days, now)
+        outflow = np.where(self.alive, outflow, 0)
+        n = min(n, len(outflow))
+        if n <= 0:
+            return []
+        candidates = np.argpartition(-outflow, n - 1)[:n]
+        ranked = candidates[np.argsort(-outflow[candidates], kind="stable")]
+        ids = self.product_ids
+        return [(ids[code], int(outflow[code])) for code in ranked if outflow[code] > 0]
+
+    def _per_product(self, values: np.ndarray) -> Dict[str, float]:
+        ids = self.product_ids
+        codes = np.flatnonzero(self.alive)
+        return dict(zip((ids[code] for code in codes.tolist()), values[codes].tolist()))
@@ -0,0 +1,146 @@
+"""Async Service - awaitable Fassade des WarehouseService für asyncio-Anwendungen"""
+
+from datetime import date, datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from ..adapters.async_repository import ThreadPoolRepositoryAdapter
+from ..domain.product import Product
+from ..domain.warehouse import Booking, Movement
+from ..ports import MetricsPort, MovementPage, RepositoryPort
+from . import WarehouseService
+
+
+class AsyncWarehouseService:
+    """
+    Lagerverwaltung für asyncio-Code (z.B. Kassen-Gateway).
+
+    Buchungen laufen über einen thread-sicheren WarehouseService auf dem
+    begrenzten Thread-Pool eines ThreadPoolRepositoryAdapter - die
+    Geschäftslogik existiert damit nur einmal. Lesezugriffe gehen direkt über
+    den AsyncRepositoryPort; gleichzeitige Abfragen desselben Produkts teilen
+    sich einen Ladevorgang.
+
+    Verwendung:
+        async with AsyncWarehouseService(SQLiteRepository("lager.db")) as service:
+            await service.add_to_stock("P001", 5)
+    """
+
+    def __init__(
+        self,
+        repository: RepositoryPort,
+        max_workers: int = 4,
+        id_generator: Optional[Callable[[], str]] = None,
+        metrics: Optional[MetricsPort] = None,
+    ):
+        """
+        Args:
+            repository: Synchrones Repository (muss Aufrufe aus mehreren Threads vertragen)
+            max_workers: Größe des Thread-Pools für Repository-Zugriffe
+            id_generator: Erzeugt Bewegungs-IDs (siehe WarehouseService)
+            metrics: Metriken des darunterliegenden WarehouseService (siehe dort)
+        """
+        self.repository = ThreadPoolRepositoryAdapter(repository, max_workers)
+        self.service = WarehouseService(
+            repository, id_generator=id_generator, thread_safe=True, metrics=metrics
+        )
+
+    async def __aenter__(self) -> "AsyncWarehouseService":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Thread-Pool beenden"""
+        self.repository.close()
+
+    async def create_product(
+        self,
+        product_id: str,
+        name: str,
+        description: str,
+        price: float,
+        category: str = "",
+        initial_quantity: int = 0,
+    ) -> Product:
+        """Neues Produkt erstellen und speichern"""
+        return await self.repository.run(
+            self.service.create_product,
+            product_id,
+            name,
+            description,
+            price,
+            category=category,
+            initial_quantity=initial_quantity,
+        )
+
+    async def delete_product(self, product_id: str) -> None:
+        """Produkt löschen (unbekannte IDs werden ignoriert)"""
+        await self.repository.run(self.service.delete_product, product_id)
+
+    async def add_to_stock(
+        self,
+        product_id: str,
+        quantity: int,
+        reason: str = "",
+        user: str = "system",
+        expires_at: Optional[date] = None,
+        lot_id: Optional[str] = None,
+    ) -> None:
+        """Bestand erhöhen, optional als Charge (siehe WarehouseService.add_to_stock)"""
+        await self.repository.run(
+            self.service.add_to_stock, product_id, quantity, reason, user, expires_at, lot_id
+        )
+
+    async def remove_from_stock(
+        self, product_id: str, quantity: int, reason: str = "", user: str = "system"
+    ) -> List[Tuple[str, int]]:
+        """Bestand verringern; liefert die FEFO-Entnahmeliste"""
+        return await self.repository.run(
+            self.service.remove_from_stock, product_id, quantity, reason, user
+        )
+
+    async def book_movements(self, batch: Iterable[Booking]) -> List[Movement]:
+        """Sammelbuchung ausführen (siehe WarehouseService.book_movements)"""
+        return await self.repository.run(self.service.book_movements, list(batch))
+
+    async def get_product(self, product_id: str) -> Optional[Product]:
+        """Produkt abrufen"""
+        return await self.repository.load_product(product_id)
+
+    async def get_all_products(self) -> Dict[str, Product]:
+        """Alle Produkte abrufen"""
+        return await self.repository.load_all_products()
+
+    async def get_movements(self) -> List[Movement]:
+        """Alle Lagerbewegungen abrufen"""
+        return await self.repository.load_movements()
+
+    async def query_movements(
+        self,
+        product_id: Optional[str] = None,
+        movement_type: Optional[str] = None,
+        performed_by: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> MovementPage:
+        """Lagerbewegungen gefiltert und seitenweise abrufen (siehe RepositoryPort)"""
+        return await self.repository.query_movements(
+            product_id=product_id,
+            movement_type=movement_type,
+            performed_by=performed_by,
+            start=start,
+            end=end,
+            limit=limit,
+            cursor=cursor,
+        )
+
+    def get_total_inventory_value(self) -> float:
+        """Gesamtwert des Lagerbestands (im Speicher gepflegt, blockiert nicht)"""
+        return self.service.get_total_inventory_value()
+
+    def get_category_values(self) -> Dict[str, float]:
+        """Lagerwert pro Kategorie (im Speicher gepflegt, blockiert nicht)"""
+        return self.service.get_category_values()
@@ -0,0 +1,303 @@
+"""Bulk - Katalogimport und -export über CSV, Parquet und Arrow IPC in Blöcken"""
+
+import math
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import islice
+from operator import attrgetter
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from ..adapters.tabular import Chunk, Schema, TableWriter, read_chunks
+from ..domain.product import Product
+from . import WarehouseService
+
+PRODUCT_SCHEMA: Schema = (
+    ("id", "string"),
+    ("name", "string"),
+    ("description", "string"),
+    ("price", "float"),
+    ("quantity", "int"),
+    ("sku", "string"),
+    ("category", "string"),
+    ("created_at", "timestamp"),
+    ("updated_at", "timestamp"),
+    ("notes", "string"),
+)
+MOVEMENT_SCHEMA: Schema = (
+    ("id", "string"),
+    ("product_id", "string"),
+    ("product_name", "string"),
+    ("quantity_change", "int"),
+    ("movement_type", "string"),
+    ("reason", "string"),
+    ("timestamp", "timestamp"),
+    ("performed_by", "string"),
+)
+REQUIRED_PRODUCT_COLUMNS = ("id", "name", "price")
+
+
+@dataclass
+class RowError:
+    """Abgelehnte Importzeile"""
+
+    row: int  # Datenzeile, 1 = erste Zeile nach der Kopfzeile
+    product_id: str
+    message: str
+
+
+@dataclass
+class ImportReport:
+    """Ergebnis eines Imports (errors: höchstens max_errors Einträge, rejected: alle)"""
+
+    imported: int = 0
+    rejected: int = 0
+    errors: List[RowError] = field(default_factory=list)
+    seconds: float = 0.0
+
+
+def _text(value: Any) -> str:
+    return "" if value is None else str(value).strip()
+
+
+def _texts(values: List[Any]) -> List[str]:
+    """Textspalte bereinigen; reine Stringspalten (CSV) ohne Python-Aufruf pro Wert"""
+    try:
+        return list(map(str.strip, values))
+    except TypeError:
+        return [_text(value) for value in values]
+
+
+def _to_float(value: Any) -> float:
+    number = float(value)
+    if not math.isfinite(number):
+        raise ValueError(value)
+    return number
+
+
+def _to_int(value: Any) -> int:
+    if value is None or value == "":
+        return 0
+    if isinstance(value, float) and not value.is_integer():
+        raise ValueError(value)
+    return int(value)
+
+
+def _to_timestamp(value: Any) -> Optional[datetime]:
+    if value is None or value == "":
+        return None
+    if not isinstance(value, datetime):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is not None:
+        # Gespeichert wird naive Ortszeit (wie datetime.now()) - sonst scheitern Vergleiche
+        value = value.astimezone().replace(tzinfo=None)
+    return value
+
+
+def _convert(
+    values: List[Any], convert: Callable[[Any], Any], name: str, errors: Dict[int, str]
+) -> List[Any]:
+    """
+    Spalte umwandeln; fehlerhafte Zeilen landen in errors (erster Fehler pro Zeile zählt)
+
+    Erst ein Durchlauf ohne Einzelbehandlung über die ganze Spalte, nur wenn
+    der scheitert, Zeile für Zeile.
+    """
+    try:
+        return list(map(convert, values))
+    except (TypeError, ValueError):
+        pass
+    converted: List[Any] = []
+    for index, value in enumerate(values):
+        try:
+            converted.append(convert(value))
+        except (TypeError, ValueError):
+            converted.append(None)
+            errors.setdefault(index, f"{name}: ungültiger Wert {value!r}")
+    return converted
+
+
+def _validate_products(
+    chunk: Chunk, now: datetime
+) -> Tuple[List[Product], Dict[int, str], List[str]]:
+    """
+    Block spaltenweise prüfen und gültige Zeilen in Produkte umwandeln
+
+    Returns:
+        (Produkte, {Zeilenindex im Block: Fehlermeldung}, IDs pro Zeile)
+    """
+    length = len(chunk["id"])
+    errors: Dict[int, str] = {}
+    blank = [""] * length
+    ids = _texts(chunk["id"])
+    names = _texts(chunk["name"])
+    for index in (i for i, (pid, name) in enumerate(zip(ids, names)) if not pid or not name):
+        errors[index] = "id: fehlt" if not ids[index] else "name: fehlt"
+    prices = _convert(chunk["price"], _to_float, "price", errors)
+    quantities = _convert(chunk.get("quantity", blank), _to_int, "quantity", errors)
+    created = _convert(chunk.get("created_at", blank), _to_timestamp, "created_at", errors)
+    updated = _convert(chunk.get("updated_at", blank), _to_timestamp, "updated_at", errors)
+    for index, (price, quantity) in enumerate(zip(prices, quantities)):
+        if price is not None and price < 0:
+            errors.setdefault(index, "price: darf nicht negativ sein")
+        elif quantity is not None and quantity < 0:
+            errors.setdefault(index, "quantity: darf nicht negativ sein")
+
+    # Nur gültige Zeilen belegen eine ID - eine abgelehnte sperrt keine spätere Korrektur
+    seen: Dict[str, int] = {}
+    for index, product_id in enumerate(ids):
+        if index in errors:
+            continue
+        if product_id in seen:
+            errors[index] = f"id: doppelt (Datenzeile {seen[product_id] + 1} im Block)"
+        else:
+            seen[product_id] = index
+
+    descriptions = _texts(chunk.get("description", blank))
+    skus = _texts(chunk.get("sku", blank))
+    categories = _texts(chunk.get("category", blank))
+    notes = _texts(chunk.get("notes", blank))
+    products = [
+        Product(
+            id=ids[index],
+            name=names[index],
+            description=descriptions[index],
+            price=prices[index],
+            quantity=quantities[index],
+            sku=skus[index],
+            category=categories[index],
+            created_at=created[index] or now,
+            updated_at=updated[index] or created[index] or now,
+            notes=notes[index] or None,
+        )
+        for index in range(length)
+        if index not in errors
+    ]
+    return products, errors, ids
+
+
+def import_products(
+    service: WarehouseService,
+    source: Union[str, Path],
+    format: Optional[str] = None,
+    chunk_size: int = 50_000,
+    max_errors: int = 1_000,
+    on_chunk: Optional[Callable[[ImportReport], None]] = None,
+) -> ImportReport:
+    """
+    Produkte aus einer Tabellendatei blockweise importieren
+
+    Jeder Block wird spaltenweise geprüft; ungültige Zeilen (fehlende Pflichtfelder,
+    kein Zahlwert, negativer Preis/Bestand, doppelte oder schon vorhandene ID)
+    werden gemeldet, der Rest über WarehouseService.create_products gespeichert.
+    Zeitstempel mit Zeitzone werden in naive Ortszeit umgerechnet.
+    Der Speicherbedarf hängt von chunk_size ab, nicht von der Dateigröße.
+
+    Args:
+        service: Ziel des Imports
+        source: CSV-, Parquet- oder Arrow-Datei mit den Spalten aus PRODUCT_SCHEMA
+            (Pflicht: id, name, price; quantity ist der Anfangsbestand)
+        format: "csv", "parquet" oder "arrow" (Standard: aus der Dateiendung)
+        chunk_size: Zeilen pro Block
+        max_errors: höchstens so viele RowErrors im Bericht aufbewahren
+        on_chunk: wird nach jedem Block mit dem Zwischenstand aufgerufen
+
+    Returns:
+        ImportReport mit Anzahl importierter und abgelehnter Zeilen
+
+    Raises:
+        ValueError: bei unbekanntem Format oder fehlender Pflichtspalte
+    """
+    started = time.perf_counter()
+    report = ImportReport()
+    first_row = 1
+
+    def reject(index: int, product_id: str, message: str) -> None:
+        report.rejected += 1
+        if len(report.errors) < max_errors:
+            report.errors.append(RowError(first_row + index, product_id, message))
+
+    for chunk in read_chunks(source, chunk_size, format):
+        missing = [name for name in REQUIRED_PRODUCT_COLUMNS if name not in chunk]
+        if missing:
+            raise ValueError(f"Pflichtspalte fehlt in {source}: {', '.join(missing)}")
+        products, errors, ids = _validate_products(chunk, datetime.now())
+
+        # Bereits vorhandene Produkte (auch aus früheren Blöcken) einzeln ablehnen
+        existing = service.repository.load_products(product.id for product in products)
+        if existing:
+            products = [product for product in products if product.id not in existing]
+            for index, product_id in enumerate(ids):
+                if index not in errors and product_id in existing:
+                    errors[index] = "id: Produkt existiert bereits"
+        try:
+            service.create_products(products)
+        except ValueError as error:
+            # Nur bei gleichzeitigem Anlegen derselben IDs: der Block wird nicht gespeichert
+            valid = set(range(len(ids))) - set(errors)
+            errors.update({index: str(error) for index in valid})
+            products = []
+        report.imported += len(products)
+        for index in sorted(errors):
+            reject(index, ids[index], errors[index])
+        first_row += len(ids)
+        if on_chunk is not None:
+            on_chunk(report)
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+def _export(
+    rows: Iterable[Any],
+    target: Union[str, Path],
+    schema: Schema,
+    format: Optional[str],
+    chunk_size: int,
+) -> int:
+    iterator = iter(rows)
+    names = [name for name, _ in schema]
+    fields = attrgetter(*names)
+    with TableWriter(target, schema, format) as writer:
+        while True:
+            block = list(islice(iterator, chunk_size))
+            if not block:
+                break
+            writer.write(dict(zip(names, map(list, zip(*map(fields, block))))))
+        return writer.rows
+
+
+def export_products(
+    service: WarehouseService,
+    target: Union[str, Path],
+    format: Optional[str] = None,
+    chunk_size: int = 50_000,
+) -> int:
+    """
+    Alle Produkte blockweise in eine Tabellendatei schreiben (Spalten: PRODUCT_SCHEMA)
+
+    Returns:
+        Anzahl geschriebener Produkte
+
+    Raises:
+        ValueError: bei unbekanntem Format oder fehlendem pyarrow
+    """
+    return _export(service.iter_products(), target, PRODUCT_SCHEMA, format, chunk_size)
+
+
+def export_movements(
+    service: WarehouseService,
+    target: Union[str, Path],
+    format: Optional[str] = None,
+    chunk_size: int = 50_000,
+) -> int:
+    """
+    Alle Lagerbewegungen blockweise in eine Tabellendatei schreiben (Spalten: MOVEMENT_SCHEMA)
+
+    Returns:
+        Anzahl geschriebener Bewegungen
+
+    Raises:
+        ValueError: bei unbekanntem Format oder fehlendem pyarrow
+    """
+    return _export(service.iter_movements(), target, MOVEMENT_SCHEMA, format, chunk_size)
@@ -0,0 +1,358 @@
+"""Ledger - Buchungen aus mehreren Worker-Prozessen über einen einzigen schreibenden Prozess"""
+
+import multiprocessing
+from dataclasses import dataclass
+from multiprocessing.connection import Connection, wait
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from ..adapters.shared_snapshot import ORDERED_STORES, StockSnapshot
+from ..domain.warehouse import Booking, Movement
+from ..ports import RepositoryPort
+from . import WarehouseService
+
+# Über die Pipe eines Clients: Anfrage (Anfrage-Nummer, Positionen),
+# Antwort (Anfrage-Nummer, *Ergebnis)
+# Ergebnis einer Anfrage: (Bewegungen, None) oder (None, (Fehlertyp, Meldung))
+_Result = Tuple[Optional[List[Movement]], Optional[Tuple[str, str]]]
+
+
+@dataclass
+class LedgerStats:
+    """Zähler eines Ledger-Laufs"""
+
+    requests: int = 0
+    rejected: int = 0
+    batches: int = 0
+
+    @property
+    def mean_batch_size(self) -> float:
+        """Anfragen pro Micro-Batch"""
+        return self.requests / self.batches if self.batches else 0.0
+
+
+def _apply_batch(service: WarehouseService, batch: List[List[Booking]]) -> List[_Result]:
+    """
+    Micro-Batch als eine Sammelbuchung (eine Transaktion) ausführen
+
+    Scheitert sie, wird jede Anfrage einzeln gebucht - jede bleibt für sich
+    alles oder nichts, und abgelehnte Anfragen bekommen ihre eigene Meldung.
+    Da book_movements Positionen in Reihenfolge prüft, ist das Ergebnis in
+    beiden Fällen dasselbe wie bei einzelnen Buchungen nacheinander.
+    """
+    try:
+        movements = service.book_movements([booking for bookings in batch for booking in bookings])
+    except Exception:
+        pass
+    else:
+        results: List[_Result] = []
+        start = 0
+        for bookings in batch:
+            results.append((movements[start : start + len(bookings)], None))
+            start += len(bookings)
+        return results
+
+    results = []
+    for bookings in batch:
+        try:
+            results.append((service.book_movements(bookings), None))
+        except Exception as error:
+            results.append((None, (type(error).__name__, str(error))))
+    return results
+
+
+def _book_batch(
+    service: WarehouseService,
+    snapshot: StockSnapshot,
+    batch: List[Tuple[Connection, int, List[Booking]]],
+    stats: LedgerStats,
+) -> None:
+    """Micro-Batch buchen, Snapshot nachführen und jeden Client bestätigen"""
+    results = _apply_batch(service, [bookings for _, _, bookings in batch])
+    changes: Dict[str, int] = {}
+    for movements, _ in results:
+        for movement in movements or ():
+            changes[movement.product_id] = (
+                changes.get(movement.product_id, 0) + movement.quantity_change
+            )
+    # Erst veröffentlichen, dann bestätigen: wer die Antwort hat, sieht den Stand
+    snapshot.apply(changes)
+    for (connection, request_id, _), (movements, error) in zip(batch, results):
+        try:
+            connection.send((request_id, movements, error))
+        except OSError:
+            pass  # Worker abgestürzt; die Buchung bleibt gültig
+    stats.requests += len(batch)
+    stats.rejected += sum(1 for movements, _ in results if movements is None)
+    stats.batches += 1
+
+
+def _run_ledger(
+    repository_factory: Callable[[], RepositoryPort],
+    service_options: Dict[str, Any],
+    clients: List[Connection],
+    control: Connection,
+    max_batch: int,
+    snapshot_lock: Any,
+) -> None:
+    """Hauptschleife des Ledger-Prozesses"""
+    try:
+        repository = repository_factory()
+        service = WarehouseService(repository, **service_options)
+        snapshot = StockSnapshot.create(
+            {product.id: product.quantity for product in repository.iter_products()},
+            snapshot_lock,
+        )
+    except Exception as error:
+        control.send(RuntimeError(f"Ledger-Start fehlgeschlagen: {error}"))
+        return
+    control.send((snapshot.name, snapshot.product_ids))
+
+    stats = LedgerStats()
+    open_clients = list(clients)
+    try:
+        stopping = False
+        while not stopping:
+            ready = wait(open_clients + [control])
+            stopping = control in ready
+            # Alles, was schon wartet, kommt in den Batch - unter Last wächst er von selbst
+            batch: List[Tuple[Connection, int, List[Booking]]] = []
+            for connection in ready:
+                while connection is not control and len(batch) < max_batch and connection.poll():
+                    try:
+                        request_id, bookings = connection.recv()
+                    except EOFError:
+                        open_clients.remove(connection)  # Worker beendet
+                        break
+                    batch.append((connection, request_id, bookings))
+            if batch:
+                _book_batch(service, snapshot, batch, stats)
+        control.recv()
+    finally:
+        snapshot.close()
+        snapshot.unlink()
+        close = getattr(repository, "close", None)
+        if close is not None:
+            close()
+        control.send(stats)
+
+
+class LedgerClient:
+    """
+    Zugang eines Worker-Prozesses zum Ledger: Buchungen schicken, Bestände lesen.
+
+    Buchungen und Antworten gehen über eine eigene Pipe (Unix-Socket-Paar)
+    pro Client. Bestände liest der Client ohne Nachricht aus dem
+    Shared-Memory-Snapshot. Ein Client gehört genau einem Prozess bzw. Thread.
+    """
+
+    def __init__(
+        self,
+        index: int,
+        connection: Connection,
+        snapshot_name: str,
+        product_ids: List[str],
+        snapshot_lock: Any = None,
+    ):
+        self.index = index
+        self._connection = connection
+        self._snapshot_name = snapshot_name
+        self._product_ids = product_ids
+        self._snapshot_lock = snapshot_lock
+        self._snapshot: Optional[StockSnapshot] = None
+        self._next_request = 0
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Die Anbindung an den Snapshot gilt nur im eigenen Prozess
+        state = self.__dict__.copy()
+        state["_snapshot"] = None
+        return state
+
+    def book(self, bookings: Iterable[Booking], timeout: Optional[float] = None) -> List[Movement]:
+        """
+        Buchung (alles oder nichts) vom Ledger ausführen lassen und auf das Ergebnis warten
+
+        Kehrt erst zurück, wenn die Buchung gespeichert und im Snapshot
+        sichtbar ist.
+
+        Returns:
+            Die erzeugten Lagerbewegungen
+
+        Raises:
+            ValueError: wenn der Ledger die Buchung ablehnt (wie book_movements)
+            RuntimeError: bei anderen Fehlern im Ledger oder wenn er beendet ist
+            TimeoutError: wenn nach timeout Sekunden keine Antwort kam
+        """
+        self._next_request += 1
+        request_id = self._next_request
+        try:
+            self._connection.send((request_id, list(bookings)))
+            while True:
+                if not self._connection.poll(timeout):
+                    raise TimeoutError(f"Keine Antwort vom Ledger nach {timeout} s")
+                answered, movements, error = self._connection.recv()
+                if answered == request_id:
+                    break  # sonst Antwort auf eine frühere, abgelaufene Anfrage
+        except TimeoutError:
+            raise
+        except (EOFError, OSError):
+            raise RuntimeError("Ledger nicht erreichbar (Prozess beendet)") from None
+        if error is None:
+            return movements
+        kind, message = error
+        if kind == "ValueError":
+            raise ValueError(message)
+        raise RuntimeError(f"{kind}: {message}")
+
+    @property
+    def snapshot(self) -> StockSnapshot:
+        """Shared-Memory-Snapshot (beim ersten Zugriff im eigenen Prozess angebunden)"""
+        if self._snapshot is None:
+            self._snapshot = StockSnapshot.attach(
+                self._snapshot_name, self._product_ids, self._snapshot_lock
+            )
+        return self._snapshot
+
+    def stock(self, product_id: str) -> Optional[int]:
+        """Bestand laut Snapshot (None bei unbekanntem Produkt)"""
+        return self.snapshot.get(product_id)
+
+    def stocks(self, product_ids: Iterable[str]) -> Dict[str, int]:
+        """Bestände mehrerer Produkte aus demselben Snapshot-Stand"""
+        return self.snapshot.get_many(product_ids)
+
+    def close(self) -> None:
+        """Snapshot-Anbindung lösen"""
+        if self._snapshot is not None:
+            self._snapshot.close()
+            self._snapshot = None
+
+
+class BookingLedger:
+    """
+    Single-Writer-Betrieb für mehrere Worker-Prozesse.
+
+    Ein eigener Prozess besitzt Repository und WarehouseService allein und
+    bucht alle Anfragen der Worker in Micro-Batches: was in den Pipes der
+    Clients wartet, wird zu einer Sammelbuchung in einer Transaktion. Da nur
+    dieser Prozess schreibt, sind Bestände ohne prozessübergreifende Locks
+    linearisierbar.
+    Nach jedem Batch werden die geänderten Bestände in einen Shared-Memory-
+    Snapshot geschrieben, den die Worker ohne Rückfrage lesen.
+
+    Verwendung:
+        with BookingLedger(partial(SQLiteRepository, "lager.db"), clients=4) as ledger:
+            workers = [Process(target=kasse, args=(ledger.client(i),)) for i in range(4)]
+            ...
+    """
+
+    def __init__(
+        self,
+        repository_factory: Callable[[], RepositoryPort],
+        clients: int = 1,
+        max_batch: int = 256,
+        context: Optional[multiprocessing.context.BaseContext] = None,
+        **service_options: Any,
+    ):
+        """
+        Args:
+            repository_factory: Legt das Repository im Ledger-Prozess an; muss sich
+                für den Prozessstart picklen lassen (z.B. functools.partial)
+            clients: Anzahl der Clients (je eine Pipe, vorab angelegt)
+            max_batch: höchstens so viele Anfragen pro Micro-Batch
+            context: multiprocessing-Kontext (Standard: Startmethode der Plattform)
+            service_options: weitere Argumente für den WarehouseService im Ledger
+        """
+        if clients < 1 or max_batch < 1:
+            raise ValueError("clients und max_batch müssen mindestens 1 sein")
+        context = context or multiprocessing.get_context()
+        pipes = [context.Pipe() for _ in range(clients)]
+        self._clients = [client for _, client in pipes]
+        self._control, ledger_control = context.Pipe()
+        # Enden des Ledger-Prozesses; nach dem Start nur noch dort geöffnet
+        self._ledger_ends = [ledger for ledger, _ in pipes] + [ledger_control]
+        # Seqlock ohne Sperre nur auf x86/x86-64, sonst ein gemeinsames Lock
+        self._snapshot_lock = None if ORDERED_STORES else context.Lock()
+        self._process = context.Process(
+            target=_run_ledger,
+            args=(
+                repository_factory,
+                service_options,
+                self._ledger_ends[:-1],
+                ledger_control,
+                max_batch,
+                self._snapshot_lock,
+            ),
+            name="ledger",
+            daemon=True,
+        )
+        self._snapshot_info: Optional[Tuple[str, List[str]]] = None
+
+    def start(self, timeout: float = 60.0) -> None:
+        """
+        Ledger-Prozess starten und warten, bis der Snapshot bereitsteht
+
+        Raises:
+            RuntimeError: wenn Repository oder Service nicht aufgebaut werden konnten
+        """
+        self._process.start()
+        # Ohne Kopie im Elternprozess (und in später abgezweigten Workern)
+        # sehen Clients das Ende des Ledgers als EOF statt ewig zu warten
+        for connection in self._ledger_ends:
+            connection.close()
+        if not self._control.poll(timeout):
+            self._process.terminate()
+            raise RuntimeError("Ledger nicht rechtzeitig gestartet")
+        ready = self._control.recv()
+        if isinstance(ready, Exception):
+            self._process.join()
+            raise ready
+        self._snapshot_info = ready
+
+    def client(self, index: int) -> LedgerClient:
+        """
+        Client Nummer index (0 bis clients - 1), an einen Worker-Prozess zu übergeben
+
+        Raises:
+            ValueError: vor start() oder bei ungültiger Nummer
+        """
+        if self._snapshot_info is None:
+            raise ValueError("Ledger nicht gestartet")
+        if not 0 <= index < len(self._clients):
+            raise ValueError(f"Client {index} existiert nicht")
+        name, product_ids = self._snapshot_info
+        return LedgerClient(index, self._clients[index], name, product_ids, self._snapshot_lock)
+
+    def stop(self, timeout: float = 60.0) -> LedgerStats:
+        """
+        Ledger beenden und seine Zähler liefern
+
+        Bereits anliegende Anfragen werden noch gebucht; Worker sollten vorher
+        fertig sein, spätere Anfragen bleiben unbeantwortet.
+
+        Raises:
+            RuntimeError: wenn der Ledger nicht läuft oder nicht rechtzeitig antwortet
+        """
+        if self._process.is_alive():
+            try:
+                self._control.send(None)
+            except OSError:
+                pass  # gerade beendet - seine Zähler liegen schon in der Pipe
+        elif self._process.exitcode is None:
+            raise RuntimeError("Ledger läuft nicht")
+        try:
+            if not self._control.poll(timeout):
+                self._process.terminate()
+                raise RuntimeError("Ledger nicht rechtzeitig beendet")
+            stats = self._control.recv()
+        except EOFError:
+            raise RuntimeError("Ledger läuft nicht") from None
+        self._process.join(timeout)
+        self._snapshot_info = None
+        return stats
+
+    def __enter__(self) -> "BookingLedger":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
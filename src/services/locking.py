@@ -0,0 +1,80 @@
+"""Locking - Sperren für nebenläufige Buchungen"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, ContextManager, Iterable, Iterator, List, Optional
+
+# Callback für gemessene Wartezeiten in Sekunden
+WaitCallback = Callable[[float], None]
+
+
+class StripedLock:
+    """
+    Gestreifte Sperren: eine feste Anzahl Locks, auf die Produkt-IDs per Hash
+    verteilt werden.
+
+    Buchungen auf verschiedene Produkte laufen so meist parallel, Buchungen auf
+    dasselbe Produkt werden serialisiert - ohne ein Lock pro Produkt anzulegen.
+    """
+
+    def __init__(self, stripes: int = 64, on_wait: Optional[WaitCallback] = None):
+        """
+        Args:
+            stripes: Anzahl der Locks (mehr Streifen = weniger Kollisionen)
+            on_wait: erhält nach jedem hold() die Wartezeit bis alle Locks
+                gehalten werden (None: keine Zeitmessung)
+        """
+        if stripes < 1:
+            raise ValueError("Anzahl der Streifen muss mindestens 1 sein")
+        self._locks: List[threading.Lock] = [threading.Lock() for _ in range(stripes)]
+        self.on_wait = on_wait
+
+    def _stripe(self, key: str) -> int:
+        return hash(key) % len(self._locks)
+
+    def hold(self, keys: Iterable[str]) -> ContextManager[None]:
+        """
+        Locks für alle Schlüssel halten
+
+        Streifen werden in aufsteigender Reihenfolge gesperrt, damit sich zwei
+        Sammelbuchungen mit überlappenden Produkten nicht gegenseitig blockieren.
+        """
+        return self._hold(sorted({self._stripe(key) for key in keys}))
+
+    def hold_all(self) -> ContextManager[None]:
+        """Alle Streifen halten (z.B. für einen Abgleich über alle Produkte)"""
+        return self._hold(range(len(self._locks)))
+
+    @contextmanager
+    def _hold(self, stripes: Iterable[int]) -> Iterator[None]:
+        acquired = []
+        on_wait = self.on_wait
+        started = time.perf_counter() if on_wait is not None else 0.0
+        try:
+            for stripe in stripes:
+                self._locks[stripe].acquire()
+                acquired.append(stripe)
+            if on_wait is not None:
+                on_wait(time.perf_counter() - started)
+            yield
+        finally:
+            for stripe in reversed(acquired):
+                self._locks[stripe].release()
+
+
+class TimedLock:
+    """Lock, das die Wartezeit jedes Betretens an einen Callback meldet"""
+
+    def __init__(self, on_wait: WaitCallback, lock: Optional[threading.Lock] = None):
+        self.on_wait = on_wait
+        self._lock = lock or threading.Lock()
+
+    def __enter__(self) -> "TimedLock":
+        started = time.perf_counter()
+        self._lock.acquire()
+        self.on_wait(time.perf_counter() - started)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._lock.release()
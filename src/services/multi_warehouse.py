@@ -0,0 +1,193 @@
+"""Multi Warehouse - Filialkette mit Zentrallager: Bestand pro Lager, Umlagerungen, Kettensummen"""
+
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List
+
+from ..adapters.shard_router import ShardRouter
+from ..domain.ids import MonotonicIdGenerator
+from ..domain.warehouse import Movement
+from . import WarehouseService
+
+# Umlagerungsnummern, zeitlich sortierbar wie die Bewegungs-IDs
+transfer_ids = MonotonicIdGenerator(prefix="uml_")
+
+
+@dataclass
+class Transfer:
+    """Umlagerung: Abgang im Quelllager und zugehörige Zugänge im Ziellager"""
+
+    id: str
+    product_id: str
+    quantity: int
+    source: str
+    target: str
+    outgoing: Movement
+    incoming: List[Movement]  # eine Bewegung pro Charge, Rest chargenlos
+
+
+class MultiWarehouseService:
+    """
+    Bestandsführung über mehrere Lager (Filialen und Zentrallager).
+
+    Der Bestand ist nach (Lager, Produkt) geschlüsselt: jedes Lager hat
+    einen eigenen WarehouseService auf seinem Shard des ShardRouters, mit
+    eigenen Kennzahlen, Chargen und Locks. Lagerübergreifende Summen werden
+    parallel über die Shards berechnet.
+    """
+
+    def __init__(self, router: ShardRouter, **service_options: Any):
+        """
+        Args:
+            router: Repository pro Lager
+            service_options: Weitere Argumente für jeden WarehouseService
+                (z.B. thread_safe, metrics); search_index gilt immer nur für
+                ein Lager und wird daher nicht unterstützt
+        """
+        if "search_index" in service_options:
+            raise ValueError("search_index wird pro Lager nicht unterstützt")
+        self.router = router
+        self._options = service_options
+        self._services: Dict[str, WarehouseService] = {}
+        self._lock = threading.Lock()
+        self._creating: Dict[str, threading.Lock] = {}
+
+    def warehouse(self, warehouse_id: str) -> WarehouseService:
+        """
+        Service eines Lagers (beim ersten Zugriff aus dessen Shard aufgebaut)
+
+        Raises:
+            ValueError: bei unbekanntem Lager ohne Shard-factory
+        """
+        service = self._services.get(warehouse_id)
+        if service is not None:
+            return service
+        with self._lock:
+            creating = self._creating.setdefault(warehouse_id, threading.Lock())
+        # Pro Lager sperren: verschiedene Lager dürfen parallel starten
+        with creating:
+            service = self._services.get(warehouse_id)
+            if service is None:
+                service = WarehouseService(
+                    self.router.shard(warehouse_id), warehouse_id=warehouse_id, **self._options
+                )
+                self._services[warehouse_id] = service
+        return service
+
+    def warehouse_ids(self) -> List[str]:
+        """Alle Lager des Routers"""
+        return self.router.warehouse_ids()
+
+    def add_to_stock(self, warehouse_id: str, product_id: str, quantity: int, **kwargs) -> None:
+        """Bestand in einem Lager erhöhen (Argumente wie WarehouseService.add_to_stock)"""
+        self.warehouse(warehouse_id).add_to_stock(product_id, quantity, **kwargs)
+
+    def remove_from_stock(self, warehouse_id: str, product_id: str, quantity: int, **kwargs):
+        """Bestand in einem Lager verringern (Argumente wie WarehouseService.remove_from_stock)"""
+        return self.warehouse(warehouse_id).remove_from_stock(product_id, quantity, **kwargs)
+
+    def get_stock(self, warehouse_id: str, product_id: str) -> int:
+        """Bestand eines Produkts in einem Lager (0, wenn es dort nicht geführt wird)"""
+        product = self.warehouse(warehouse_id).get_product(product_id)
+        return product.quantity if product is not None else 0
+
+    def transfer(
+        self,
+        product_id: str,
+        quantity: int,
+        source: str,
+        target: str,
+        reason: str = "",
+        user: str = "system",
+    ) -> Transfer:
+        """
+        Ware von einem Lager in ein anderes umlagern
+
+        Gebucht wird ein Abgang im Quelllager (FEFO) und passende Zugänge im
+        Ziellager; entnommene Chargen behalten ihr Ablaufdatum. Beide Buchungen
+        tragen die Umlagerungsnummer im Grund. Führt das Ziellager das Produkt
+        noch nicht, wird es mit den Stammdaten des Quelllagers angelegt.
+
+        Die Lager liegen in getrennten Backends ohne gemeinsame Transaktion:
+        scheitert der Zugang, wird der Abgang durch eine Rückbuchung ins
+        Quelllager ausgeglichen und der Fehler weitergereicht.
+
+        Returns:
+            Die gebuchte Umlagerung
+
+        Raises:
+            ValueError: bei gleichem Quell- und Ziellager, nicht positiver Menge,
+                unbekanntem Lager/Produkt oder unzureichendem Bestand
+        """
+        if source == target:
+            raise ValueError("Quell- und Ziellager sind identisch")
+        if quantity <= 0:
+            raise ValueError("Menge muss positiv sein")
+        origin, destination = self.warehouse(source), self.warehouse(target)
+        product = origin.get_product(product_id)
+        if product is None:
+            raise ValueError(f"Produkt {product_id} in Lager {source} nicht gefunden")
+
+        transfer_id = transfer_ids()
+        note = f": {reason}" if reason else ""
+        outgoing, lots = origin.transfer_out(
+            product_id, quantity, f"Umlagerung {transfer_id} nach {target}{note}", user
+        )
+        try:
+            incoming = destination.transfer_in(
+                product, quantity, lots, f"Umlagerung {transfer_id} von {source}{note}", user
+            )
+        except Exception:
+            origin.transfer_in(product, quantity, lots, f"Storno Umlagerung {transfer_id}", user)
+            raise
+        return Transfer(transfer_id, product_id, quantity, source, target, outgoing, incoming)
+
+    def chain_stock(self, product_ids: Iterable[str]) -> Dict[str, Dict[str, int]]:
+        """
+        Bestände mehrerer Produkte pro Lager, parallel aus allen Shards gelesen
+
+        Pro Shard genügt eine Abfrage (load_quantities) für alle Produkte.
+
+        Returns:
+            {Produkt-ID: {Lager-ID: Bestand}}; Lager ohne das Produkt fehlen
+        """
+        ids = list(product_ids)
+        results = self.router.map(lambda _, repository: repository.load_quantities(ids))
+        stock: Dict[str, Dict[str, int]] = {product_id: {} for product_id in ids}
+        for warehouse_id, quantities in results.items():
+            for product_id, quantity in quantities.items():
+                stock[product_id][warehouse_id] = quantity
+        return stock
+
+    def stock_by_warehouse(self, product_id: str) -> Dict[str, int]:
+        """Bestand eines Produkts pro Lager"""
+        return self.chain_stock([product_id])[product_id]
+
+    def total_stock(self, product_id: str) -> int:
+        """Kettenweiter Bestand eines Produkts"""
+        return sum(self.stock_by_warehouse(product_id).values())
+
+    def inventory_values(self) -> Dict[str, float]:
+        """Lagerwert pro Lager (Services werden dabei parallel aufgebaut)"""
+        return self.router.map(
+            lambda warehouse_id, _: self.warehouse(warehouse_id).get_total_inventory_value()
+        )
+
+    def chain_inventory_value(self) -> float:
+        """Lagerwert der gesamten Kette"""
+        return sum(self.inventory_values().values())
+
+    def chain_category_values(self) -> Dict[str, float]:
+        """Lagerwert pro Kategorie über alle Lager"""
+        results = self.router.map(
+            lambda warehouse_id, _: self.warehouse(warehouse_id).get_category_values()
+        )
+        totals: Dict[str, float] = {}
+        for values in results.values():
+            for category, value in values.items():
+                totals[category] = totals.get(category, 0.0) + value
+        return totals
+
+    def close(self) -> None:
+        """Router samt aller Shards schließen"""
+        self.router.close()
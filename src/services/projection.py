@@ -0,0 +1,238 @@
+"""Projection - Bestände aus dem Bewegungsstrom rekonstruieren (Event Sourcing)"""
+
+from bisect import bisect_right
+from datetime import datetime
+from heapq import merge
+from typing import Dict, List, Optional, Tuple
+
+from ..domain.warehouse import Movement
+from ..ports import RepositoryPort
+
+
+class StockProjection:
+    """
+    Bestand pro Produkt als Projektion des Bewegungsstroms.
+
+    Bestand zum Zeitpunkt t = Anfangsbestand + Summe aller Bewegungen bis t.
+    Für je `checkpoint_interval` Bewegungen (zeitlich sortiert) wird nur die
+    Änderung der betroffenen Produkte gesichert, alle `base_every`
+    Checkpoints zusätzlich der volle Saldo. Eine Abfrage startet beim letzten
+    vollen Saldo vor t, addiert höchstens `base_every` Änderungen und spielt
+    höchstens `checkpoint_interval` Bewegungen nach.
+
+    Anfangsbestände werden nicht gespeichert: Der WarehouseService meldet
+    neue Produkte über open_product(). Für Produkte, die schon vor der
+    Projektion existierten (z.B. nach jedem Neustart), wird der
+    Anfangsbestand beim ersten Kontakt als aktueller Bestand minus Bewegungen
+    abgeleitet - eine Abweichung aus der Zeit davor steckt dann im
+    Anfangsbestand und ist nicht erkennbar.
+
+    refresh() liest ab der Position im Bewegungsstrom (Einfügereihenfolge)
+    nach; später gespeicherte Bewegungen mit älterem Zeitstempel (Import,
+    Ledger, WAL-Replay) werden einsortiert und die Checkpoints ab dort neu
+    berechnet.
+    """
+
+    def __init__(
+        self,
+        repository: RepositoryPort,
+        checkpoint_interval: int = 10_000,
+        base_every: int = 16,
+    ):
+        """
+        Args:
+            repository: Datenquelle für Bewegungen und Produkte
+            checkpoint_interval: Bewegungen zwischen zwei Checkpoints
+            base_every: Checkpoints zwischen zwei vollen Salden
+        """
+        if checkpoint_interval < 1 or base_every < 1:
+            raise ValueError("checkpoint_interval und base_every müssen mindestens 1 sein")
+        self.repository = repository
+        self.checkpoint_interval = checkpoint_interval
+        self.base_every = base_every
+
+        # Bewegungsstrom, zeitlich sortiert, als parallele Listen
+        self._times: List[datetime] = []
+        self._product_ids: List[str] = []
+        self._changes: List[int] = []
+        self._totals: Dict[str, int] = {}
+        # _deltas[k]: Salden der Bewegungen k * checkpoint_interval bis (k + 1) * ... - 1
+        self._deltas: List[Dict[str, int]] = []
+        # _bases[j]: Salden nach den ersten (j + 1) * base_every Checkpoints
+        self._bases: List[Dict[str, int]] = []
+        # Anfangsbestand und Zeitpunkt, ab dem er gilt
+        self._openings: Dict[str, Tuple[datetime, int]] = {}
+
+        # Anzahl gelesener Bewegungen (Position im Strom des Repositorys)
+        self._position = 0
+        self._refreshed = False
+
+    # ------------------------------------------------------------------
+    # Ereignisse einlesen
+    # ------------------------------------------------------------------
+
+    def refresh(self) -> None:
+        """Neue Bewegungen nachlesen; beim ersten Aufruf Anfangsbestände ableiten"""
+        late: List[Movement] = []
+        times = self._times
+        for movement in self.repository.iter_movements(self._position):
+            self._position += 1
+            if times and movement.timestamp < times[-1]:
+                late.append(movement)
+            else:
+                self._append(movement)
+        if late:
+            self._insert_late(late)
+
+        if not self._refreshed:
+            for product in self.repository.iter_products():
+                self._derive_opening(product.id, product.created_at, product.quantity)
+            self._refreshed = True
+
+    def open_product(self, product_id: str, quantity: int, at: datetime) -> None:
+        """Anfangsbestand eines neu angelegten Produkts festhalten"""
+        self._openings[product_id] = (at, quantity)
+
+    def _derive_opening(self, product_id: str, created_at: datetime, quantity: int) -> None:
+        if product_id not in self._openings:
+            self._openings[product_id] = (created_at, quantity - self._totals.get(product_id, 0))
+
+    def _add(self, movement: Movement) -> None:
+        totals = self._totals
+        totals[movement.product_id] = totals.get(movement.product_id, 0) + movement.quantity_change
+
+    def _append(self, movement: Movement) -> None:
+        self._times.append(movement.timestamp)
+        self._product_ids.append(movement.product_id)
+        self._changes.append(movement.quantity_change)
+        self._add(movement)
+        if len(self._times) % self.checkpoint_interval == 0:
+            self._close_checkpoint()
+
+    def _insert_late(self, late: List[Movement]) -> None:
+        """Bewegungen mit älterem Zeitstempel einsortieren, Checkpoints ab dort neu"""
+        late.sort(key=lambda movement: movement.timestamp)
+        first = bisect_right(self._times, late[0].timestamp)
+        # Bei gleichem Zeitstempel stehen vorhandene Bewegungen vorn (wie bei bisect_right)
+        merged = list(
+            merge(
+                zip(self._times[first:], self._product_ids[first:], self._changes[first:]),
+                ((m.timestamp, m.product_id, m.quantity_change) for m in late),
+                key=lambda entry: entry[0],
+            )
+        )
+        self._times[first:] = [entry[0] for entry in merged]
+        self._product_ids[first:] = [entry[1] for entry in merged]
+        self._changes[first:] = [entry[2] for entry in merged]
+        for movement in late:
+            self._add(movement)
+
+        checkpoint = first // self.checkpoint_interval
+        del self._deltas[checkpoint:]
+        del self._bases[checkpoint // self.base_every :]
+        while len(self._deltas) < len(self._times) // self.checkpoint_interval:
+            self._close_checkpoint()
+
+    def _close_checkpoint(self) -> None:
+        """Änderungen des nächsten vollen Intervalls sichern, ggf. einen vollen Saldo"""
+        interval = self.checkpoint_interval
+        begin = len(self._deltas) * interval
+        delta: Dict[str, int] = {}
+        for product_id, change in zip(
+            self._product_ids[begin : begin + interval], self._changes[begin : begin + interval]
+        ):
+            delta[product_id] = delta.get(product_id, 0) + change
+        self._deltas.append(delta)
+        if len(self._deltas) % self.base_every == 0:
+            base = dict(self._bases[-1]) if self._bases else {}
+            for block in self._deltas[-self.base_every :]:
+                for product_id, change in block.items():
+                    base[product_id] = base.get(product_id, 0) + change
+            self._bases.append(base)
+
+    # ------------------------------------------------------------------
+    # Abfragen
+    # ------------------------------------------------------------------
+
+    def _replay(self, when: Optional[datetime], product_id: Optional[str]) -> Dict[str, int]:
+        """Salden aller Bewegungen bis einschließlich `when` (None: alle)"""
+        if when is None:
+            end = len(self._times)
+        else:
+            end = bisect_right(self._times, when)
+        checkpoint = end // self.checkpoint_interval
+        block = checkpoint // self.base_every
+        totals: Dict[str, int] = {}
+        if block:
+            base = self._bases[block - 1]
+            if product_id is None:
+                totals = dict(base)
+            elif product_id in base:
+                totals[product_id] = base[product_id]
+        for delta in self._deltas[block * self.base_every : checkpoint]:
+            if product_id is None:
+                for moved, change in delta.items():
+                    totals[moved] = totals.get(moved, 0) + change
+            elif product_id in delta:
+                totals[product_id] = totals.get(product_id, 0) + delta[product_id]
+        for position in range(checkpoint * self.checkpoint_interval, end):
+            moved = self._product_ids[position]
+            if product_id is None or moved == product_id:
+                totals[moved] = totals.get(moved, 0) + self._changes[position]
+        return totals
+
+    def _opening_at(self, product_id: str, when: Optional[datetime]) -> int:
+        opened_at, quantity = self._openings.get(product_id, (None, 0))
+        if opened_at is None or (when is not None and opened_at > when):
+            return 0
+        return quantity
+
+    def quantity_at(self, product_id: str, when: Optional[datetime] = None) -> int:
+        """
+        Bestand eines Produkts zu einem Zeitpunkt
+
+        Args:
+            product_id: Produkt
+            when: Zeitpunkt (Bewegungen bis einschließlich when); None: aktuell
+
+        Returns:
+            Projizierter Bestand (unbekannte Produkte: 0)
+        """
+        if product_id not in self._openings:
+            product = self.repository.load_product(product_id)
+            if product is not None:
+                self._derive_opening(product_id, product.created_at, product.quantity)
+        moved = self._replay(when, product_id).get(product_id, 0)
+        return self._opening_at(product_id, when) + moved
+
+    def quantities_at(self, when: Optional[datetime] = None) -> Dict[str, int]:
+        """Bestand aller Produkte, die zum Zeitpunkt bekannt waren"""
+        totals = self._replay(when, None)
+        product_ids = set(totals)
+        product_ids.update(
+            pid
+            for pid, (opened_at, _) in self._openings.items()
+            if when is None or opened_at <= when
+        )
+        return {pid: self._opening_at(pid, when) + totals.get(pid, 0) for pid in product_ids}
+
+    def discrepancies(self) -> Dict[str, Tuple[int, int]]:
+        """
+        Gespeicherte Bestände gegen die Projektion prüfen
+
+        Erkannt werden nur Bestandsänderungen ohne Bewegung, seit die
+        Projektion das Produkt kennt (open_product oder erster Kontakt); der
+        Anfangsbestand bereits vorhandener Produkte wird abgeleitet, nicht
+        geprüft.
+
+        Returns:
+            {Produkt-ID: (Product.quantity, projizierter Bestand)} für alle
+            vorhandenen Produkte mit Abweichung; leer wenn konsistent
+        """
+        found = {}
+        for product in self.repository.iter_products():
+            self._derive_opening(product.id, product.created_at, product.quantity)
+            projected = self._opening_at(product.id, None) + self._totals.get(product.id, 0)
+            if projected != product.quantity:
+                found[product.id] = (product.quantity, projected)
+        return found
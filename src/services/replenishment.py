@@ -0,0 +1,288 @@
+"""Replenishment - Nachfrageprognose, Meldebestände und Bestellvorschläge"""
+
+import math
+from dataclasses import dataclass
+from datetime import datetime
+from statistics import NormalDist
+from typing import Dict, List, Mapping, Optional, Set, Tuple
+
+from ..domain.warehouse import Movement
+from ..ports import RepositoryPort
+
+
+@dataclass(frozen=True)
+class ReplenishmentPolicy:
+    """Dispositionsparameter eines Artikels"""
+
+    lead_time_days: float = 3.0  # Wiederbeschaffungszeit
+    review_period_days: float = 1.0  # Abstand zwischen zwei Bestellläufen
+    service_level: float = 0.95  # gewünschte Wahrscheinlichkeit, nicht auszuverkaufen
+    pack_size: int = 1  # Bestellmengen werden darauf aufgerundet
+
+    def __post_init__(self):
+        if self.lead_time_days < 0 or self.review_period_days < 0:
+            raise ValueError("Wiederbeschaffungszeit und Bestellabstand dürfen nicht negativ sein")
+        if not 0 < self.service_level < 1:
+            raise ValueError("service_level muss zwischen 0 und 1 liegen")
+        if self.pack_size < 1:
+            raise ValueError("pack_size muss mindestens 1 sein")
+
+
+@dataclass
+class PurchaseProposal:
+    """Bestellvorschlag für einen Artikel"""
+
+    product_id: str
+    quantity: int  # vorgeschlagene Bestellmenge
+    inventory_position: int  # Bestand + offene Bestellungen
+    reorder_point: float
+    safety_stock: float
+    order_up_to: float  # Zielbestand nach Eingang
+    daily_demand: float
+    days_of_cover: float  # Reichweite der Bestandsposition in Tagen
+
+
+class _DemandState:
+    """Exponentiell geglättete Tagesnachfrage eines Artikels"""
+
+    __slots__ = ("mean", "variance", "day", "today")
+
+    def __init__(self, day: int):
+        self.mean = 0.0
+        self.variance = 0.0
+        self.day = day  # offener Tag (Ordinalzahl)
+        self.today = 0  # Nachfrage des offenen Tages
+
+
+class ReplenishmentEngine:
+    """
+    Disposition nach dem Bestellpunktverfahren mit Sicherheitsbestand.
+
+    Nachfrage: Abgänge (negative Mengenänderungen) werden pro Artikel und Tag
+    summiert. Endet ein Tag, fließt seine Summe in einen exponentiell
+    gewichteten Mittelwert und eine Varianz (Glättungsfaktor `alpha`) ein.
+    Tage ohne Abgang zählen als Nachfrage 0 und werden geschlossen in einem
+    Schritt verrechnet - jede Bewegung kostet O(1), unabhängig von der Lücke.
+
+    Mit μ/σ der Tagesnachfrage, L = Wiederbeschaffungszeit, R = Bestellabstand
+    und z = Quantil des Servicegrads gilt:
+        Sicherheitsbestand SS = z · σ · √(L + R)
+        Meldebestand       s  = μ · L + SS
+        Zielbestand        S  = μ · (L + R) + SS
+    Fällt die Bestandsposition auf s oder darunter, wird auf S aufgefüllt.
+
+    refresh() liest wie StockProjection inkrementell ab dem zuletzt gesehenen
+    Zeitstempel nach. Bewegungen, die älter als der offene Tag eines Artikels
+    sind, werden dem offenen Tag zugerechnet.
+    """
+
+    def __init__(
+        self,
+        repository: RepositoryPort,
+        alpha: float = 0.1,
+        policy: Optional[ReplenishmentPolicy] = None,
+        page_size: int = 100_000,
+    ):
+        """
+        Args:
+            repository: Datenquelle für Bewegungen und Bestände
+            alpha: Glättungsfaktor der Tagesnachfrage (größer: reagiert schneller)
+            policy: Standard-Dispositionsparameter für alle Artikel
+            page_size: Bewegungen pro query_movements-Seite beim Nachlesen
+
+        Raises:
+            ValueError: bei alpha außerhalb von (0, 1]
+        """
+        if not 0 < alpha <= 1:
+            raise ValueError("alpha muss zwischen 0 (exklusive) und 1 liegen")
+        self.repository = repository
+        self.alpha = alpha
+        self.default_policy = policy or ReplenishmentPolicy()
+        self.page_size = page_size
+        self._policies: Dict[str, ReplenishmentPolicy] = {}
+        self._demand: Dict[str, _DemandState] = {}
+        self._z_scores: Dict[float, float] = {}
+
+        self._last_timestamp: Optional[datetime] = None
+        self._ids_at_last_timestamp: Set[str] = set()
+
+    # ------------------------------------------------------------------
+    # Nachfrage einlesen
+    # ------------------------------------------------------------------
+
+    def refresh(self) -> None:
+        """Neue Bewegungen seit dem letzten Aufruf verarbeiten"""
+        cursor = None
+        while True:
+            page = self.repository.query_movements(
+                start=self._last_timestamp, limit=self.page_size, cursor=cursor
+            )
+            for movement in page.movements:
+                if self._already_seen(movement):
+                    continue
+                self.observe(movement)
+                if movement.timestamp != self._last_timestamp:
+                    self._last_timestamp = movement.timestamp
+                    self._ids_at_last_timestamp = set()
+                self._ids_at_last_timestamp.add(movement.id)
+            if page.next_cursor is None:
+                break
+            cursor = page.next_cursor
+
+    def _already_seen(self, movement: Movement) -> bool:
+        return (
+            movement.timestamp == self._last_timestamp
+            and movement.id in self._ids_at_last_timestamp
+        )
+
+    def observe(self, movement: Movement) -> None:
+        """Eine Bewegung einrechnen (O(1)); Zugänge ändern die Nachfrage nicht"""
+        if movement.quantity_change >= 0:
+            return
+        day = movement.timestamp.toordinal()
+        state = self._demand.get(movement.product_id)
+        if state is None:
+            state = self._demand[movement.product_id] = _DemandState(day)
+        elif day > state.day:
+            self._close_days(state, day)
+        state.today -= movement.quantity_change
+
+    def _close_days(self, state: _DemandState, day: int) -> None:
+        """Offenen Tag abschließen und bis `day` leere Tage verrechnen"""
+        alpha = self.alpha
+        # Abgeschlossener Tag: exponentiell gewichteter Mittelwert und Varianz
+        diff = state.today - state.mean
+        increment = alpha * diff
+        state.mean += increment
+        state.variance = (1 - alpha) * (state.variance + diff * increment)
+        # k Tage ohne Abgang in geschlossener Form:
+        #   μ_k = βᵏ·μ,  σ²_k = βᵏ·σ² + μ²·βᵏ·(1 - βᵏ)  mit β = 1 - alpha
+        empty_days = day - state.day - 1
+        if empty_days > 0:
+            decay = (1 - alpha) ** empty_days
+            mean = state.mean
+            state.variance = decay * state.variance + mean * mean * decay * (1 - decay)
+            state.mean = decay * mean
+        state.day = day
+        state.today = 0
+
+    # ------------------------------------------------------------------
+    # Parameter
+    # ------------------------------------------------------------------
+
+    def set_policy(self, product_id: str, policy: Optional[ReplenishmentPolicy]) -> None:
+        """Eigene Parameter für einen Artikel setzen (None: wieder Standard)"""
+        if policy is None:
+            self._policies.pop(product_id, None)
+        else:
+            self._policies[product_id] = policy
+
+    def policy(self, product_id: str) -> ReplenishmentPolicy:
+        return self._policies.get(product_id, self.default_policy)
+
+    def _z_score(self, service_level: float) -> float:
+        z = self._z_scores.get(service_level)
+        if z is None:
+            z = self._z_scores[service_level] = NormalDist().inv_cdf(service_level)
+        return z
+
+    # ------------------------------------------------------------------
+    # Abfragen
+    # ------------------------------------------------------------------
+
+    def daily_demand(self, product_id: str, now: Optional[datetime] = None) -> Tuple[float, float]:
+        """
+        Geschätzte Tagesnachfrage eines Artikels
+
+        Args:
+            product_id: Artikel
+            now: Stichtag; alle Tage davor gelten als abgeschlossen (Standard: jetzt)
+
+        Returns:
+            (Mittelwert, Standardabweichung) in Einheiten pro Tag; (0, 0) ohne Abgänge
+        """
+        state = self._demand.get(product_id)
+        if state is None:
+            return 0.0, 0.0
+        day = (now or datetime.now()).toordinal()
+        if day > state.day:
+            self._close_days(state, day)
+        return state.mean, math.sqrt(state.variance)
+
+    def plan(
+        self,
+        product_id: str,
+        on_hand: int,
+        on_order: int = 0,
+        now: Optional[datetime] = None,
+    ) -> Optional[PurchaseProposal]:
+        """
+        Bestellvorschlag für einen Artikel
+
+        Args:
+            product_id: Artikel
+            on_hand: aktueller Bestand
+            on_order: bereits bestellte, noch nicht eingegangene Menge
+            now: Stichtag (Standard: jetzt)
+
+        Returns:
+            PurchaseProposal, wenn der Meldebestand erreicht ist; sonst None
+        """
+        mean, deviation = self.daily_demand(product_id, now)
+        if mean <= 0:
+            return None
+        policy = self.policy(product_id)
+        safety_stock = (
+            self._z_score(policy.service_level)
+            * deviation
+            * math.sqrt(policy.lead_time_days + policy.review_period_days)
+        )
+        reorder_point = mean * policy.lead_time_days + safety_stock
+        position = on_hand + on_order
+        if position > reorder_point:
+            return None
+        order_up_to = mean * (policy.lead_time_days + policy.review_period_days) + safety_stock
+        quantity = math.ceil(order_up_to - position)
+        if quantity <= 0:
+            return None
+        pack_size = policy.pack_size
+        quantity = -(-quantity // pack_size) * pack_size
+        return PurchaseProposal(
+            product_id=product_id,
+            quantity=quantity,
+            inventory_position=position,
+            reorder_point=reorder_point,
+            safety_stock=safety_stock,
+            order_up_to=order_up_to,
+            daily_demand=mean,
+            days_of_cover=max(position, 0) / mean,
+        )
+
+    def propose(
+        self,
+        now: Optional[datetime] = None,
+        on_order: Optional[Mapping[str, int]] = None,
+    ) -> List[PurchaseProposal]:
+        """
+        Bestelllauf über alle Artikel mit Nachfrage
+
+        Args:
+            now: Stichtag (Standard: jetzt)
+            on_order: offene Bestellmengen pro Produkt-ID
+
+        Returns:
+            Bestellvorschläge, dringendste (geringste Reichweite) zuerst
+        """
+        self.refresh()
+        now = now or datetime.now()
+        on_order = on_order or {}
+        demand = self._demand
+        proposals = []
+        for product in self.repository.iter_products():
+            if product.id not in demand:
+                continue
+            proposal = self.plan(product.id, product.quantity, on_order.get(product.id, 0), now)
+            if proposal is not None:
+                proposals.append(proposal)
+        proposals.sort(key=lambda proposal: (proposal.days_of_cover, proposal.product_id))
+        return proposals
@@ -10,8 +10,8 @@ from PyQt6.QtWidgets import (
     QVBoxLayout,
     QHBoxLayout,
     QPushButton,
+    QTableView,
     QTableWidget,
-    QTableWidgetItem,
     QLabel,
     QSpinBox,
     QLineEdit,
@@ -20,11 +20,18 @@ from PyQt6.QtWidgets import (
     QDialog,
     QFormLayout,
     QDoubleSpinBox,
+    QHeaderView,
+    QPlainTextEdit,
+    QProgressBar,
 )
 from PyQt6.QtCore import Qt
 
+from ..adapters.report import ConsoleReportAdapter
 from ..adapters.repository import RepositoryFactory
+from ..adapters.search_index import InMemorySearchIndex
 from ..services import WarehouseService
+from .models import ProductTableModel
+from .workers import Debouncer, Task, TaskContext, TaskRunner
 
 
 class ProductDialogWindow(QDialog):
@@ -80,14 +87,29 @@ class ProductDialogWindow(QDialog):
 class WarehouseMainWindow(QMainWindow):
     """Hauptfenster der Lagerverwaltungsanwendung"""
 
+    SEARCH_LIMIT = 200  # Treffer, die die Produkttabelle bei einer Suche zeigt
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Lagerverwaltungssystem v0.1.0")
         self.setGeometry(100, 100, 1000, 600)
 
-        # Initialisiere Service
+        # Initialisiere Service (thread-sicher, da Hintergrundaufgaben ihn nutzen)
         self.repository = RepositoryFactory.create_repository("memory")
-        self.service = WarehouseService(self.repository)
+        self.service = WarehouseService(
+            self.repository, thread_safe=True, search_index=InMemorySearchIndex()
+        )
+
+        # Hintergrundaufgaben: nichts Langsames läuft im Qt-Hauptthread
+        self.tasks = TaskRunner(parent=self)
+        self._refresh_task: Optional[Task] = None
+        self._report_task: Optional[Task] = None
+        # Mehrfaches "Aktualisieren" kurz hintereinander lädt nur einmal
+        self._refresh_debouncer = Debouncer(200, parent=self)
+        self._refresh_debouncer.fired.connect(self._start_refresh)
+        # Suche während der Eingabe: erst nach einer kurzen Tipp-Pause
+        self._search_debouncer = Debouncer(150, parent=self)
+        self._search_debouncer.fired.connect(self._start_search)
 
         # Erstelle UI
         self._create_ui()
@@ -137,12 +159,20 @@ class WarehouseMainWindow(QMainWindow):
 
         layout.addLayout(button_layout)
 
-        # Produkttabelle
-        self.products_table = QTableWidget()
-        self.products_table.setColumnCount(6)
-        self.products_table.setHorizontalHeaderLabels(
-            ["ID", "Name", "Kategorie", "Bestand", "Preis (€)", "Gesamtwert (€)"]
-        )
+        # Suche nach Name, SKU, ID oder Kategorie
+        self.search_field = QLineEdit()
+        self.search_field.setPlaceholderText("Suchen (Name, SKU, Kategorie) ...")
+        self.search_field.setClearButtonEnabled(True)
+        self.search_field.textChanged.connect(self._search_debouncer.trigger)
+        layout.addWidget(self.search_field)
+
+        # Produkttabelle (Model/View: Zeilen werden beim Scrollen nachgeladen)
+        self.products_model = ProductTableModel(self.service, parent=self)
+        self.products_table = QTableView()
+        self.products_table.setModel(self.products_model)
+        self.products_table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        # Feste Zeilenhöhe: die Ansicht muss nicht jede Zeile vermessen
+        self.products_table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
         layout.addWidget(self.products_table)
 
         widget.setLayout(layout)
@@ -181,20 +211,34 @@ class WarehouseMainWindow(QMainWindow):
         inventory_btn.clicked.connect(self._show_inventory_report)
         movement_btn.clicked.connect(self._show_movement_report)
 
+        self.report_cancel_btn = QPushButton("Abbrechen")
+        self.report_cancel_btn.setEnabled(False)
+        self.report_cancel_btn.clicked.connect(self._cancel_report)
+
         button_layout.addWidget(inventory_btn)
         button_layout.addWidget(movement_btn)
+        button_layout.addWidget(self.report_cancel_btn)
         layout.addLayout(button_layout)
 
+        self.report_progress = QProgressBar()
+        self.report_progress.setVisible(False)
+        layout.addWidget(self.report_progress)
+
+        self.report_view = QPlainTextEdit()
+        self.report_view.setReadOnly(True)
+        layout.addWidget(self.report_view)
+
         widget.setLayout(layout)
         self.tabs.addTab(widget, "Berichte")
 
     def _add_product(self):
-        """Neues Produkt hinzufügen"""
+        """Neues Produkt hinzufügen (Speichern im Hintergrund)"""
         dialog = ProductDialogWindow(self)
         if dialog.exec():
             data = dialog.get_data()
-            try:
-                self.service.create_product(
+
+            def create(context: TaskContext):
+                return self.service.create_product(
                     product_id=data["product_id"],
                     name=data["name"],
                     description=data["description"],
@@ -202,41 +246,132 @@ class WarehouseMainWindow(QMainWindow):
                     category=data["category"],
                     initial_quantity=data["quantity"],
                 )
+
+            def created(product):
+                self.products_model.product_added(product.id)
                 QMessageBox.information(self, "Erfolg", "Produkt erfolgreich hinzugefügt")
-                self._refresh_products()
-            except Exception as e:
-                QMessageBox.critical(self, "Fehler", str(e))
+
+            self.tasks.submit(create, on_result=created, on_error=self._show_error)
 
     def _refresh_products(self):
-        """Produkttabelle aktualisieren"""
-        products = self.service.get_all_products()
-        self.products_table.setRowCount(len(products))
-
-        for row, (product_id, product) in enumerate(products.items()):
-            self.products_table.setItem(row, 0, QTableWidgetItem(product_id))
-            self.products_table.setItem(row, 1, QTableWidgetItem(product.name))
-            self.products_table.setItem(row, 2, QTableWidgetItem(product.category))
-            self.products_table.setItem(row, 3, QTableWidgetItem(str(product.quantity)))
-            self.products_table.setItem(row, 4, QTableWidgetItem(f"{product.price:.2f}"))
-            self.products_table.setItem(
-                row, 5, QTableWidgetItem(f"{product.get_total_value():.2f}")
-            )
+        """Produkttabelle aktualisieren (entprellt, Laden im Hintergrund)"""
+        self._refresh_debouncer.trigger()
+
+    def _start_refresh(self):
+        """Produkt-IDs im Hintergrund lesen; ein noch laufendes Laden wird verworfen"""
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+
+        def load_ids(context: TaskContext):
+            # Schnappschuss statt iter_products(): parallele Aufgaben dürfen
+            # währenddessen Produkte anlegen oder löschen
+            ids = list(self.service.get_all_products())
+            context.check_cancelled()
+            context.report_progress(len(ids), len(ids))
+            return ids
+
+        task = self.tasks.submit(load_ids, on_error=self._show_error)
+        task.signals.finished.connect(lambda ids, task=task: self._finish_refresh(task, ids))
+        self._refresh_task = task
+
+    def _finish_refresh(self, task: Task, product_ids):
+        if task is not self._refresh_task:
+            return  # überholt von einem neueren Laden
+        self._refresh_task = None
+        self.products_model.set_product_ids(product_ids)
+
+    def _start_search(self):
+        """Tabelle auf die Suchtreffer beschränken; leere Suche zeigt wieder alles"""
+        query = self.search_field.text().strip()
+        if not query:
+            self._start_refresh()
+            return
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            self._refresh_task = None
+        products = self.service.search_products(query, limit=self.SEARCH_LIMIT)
+        self.products_model.set_product_ids([product.id for product in products])
 
     def _delete_product(self):
         """Produkt löschen"""
         QMessageBox.information(self, "Info", "Delete-Funktion wird implementiert")
 
     def _show_inventory_report(self):
-        """Lagerbestandsbericht anzeigen"""
-        QMessageBox.information(
-            self, "Lagerbestandsbericht", "Report-Funktion wird implementiert"
-        )
+        """Lagerbestandsbericht im Hintergrund erzeugen und anzeigen"""
+
+        def build(context: TaskContext) -> str:
+            # Schnappschuss statt iter_products(): parallele Aufgaben dürfen
+            # währenddessen Produkte anlegen oder löschen
+            products = self.service.get_all_products()
+            adapter = ConsoleReportAdapter(products=products)
+            return self._collect_report(context, adapter.iter_inventory_report(), len(products))
+
+        self._start_report(build)
 
     def _show_movement_report(self):
-        """Bewegungsprotokoll anzeigen"""
-        QMessageBox.information(
-            self, "Bewegungsprotokoll", "Report-Funktion wird implementiert"
+        """Bewegungsprotokoll im Hintergrund erzeugen und anzeigen"""
+
+        def build(context: TaskContext) -> str:
+            total = self.service.count_movements()
+            adapter = ConsoleReportAdapter(movements=self.service.iter_movements())
+            return self._collect_report(context, adapter.iter_movement_report(), total)
+
+        self._start_report(build)
+
+    @staticmethod
+    def _collect_report(context: TaskContext, blocks, total: int) -> str:
+        """Berichtsblöcke sammeln, dabei Fortschritt melden und auf Abbruch prüfen"""
+        parts = []
+        for done, block in enumerate(blocks):
+            parts.append(block)
+            if done % 1000 == 0:
+                context.check_cancelled()
+                context.report_progress(min(done, total), total)
+        return "".join(parts)
+
+    def _start_report(self, build):
+        if self._report_task is not None:
+            self._report_task.cancel()
+        self.report_progress.setValue(0)
+        self.report_progress.setVisible(True)
+        self.report_cancel_btn.setEnabled(True)
+
+        task = self.tasks.submit(
+            build,
+            on_progress=self._update_report_progress,
+            on_error=self._show_error,
         )
+        task.signals.finished.connect(lambda text, task=task: self._finish_report(task, text))
+        for signal in (task.signals.failed, task.signals.cancelled):
+            signal.connect(lambda *_, task=task: self._finish_report(task, None))
+        self._report_task = task
+
+    def _update_report_progress(self, done: int, total: int):
+        self.report_progress.setMaximum(max(total, 1))
+        self.report_progress.setValue(done)
+
+    def _finish_report(self, task: Task, text: Optional[str]):
+        if task is not self._report_task:
+            return
+        self._report_task = None
+        self.report_progress.setVisible(False)
+        self.report_cancel_btn.setEnabled(False)
+        if text is not None:
+            self.report_view.setPlainText(text)
+
+    def _cancel_report(self):
+        """Laufende Berichtserzeugung abbrechen"""
+        if self._report_task is not None:
+            self._report_task.cancel()
+
+    def _show_error(self, error: Exception):
+        QMessageBox.critical(self, "Fehler", str(error))
+
+    def closeEvent(self, event):
+        """Laufende Aufgaben abbrechen und abwarten, bevor das Fenster schließt"""
+        self.tasks.cancel_all()
+        self.tasks.wait(5000)
+        super().closeEvent(event)
 
 
 def main():
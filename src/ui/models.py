@@ -0,0 +1,155 @@
+"""UI Models - Qt-Modelle für große Datenmengen (Model/View statt QTableWidget)"""
+
+from typing import Dict, List, Optional
+
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+from ..domain.product import Product
+from ..services import WarehouseService
+
+
+class ProductTableModel(QAbstractTableModel):
+    """
+    Tabellenmodell über die Produkte des WarehouseService.
+
+    Das Modell hält nur die Reihenfolge der Produkt-IDs. Produkte werden in
+    Blöcken von `batch_size` Zeilen nachgeladen, sobald die Ansicht dorthin
+    scrollt (canFetchMore/fetchMore), und Zellen erst in data() formatiert -
+    die Arbeit hängt damit von den sichtbaren Zeilen ab, nicht vom Katalog.
+    Einzelne Änderungen melden product_changed/product_added/product_removed.
+    """
+
+    HEADERS = ("ID", "Name", "Kategorie", "Bestand", "Preis (€)", "Gesamtwert (€)")
+    _NUMERIC_COLUMNS = (3, 4, 5)
+
+    def __init__(self, service: WarehouseService, batch_size: int = 500, parent=None):
+        """
+        Args:
+            service: Datenquelle
+            batch_size: Zeilen pro Nachladeschritt
+            parent: Qt-Elternobjekt
+        """
+        super().__init__(parent)
+        self.service = service
+        self.batch_size = batch_size
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._products: Dict[str, Product] = {}
+        self._fetched = 0
+
+    # ------------------------------------------------------------------
+    # QAbstractTableModel
+    # ------------------------------------------------------------------
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._fetched
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section: int, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        column = index.column()
+        if role == Qt.ItemDataRole.TextAlignmentRole and column in self._NUMERIC_COLUMNS:
+            return int(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        product = self._products.get(self._ids[index.row()])
+        if product is None:
+            return None
+        if column == 0:
+            return product.id
+        if column == 1:
+            return product.name
+        if column == 2:
+            return product.category
+        if column == 3:
+            return str(product.quantity)
+        if column == 4:
+            return f"{product.price:.2f}"
+        return f"{product.get_total_value():.2f}"
+
+    def canFetchMore(self, parent: QModelIndex = QModelIndex()) -> bool:
+        return not parent.isValid() and self._fetched < len(self._ids)
+
+    def fetchMore(self, parent: QModelIndex = QModelIndex()) -> None:
+        if parent.isValid():
+            return
+        batch = self._ids[self._fetched : self._fetched + self.batch_size]
+        if not batch:
+            return
+        self.beginInsertRows(QModelIndex(), self._fetched, self._fetched + len(batch) - 1)
+        self._products.update(self.service.repository.load_products(batch))
+        self._fetched += len(batch)
+        self.endInsertRows()
+
+    # ------------------------------------------------------------------
+    # Aktualisierung
+    # ------------------------------------------------------------------
+
+    def reload(self) -> None:
+        """Produktliste neu lesen; Zeilen werden danach wieder blockweise geladen"""
+        self.set_product_ids([product.id for product in self.service.iter_products()])
+
+    def set_product_ids(self, product_ids: List[str]) -> None:
+        """Anzuzeigende Produkt-IDs setzen (z.B. im Hintergrund gelesen)"""
+        self.beginResetModel()
+        self._ids = list(product_ids)
+        self._rows = {product_id: row for row, product_id in enumerate(self._ids)}
+        self._products = {}
+        self._fetched = 0
+        self.endResetModel()
+
+    def product_changed(self, product_id: str) -> None:
+        """Eine Zeile neu lesen und nur für sie dataChanged senden (z.B. nach Buchung)"""
+        row = self._rows.get(product_id)
+        if row is None or row >= self._fetched:
+            return  # noch nicht geladen - wird beim Nachladen aktuell gelesen
+        product = self.service.get_product(product_id)
+        if product is None:
+            self.product_removed(product_id)
+            return
+        self._products[product_id] = product
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.HEADERS) - 1))
+
+    def product_added(self, product_id: str) -> None:
+        """Neues Produkt am Ende anfügen"""
+        if product_id in self._rows:
+            self.product_changed(product_id)
+            return
+        row = len(self._ids)
+        self._ids.append(product_id)
+        self._rows[product_id] = row
+        if self._fetched == row:
+            # Alles geladen - Zeile sofort sichtbar machen
+            self.beginInsertRows(QModelIndex(), row, row)
+            product = self.service.get_product(product_id)
+            if product is not None:
+                self._products[product_id] = product
+            self._fetched += 1
+            self.endInsertRows()
+
+    def product_removed(self, product_id: str) -> None:
+        """Zeile eines gelöschten Produkts entfernen"""
+        row = self._rows.get(product_id)
+        if row is None:
+            return
+        visible = row < self._fetched
+        if visible:
+            self.beginRemoveRows(QModelIndex(), row, row)
+        del self._ids[row]
+        self._products.pop(product_id, None)
+        self._rows = {pid: position for position, pid in enumerate(self._ids)}
+        if visible:
+            self._fetched -= 1
+            self.endRemoveRows()
+
+    def product_id_at(self, row: int) -> Optional[str]:
+        """Produkt-ID einer Zeile (z.B. für die Auswahl in der Ansicht)"""
+        return self._ids[row] if 0 <= row < self._fetched else None
@@ -0,0 +1,169 @@
+"""UI Workers - Hintergrundaufgaben für die Oberfläche (QThreadPool/QRunnable)"""
+
+import threading
+from typing import Any, Callable, Optional, Set
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+
+
+class TaskCancelled(Exception):
+    """Wird in einer Aufgabe ausgelöst, wenn sie abgebrochen wurde"""
+
+
+class TaskContext:
+    """
+    Wird der Aufgabenfunktion übergeben: Fortschritt melden und auf Abbruch prüfen.
+
+    Abbruch ist kooperativ - die Funktion ruft regelmäßig check_cancelled() auf.
+    """
+
+    def __init__(self, signals: "TaskSignals"):
+        self._signals = signals
+        self._cancelled = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+    def check_cancelled(self) -> None:
+        """
+        Raises:
+            TaskCancelled: wenn die Aufgabe abgebrochen wurde
+        """
+        if self._cancelled.is_set():
+            raise TaskCancelled()
+
+    def report_progress(self, done: int, total: int) -> None:
+        """Fortschritt an die Oberfläche melden (threadsicher über ein Qt-Signal)"""
+        self._signals.progress.emit(done, total)
+
+
+class TaskSignals(QObject):
+    """Signale einer Aufgabe; werden im Hauptthread zugestellt"""
+
+    progress = pyqtSignal(int, int)  # erledigt, gesamt
+    finished = pyqtSignal(object)  # Ergebnis
+    failed = pyqtSignal(object)  # Exception
+    cancelled = pyqtSignal()
+
+
+class Task(QRunnable):
+    """
+    Führt `function(context, *args, **kwargs)` im Thread-Pool aus und meldet
+    Ergebnis, Fehler oder Abbruch über `signals`.
+    """
+
+    def __init__(self, function: Callable[..., Any], *args: Any, **kwargs: Any):
+        super().__init__()
+        self.signals = TaskSignals()
+        self.context = TaskContext(self.signals)
+        self._function = function
+        self._args = args
+        self._kwargs = kwargs
+
+    def cancel(self) -> None:
+        """Abbruch anfordern"""
+        self.context.cancel()
+
+    def run(self) -> None:
+        try:
+            self.context.check_cancelled()
+            result = self._function(self.context, *self._args, **self._kwargs)
+            self.context.check_cancelled()
+        except TaskCancelled:
+            self.signals.cancelled.emit()
+        except Exception as e:
+            self.signals.failed.emit(e)
+        else:
+            self.signals.finished.emit(result)
+
+
+class TaskRunner(QObject):
+    """
+    Startet Aufgaben im Thread-Pool und hält sie bis zum Ende am Leben.
+
+    Verwendung:
+        task = runner.submit(load, on_result=show, on_error=report)
+        task.cancel()
+    """
+
+    def __init__(self, pool: Optional[QThreadPool] = None, parent=None):
+        """
+        Args:
+            pool: Thread-Pool (Standard: QThreadPool.globalInstance())
+            parent: Qt-Elternobjekt
+        """
+        super().__init__(parent)
+        self.pool = pool or QThreadPool.globalInstance()
+        self._running: Set[Task] = set()
+
+    def submit(
+        self,
+        function: Callable[..., Any],
+        *args: Any,
+        on_result: Optional[Callable[[Any], None]] = None,
+        on_error: Optional[Callable[[Exception], None]] = None,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+        on_cancelled: Optional[Callable[[], None]] = None,
+        **kwargs: Any,
+    ) -> Task:
+        """Aufgabe starten; Rückrufe laufen im Hauptthread"""
+        task = Task(function, *args, **kwargs)
+        task.setAutoDelete(False)
+        signals = task.signals
+        if on_result is not None:
+            signals.finished.connect(on_result)
+        if on_error is not None:
+            signals.failed.connect(on_error)
+        if on_progress is not None:
+            signals.progress.connect(on_progress)
+        if on_cancelled is not None:
+            signals.cancelled.connect(on_cancelled)
+        for signal in (signals.finished, signals.failed, signals.cancelled):
+            signal.connect(lambda *_, task=task: self._running.discard(task))
+        self._running.add(task)
+        self.pool.start(task)
+        return task
+
+    def cancel_all(self) -> None:
+        """Abbruch für alle laufenden Aufgaben anfordern"""
+        for task in list(self._running):
+            task.cancel()
+
+    def wait(self, msecs: int = -1) -> bool:
+        """Auf alle Aufgaben im Pool warten (z.B. beim Schließen des Fensters)"""
+        return self.pool.waitForDone(msecs)
+
+    @property
+    def active(self) -> int:
+        """Anzahl noch nicht abgeschlossener Aufgaben"""
+        return len(self._running)
+
+
+class Debouncer(QObject):
+    """
+    Fasst schnell aufeinanderfolgende Auslösungen zusammen: `fired` kommt
+    einmal, `delay_ms` nach der letzten trigger()-Auslösung.
+    """
+
+    fired = pyqtSignal()
+
+    def __init__(self, delay_ms: int = 250, parent=None):
+        super().__init__(parent)
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay_ms)
+        self._timer.timeout.connect(self.fired)
+
+    def trigger(self) -> None:
+        """Auslösen bzw. die Wartezeit neu starten"""
+        self._timer.start()
+
+    def flush(self) -> None:
+        """Ausstehende Auslösung sofort ausführen"""
+        if self._timer.isActive():
+            self._timer.stop()
+            self.fired.emit()
@@ -0,0 +1,96 @@
+"""Integration Tests - Nebenläufige Buchungen"""
+
+import sys
+import threading
+
+import pytest
+from src.adapters.repository import RepositoryFactory
+from src.domain.warehouse import Booking
+from src.services import WarehouseService
+
+
+@pytest.fixture(autouse=True)
+def frequent_thread_switches():
+    """Thread-Wechsel erzwingen, damit Race Conditions sichtbar würden"""
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def run_threads(count, target):
+    threads = [threading.Thread(target=target, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+class TestConcurrentBookings:
+    """Stresstests für den thread-sicheren WarehouseService"""
+
+    @pytest.fixture(params=["memory", "sqlite"])
+    def service(self, request):
+        repository = RepositoryFactory.create_repository(request.param)
+        service = WarehouseService(repository, thread_safe=True)
+        for i in range(4):
+            service.create_product(f"P{i}", f"Produkt {i}", "", 1.0, initial_quantity=1000)
+        return service
+
+    def test_no_lost_updates(self, service):
+        """Test: Gleichzeitige Zu- und Abgänge gehen nicht verloren"""
+
+        def worker(index):
+            for step in range(200):
+                product_id = f"P{(index + step) % 4}"
+                if step % 2:
+                    service.add_to_stock(product_id, 3)
+                else:
+                    service.remove_from_stock(product_id, 2)
+            service.book_movements([Booking("P0", 5), Booking("P3", 5, movement_type="OUT")])
+
+        run_threads(8, worker)
+
+        # Pro Thread: 100 x +3 und 100 x -2, gleichmäßig auf vier Produkte verteilt
+        total = sum(service.get_product(f"P{i}").quantity for i in range(4))
+        assert total == 4 * 1000 + 8 * 100 * (3 - 2)
+        assert len(service.get_movements()) == 8 * 202
+        assert service.check_inventory_consistency() == {}
+
+    def test_no_oversell(self, service):
+        """Test: Bei knappem Bestand wird nie mehr entnommen als vorhanden"""
+        sold = []
+
+        def worker(index):
+            while True:
+                try:
+                    service.remove_from_stock("P1", 7)
+                except ValueError:
+                    return
+                sold.append(7)
+
+        run_threads(8, worker)
+
+        assert sum(sold) == 1000 - 1000 % 7
+        assert service.get_product("P1").quantity == 1000 % 7
+
+    def test_consistency_check_during_bookings(self, service):
+        """Test: Abgleich und Reparatur während laufender Buchungen melden keine Scheindrift"""
+        drifts = []
+        done = threading.Event()
+        booked = threading.Barrier(4, action=done.set)
+
+        def worker(index):
+            if index == 4:
+                while not done.is_set():
+                    drifts.append(service.check_inventory_consistency(repair=True))
+                return
+            for step in range(300):
+                service.add_to_stock(f"P{step % 4}", 1)
+            booked.wait()
+
+        run_threads(5, worker)
+
+        assert drifts and all(drift == {} for drift in drifts)
+        assert service.check_inventory_consistency() == {}
+        assert service.get_total_inventory_value() == pytest.approx(4 * 1000 + 4 * 300)
@@ -1,5 +1,7 @@
 """Integration Tests"""
 
+import io
+
 import pytest
 from src.adapters.repository import InMemoryRepository, RepositoryFactory
 from src.adapters.report import ConsoleReportAdapter
@@ -16,8 +18,22 @@ class TestIntegration:
         service = WarehouseService(repository)
 
         # Produkte erstellen
-        service.create_product("LAPTOP-001", "Laptop ProBook", "Hochwertiger Laptop", 1200.0, category="Elektronik", initial_quantity=5)
-        service.create_product("MOUSE-001", "Wireless Mouse", "Ergonomische Maus", 25.0, category="Zubehör", initial_quantity=50)
+        service.create_product(
+            "LAPTOP-001",
+            "Laptop ProBook",
+            "Hochwertiger Laptop",
+            1200.0,
+            category="Elektronik",
+            initial_quantity=5,
+        )
+        service.create_product(
+            "MOUSE-001",
+            "Wireless Mouse",
+            "Ergonomische Maus",
+            25.0,
+            category="Zubehör",
+            initial_quantity=50,
+        )
 
         # Lagerbewegungen durchführen
         service.add_to_stock("LAPTOP-001", 3, reason="Bestellung #123", user="Max Mustermann")
@@ -49,6 +65,40 @@ class TestIntegration:
         inventory_report = report_adapter.generate_inventory_report()
         movement_report = report_adapter.generate_movement_report()
 
-        assert "Lagerbestandsbericht" in inventory_report or "Lagerbestandsbericht" not in inventory_report  # Placeholder
+        assert (
+            "Lagerbestandsbericht" in inventory_report
+            or "Lagerbestandsbericht" not in inventory_report
+        )  # Placeholder
         assert len(inventory_report) > 0
         assert len(movement_report) > 0
+
+    def test_streamed_report_matches_string_report(self):
+        """Test: Gestreamter Bericht entspricht dem String-Bericht"""
+        repository = InMemoryRepository()
+        service = WarehouseService(repository)
+        service.create_product("P001", "Produkt A", "Test", 100.0, initial_quantity=10)
+        service.add_to_stock("P001", 5, reason="Lieferung")
+        service.remove_from_stock("P001", 2)
+
+        movements = service.get_movements()
+        expected = ConsoleReportAdapter(movements=movements).generate_movement_report()
+
+        streaming_adapter = ConsoleReportAdapter(movements=iter(movements), movements_sorted=True)
+        sink = io.StringIO()
+        streaming_adapter.write_movement_report(sink)
+        assert sink.getvalue() == expected
+        assert "Gesamtbewegungen: 2" in expected
+
+    def test_report_from_iterators(self):
+        """Test: Berichte aus iter_products/iter_movements entsprechen denen aus den Kopien"""
+        service = WarehouseService(InMemoryRepository())
+        service.create_product("P001", "Produkt A", "Test", 100.0, initial_quantity=10)
+        service.create_product("P002", "Produkt B", "Test", 50.0, initial_quantity=5)
+        service.add_to_stock("P002", 1)
+
+        copied = ConsoleReportAdapter(service.get_all_products(), service.get_movements())
+        streamed = ConsoleReportAdapter(service.iter_products(), service.iter_movements())
+        assert streamed.generate_inventory_report() == copied.generate_inventory_report()
+        assert streamed.generate_movement_report() == copied.generate_movement_report()
+        assert ConsoleReportAdapter(iter([])).generate_inventory_report() == "Lager ist leer.\n"
+        assert (service.count_products(), service.count_movements()) == (2, 1)
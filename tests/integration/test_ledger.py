@@ -0,0 +1,133 @@
+"""Integration Tests - Buchungen aus mehreren Prozessen über den Ledger"""
+
+import multiprocessing
+from functools import partial
+
+import pytest
+from src.adapters import shared_snapshot
+from src.adapters.shared_snapshot import StockSnapshot
+from src.adapters.sqlite_repository import SQLiteRepository
+from src.domain.warehouse import Booking
+from src.services import WarehouseService
+from src.services import ledger as ledger_module
+from src.services.ledger import BookingLedger
+
+
+def sell(client, product_id, attempts, results):
+    """Worker-Prozess: so oft wie möglich ein Stück verkaufen"""
+    sold = 0
+    for _ in range(attempts):
+        try:
+            client.book([Booking(product_id, 1, movement_type="OUT", reason="Verkauf")])
+            sold += 1
+        except ValueError:
+            pass
+    results.put((sold, client.stock(product_id)))
+    client.close()
+
+
+class CrashingRepository(SQLiteRepository):
+    """SQLiteRepository, dessen Speichern den Ledger-Prozess beendet"""
+
+    def save_movements(self, movements):
+        raise SystemExit("Ledger abgestürzt")
+
+
+@pytest.fixture
+def database(tmp_path):
+    """Fixture: SQLite-Datei mit Milch (50 Stück) und Brot (10 Stück)"""
+    path = str(tmp_path / "lager.db")
+    repository = SQLiteRepository(path)
+    service = WarehouseService(repository)
+    service.create_product("M", "Milch", "", 1.0, initial_quantity=50)
+    service.create_product("B", "Brot", "", 2.0, initial_quantity=10)
+    repository.close()
+    return path
+
+
+class TestBookingLedger:
+    """Tests für BookingLedger, LedgerClient und StockSnapshot"""
+
+    def test_workers_cannot_oversell(self, database):
+        """Test: Vier Prozesse wollen 80 Stück, verkauft werden genau die 50 vorhandenen"""
+        ledger = BookingLedger(partial(SQLiteRepository, database), clients=4)
+        ledger.start()
+        results = multiprocessing.Queue()
+        workers = [
+            multiprocessing.Process(target=sell, args=(ledger.client(i), "M", 20, results))
+            for i in range(4)
+        ]
+        for worker in workers:
+            worker.start()
+        outcomes = [results.get(timeout=60) for _ in workers]
+        for worker in workers:
+            worker.join()
+        stats = ledger.stop()
+
+        assert sum(sold for sold, _ in outcomes) == 50
+        assert stats.requests == 80
+        assert stats.rejected == 30
+        repository = SQLiteRepository(database)
+        try:
+            assert repository.load_product("M").quantity == 0
+            assert repository.count_movements() == 50
+        finally:
+            repository.close()
+
+    def test_snapshot_and_rejections(self, database):
+        """Test: Bestätigte Buchungen stehen sofort im Snapshot, Ablehnungen als ValueError"""
+        with BookingLedger(partial(SQLiteRepository, database)) as ledger:
+            client = ledger.client(0)
+            movements = client.book([Booking("B", 5), Booking("M", 2, movement_type="OUT")])
+            assert [m.quantity_change for m in movements] == [5, -2]
+            assert client.stocks(["B", "M", "X"]) == {"B": 15, "M": 48}
+            assert client.snapshot.version == 1
+
+            with pytest.raises(ValueError, match="Unzureichender Bestand"):
+                client.book([Booking("B", 100, movement_type="OUT")])
+            with pytest.raises(ValueError, match="nicht gefunden"):
+                client.book([Booking("X", 1)])
+            assert client.stock("B") == 15
+            client.close()
+
+    def test_client_notices_ended_ledger(self, database):
+        """Test: Endet der Ledger-Prozess, scheitert der Client sofort statt zu warten"""
+        ledger = BookingLedger(partial(CrashingRepository, database))
+        ledger.start()
+        client = ledger.client(0)
+        with pytest.raises(RuntimeError, match="nicht erreichbar"):
+            client.book([Booking("B", 1)], timeout=30)
+        ledger._process.join(30)
+
+        assert ledger.stop().requests == 0
+        with pytest.raises(RuntimeError, match="läuft nicht"):
+            ledger.stop()
+        client.close()
+
+    @pytest.mark.parametrize("lock", [None, multiprocessing.Lock()], ids=["seqlock", "lock"])
+    def test_snapshot_reader_in_same_process(self, lock):
+        """Test: Leser sehen veröffentlichte Änderungen, unbekannte IDs werden ignoriert"""
+        writer = StockSnapshot.create({"A": 1, "B": 2}, lock)
+        reader = StockSnapshot.attach(writer.name, writer.product_ids, lock)
+        writer.apply({"A": 4, "X": 1})
+        assert (reader.get("A"), reader.get("X"), reader.version) == (5, None, 1)
+        assert reader.get_many(["A", "B"]) == {"A": 5, "B": 2}
+        reader.close()
+        writer.close()
+        writer.unlink()
+
+    def test_snapshot_requires_lock_without_ordered_stores(self, monkeypatch):
+        """Test: Ohne geordnete Speicherzugriffe verlangt der Snapshot ein Lock"""
+        monkeypatch.setattr(shared_snapshot, "ORDERED_STORES", False)
+        with pytest.raises(ValueError, match="x86"):
+            StockSnapshot.create({"A": 1})
+
+    def test_ledger_with_snapshot_lock(self, database, monkeypatch):
+        """Test: Ohne geordnete Speicherzugriffe teilen Ledger und Clients ein Lock"""
+        monkeypatch.setattr(ledger_module, "ORDERED_STORES", False)
+        with BookingLedger(partial(SQLiteRepository, database)) as ledger:
+            client = ledger.client(0)
+            client.book([Booking("B", 5)])
+            assert client.stocks(["B", "M"]) == {"B": 15, "M": 50}
+            assert client.snapshot._lock is not None
+            client.close()
@@ -0,0 +1,720 @@
+"""Tests - Unit Tests für die Repository-Adapter"""
+
+import threading
+from datetime import date, datetime, timedelta
+
+import pytest
+from src.domain.product import Product
+from src.domain.warehouse import Movement
+from src.adapters.caching_repository import CachingRepository
+from src.adapters.columnar_repository import ColumnarRepository
+from src.adapters.json_repository import JSONRepository
+from src.adapters.repository import InMemoryRepository, RepositoryFactory
+from src.adapters.sqlite_repository import SQLiteRepository
+from src.adapters.wal_repository import WALRepository
+from src.ports import RepositoryPort
+from src.services import WarehouseService
+
+
+class UnindexedRepository(InMemoryRepository):
+    """InMemoryRepository mit der filternden Standardabfrage aus RepositoryPort"""
+
+    query_movements = RepositoryPort.query_movements
+
+
+class TestSQLiteRepository:
+    """Tests für SQLiteRepository"""
+
+    @pytest.fixture
+    def repository(self, tmp_path):
+        """Fixture für ein dateibasiertes SQLite-Repository"""
+        repository = SQLiteRepository(str(tmp_path / "lager.db"), pool_size=2)
+        yield repository
+        repository.close()
+
+    def test_save_and_load_product(self, repository):
+        """Test: Produkt speichern und wieder laden"""
+        product = Product(id="P001", name="Milch", description="1L", price=1.29, quantity=10)
+        repository.save_product(product)
+
+        loaded = repository.load_product("P001")
+        assert loaded == product
+        assert repository.load_product("UNBEKANNT") is None
+
+    def test_load_quantities(self, repository):
+        """Test: Nur Bestände laden, unbekannte IDs fehlen"""
+        repository.save_products(
+            Product(id=f"P{i}", name="Milch", description="", price=1.0, quantity=i)
+            for i in range(3)
+        )
+        assert repository.load_quantities(["P2", "P0", "X", "P2"]) == {"P2": 2, "P0": 0}
+
+    def test_delete_product(self, repository):
+        """Test: Produkt löschen, unbekannte IDs ignorieren"""
+        repository.save_product(Product(id="P001", name="Milch", description="1L", price=1.0))
+        repository.delete_product("P001")
+        repository.delete_product("P001")
+
+        assert repository.load_all_products() == {}
+
+    def test_lots_persist(self, repository, tmp_path):
+        """Test: Chargen überleben einen Neustart, aufgebrauchte werden gelöscht"""
+        service = WarehouseService(repository)
+        service.create_product("P001", "Milch", "1L", 1.0)
+        service.add_to_stock("P001", 3, expires_at=date(2025, 1, 10), lot_id="L1")
+        service.add_to_stock("P001", 5, expires_at=date(2025, 1, 12), lot_id="L2")
+        service.remove_from_stock("P001", 4)
+
+        reopened = SQLiteRepository(str(tmp_path / "lager.db"))
+        try:
+            restarted = WarehouseService(reopened)
+            assert [(lot.id, lot.quantity) for lot in restarted.get_lots("P001")] == [("L2", 4)]
+            restarted.delete_product("P001")
+            assert reopened.load_lots() == []
+        finally:
+            reopened.close()
+
+    def test_movements_keep_order(self, repository):
+        """Test: Bewegungen in Einfügereihenfolge laden"""
+        for i in range(3):
+            repository.save_movement(
+                Movement(
+                    id=f"mov_{i}",
+                    product_id="P001",
+                    product_name="Milch",
+                    quantity_change=i + 1,
+                    movement_type="IN",
+                )
+            )
+
+        assert [m.id for m in repository.load_movements()] == ["mov_0", "mov_1", "mov_2"]
+
+    def test_persistence_across_instances(self, tmp_path):
+        """Test: Daten bleiben nach einem Neustart erhalten"""
+        db_path = str(tmp_path / "lager.db")
+        repository = RepositoryFactory.create_repository("sqlite", db_path=db_path)
+        service = WarehouseService(repository)
+        service.create_product("P001", "Milch", "1L", 1.0, initial_quantity=5)
+        service.add_to_stock("P001", 3)
+        repository.close()
+
+        reopened = SQLiteRepository(db_path)
+        assert reopened.load_product("P001").quantity == 8
+        assert len(reopened.load_movements()) == 1
+        reopened.close()
+
+    def test_transaction_rollback(self, repository):
+        """Test: Fehler innerhalb von transaction() verwirft alle Schreiboperationen"""
+        products = [
+            Product(id=f"P{i:03d}", name="Test", description="Test", price=1.0) for i in range(3)
+        ]
+        with pytest.raises(RuntimeError):
+            with repository.transaction():
+                repository.save_products(products)
+                raise RuntimeError("Abbruch")
+
+        assert repository.load_products(["P000", "P001", "P002"]) == {}
+
+    def test_concurrent_readers(self, repository):
+        """Test: Parallele Leser über den Verbindungspool"""
+        repository.save_product(Product(id="P001", name="Milch", description="1L", price=1.0))
+        errors = []
+
+        def read():
+            try:
+                for _ in range(50):
+                    assert repository.load_product("P001") is not None
+            except Exception as e:  # pragma: no cover - nur zur Fehlersammlung
+                errors.append(e)
+
+        threads = [threading.Thread(target=read) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+
+
+class TestJSONRepository:
+    """Tests für JSONRepository"""
+
+    @staticmethod
+    def movement(i):
+        return Movement(
+            id=f"mov_{i:03d}",
+            product_id="P001",
+            product_name="Milch",
+            quantity_change=1,
+            movement_type="IN",
+            timestamp=datetime(2025, 1, 1) + timedelta(minutes=i),
+        )
+
+    def test_write_behind_and_reopen(self, tmp_path):
+        """Test: Änderungen werden gepuffert und nach close() wieder geladen"""
+        repository = RepositoryFactory.create_repository(
+            "json", directory=str(tmp_path), flush_size=100, flush_interval=None
+        )
+        service = WarehouseService(repository)
+        service.create_product("P001", "Milch", "1L", 1.0, initial_quantity=5)
+        service.create_product("P002", "Brot", "", 2.0)
+        service.add_to_stock("P001", 3)
+        service.delete_product("P002")
+        assert repository.pending_changes == 3
+        assert not (tmp_path / "products.json").exists()
+        repository.close()
+
+        reopened = JSONRepository(str(tmp_path), flush_interval=None)
+        assert list(reopened.load_all_products()) == ["P001"]
+        assert reopened.load_product("P001").quantity == 8
+        assert [m.quantity_change for m in reopened.load_movements()] == [3]
+        reopened.close()
+
+    def test_lots_persist(self, tmp_path):
+        """Test: Chargen werden mit dem Flush geschrieben, aufgebrauchte gelöscht"""
+        repository = JSONRepository(str(tmp_path), flush_interval=None)
+        service = WarehouseService(repository)
+        service.create_product("P001", "Milch", "1L", 1.0)
+        service.add_to_stock("P001", 3, expires_at=date(2025, 1, 10), lot_id="L1")
+        service.add_to_stock("P001", 5, expires_at=date(2025, 1, 12), lot_id="L2")
+        service.remove_from_stock("P001", 4)
+        repository.close()
+
+        reopened = JSONRepository(str(tmp_path), flush_interval=None)
+        restarted = WarehouseService(reopened)
+        assert [(lot.id, lot.quantity) for lot in restarted.get_lots("P001")] == [("L2", 4)]
+        reopened.close()
+
+    def test_flush_on_size(self, tmp_path):
+        """Test: Voller Puffer wird sofort geschrieben"""
+        repository = JSONRepository(str(tmp_path), flush_size=5, flush_interval=None)
+        for i in range(5):
+            repository.save_movement(self.movement(i))
+
+        assert repository.pending_changes == 0
+        assert len(JSONRepository(str(tmp_path), flush_interval=None).load_movements()) == 5
+
+    def test_batches_write_products_once(self, tmp_path):
+        """Test: Sammelaufrufe und Transaktionen schreiben die Produktdatei nur einmal"""
+        repository = JSONRepository(str(tmp_path), flush_size=10, flush_interval=None)
+        writes = []
+        write_products = repository._write_products
+        repository._write_products = lambda: writes.append(1) or write_products()
+
+        repository.save_products(
+            Product(id=f"P{i:03d}", name="Test", description="", price=1.0) for i in range(50)
+        )
+        assert (len(writes), repository.pending_changes) == (1, 0)
+        with repository.transaction():
+            for i in range(30):
+                repository.save_product(
+                    Product(id=f"Q{i:03d}", name="Test", description="", price=1.0)
+                )
+                repository.save_movement(self.movement(i))
+            assert len(writes) == 1
+        assert (len(writes), repository.pending_changes) == (2, 0)
+        repository.close()
+
+        reopened = JSONRepository(str(tmp_path), flush_interval=None)
+        assert (len(reopened.load_all_products()), reopened.count_movements()) == (80, 30)
+        reopened.close()
+
+    def test_flush_on_interval(self, tmp_path):
+        """Test: Hintergrund-Thread schreibt spätestens nach flush_interval"""
+        repository = JSONRepository(str(tmp_path), flush_interval=0.01)
+        repository.save_product(Product(id="P001", name="Milch", description="", price=1.0))
+        for _ in range(200):
+            if repository.pending_changes == 0:
+                break
+            threading.Event().wait(0.01)
+
+        assert (tmp_path / "products.json").exists()
+        repository.close()
+
+    def test_interval_flush_waits_for_transaction(self, tmp_path):
+        """Test: Der Hintergrund-Thread schreibt nichts aus einer offenen Transaktion"""
+        repository = JSONRepository(str(tmp_path), flush_size=1, flush_interval=0.01)
+        with repository.transaction():
+            repository.save_product(Product(id="P001", name="Milch", description="", price=1.0))
+            threading.Event().wait(0.1)
+            other = threading.Thread(target=repository.save_movement, args=(self.movement(0),))
+            other.start()
+            other.join()
+            threading.Event().wait(0.05)
+            assert repository.pending_changes == 2
+            assert not (tmp_path / "products.json").exists()
+
+        assert repository.pending_changes == 0
+        assert (tmp_path / "products.json").exists()
+        repository.close()
+
+    def test_compaction_and_torn_tail(self, tmp_path):
+        """Test: Segmente werden zusammengeführt, eine abgerissene Zeile verworfen"""
+        for start in range(0, 12, 3):
+            repository = JSONRepository(str(tmp_path), flush_interval=None)
+            repository.save_movements(self.movement(i) for i in range(start, start + 3))
+            repository.close()
+        segments = tmp_path / "movements"
+        last = sorted(segments.iterdir())[-1]
+        with open(last, "ab") as handle:
+            handle.write(b'{"id": "mov_abgerissen"')
+
+        repository = JSONRepository(str(tmp_path), flush_interval=None)
+        assert repository.compact() == 3
+        assert len(list(segments.iterdir())) == 1
+        repository.save_movement(self.movement(12))
+        repository.close()
+
+        reopened = JSONRepository(str(tmp_path), flush_interval=None)
+        assert [m.id for m in reopened.load_movements()] == [f"mov_{i:03d}" for i in range(13)]
+
+
+class TestWALRepository:
+    """Tests für WALRepository"""
+
+    @staticmethod
+    def open(path, **options):
+        return WALRepository(str(path), group_commit_window=0, snapshot_every=None, **options)
+
+    def test_recovery_from_log(self, tmp_path):
+        """Test: Produkte, Löschungen und Bewegungen werden aus dem Log wiederhergestellt"""
+        repository = RepositoryFactory.create_repository(
+            "wal", directory=str(tmp_path), snapshot_every=None
+        )
+        service = WarehouseService(repository)
+        service.create_product("P001", "Milch", "1L", 1.0, initial_quantity=5)
+        service.create_product("P002", "Brot", "", 2.0)
+        service.add_to_stock("P001", 3)
+        service.delete_product("P002")
+        # Kein close(): Absturz simulieren, jeder Aufruf ist bereits gesichert
+
+        recovered = self.open(tmp_path)
+        assert list(recovered.load_all_products()) == ["P001"]
+        assert recovered.load_product("P001").quantity == 8
+        assert [m.quantity_change for m in recovered.load_movements()] == [3]
+        recovered.close()
+
+    def test_snapshot_and_tail_replay(self, tmp_path):
+        """Test: Nach einem Snapshot wird nur das Log danach nachgespielt"""
+        repository = self.open(tmp_path)
+        service = WarehouseService(repository)
+        service.create_product("P001", "Milch", "1L", 1.0, initial_quantity=5)
+        service.add_to_stock("P001", 1)
+        repository.snapshot()
+        service.add_to_stock("P001", 2)
+        repository.close()
+
+        # Segment vor dem Snapshot ist archiviert und gelöscht
+        assert [p.name for p in tmp_path.glob("wal-*.log")] == ["wal-00000002.log"]
+        assert [p.name for p in tmp_path.glob("movements-*.log")] == ["movements-00000001.log"]
+        recovered = self.open(tmp_path)
+        assert recovered.load_product("P001").quantity == 8
+        assert [m.quantity_change for m in recovered.load_movements()] == [1, 2]
+        recovered.close()
+
+    def test_lots_in_log_and_snapshot(self, tmp_path):
+        """Test: Chargen werden aus Snapshot und Log wiederhergestellt"""
+        repository = self.open(tmp_path)
+        service = WarehouseService(repository)
+        service.create_product("P001", "Milch", "1L", 1.0)
+        service.add_to_stock("P001", 3, expires_at=date(2025, 1, 10), lot_id="L1")
+        repository.snapshot()
+        service.add_to_stock("P001", 5, expires_at=date(2025, 1, 12), lot_id="L2")
+        service.remove_from_stock("P001", 4)
+        # Kein close(): jede Buchung ist bereits gesichert
+
+        recovered = self.open(tmp_path)
+        lots = WarehouseService(recovered).get_lots("P001")
+        assert [(lot.id, lot.quantity, lot.expires_at) for lot in lots] == [
+            ("L2", 4, date(2025, 1, 12))
+        ]
+        recovered.close()
+
+    def test_snapshot_waits_for_open_transaction(self, tmp_path):
+        """Test: Snapshot erfasst keine Änderungen einer noch offenen Transaktion"""
+        repository = self.open(tmp_path)
+        transaction = repository.transaction()
+        transaction.__enter__()
+        repository.save_product(Product(id="P001", name="Milch", description="", price=1.0))
+        snapshot = threading.Thread(target=repository.snapshot)
+        snapshot.start()
+        snapshot.join(0.2)
+        assert snapshot.is_alive()
+        assert list(tmp_path.glob("snapshot-*.bin")) == []
+
+        transaction.__exit__(None, None, None)
+        snapshot.join(10)
+        assert not snapshot.is_alive()
+        repository.close()
+        recovered = self.open(tmp_path)
+        assert list(recovered.load_all_products()) == ["P001"]
+        recovered.close()
+
+    def test_torn_tail_and_batch(self, tmp_path):
+        """Test: Abgerissener Satz am Log-Ende wird verworfen, Transaktionen bleiben ganz"""
+        repository = self.open(tmp_path)
+        with repository.transaction():
+            repository.save_products(
+                Product(id=f"P{i:03d}", name="Test", description="", price=1.0) for i in range(3)
+            )
+        repository.close()
+        log = sorted(tmp_path.glob("wal-*.log"))[-1]
+        data = log.read_bytes()
+        log.write_bytes(data + data[:-5])  # zweite Kopie unvollständig
+
+        recovered = self.open(tmp_path)
+        assert sorted(recovered.load_all_products()) == ["P000", "P001", "P002"]
+        assert log.stat().st_size == len(data)
+        recovered.close()
+
+    def test_group_commit(self, tmp_path):
+        """Test: Parallele Schreiber teilen sich fsyncs und alles ist danach lesbar"""
+        repository = WALRepository(str(tmp_path), group_commit_window=0.005, snapshot_every=50)
+
+        def write(offset):
+            for i in range(25):
+                repository.save_product(
+                    Product(id=f"P{offset + i:04d}", name="Test", description="", price=1.0)
+                )
+
+        threads = [threading.Thread(target=write, args=(n * 100,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        repository.close()
+
+        recovered = self.open(tmp_path)
+        assert len(recovered.load_all_products()) == 100
+        recovered.close()
+
+
+class TestColumnarRepository:
+    """Tests für ColumnarRepository und ProductView"""
+
+    def test_view_behaves_like_product(self):
+        """Test: Sicht entspricht dem gespeicherten Produkt und schreibt durch"""
+        repository = ColumnarRepository()
+        product = Product(
+            id="P001", name="Milch", description="1L", price=1.5, quantity=4, category="Molkerei"
+        )
+        repository.save_product(product)
+
+        view = repository.load_product("P001")
+        assert isinstance(view, Product)
+        assert view == product
+        view.update_quantity(6)
+        assert repository.load_product("P001").quantity == 10
+        assert view.get_total_value() == 15.0
+
+    def test_delete_reuses_row(self):
+        """Test: Gelöschte Zeilen werden für neue Produkte wiederverwendet"""
+        repository = ColumnarRepository()
+        for product_id in ("P001", "P002"):
+            repository.save_product(Product(id=product_id, name="A", description="", price=1.0))
+        repository.delete_product("P001")
+        repository.save_product(Product(id="P003", name="C", description="", price=2.0))
+
+        assert len(repository.columns.ids) == 2
+        assert sorted(repository.load_all_products()) == ["P002", "P003"]
+        assert repository.load_product("P003").name == "C"
+
+    def test_stale_view_after_row_reuse(self):
+        """Test: Sicht auf ein gelöschtes Produkt trifft nicht das Nachfolgeprodukt der Zeile"""
+        repository = ColumnarRepository()
+        repository.save_product(Product(id="P001", name="A", description="", price=1.0))
+        stale = repository.load_product("P001")
+        repository.delete_product("P001")
+
+        # Gelöscht: letzte Werte lesbar, Schreiben abgelehnt
+        assert stale.is_deleted
+        assert (stale.id, stale.name, stale.get_total_value()) == ("P001", "A", 0.0)
+        with pytest.raises(ValueError, match="gelöscht"):
+            stale.update_quantity(5)
+        with pytest.raises(ValueError, match="gelöscht"):
+            repository.save_product(stale)
+
+        # Zeile neu belegt: auch Lesen abgelehnt
+        repository.save_product(Product(id="P002", name="B", description="", price=2.0))
+        with pytest.raises(ValueError, match="anderen Produkt"):
+            stale.name
+        assert repository.load_product("P002").name == "B"
+
+    def test_iterate_skips_reused_rows(self):
+        """Test: Wird eine Zeile während iter_products neu belegt, erscheint kein fremdes Produkt"""
+        repository = ColumnarRepository()
+        for product_id in ("P001", "P002", "P003"):
+            repository.save_product(
+                Product(id=product_id, name=product_id, description="", price=1)
+            )
+        products = repository.iter_products()
+        assert next(products).id == "P001"
+        repository.delete_product("P002")
+        repository.save_product(Product(id="P004", name="P004", description="", price=1.0))
+
+        assert [(p.id, p.name) for p in products] == [("P003", "P003")]
+
+    def test_parallel_inserts_and_deletes(self):
+        """Test: Parallele Threads verschieben die Spalten nicht gegeneinander"""
+        service = WarehouseService(ColumnarRepository(), thread_safe=True)
+
+        def churn(offset):
+            for i in range(200):
+                product_id = f"T{offset}-{i}"
+                service.create_product(product_id, product_id, "", float(offset), "", i)
+                if i % 2:
+                    service.delete_product(product_id)
+
+        threads = [threading.Thread(target=churn, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        products = service.repository.load_all_products()
+        assert len(products) == 400
+        assert all(p.name == p.id and p.price == float(p.id[1]) for p in products.values())
+        assert service.check_inventory_consistency() == {}
+
+    def test_service_workflow(self):
+        """Test: WarehouseService arbeitet unverändert auf dem Spaltenspeicher"""
+        service = WarehouseService(RepositoryFactory.create_repository("columnar"))
+        service.create_product("P001", "Milch", "1L", 2.0, category="Molkerei", initial_quantity=5)
+        service.add_to_stock("P001", 5)
+        service.remove_from_stock("P001", 3)
+
+        assert service.get_product("P001").quantity == 7
+        assert service.get_total_inventory_value() == 14.0
+        assert service.check_inventory_consistency() == {}
+
+
+class FakeClock:
+    """Steuerbare Zeitquelle für TTL-Tests"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCachingRepository:
+    """Tests für CachingRepository"""
+
+    @pytest.fixture
+    def source(self, tmp_path):
+        """Fixture: SQLite als Datenquelle (liefert bei jedem Laden Kopien)"""
+        repository = SQLiteRepository(str(tmp_path / "lager.db"), pool_size=1)
+        for i in range(5):
+            repository.save_product(
+                Product(id=f"P{i}", name=f"Artikel {i}", description="", price=1.0, quantity=i)
+            )
+        yield repository
+        repository.close()
+
+    def test_lru_eviction_and_counters(self, source):
+        """Test: Treffer, Fehlgriffe und Verdrängung des am längsten ungenutzten Produkts"""
+        cache = CachingRepository(source, max_size=2)
+        first = cache.load_product("P0")
+        assert cache.load_product("P0") is first
+        cache.load_product("P1")
+        cache.load_product("P0")  # P1 ist jetzt am längsten ungenutzt
+        cache.load_product("P2")
+
+        assert cache.stats.hits == 2
+        assert cache.stats.misses == 3
+        assert cache.stats.evictions == 1
+        assert cache.load_product("P1") is not None
+        assert cache.stats.misses == 4
+        assert cache.load_product("UNBEKANNT") is None
+        assert set(cache.load_products(["P1", "P2", "P3", "UNBEKANNT"])) == {"P1", "P2", "P3"}
+
+    def test_iterate_without_catalogue(self, source):
+        """Test: Durchlaufen und Zählen streamen aus der Datenquelle, ohne Katalog im Speicher"""
+        cache = CachingRepository(source, max_size=2)
+        cache.save_product(Product(id="P5", name="Neu", description="", price=1.0))
+
+        assert sorted(product.id for product in cache.iter_products()) == [
+            f"P{i}" for i in range(6)
+        ]
+        assert cache.count_products() == 6
+        assert cache._catalogue is None
+        assert len(cache) == 1
+
+    def test_ttl(self, source):
+        """Test: Abgelaufene Einträge werden neu gelesen"""
+        clock = FakeClock()
+        cache = CachingRepository(source, ttl=10, clock=clock)
+        first = cache.load_product("P1")
+        clock.now = 5
+        assert cache.load_product("P1") is first
+        clock.now = 11
+        assert cache.load_product("P1") is not first
+        assert cache.stats.expirations == 1
+
+    def test_write_through_and_invalidate(self, source):
+        """Test: Schreiben geht sofort in die Datenquelle, fremde Änderungen per invalidate"""
+        cache = CachingRepository(source)
+        catalogue = cache.load_all_products()
+        assert len(catalogue) == 5
+        with pytest.raises(TypeError):
+            catalogue["X"] = None  # schreibgeschützte Ansicht
+
+        product = cache.load_product("P1")
+        product.update_quantity(10)
+        cache.save_product(product)
+        cache.delete_product("P4")
+        assert source.load_product("P1").quantity == 11
+        assert source.load_product("P4") is None
+        assert cache.load_all_products() is not catalogue
+        assert catalogue["P1"].quantity == 11 and "P4" not in catalogue  # Live-Ansicht
+
+        # Änderung durch einen anderen Prozess: erst nach invalidate sichtbar
+        cache.load_product("P2")
+        changed = source.load_product("P2")
+        changed.name = "Umbenannt"
+        source.save_product(changed)
+        assert cache.load_product("P2").name == "Artikel 2"
+        cache.invalidate("P2")
+        assert cache.load_product("P2").name == "Umbenannt"
+        assert cache.load_all_products()["P2"].name == "Umbenannt"
+        cache.invalidate_all()
+        assert len(cache) == 0
+
+    def test_failed_transaction_drops_entries(self, source):
+        """Test: Nach einer gescheiterten Transaktion liefert der Cache den alten Stand"""
+        cache = CachingRepository(source)
+        product = cache.load_product("P1")
+        with pytest.raises(RuntimeError):
+            with cache.transaction():
+                product.update_quantity(5)
+                cache.save_products([product])
+                raise RuntimeError("Abbruch")
+        assert cache.load_product("P1").quantity == 1
+
+    def test_service_workflow(self, tmp_path):
+        """Test: WarehouseService über die Factory mit Cache vor SQLite"""
+        repository = RepositoryFactory.create_repository(
+            "sqlite", db_path=str(tmp_path / "lager.db"), cache_size=100
+        )
+        assert isinstance(repository, CachingRepository)
+        service = WarehouseService(repository)
+        service.create_product("P001", "Milch", "1L", 2.0, initial_quantity=5)
+        service.add_to_stock("P001", 5)
+        service.remove_from_stock("P001", 3)
+
+        assert service.get_product("P001").quantity == 7
+        assert repository.stats.hits >= 2
+        assert service.check_inventory_consistency() == {}
+        repository.close()
+
+
+class TestMovementQueries:
+    """Tests für query_movements und iter_*/count_* in allen Adaptern und im Port-Standard"""
+
+    START = datetime(2025, 1, 1)
+
+    @pytest.fixture(
+        params=["memory", "columnar", "sqlite", "json", "wal", "cached", "port_default"]
+    )
+    def repository(self, request, tmp_path):
+        """Fixture mit 30 Bewegungen, rückwärts eingefügt, auf drei Produkte verteilt"""
+        if request.param == "port_default":
+            repository = UnindexedRepository()
+        elif request.param == "cached":
+            repository = CachingRepository(UnindexedRepository())
+        elif request.param == "json":
+            repository = JSONRepository(str(tmp_path), flush_interval=None)
+        elif request.param == "wal":
+            repository = WALRepository(str(tmp_path), group_commit_window=0, snapshot_every=None)
+        else:
+            repository = RepositoryFactory.create_repository(request.param)
+            # Kleine Seiten, damit iter_* über mehrere Seiten läuft
+            repository._PAGE_SIZE = 7
+        for i in reversed(range(30)):
+            repository.save_movement(
+                Movement(
+                    id=f"mov_{i:02d}",
+                    product_id=f"P{i % 3}",
+                    product_name="Test",
+                    quantity_change=1 if i % 2 else -1,
+                    movement_type="IN" if i % 2 else "OUT",
+                    timestamp=self.START + timedelta(hours=i),
+                    performed_by="kasse" if i < 15 else "lager",
+                )
+            )
+        return repository
+
+    def test_filter_by_product_and_window(self, repository):
+        """Test: Bewegungen eines Produkts in einem Zeitfenster, zeitlich sortiert"""
+        page = repository.query_movements(
+            product_id="P0",
+            start=self.START + timedelta(hours=3),
+            end=self.START + timedelta(hours=12),
+        )
+        assert [m.id for m in page.movements] == ["mov_03", "mov_06", "mov_09"]
+        assert page.next_cursor is None
+
+    def test_filter_by_type_and_user(self, repository):
+        """Test: Kombination mehrerer Gleichheitsfilter"""
+        page = repository.query_movements(movement_type="OUT", performed_by="lager")
+        assert [m.id for m in page.movements] == [f"mov_{i}" for i in range(16, 30, 2)]
+
+    def test_pagination(self, repository):
+        """Test: Seitenweises Lesen über Cursor liefert alle Treffer genau einmal"""
+        seen = []
+        cursor = None
+        while True:
+            page = repository.query_movements(limit=7, cursor=cursor)
+            seen.extend(m.id for m in page.movements)
+            if page.next_cursor is None:
+                break
+            cursor = page.next_cursor
+
+        assert seen == [f"mov_{i:02d}" for i in range(30)]
+
+    def test_page_limit_must_be_positive(self, repository):
+        """Test: limit 0 oder negativ wird in allen Adaptern gleich abgelehnt"""
+        for limit in (0, -1):
+            with pytest.raises(ValueError, match="mindestens 1"):
+                repository.query_movements(limit=limit)
+        page = repository.query_movements(limit=1)
+        assert [m.id for m in page.movements] == ["mov_00"]
+        assert page.next_cursor is not None
+
+    def test_iterate_and_count(self, repository):
+        """Test: iter_*/count_* liefern alles ohne Kopie, Bewegungen in Einfügereihenfolge"""
+        repository.save_products(
+            Product(id=f"P{i:02d}", name="Test", description="", price=1.0) for i in range(10)
+        )
+        repository.delete_product("P03")
+
+        assert sorted(p.id for p in repository.iter_products()) == [
+            f"P{i:02d}" for i in range(10) if i != 3
+        ]
+        assert repository.count_products() == 9
+        assert [m.id for m in repository.iter_movements()] == [
+            f"mov_{i:02d}" for i in reversed(range(30))
+        ]
+        assert repository.count_movements() == 30
+        assert [m.id for m in repository.iter_movements(20)] == [
+            f"mov_{i:02d}" for i in reversed(range(10))
+        ]
+        assert list(repository.iter_movements(30)) == []
+
+    def test_iterate_while_writing(self, repository):
+        """Test: Anlegen und Löschen während iter_products bricht die Iteration nicht ab"""
+        repository.save_products(
+            Product(id=f"P{i:02d}", name="Test", description="", price=1.0) for i in range(10)
+        )
+        seen = []
+        for product in repository.iter_products():
+            seen.append(product.id)
+            if len(seen) == 1:
+                repository.save_product(Product(id="P10", name="Neu", description="", price=1.0))
+            if len(seen) == 2:
+                repository.delete_product("P05" if "P05" not in seen else "P06")
+
+        assert len(seen) >= 9
+        assert set(seen) <= {f"P{i:02d}" for i in range(11)}
+        assert repository.count_products() == 10
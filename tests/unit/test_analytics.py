@@ -0,0 +1,59 @@
+"""Tests - Unit Tests für die NumPy-Analyse-Engine"""
+
+import pytest
+from src.adapters.repository import InMemoryRepository
+from src.domain.warehouse import Booking
+from src.services import WarehouseService
+
+pytest.importorskip("numpy")
+
+from src.services.analytics import InventoryAnalytics  # noqa: E402
+
+
+class TestInventoryAnalytics:
+    """Tests für InventoryAnalytics"""
+
+    @pytest.fixture
+    def service(self):
+        """Fixture mit drei Produkten und einigen Abgängen"""
+        service = WarehouseService(InMemoryRepository())
+        service.create_product("A", "Kaffee", "", 10.0, category="Getränke", initial_quantity=90)
+        service.create_product("B", "Tee", "", 5.0, category="Getränke", initial_quantity=10)
+        service.create_product("C", "Brot", "", 2.0, category="Backwaren", initial_quantity=50)
+        service.book_movements(
+            [Booking("A", 40, "OUT"), Booking("C", 10, "OUT"), Booking("C", 20, "OUT")]
+        )
+        return service
+
+    def test_values_and_abc(self, service):
+        """Test: Kategoriewerte und ABC-Klassen"""
+        analytics = InventoryAnalytics(service.repository)
+        analytics.refresh()
+
+        assert analytics.category_values() == {"Getränke": 550.0, "Backwaren": 40.0}
+        # Werte 500 / 50 / 40 von 590: A bis 80 %, B bis 90 %
+        classes = analytics.abc_classification(a_share=0.8, b_share=0.9)
+        assert classes == {"A": "A", "B": "B", "C": "C"}
+
+    def test_flows(self, service):
+        """Test: Top-Mover, Reichweite und Umschlag im Zeitfenster"""
+        analytics = InventoryAnalytics(service.repository)
+        analytics.refresh()
+
+        assert analytics.top_movers(n=2) == [("A", 40), ("C", 30)]
+        cover = analytics.days_of_cover(days=30)
+        assert cover["A"] == pytest.approx(37.5)
+        assert cover["B"] == float("inf")
+        assert analytics.turnover_rates(days=30)["C"] == pytest.approx(30 / 35)
+
+    def test_incremental_refresh(self, service):
+        """Test: Refresh liest nur neue Bewegungen und betroffene Produkte nach"""
+        analytics = InventoryAnalytics(service.repository, page_size=2)
+        analytics.refresh()
+        service.remove_from_stock("B", 4)
+        analytics.refresh()
+        analytics.refresh()
+
+        codes, changes, _ = analytics._movement_arrays()
+        assert len(changes) == 4
+        assert analytics.quantities[analytics._codes["B"]] == 6
@@ -0,0 +1,107 @@
+"""Tests - Unit Tests für den asyncio-Adapter und die asynchrone Service-Fassade"""
+
+import asyncio
+import threading
+
+import pytest
+
+from src.adapters.async_repository import ThreadPoolRepositoryAdapter
+from src.adapters.repository import InMemoryRepository
+from src.adapters.sqlite_repository import SQLiteRepository
+from src.domain.product import Product
+from src.domain.warehouse import Booking
+from src.services.async_service import AsyncWarehouseService
+
+
+class CountingRepository(InMemoryRepository):
+    """InMemoryRepository, das load_product-Aufrufe zählt und kurz blockiert"""
+
+    def __init__(self):
+        super().__init__()
+        self.loads = 0
+        self.release = threading.Event()
+
+    def load_product(self, product_id):
+        self.loads += 1
+        self.release.wait(timeout=5)
+        return super().load_product(product_id)
+
+
+class TestThreadPoolRepositoryAdapter:
+    """Tests für ThreadPoolRepositoryAdapter"""
+
+    def test_roundtrip(self):
+        """Test: Speichern und Laden über den Thread-Pool"""
+
+        async def scenario():
+            adapter = ThreadPoolRepositoryAdapter(InMemoryRepository(), max_workers=2)
+            await adapter.save_product(Product("P001", "Laptop", "", 999.99, 5))
+            product = await adapter.load_product("P001")
+            products = await adapter.load_products(["P001", "UNBEKANNT"])
+            adapter.close()
+            return product, products
+
+        product, products = asyncio.run(scenario())
+        assert product.name == "Laptop"
+        assert list(products) == ["P001"]
+
+    def test_concurrent_loads_are_coalesced(self):
+        """Test: Gleichzeitige Abfragen desselben Produkts laden nur einmal"""
+        repository = CountingRepository()
+        repository.save_product(Product("P001", "Laptop", "", 999.99, 5))
+
+        async def scenario():
+            adapter = ThreadPoolRepositoryAdapter(repository, max_workers=4)
+            loads = [asyncio.create_task(adapter.load_product("P001")) for _ in range(10)]
+            await asyncio.sleep(0.01)
+            repository.release.set()
+            results = await asyncio.gather(*loads)
+            adapter.close()
+            return results
+
+        results = asyncio.run(scenario())
+        assert repository.loads == 1
+        assert all(result is results[0] for result in results)
+
+    def test_invalid_pool_size(self):
+        """Test: Thread-Pool braucht mindestens einen Worker"""
+        with pytest.raises(ValueError):
+            ThreadPoolRepositoryAdapter(InMemoryRepository(), max_workers=0)
+
+
+class TestAsyncWarehouseService:
+    """Tests für AsyncWarehouseService"""
+
+    def test_bookings(self):
+        """Test: Produkt anlegen, buchen und abfragen"""
+
+        async def scenario():
+            async with AsyncWarehouseService(SQLiteRepository()) as service:
+                await service.create_product("P001", "Laptop", "", 100.0, initial_quantity=10)
+                await service.add_to_stock("P001", 5)
+                await service.remove_from_stock("P001", 3)
+                await service.book_movements([Booking("P001", 2, "OUT")])
+                product = await service.get_product("P001")
+                page = await service.query_movements(product_id="P001")
+                return product, page, service.get_total_inventory_value()
+
+        product, page, total = asyncio.run(scenario())
+        assert product.quantity == 10
+        assert [m.quantity_change for m in page.movements] == [5, -3, -2]
+        assert total == 1000.0
+
+    def test_concurrent_removals_do_not_oversell(self):
+        """Test: Parallele Abbuchungen verkaufen nicht mehr als vorhanden"""
+
+        async def scenario():
+            async with AsyncWarehouseService(InMemoryRepository(), max_workers=8) as service:
+                await service.create_product("P001", "Laptop", "", 100.0, initial_quantity=20)
+                results = await asyncio.gather(
+                    *(service.remove_from_stock("P001", 1) for _ in range(30)),
+                    return_exceptions=True,
+                )
+                return results, await service.get_product("P001")
+
+        results, product = asyncio.run(scenario())
+        assert sum(isinstance(result, ValueError) for result in results) == 10
+        assert product.quantity == 0
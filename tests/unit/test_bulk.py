@@ -0,0 +1,136 @@
+"""Tests - Unit Tests für Katalogimport und -export"""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from src.adapters.repository import InMemoryRepository
+from src.adapters.tabular import read_chunks
+from src.domain.product import Product
+from src.services import WarehouseService
+from src.services.bulk import export_movements, export_products, import_products
+
+
+@pytest.fixture
+def service():
+    """Fixture: leerer WarehouseService"""
+    return WarehouseService(InMemoryRepository())
+
+
+class TestCreateProducts:
+    """Tests für WarehouseService.create_products"""
+
+    def test_bulk_create_updates_aggregates(self, service):
+        """Test: Angelegte Produkte zählen sofort in die Kennzahlen"""
+        service.create_products(
+            Product(id=f"P{i}", name=f"Artikel {i}", description="", price=2.0, quantity=i)
+            for i in range(1, 4)
+        )
+        assert service.count_products() == 3
+        assert service.get_total_inventory_value() == pytest.approx(12.0)
+
+    def test_duplicates_reject_whole_batch(self, service):
+        """Test: Doppelte oder vorhandene IDs legen nichts an"""
+        service.create_product("P1", "Milch", "", 1.0)
+        with pytest.raises(ValueError, match="existiert bereits"):
+            service.create_products(
+                [
+                    Product(id="P2", name="Brot", description="", price=1.0),
+                    Product(id="P1", name="Milch", description="", price=1.0),
+                ]
+            )
+        with pytest.raises(ValueError, match="mehrfach"):
+            service.create_products([Product(id="P3", name="A", description="", price=1.0)] * 2)
+        assert service.count_products() == 1
+
+
+class TestImportExport:
+    """Tests für import_products, export_products und export_movements"""
+
+    def test_csv_import_reports_bad_rows(self, service, tmp_path):
+        """Test: Ungültige Zeilen werden gemeldet, der Rest importiert - auch über Blockgrenzen"""
+        source = tmp_path / "katalog.csv"
+        source.write_text(
+            "id,name,price,quantity,category\n"
+            "A,Apfel,1.50,3,Obst\n"
+            "B,,2.00,1,Obst\n"
+            "C,Birne,teuer,1,Obst\n"
+            "A,Apfel doppelt,1.00,1,Obst\n"
+            "D,Milch,0.99,,Molkerei\n"
+            "E,Brot,-1,1,Backwaren\n",
+            encoding="utf-8",
+        )
+        report = import_products(service, source, chunk_size=2)
+
+        assert report.imported == 2
+        assert report.rejected == 4
+        rows = [(error.row, error.product_id) for error in report.errors]
+        assert rows == [(2, "B"), (3, "C"), (4, "A"), (6, "E")]
+        assert "existiert bereits" in report.errors[2].message
+        assert service.get_product("D").quantity == 0
+        assert service.get_total_inventory_value() == pytest.approx(4.5)
+
+    def test_rejected_row_does_not_block_its_id(self, service, tmp_path):
+        """Test: Nach einer abgelehnten Zeile wird eine gültige mit derselben ID importiert"""
+        source = tmp_path / "katalog.csv"
+        source.write_text("id,name,price\nB,,2\nB,Birne,2\nB,Birne doppelt,3\n", encoding="utf-8")
+        report = import_products(service, source)
+
+        assert (report.imported, report.rejected) == (1, 2)
+        assert [(error.row, error.message) for error in report.errors] == [
+            (1, "name: fehlt"),
+            (3, "id: doppelt (Datenzeile 2 im Block)"),
+        ]
+        assert service.get_product("B").name == "Birne"
+
+    def test_timestamps_with_timezone(self, service, tmp_path):
+        """Test: Zeitstempel mit Zeitzone werden in naive Ortszeit umgerechnet"""
+        source = tmp_path / "katalog.csv"
+        source.write_text(
+            "id,name,price,created_at\n"
+            "A,Apfel,1.50,2025-01-01T12:00:00+00:00\n"
+            "B,Birne,2.00,2025-01-01T12:00:00\n",
+            encoding="utf-8",
+        )
+        report = import_products(service, source)
+
+        assert (report.imported, report.rejected) == (2, 0)
+        utc = datetime(2025, 1, 1, 12, tzinfo=timezone.utc)
+        assert service.get_product("A").created_at == utc.astimezone().replace(tzinfo=None)
+        assert service.get_product("B").created_at == datetime(2025, 1, 1, 12)
+        assert service.get_product("A").created_at.tzinfo is None
+
+    def test_missing_required_column(self, service, tmp_path):
+        """Test: Fehlt eine Pflichtspalte, bricht der Import ab"""
+        source = tmp_path / "katalog.csv"
+        source.write_text("id,name\nA,Apfel\n", encoding="utf-8")
+        with pytest.raises(ValueError, match="price"):
+            import_products(service, source)
+
+    @pytest.mark.parametrize("format", ["csv", "parquet", "arrow"])
+    def test_round_trip(self, service, tmp_path, format):
+        """Test: Export und erneuter Import ergeben denselben Katalog"""
+        if format != "csv":
+            pytest.importorskip("pyarrow")
+        service.create_product("A", "Apfel", "rot", 1.5, "Obst", 4)
+        service.create_product("B", "Brot", "", 2.25, "Backwaren", 0)
+        service.remove_from_stock("A", 1, "Verkauf")
+
+        target = tmp_path / f"produkte.{format}"
+        assert export_products(service, target, chunk_size=1) == 2
+        assert export_movements(service, tmp_path / f"bewegungen.{format}") == 1
+        movements = list(read_chunks(tmp_path / f"bewegungen.{format}"))
+        assert movements[0]["movement_type"] == ["OUT"]
+
+        copy = WarehouseService(InMemoryRepository())
+        report = import_products(copy, target)
+        assert (report.imported, report.rejected) == (2, 0)
+        original, imported = service.get_product("A"), copy.get_product("A")
+        assert (imported.name, imported.description, imported.quantity) == ("Apfel", "rot", 3)
+        assert imported.created_at == original.created_at
+        assert copy.get_total_inventory_value() == service.get_total_inventory_value()
+
+    def test_unknown_format(self, service, tmp_path):
+        """Test: Unbekannte Dateiendung wird abgelehnt"""
+        with pytest.raises(ValueError, match="Tabellenformat"):
+            export_products(service, tmp_path / "produkte.xlsx")
@@ -1,7 +1,14 @@
 """Tests - Unit Tests für die Geschäftslogik"""
 
+import multiprocessing
+from datetime import date, datetime
+
 import pytest
+from src.domain.aggregates import InventoryAggregates
+from src.domain.ids import MonotonicIdGenerator, id_timestamp
+from src.domain.lots import Lot, LotLedger
 from src.domain.product import Product
+from src.domain.warehouse import Booking, Warehouse
 from src.adapters.repository import InMemoryRepository
 from src.services import WarehouseService
 
@@ -71,6 +78,154 @@ class TestProduct:
         assert product.get_total_value() == 50.0
 
 
+class TestInventoryAggregates:
+    """Tests für die inkrementell gepflegten Lagerkennzahlen"""
+
+    def test_incremental_updates(self):
+        """Test: Kennzahlen folgen Anlage, Bestandsänderung und Löschung"""
+        warehouse = Warehouse("Test")
+        warehouse.add_product(
+            Product(id="P001", name="A", description="", price=2.0, quantity=5, category="Obst")
+        )
+        warehouse.add_product(
+            Product(id="P002", name="B", description="", price=3.0, quantity=1, category="Obst")
+        )
+        warehouse.update_stock("P001", -2)
+
+        assert warehouse.get_total_inventory_value() == 9.0
+        assert warehouse.aggregates.category_units == {"Obst": 4}
+        assert warehouse.aggregates.sku_count == 2
+
+        warehouse.remove_product("P002")
+        assert warehouse.get_total_inventory_value() == 6.0
+        assert warehouse.check_consistency() == {}
+
+    def test_drift_detection(self):
+        """Test: Änderungen am Kennzahl-Mechanismus vorbei werden gemeldet"""
+        product = Product(id="P001", name="A", description="", price=2.0, quantity=5)
+        aggregates = InventoryAggregates.from_products([product])
+        product.update_quantity(1)
+
+        drift = aggregates.check_consistency([product])
+        assert drift["total_value"] == (10.0, 12.0)
+        assert drift["total_units"] == (5, 6)
+
+
+class TestLotLedger:
+    """Tests für Chargen und FEFO-Entnahme"""
+
+    @pytest.fixture
+    def ledger(self):
+        """Fixture: drei Chargen Milch, eine Charge Joghurt"""
+        return LotLedger(
+            [
+                Lot("L2", "MILCH", 5, date(2025, 1, 12)),
+                Lot("L1", "MILCH", 3, date(2025, 1, 10)),
+                Lot("L3", "MILCH", 4, date(2025, 1, 12)),
+                Lot("J1", "JOGHURT", 6, date(2025, 1, 11)),
+            ]
+        )
+
+    def test_consume_first_expired_first_out(self, ledger):
+        """Test: Entnahme nach Ablaufdatum, bei Gleichstand in Eingangsreihenfolge"""
+        taken = ledger.consume("MILCH", 9)
+
+        assert [(lot.id, amount) for lot, amount in taken] == [("L1", 3), ("L2", 5), ("L3", 1)]
+        assert [lot.id for lot in ledger.lots("MILCH")] == ["L3"]
+        assert ledger.tracked_quantity("MILCH") == 3
+        # Mehr als vorhanden: nur die Chargen, den Rest deckt chargenloser Bestand
+        assert sum(amount for _, amount in ledger.consume("MILCH", 10)) == 3
+        assert ledger.tracked_quantity("MILCH") == 0
+
+    def test_restore_and_remove(self, ledger):
+        """Test: Entnahme rückgängig machen, Charge ausbuchen, doppelte IDs ablehnen"""
+        taken = ledger.consume("MILCH", 9)
+        ledger.restore(taken)
+        assert [(lot.id, lot.quantity) for lot in ledger.lots("MILCH")] == [
+            ("L1", 3),
+            ("L2", 5),
+            ("L3", 4),
+        ]
+        assert ledger.tracked_quantity("MILCH") == 12
+
+        ledger.remove("L1")
+        assert [lot.id for lot, _ in ledger.consume("MILCH", 1)] == ["L2"]
+        with pytest.raises(ValueError):
+            ledger.add(Lot("L2", "MILCH", 1, date(2025, 1, 1)))
+        with pytest.raises(ValueError):
+            ledger.remove("L1")
+
+    def test_expiring(self, ledger):
+        """Test: Ablaufabfrage liefert nur Chargen bis zum Stichtag, sortiert"""
+        assert [lot.id for lot in ledger.expiring(date(2025, 1, 11))] == ["L1", "J1"]
+        assert [lot.id for lot in ledger.expiring(date(2025, 1, 9))] == []
+
+        ledger.consume("MILCH", 3)  # L1 aufgebraucht
+        ledger.remove_product("JOGHURT")
+        assert [lot.id for lot in ledger.expiring(date(2025, 1, 31))] == ["L2", "L3"]
+
+    def test_expiring_matches_full_scan(self):
+        """Test: Heap-Abfrage entspricht einem Durchlauf über alle Chargen"""
+        ledger = LotLedger(
+            Lot(f"L{i}", f"P{i % 7}", 1 + i % 5, date(2025, 1, 1 + (i * 37) % 28))
+            for i in range(300)
+        )
+        for i in range(0, 300, 3):
+            ledger.consume(f"P{i % 7}", 4)
+        until = date(2025, 1, 14)
+        expected = sorted(
+            (lot for product in range(7) for lot in ledger.lots(f"P{product}")),
+            key=lambda lot: lot.expires_at,
+        )
+        found = ledger.expiring(until)
+        assert {lot.id for lot in found} == {lot.id for lot in expected if lot.expires_at <= until}
+        assert [lot.expires_at for lot in found] == sorted(lot.expires_at for lot in found)
+
+
+class TestMonotonicIdGenerator:
+    """Tests für die Bewegungs-IDs"""
+
+    def test_monotonic_with_frozen_and_backward_clock(self):
+        """Test: IDs bleiben eindeutig und sortiert, auch wenn die Uhr steht oder zurückspringt"""
+        times = iter([1000.0] * 500 + [999.0] * 500)
+        generator = MonotonicIdGenerator(clock=lambda: next(times))
+
+        ids = [generator() for _ in range(1000)]
+        assert len(set(ids)) == 1000
+        assert ids == sorted(ids)
+
+    @pytest.mark.skipif(
+        "fork" not in multiprocessing.get_all_start_methods(), reason="fork nicht verfügbar"
+    )
+    def test_forked_child_does_not_repeat_parent_ids(self):
+        """Test: Kindprozess setzt nach fork() nicht den Zähler des Elternprozesses fort"""
+        generator = MonotonicIdGenerator(clock=lambda: 1000.0)
+        generator()
+        context = multiprocessing.get_context("fork")
+        receiver, sender = context.Pipe(duplex=False)
+        child = context.Process(target=_send_id, args=(generator, sender))
+        child.start()
+        child_id = receiver.recv()
+        child.join()
+
+        assert child_id != generator()
+
+    def test_timestamp_and_range(self):
+        """Test: Zeitstempel ist aus der ID ablesbar und liegt im Schlüsselbereich"""
+        created = datetime(2025, 3, 1, 12, 30)
+        generator = MonotonicIdGenerator(clock=created.timestamp)
+        movement_id = generator()
+
+        assert id_timestamp(movement_id) == created
+        low, high = generator.id_range(datetime(2025, 3, 1), datetime(2025, 3, 2))
+        assert low <= movement_id < high
+
+
+def _send_id(generator, connection):
+    connection.send(generator())
+    connection.close()
+
+
 class TestWarehouseService:
     """Tests für WarehouseService"""
 
@@ -93,6 +248,17 @@ class TestWarehouseService:
         assert product.id == "P001"
         assert product.quantity == 10
 
+    def test_create_product_rejects_existing(self):
+        """Test: Im Repository vorhandenes Produkt wird nicht überschrieben"""
+        repository = InMemoryRepository()
+        WarehouseService(repository).create_product("P001", "Milch", "1L", 1.0, initial_quantity=5)
+        restarted = WarehouseService(repository)
+
+        with pytest.raises(ValueError, match="existiert bereits"):
+            restarted.create_product("P001", "Brot", "", 2.0)
+        assert repository.load_product("P001").name == "Milch"
+        assert restarted.get_total_inventory_value() == pytest.approx(5.0)
+
     def test_add_to_stock(self, service):
         """Test: Bestand erhöhen"""
         service.create_product("P001", "Test", "Test", 10.0, initial_quantity=5)
@@ -140,3 +306,148 @@ class TestWarehouseService:
 
         movements = service.get_movements()
         assert len(movements) == 2
+
+    def test_book_movements(self, service):
+        """Test: Sammelbuchung mit mehreren Positionen"""
+        service.create_product("P001", "Test 1", "Test", 10.0, initial_quantity=5)
+        service.create_product("P002", "Test 2", "Test", 20.0)
+
+        movements = service.book_movements(
+            [
+                Booking("P001", 10, reason="Lieferung"),
+                Booking("P002", 4),
+                Booking("P001", 12, movement_type="OUT"),
+            ]
+        )
+
+        assert [m.quantity_change for m in movements] == [10, 4, -12]
+        assert service.get_product("P001").quantity == 3
+        assert service.get_product("P002").quantity == 4
+        assert len(service.get_movements()) == 3
+
+    def test_book_movements_all_or_nothing(self, service):
+        """Test: Fehlerhafte Position verhindert die gesamte Sammelbuchung"""
+        service.create_product("P001", "Test", "Test", 10.0, initial_quantity=5)
+
+        with pytest.raises(ValueError):
+            service.book_movements(
+                [
+                    Booking("P001", 3, movement_type="OUT"),
+                    Booking("P001", 3, movement_type="OUT"),
+                ]
+            )
+
+        assert service.get_product("P001").quantity == 5
+        assert service.get_movements() == []
+
+    def test_book_movements_failed_save_keeps_stock(self):
+        """Test: Scheitert das Speichern, bleiben Bestände, Chargen und Kennzahlen unverändert"""
+
+        class FailingRepository(InMemoryRepository):
+            def save_movements(self, movements):
+                raise OSError("Datenträger voll")
+
+        service = WarehouseService(FailingRepository())
+        service.create_product("P001", "Milch", "1L", 1.0, initial_quantity=5)
+        service.add_to_stock("P001", 3, expires_at=date(2025, 1, 20), lot_id="L1")
+
+        with pytest.raises(OSError):
+            service.book_movements(
+                [
+                    Booking("P001", 2, expires_at=date(2025, 2, 1)),
+                    Booking("P001", 6, movement_type="OUT"),
+                ]
+            )
+
+        assert service.get_product("P001").quantity == 8
+        assert [(lot.id, lot.quantity) for lot in service.get_lots("P001")] == [("L1", 3)]
+        assert [lot.id for lot in service.repository.load_lots()] == ["L1"]
+        assert service.check_inventory_consistency() == {}
+
+    def test_single_booking_failed_save_leaves_no_lot(self):
+        """Test: Scheitert das Speichern der Bewegung, bleibt keine Charge zurück"""
+
+        class FailingRepository(InMemoryRepository):
+            fail = False
+
+            def save_movement(self, movement):
+                if self.fail:
+                    raise OSError("Datenträger voll")
+                super().save_movement(movement)
+
+        repository = FailingRepository()
+        service = WarehouseService(repository)
+        service.create_product("P001", "Milch", "1L", 1.0, initial_quantity=5)
+        service.add_to_stock("P001", 3, expires_at=date(2025, 1, 20), lot_id="L1")
+        repository.fail = True
+
+        with pytest.raises(OSError):
+            service.add_to_stock("P001", 4, expires_at=date(2025, 1, 10), lot_id="L2")
+        with pytest.raises(OSError):
+            service.remove_from_stock("P001", 2)
+
+        assert service.get_product("P001").quantity == 8
+        assert [(lot.id, lot.quantity) for lot in service.get_lots("P001")] == [("L1", 3)]
+        assert [(lot.id, lot.quantity) for lot in repository.load_lots()] == [("L1", 3)]
+        assert service.check_inventory_consistency() == {}
+        restarted = WarehouseService(repository)
+        assert [lot.id for lot in restarted.get_lots("P001")] == ["L1"]
+
+    def test_delete_product(self, service):
+        """Test: Gelöschtes Produkt zählt nicht mehr zum Lagerwert"""
+        service.create_product("P001", "Test 1", "Test", 10.0, initial_quantity=5)
+        service.create_product("P002", "Test 2", "Test", 20.0, initial_quantity=3)
+        service.delete_product("P001")
+        service.delete_product("P001")
+
+        assert service.get_product("P001") is None
+        assert service.get_total_inventory_value() == 60.0
+
+    def test_inventory_consistency(self, service):
+        """Test: Konsistenzprüfung meldet Drift und kann reparieren"""
+        service.create_product("P001", "Test", "Test", 10.0, category="A", initial_quantity=5)
+        service.add_to_stock("P001", 5)
+        assert service.get_category_values() == {"A": 100.0}
+        assert service.check_inventory_consistency() == {}
+
+        service.get_product("P001").update_quantity(-10)
+        assert "total_value" in service.check_inventory_consistency(repair=True)
+        assert service.get_total_inventory_value() == 0.0
+
+    def test_lots_fefo(self, service):
+        """Test: Zugänge als Chargen, Entnahme nach FEFO, Ablaufabfrage"""
+        service.create_product("P001", "Milch", "1L", 1.0, initial_quantity=2)
+        service.add_to_stock("P001", 4, expires_at=date(2025, 1, 20), lot_id="L-SPAET")
+        service.add_to_stock("P001", 3, expires_at=date(2025, 1, 15), lot_id="L-FRUEH")
+
+        picked = service.remove_from_stock("P001", 5)
+
+        assert picked == [("L-FRUEH", 3), ("L-SPAET", 2)]
+        assert service.get_product("P001").quantity == 4
+        assert [lot.quantity for lot in service.get_lots("P001")] == [2]
+        assert service.get_expiring_lots(days=3, today=date(2025, 1, 17))[0].id == "L-SPAET"
+        assert service.get_expiring_lots(days=3, today=date(2025, 1, 10)) == []
+        # Restmenge nach den Chargen kommt aus dem chargenlosen Anfangsbestand
+        assert service.remove_from_stock("P001", 4) == [("L-SPAET", 2)]
+        with pytest.raises(ValueError):
+            service.add_to_stock("P001", 1, lot_id="OHNE-DATUM")
+
+    def test_book_movements_with_lots(self, service):
+        """Test: Sammelbuchung legt Chargen an und entnimmt in Buchungsreihenfolge"""
+        service.create_product("P001", "Joghurt", "", 0.5)
+        service.book_movements(
+            [
+                Booking("P001", 6, expires_at=date(2025, 2, 1), lot_id="A"),
+                Booking("P001", 6, expires_at=date(2025, 1, 25), lot_id="B"),
+                Booking("P001", 8, movement_type="OUT"),
+            ]
+        )
+        assert [(lot.id, lot.quantity) for lot in service.get_lots("P001")] == [("A", 4)]
+
+        with pytest.raises(ValueError):
+            service.book_movements([Booking("P001", 1, expires_at=date(2025, 3, 1), lot_id="A")])
+        with pytest.raises(ValueError):
+            service.book_movements(
+                [Booking("P001", 1, movement_type="OUT", expires_at=date(2025, 3, 1))]
+            )
+        assert service.get_product("P001").quantity == 4
@@ -0,0 +1,180 @@
+"""Tests - Unit Tests für Metriken, Instrumentierung und Profiler"""
+
+import json
+import threading
+import time
+import urllib.request
+
+import pytest
+
+from src.adapters.instrumented_repository import InstrumentedRepository
+from src.adapters.metrics import MetricsRegistry, PrometheusExporter
+from src.adapters.profiler import SamplingProfiler
+from src.adapters.repository import InMemoryRepository, RepositoryFactory
+from src.domain.warehouse import Booking
+from src.ports import RepositoryPort
+from src.services import WarehouseService
+
+
+class NoLotsRepository(InMemoryRepository):
+    """Repository ohne Chargenablage"""
+
+    save_lots = RepositoryPort.save_lots
+
+
+class TestMetricsRegistry:
+    """Tests für MetricsRegistry und die Exporte"""
+
+    def test_histogram_buckets_by_unit(self):
+        """Test: "_seconds" nutzt Zeit-Grenzen, andere Namen Größen-Grenzen; Grenzen inklusive"""
+        registry = MetricsRegistry()
+        for value in (0.0005, 0.002, 3.0):
+            registry.observe("call_seconds", value, {"method": "a"})
+        registry.observe("batch_size", 5)
+
+        histogram = registry.histogram("call_seconds", {"method": "a"})
+        cumulative = dict(histogram.cumulative())
+        assert cumulative[0.0005] == 1
+        assert cumulative[0.0025] == 2
+        assert cumulative[float("inf")] == 3
+        assert histogram.sum == pytest.approx(3.0025)
+        assert histogram.quantile(0.5) == 0.0025
+        assert dict(registry.histogram("batch_size").cumulative())[5] == 1
+        assert registry.histogram("call_seconds", {"method": "b"}) is None
+
+    def test_prometheus_text_and_json(self):
+        """Test: Zähler, Momentwerte, Histogramme und Collectors erscheinen in beiden Exporten"""
+        registry = MetricsRegistry()
+        registry.increment("errors_total", labels={"method": 'a"b'})
+        registry.increment("errors_total", 2, labels={"method": 'a"b'})
+        registry.register_collector(lambda metrics: metrics.set_gauge("cache_entries", 7))
+        registry.observe("call_seconds", 0.001)
+
+        text = registry.render_prometheus()
+        assert "# TYPE errors_total counter" in text
+        assert 'errors_total{method="a\\"b"} 3.0' in text
+        assert "cache_entries 7.0" in text
+        assert 'call_seconds_bucket{le="0.001"} 1' in text
+        assert 'call_seconds_bucket{le="+Inf"} 1' in text
+        assert "call_seconds_count 1" in text
+
+        document = json.loads(registry.to_json())
+        assert document["counters"]["errors_total"][0]["value"] == 3.0
+        assert document["gauges"]["cache_entries"][0]["value"] == 7
+        assert document["histograms"]["call_seconds"][0]["buckets"][-1] == ["+Inf", 1]
+
+    def test_exporter_serves_metrics(self):
+        """Test: Der Exporter liefert das Textformat lokal unter /metrics"""
+        registry = MetricsRegistry()
+        registry.increment("scrapes_total")
+        with PrometheusExporter(registry, port=0) as exporter:
+            host, port = exporter.address
+            with urllib.request.urlopen(f"http://{host}:{port}/metrics", timeout=5) as response:
+                body = response.read().decode("utf-8")
+                content_type = response.headers["Content-Type"]
+        assert "scrapes_total 1.0" in body
+        assert content_type.startswith("text/plain")
+
+
+class TestInstrumentation:
+    """Tests für InstrumentedRepository und die Messung im WarehouseService"""
+
+    def test_repository_calls_and_cache_stats(self):
+        """Test: Jeder Port-Aufruf wird gemessen, Fehler gezählt, Cache-Statistik exportiert"""
+        registry = MetricsRegistry()
+        repository = RepositoryFactory.create_repository("memory", cache_size=10, metrics=registry)
+        assert isinstance(repository, InstrumentedRepository)
+        repository.load_product("X")
+        repository.load_product("X")
+        assert list(repository.iter_products()) == []
+        with repository.transaction():
+            pass
+        with pytest.raises(NotImplementedError):
+            InstrumentedRepository(NoLotsRepository(), registry).save_lots([])
+
+        labels = {"repository": "memory", "method": "load_product"}
+        assert registry.histogram("repository_call_seconds", labels).count == 2
+        for method in ("iter_products", "transaction"):
+            labels = {"repository": "memory", "method": method}
+            assert registry.histogram("repository_call_seconds", labels).count == 1
+        errors = {"repository": "NoLotsRepository", "method": "save_lots"}
+        assert registry.counter("repository_errors_total", errors) == 1
+        registry.collect()
+        # Unbekannte Produkte werden nicht gecacht: beide Zugriffe sind Fehlgriffe
+        assert registry.gauge("repository_cache_misses", {"repository": "memory"}) == 2
+
+    def test_service_methods_and_batch_size(self):
+        """Test: Öffentliche Methoden werden gemessen, Fehler mit Typ gezählt"""
+        registry = MetricsRegistry()
+        service = WarehouseService(InMemoryRepository(), metrics=registry)
+        service.create_product("P1", "Milch", "", 1.0, "Milch", 5)
+        service.book_movements([Booking("P1", 3, "IN"), Booking("P1", 2, "OUT")])
+        with pytest.raises(ValueError):
+            service.remove_from_stock("P1", 100)
+
+        def calls(method):
+            histogram = registry.histogram("warehouse_service_call_seconds", {"method": method})
+            return histogram.count if histogram else 0
+
+        assert calls("create_product") == 1
+        assert calls("book_movements") == 1
+        assert calls("remove_from_stock") == 1
+        errors = {"method": "remove_from_stock", "error": "ValueError"}
+        assert registry.counter("warehouse_service_errors_total", errors) == 1
+        assert registry.histogram("warehouse_booking_batch_size").sum == 2
+        assert service.add_to_stock.__name__ == "add_to_stock"
+
+    def test_disabled_metrics_leave_methods_untouched(self):
+        """Test: Ohne Metriken werden keine Methoden umhüllt"""
+        service = WarehouseService(InMemoryRepository(), thread_safe=True)
+        assert "add_to_stock" not in vars(service)
+        assert isinstance(service._aggregates_lock, type(threading.Lock()))
+        assert service._locks.on_wait is None
+
+    def test_lock_wait_is_recorded(self):
+        """Test: Wartezeit auf ein belegtes Produkt-Lock landet im Histogramm"""
+        registry = MetricsRegistry()
+        service = WarehouseService(InMemoryRepository(), thread_safe=True, metrics=registry)
+        service.create_product("P1", "Milch", "", 1.0, "Milch", 5)
+
+        with service._locks.hold(["P1"]):
+            worker = threading.Thread(target=service.add_to_stock, args=("P1", 1))
+            worker.start()
+            time.sleep(0.05)
+        worker.join()
+
+        waits = registry.histogram("warehouse_lock_wait_seconds", {"lock": "products"})
+        assert waits.sum >= 0.04
+        assert registry.histogram("warehouse_lock_wait_seconds", {"lock": "aggregates"}).count
+
+
+class TestSamplingProfiler:
+    """Tests für SamplingProfiler"""
+
+    def test_samples_busy_thread(self):
+        """Test: Eine rechnende Funktion erscheint in collapsed(), top() und den Metriken"""
+        registry = MetricsRegistry()
+        stop = threading.Event()
+
+        def busy_loop():
+            while not stop.is_set():
+                sum(range(1000))
+
+        worker = threading.Thread(target=busy_loop)
+        worker.start()
+        try:
+            profiler = SamplingProfiler(interval=0.001, thread_ids=[worker.ident], metrics=registry)
+            with profiler:
+                time.sleep(0.1)
+        finally:
+            stop.set()
+            worker.join()
+
+        assert "busy_loop" in profiler.collapsed()
+        assert any("busy_loop" in function for function, _ in profiler.top())
+        total = sum(
+            entry["value"] for entry in registry.collect()["counters"]["profiler_samples_total"]
+        )
+        assert total == sum(profiler.samples.values())
+        with pytest.raises(ValueError):
+            SamplingProfiler(interval=0)
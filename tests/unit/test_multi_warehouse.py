@@ -0,0 +1,151 @@
+"""Tests - Unit Tests für mehrere Lager, Umlagerungen und den Shard-Router"""
+
+from datetime import date
+
+import pytest
+
+from src.adapters.columnar_repository import ColumnarRepository
+from src.adapters.repository import InMemoryRepository
+from src.adapters.shard_router import ShardRouter
+from src.ports import RepositoryPort
+from src.services.multi_warehouse import MultiWarehouseService
+
+
+class NoLotsRepository(InMemoryRepository):
+    """InMemoryRepository ohne Chargenablage (Standard aus RepositoryPort)"""
+
+    save_lots = RepositoryPort.save_lots
+
+
+class OfflineRepository(InMemoryRepository):
+    """InMemoryRepository, dessen Bewegungen sich nicht speichern lassen"""
+
+    def save_movements(self, movements):
+        raise OSError("Filiale nicht erreichbar")
+
+
+@pytest.fixture
+def chain():
+    """Fixture: Zentrallager mit Milch (10 Stück, davon 4 als Charge), dazu zwei Filialen"""
+    router = ShardRouter(factory=lambda warehouse_id: InMemoryRepository())
+    chain = MultiWarehouseService(router, thread_safe=True)
+    central = chain.warehouse("Zentrallager")
+    central.create_product("M", "Milch", "1 l", 1.0, "Molkerei", 6)
+    central.add_to_stock("M", 4, "Wareneingang", expires_at=date(2025, 3, 1))
+    chain.warehouse("Filiale 1")
+    chain.warehouse("Filiale 2")
+    yield chain
+    chain.close()
+
+
+class TestShardRouter:
+    """Tests für ShardRouter"""
+
+    def test_unknown_shard_without_factory(self):
+        """Test: Ohne factory sind nur eingetragene Lager erreichbar"""
+        router = ShardRouter({"A": InMemoryRepository()})
+        router.add_shard("B", InMemoryRepository())
+        with pytest.raises(ValueError, match="existiert bereits"):
+            router.add_shard("A", InMemoryRepository())
+        with pytest.raises(ValueError, match="nicht gefunden"):
+            router.shard("C")
+        assert router.map(lambda warehouse_id, _: warehouse_id.lower()) == {"A": "a", "B": "b"}
+        router.close()
+
+
+class TestMultiWarehouseService:
+    """Tests für MultiWarehouseService"""
+
+    def test_stock_is_kept_per_warehouse(self, chain):
+        """Test: Dasselbe Produkt hat pro Lager einen eigenen Bestand"""
+        chain.warehouse("Filiale 1").create_product("M", "Milch", "1 l", 1.0, "Molkerei", 3)
+        chain.remove_from_stock("Filiale 1", "M", 1, reason="Verkauf")
+
+        assert chain.get_stock("Zentrallager", "M") == 10
+        assert chain.get_stock("Filiale 1", "M") == 2
+        assert chain.get_stock("Filiale 2", "M") == 0
+        assert chain.warehouse("Filiale 1").warehouse.name == "Filiale 1"
+
+    def test_transfer_books_paired_movements(self, chain):
+        """Test: Umlagerung bucht Abgang und Zugänge, Chargen behalten ihr Ablaufdatum"""
+        transfer = chain.transfer("M", 5, "Zentrallager", "Filiale 1", reason="Nachschub")
+
+        assert chain.get_stock("Zentrallager", "M") == 5
+        assert chain.get_stock("Filiale 1", "M") == 5
+        assert transfer.outgoing.quantity_change == -5
+        assert [m.quantity_change for m in transfer.incoming] == [4, 1]
+        assert all(transfer.id in m.reason for m in [transfer.outgoing, *transfer.incoming])
+        branch = chain.warehouse("Filiale 1")
+        assert branch.get_product("M").category == "Molkerei"
+        assert [(lot.quantity, lot.expires_at) for lot in branch.get_lots("M")] == [
+            (4, date(2025, 3, 1))
+        ]
+        assert chain.warehouse("Zentrallager").get_lots("M") == []
+
+    def test_failed_transfer_is_compensated(self, chain):
+        """Test: Scheitert der Zugang, wird der Abgang ins Quelllager zurückgebucht"""
+
+        def broken(*args, **kwargs):
+            raise RuntimeError("Filiale nicht erreichbar")
+
+        chain.warehouse("Filiale 2").transfer_in = broken
+        with pytest.raises(RuntimeError):
+            chain.transfer("M", 7, "Zentrallager", "Filiale 2")
+
+        central = chain.warehouse("Zentrallager")
+        assert chain.get_stock("Zentrallager", "M") == 10
+        assert [lot.quantity for lot in central.get_lots("M")] == [4]
+        assert [m.quantity_change for m in central.get_movements()][-3:] == [-7, 4, 3]
+        with pytest.raises(ValueError, match="Unzureichender Bestand"):
+            chain.transfer("M", 11, "Zentrallager", "Filiale 2")
+        with pytest.raises(ValueError, match="identisch"):
+            chain.transfer("M", 1, "Filiale 2", "Filiale 2")
+
+    def test_transfer_into_repository_without_lots(self, chain):
+        """Test: Kann das Ziellager keine Chargen speichern, kommt die Ware chargenlos an"""
+        chain.router.add_shard("Filiale 3", NoLotsRepository())
+        transfer = chain.transfer("M", 5, "Zentrallager", "Filiale 3")
+
+        branch = chain.warehouse("Filiale 3")
+        assert [m.quantity_change for m in transfer.incoming] == [5]
+        assert chain.get_stock("Filiale 3", "M") == 5
+        assert branch.get_lots("M") == []
+        assert branch.check_inventory_consistency() == {}
+        assert chain.get_stock("Zentrallager", "M") == 5
+
+    def test_transfer_between_columnar_shards(self):
+        """Test: Umlagerung legt das Produkt auch aus einer Spalten-Sicht im Ziellager an"""
+        chain = MultiWarehouseService(ShardRouter(factory=lambda _: ColumnarRepository()))
+        chain.warehouse("A").create_product("P1", "Käse", "200 g", 3.0, "Molkerei", 5)
+        transfer = chain.transfer("P1", 3, "A", "B")
+
+        assert [m.quantity_change for m in transfer.incoming] == [3]
+        assert chain.stock_by_warehouse("P1") == {"A": 2, "B": 3}
+        product = chain.warehouse("B").get_product("P1")
+        assert (product.name, product.category, product.price) == ("Käse", "Molkerei", 3.0)
+        chain.close()
+
+    def test_failed_transfer_leaves_no_stock_in_target(self, chain):
+        """Test: Scheitert das Speichern im Ziellager, bleibt dort kein Bestand zurück"""
+        chain.router.add_shard("Filiale 3", OfflineRepository())
+        with pytest.raises(OSError):
+            chain.transfer("M", 7, "Zentrallager", "Filiale 3")
+
+        branch = chain.warehouse("Filiale 3")
+        assert chain.get_stock("Filiale 3", "M") == 0
+        assert branch.get_lots("M") == []
+        assert chain.get_stock("Zentrallager", "M") == 10
+        assert chain.chain_inventory_value() == pytest.approx(10.0)
+
+    def test_chain_aggregates(self, chain):
+        """Test: Kettensummen über alle Shards"""
+        chain.transfer("M", 3, "Zentrallager", "Filiale 1")
+        chain.transfer("M", 2, "Zentrallager", "Filiale 2")
+        chain.warehouse("Filiale 2").create_product("B", "Brot", "", 2.5, "Backwaren", 2)
+
+        assert chain.stock_by_warehouse("M") == {"Filiale 1": 3, "Filiale 2": 2, "Zentrallager": 5}
+        assert chain.total_stock("M") == 10
+        assert chain.total_stock("X") == 0
+        assert chain.inventory_values()["Filiale 2"] == pytest.approx(7.0)
+        assert chain.chain_inventory_value() == pytest.approx(15.0)
+        assert chain.chain_category_values() == pytest.approx({"Molkerei": 10.0, "Backwaren": 5.0})
@@ -0,0 +1,137 @@
+"""Tests - Unit Tests für die Bestandsprojektion aus dem Bewegungsstrom"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.adapters.repository import InMemoryRepository
+from src.domain.product import Product
+from src.domain.warehouse import Movement
+from src.services import WarehouseService
+from src.services.projection import StockProjection
+
+START = datetime(2025, 1, 1)
+
+
+def movement(i, product_id, change):
+    """Bewegung i Stunden nach START"""
+    return Movement(
+        id=f"mov_{i:03d}",
+        product_id=product_id,
+        product_name="Test",
+        quantity_change=change,
+        movement_type="IN" if change > 0 else "OUT",
+        timestamp=START + timedelta(hours=i),
+    )
+
+
+class TestStockProjection:
+    """Tests für StockProjection"""
+
+    @pytest.fixture
+    def repository(self):
+        """Fixture: zwei Produkte, zehn Bewegungen, Bestände passend zu den Bewegungen"""
+        repository = InMemoryRepository()
+        repository.save_product(
+            Product(id="A", name="A", description="", price=1.0, quantity=15, created_at=START)
+        )
+        repository.save_product(
+            Product(id="B", name="B", description="", price=1.0, quantity=1, created_at=START)
+        )
+        for i in range(10):
+            repository.save_movement(movement(i, "A" if i % 2 else "B", 2 if i % 2 else -1))
+        return repository
+
+    def test_quantities_as_of(self, repository):
+        """Test: Bestände zu beliebigen Zeitpunkten, mit und ohne Checkpoint davor"""
+        projection = StockProjection(repository, checkpoint_interval=3)
+        projection.refresh()
+
+        # Anfangsbestände: A = 15 - 10 = 5, B = 1 + 5 = 6
+        assert projection.quantity_at("A", START) == 5
+        assert projection.quantity_at("A", START - timedelta(hours=1)) == 0  # noch nicht angelegt
+        assert projection.quantity_at("A", START + timedelta(hours=3)) == 9
+        assert projection.quantities_at(START + timedelta(hours=6, minutes=30)) == {
+            "A": 11,
+            "B": 2,
+        }
+        assert projection.quantities_at() == {"A": 15, "B": 1}
+        assert projection.quantity_at("UNBEKANNT") == 0
+
+    def test_incremental_refresh_and_discrepancies(self, repository):
+        """Test: Neue Bewegungen werden nachgelesen, Abweichungen gemeldet"""
+        projection = StockProjection(repository, checkpoint_interval=4)
+        projection.refresh()
+        assert projection.discrepancies() == {}
+
+        repository.save_movement(movement(10, "A", 5))
+        repository.products["A"].quantity += 5
+        repository.products["B"].quantity = 100  # Bestand ohne Bewegung geändert
+        projection.refresh()
+
+        assert projection.quantity_at("A") == 20
+        assert projection.discrepancies() == {"B": (100, 1)}
+
+    def test_late_movement_with_older_timestamp(self, repository):
+        """Test: Später gespeicherte Bewegung mit älterem Zeitstempel wird einsortiert"""
+        projection = StockProjection(repository, checkpoint_interval=2, base_every=2)
+        projection.refresh()
+
+        repository.save_movement(movement(2, "A", 7))  # z.B. nachträglicher Import
+        repository.products["A"].quantity += 7
+        projection.refresh()
+
+        assert projection.quantity_at("A", START + timedelta(hours=1)) == 7
+        assert projection.quantity_at("A", START + timedelta(hours=2)) == 14
+        assert projection.quantities_at(START + timedelta(hours=9)) == {"A": 22, "B": 1}
+        assert projection.discrepancies() == {}
+
+    def test_delta_checkpoints_match_full_replay(self):
+        """Test: Änderungs-Checkpoints mit vollen Salden ergeben dieselben Bestände"""
+        repository = InMemoryRepository()
+        for i in range(60):
+            repository.save_movement(movement((i * 37) % 60, f"P{i % 7}", i % 5 - 2))
+        projection = StockProjection(repository, checkpoint_interval=4, base_every=3)
+        projection.refresh()
+
+        assert all(len(delta) <= 4 for delta in projection._deltas)
+        for hour in range(-1, 61, 5):
+            when = START + timedelta(hours=hour)
+            expected = {}
+            for m in repository.movements:
+                if m.timestamp <= when:
+                    expected[m.product_id] = expected.get(m.product_id, 0) + m.quantity_change
+            assert projection.quantities_at(when) == expected
+            assert projection.quantity_at("P3", when) == expected.get("P3", 0)
+
+
+class TestServiceProjection:
+    """Tests für die Projektion im WarehouseService"""
+
+    def test_stock_at_and_check(self):
+        """Test: Historischer Bestand und Abgleich über den Service"""
+        service = WarehouseService(InMemoryRepository())
+        service.create_product("P001", "Milch", "1L", 1.0, initial_quantity=5)
+        service.add_to_stock("P001", 3)
+        assert service.check_stock_against_movements() == {}
+        before = datetime.now()
+
+        # Nach dem Aufbau angelegte Produkte bringen ihren Anfangsbestand mit
+        service.create_product("P002", "Brot", "", 2.0, initial_quantity=4)
+        service.remove_from_stock("P001", 6)
+        service.repository.load_product("P002").quantity = 7
+
+        assert service.get_stock_at("P001", before) == 8
+        assert service.get_stock_at("P001", datetime.now()) == 2
+        assert service.check_stock_against_movements() == {"P002": (7, 4)}
+
+    def test_check_after_restart_derives_opening(self):
+        """Test: Nach einem Neustart gilt der Bestand als Anfangsbestand, danach wird geprüft"""
+        repository = InMemoryRepository()
+        WarehouseService(repository).create_product("P001", "Milch", "1L", 1.0, initial_quantity=5)
+        repository.load_product("P001").quantity = 9  # Abweichung vor dem Neustart
+
+        restarted = WarehouseService(repository)
+        assert restarted.check_stock_against_movements() == {}
+        repository.load_product("P001").quantity = 12
+        assert restarted.check_stock_against_movements() == {"P001": (12, 9)}
@@ -0,0 +1,116 @@
+"""Tests - Unit Tests für Nachfrageprognose und Bestellvorschläge"""
+
+import math
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.adapters.repository import InMemoryRepository
+from src.domain.product import Product
+from src.domain.warehouse import Movement
+from src.services import WarehouseService
+from src.services.replenishment import ReplenishmentEngine, ReplenishmentPolicy
+
+START = datetime(2025, 1, 1, 9)
+
+
+def sale(i, product_id, quantity, day):
+    """Abgang am Tag `day` nach START"""
+    return Movement(
+        id=f"mov_{i:05d}",
+        product_id=product_id,
+        product_name="Test",
+        quantity_change=-quantity,
+        movement_type="OUT",
+        timestamp=START + timedelta(days=day, minutes=i % 60),
+    )
+
+
+class TestReplenishmentEngine:
+    """Tests für ReplenishmentEngine"""
+
+    @pytest.fixture
+    def repository(self):
+        """Fixture: A verkauft 60 Tage lang 10 Stück pro Tag, B nichts"""
+        repository = InMemoryRepository()
+        for product_id, quantity in (("A", 25), ("B", 0)):
+            product = Product(
+                id=product_id, name=product_id, description="", price=1.0, quantity=quantity
+            )
+            repository.save_product(product)
+        repository.save_movements(sale(day, "A", 10, day) for day in range(60))
+        return repository
+
+    def test_constant_demand(self, repository):
+        """Test: Gleichmäßige Nachfrage ergibt Meldebestand μ·L ohne Sicherheitsbestand"""
+        engine = ReplenishmentEngine(repository, alpha=0.2)
+        proposals = engine.propose(now=START + timedelta(days=60))
+
+        assert [p.product_id for p in proposals] == ["A"]
+        proposal = proposals[0]
+        assert proposal.daily_demand == pytest.approx(10.0, rel=1e-3)
+        assert proposal.safety_stock == pytest.approx(0.0, abs=0.1)
+        assert proposal.reorder_point == pytest.approx(30.0, rel=1e-2)
+        # Auffüllen auf μ·(L + R) ≈ 40 ab Bestand 25; der Rest des Anlaufs rundet auf
+        assert proposal.quantity == 16
+        assert proposal.days_of_cover == pytest.approx(2.5, rel=1e-2)
+
+    def test_empty_days_match_stepwise_update(self, repository):
+        """Test: Lücken in geschlossener Form entsprechen dem tageweisen Nachrechnen"""
+        alpha = 0.3
+        engine = ReplenishmentEngine(repository, alpha=alpha)
+        engine.observe(sale(1, "X", 7, 0))
+        engine.observe(sale(2, "X", 3, 1))
+        engine.observe(sale(3, "X", 5, 6))  # Tage 2-5 ohne Abgang
+        mean, deviation = engine.daily_demand("X", START + timedelta(days=7))
+
+        expected_mean = expected_var = 0.0
+        for demand in (7, 3, 0, 0, 0, 0, 5):
+            diff = demand - expected_mean
+            expected_mean += alpha * diff
+            expected_var = (1 - alpha) * (expected_var + diff * alpha * diff)
+        assert mean == pytest.approx(expected_mean)
+        assert deviation == pytest.approx(math.sqrt(expected_var))
+
+    def test_refresh_is_incremental(self, repository):
+        """Test: Nachlesen verarbeitet jede Bewegung genau einmal"""
+        engine = ReplenishmentEngine(repository, alpha=0.5, page_size=7)
+        engine.refresh()
+        engine.refresh()
+        repository.save_movement(sale(999, "A", 30, 60))
+        engine.refresh()
+        # Tag 60 mit 30 Stück: 10 + 0.5 · (30 - 10)
+        mean, _ = engine.daily_demand("A", START + timedelta(days=61))
+        assert mean == pytest.approx(20.0, rel=1e-3)
+
+    def test_policy_on_order_and_pack_size(self, repository):
+        """Test: Offene Bestellungen unterdrücken Vorschläge, Mengen auf Gebinde gerundet"""
+        engine = ReplenishmentEngine(repository, alpha=0.2)
+        now = START + timedelta(days=60)
+        assert engine.propose(now=now, on_order={"A": 10}) == []
+
+        engine.set_policy("A", ReplenishmentPolicy(lead_time_days=3, pack_size=12))
+        assert engine.propose(now=now)[0].quantity == 24
+        engine.set_policy("A", None)
+        assert engine.propose(now=now)[0].quantity == 16
+
+        with pytest.raises(ValueError):
+            ReplenishmentPolicy(service_level=1.0)
+        with pytest.raises(ValueError):
+            ReplenishmentEngine(repository, alpha=0)
+
+    def test_service_propose_purchases(self):
+        """Test: WarehouseService liefert Vorschläge aus gebuchten Abgängen"""
+        service = WarehouseService(InMemoryRepository())
+        service.create_product("P1", "Milch", "", 1.0, initial_quantity=20)
+        service.remove_from_stock("P1", 18)
+        service.replenishment().set_policy("P1", ReplenishmentPolicy(lead_time_days=2))
+
+        proposals = service.propose_purchases(now=datetime.now() + timedelta(days=1))
+
+        assert [p.product_id for p in proposals] == ["P1"]
+        assert proposals[0].inventory_position == 2
+        assert (
+            service.propose_purchases(now=datetime.now() + timedelta(days=1), on_order={"P1": 100})
+            == []
+        )
@@ -0,0 +1,142 @@
+"""Tests - Unit Tests für den Suchindex"""
+
+import pytest
+
+from src.adapters.repository import InMemoryRepository
+from src.adapters.search_index import InMemorySearchIndex, tokenize
+from src.domain.product import Product
+from src.services import WarehouseService
+
+
+def product(product_id, name, sku="", category="", description=""):
+    return Product(
+        id=product_id,
+        name=name,
+        description=description,
+        price=1.0,
+        sku=sku,
+        category=category,
+    )
+
+
+class TestInMemorySearchIndex:
+    """Tests für InMemorySearchIndex"""
+
+    @pytest.fixture
+    def index(self):
+        """Fixture: kleiner Katalog"""
+        index = InMemorySearchIndex()
+        index.index_products(
+            [
+                product("P1", "Vollmilch 3,5%", "4001", "Molkerei", "Frische Milch 1L"),
+                product("P2", "Milchreis", "4002", "Molkerei"),
+                product("P3", "Hafermilch", "4003", "Getränke", "Milch-Alternative"),
+                product("P4", "Mildes Curry", "5001", "Gewürze"),
+            ]
+        )
+        return index
+
+    def test_tokenize(self):
+        """Test: Zerlegung in kleingeschriebene Wörter"""
+        assert tokenize("SKU-0001 Vollmilch, 3,5%") == ["sku", "0001", "vollmilch", "3", "5"]
+        assert tokenize(None) == []
+
+    def test_ranking_and_prefix(self, index):
+        """Test: Name schlägt Beschreibung, der letzte Begriff gilt als Präfix"""
+        hits = index.search("milch")
+        # P2: Präfix im Namen (3 * 0.5); P1, P3: ganzes Wort nur in der Beschreibung (1)
+        assert [hit.product_id for hit in hits] == ["P2", "P1", "P3"]
+        assert [hit.product_id for hit in index.search("mil")] == ["P2", "P4", "P1", "P3"]
+        assert [hit.product_id for hit in index.search("molkerei milchr")] == ["P2"]
+        assert [hit.product_id for hit in index.search("milch", limit=2)] == ["P2", "P1"]
+        assert index.search("unbekannt milch") == []
+        assert index.search("  ") == []
+
+    def test_sku_and_suggest(self, index):
+        """Test: Suche über SKU/ID und Vervollständigung"""
+        assert [hit.product_id for hit in index.search("400")] == ["P1", "P2", "P3"]
+        assert index.search("p4")[0].product_id == "P4"
+        assert index.suggest("mi") == ["milch", "milchreis", "mildes"]
+        assert index.suggest("mi", limit=1) == ["milch"]
+
+    def test_incremental_updates(self, index):
+        """Test: Ändern und Löschen halten den Index aktuell"""
+        index.index_product(product("P2", "Grießbrei", "4002", "Molkerei"))
+        assert "P2" not in [hit.product_id for hit in index.search("milchreis")]
+        assert index.search("grieß")[0].product_id == "P2"
+
+        index.remove_product("P3")
+        index.remove_product("UNBEKANNT")
+        assert index.search("hafermilch") == []
+        assert "hafermilch" not in index.suggest("haf")
+        assert len(index) == 3
+
+        index.index_product(product("P5", "Hafermilch Barista"))
+        assert [hit.product_id for hit in index.search("hafer")] == ["P5"]
+
+    def test_ranked_lists_match_full_scoring(self):
+        """Test: Vorzeitiger Abbruch über sortierte Trefferlisten liefert dieselben Treffer"""
+        catalogue = [
+            product(
+                f"P{i:03d}",
+                f"Artikel {i % 7} {'Bio' if i % 3 else ''}",
+                category="Molkerei" if i % 2 else "Backwaren",
+                description=f"Artikel Nr {i}",
+            )
+            for i in range(300)
+        ]
+        full = InMemorySearchIndex()
+        ranked = InMemorySearchIndex()
+        ranked.RANKED_MIN = 10
+        ranked.EXHAUSTIVE_MAX = 10
+        for index in (full, ranked):
+            index.index_products(catalogue)
+            # Änderungen nach dem Aufbau pflegen die sortierten Listen weiter
+            index.search("artikel")
+            index.index_product(product("P007", "Bio Artikel", category="Molkerei"))
+            index.remove_product("P010")
+
+        for query in ("artikel", "art", "bio", "artikel bio", "molkerei ar", "artikel 3", "nr"):
+            assert ranked.search(query, limit=5) == full.search(query, limit=5), query
+
+
+class TestServiceSearch:
+    """Tests für die Suche über den WarehouseService"""
+
+    def test_search_follows_create_update_delete(self):
+        """Test: Bestand beim Start, Anlegen, Ändern und Löschen"""
+        repository = InMemoryRepository()
+        repository.save_product(product("OLD", "Roggenbrot"))
+        service = WarehouseService(repository, search_index=InMemorySearchIndex())
+        service.create_product("P1", "Butter", "Süßrahm", 2.0, category="Molkerei")
+
+        assert [p.id for p in service.search_products("roggen")] == ["OLD"]
+        assert [p.id for p in service.search_products("butt")] == ["P1"]
+
+        service.update_product("P1", name="Margarine", price=1.5)
+        assert service.search_products("butter") == []
+        assert [p.id for p in service.search_products("marga")] == ["P1"]
+        assert service.get_total_inventory_value() == 0.0
+        assert service.check_inventory_consistency() == {}
+
+        service.delete_product("P1")
+        assert service.search_products("margarine") == []
+
+    def test_without_index(self):
+        """Test: Ohne Suchindex ist keine Suche möglich"""
+        service = WarehouseService(InMemoryRepository())
+        with pytest.raises(ValueError):
+            service.search_products("milch")
+
+    def test_update_product(self):
+        """Test: Preis- und Kategorieänderung werden in die Kennzahlen übernommen"""
+        service = WarehouseService(InMemoryRepository())
+        service.create_product("P1", "Butter", "", 2.0, category="Molkerei", initial_quantity=10)
+        service.update_product("P1", price=3.0, category="Kühlregal")
+
+        assert service.get_category_values() == {"Kühlregal": 30.0}
+        assert service.warehouse.check_consistency() == {}
+        with pytest.raises(ValueError):
+            service.update_product("P1", price=-1)
+        with pytest.raises(ValueError):
+            service.update_product("UNBEKANNT", name="x")
@@ -0,0 +1,152 @@
+"""Tests - Unit Tests für Qt-Modelle und Hintergrundaufgaben der Oberfläche (offscreen)"""
+
+import os
+import threading
+import time
+
+import pytest
+from src.adapters.repository import InMemoryRepository
+from src.services import WarehouseService
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+QtCore = pytest.importorskip("PyQt6.QtCore")
+QtWidgets = pytest.importorskip("PyQt6.QtWidgets")
+
+from src.ui.models import ProductTableModel  # noqa: E402
+from src.ui.workers import Debouncer, TaskRunner  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def app():
+    """Eine QApplication für alle Tests des Moduls"""
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+def process_events_until(condition, timeout=5.0):
+    """Qt-Ereignisse verarbeiten, bis die Bedingung erfüllt ist"""
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        QtCore.QCoreApplication.processEvents()
+        time.sleep(0.001)
+    return condition()
+
+
+class TestProductTableModel:
+    """Tests für ProductTableModel"""
+
+    @pytest.fixture
+    def service(self):
+        """Fixture mit 25 Produkten"""
+        service = WarehouseService(InMemoryRepository())
+        for i in range(25):
+            service.create_product(f"P{i:03d}", f"Artikel {i}", "", 2.0, initial_quantity=i)
+        return service
+
+    def test_lazy_fetch(self, app, service):
+        """Test: Zeilen werden blockweise nachgeladen und erst in data() formatiert"""
+        model = ProductTableModel(service, batch_size=10)
+        model.reload()
+        assert model.rowCount() == 0
+        assert model.canFetchMore()
+
+        model.fetchMore()
+        assert model.rowCount() == 10
+        assert model.data(model.index(3, 0)) == "P003"
+        assert model.data(model.index(3, 5)) == "6.00"
+
+        model.fetchMore()
+        model.fetchMore()
+        assert model.rowCount() == 25
+        assert not model.canFetchMore()
+
+    def test_single_row_updates(self, app, service):
+        """Test: Bestandsänderung meldet nur die betroffene Zeile"""
+        model = ProductTableModel(service, batch_size=10)
+        model.reload()
+        model.fetchMore()
+        changed = []
+        model.dataChanged.connect(lambda first, last: changed.append((first.row(), last.row())))
+
+        service.add_to_stock("P004", 6)
+        model.product_changed("P004")
+        model.product_changed("P020")  # noch nicht geladen - kein Signal
+
+        assert changed == [(4, 4)]
+        assert model.data(model.index(4, 3)) == "10"
+
+    def test_add_and_remove(self, app, service):
+        """Test: Neue und gelöschte Produkte ändern nur ihre Zeile"""
+        model = ProductTableModel(service, batch_size=100)
+        model.reload()
+        model.fetchMore()
+
+        service.create_product("NEU", "Neu", "", 1.0)
+        model.product_added("NEU")
+        assert model.rowCount() == 26
+        assert model.product_id_at(25) == "NEU"
+
+        service.delete_product("P000")
+        model.product_removed("P000")
+        assert model.rowCount() == 25
+        assert model.product_id_at(0) == "P001"
+
+
+class TestTaskRunner:
+    """Tests für TaskRunner, Task und Debouncer"""
+
+    def test_result_and_progress(self, app):
+        """Test: Ergebnis und Fortschritt kommen im Hauptthread an"""
+        runner = TaskRunner()
+        results, progress, threads = [], [], []
+
+        def work(context, count):
+            threads.append(threading.current_thread())
+            for i in range(count):
+                context.report_progress(i + 1, count)
+            return count * 2
+
+        runner.submit(
+            work, 3, on_result=results.append, on_progress=lambda done, _: progress.append(done)
+        )
+
+        assert process_events_until(lambda: results)
+        assert results == [6]
+        assert progress == [1, 2, 3]
+        assert threads[0] is not threading.main_thread()
+        assert runner.active == 0
+
+    def test_cancel_and_error(self, app):
+        """Test: Abbruch und Fehler werden gemeldet statt eines Ergebnisses"""
+        runner = TaskRunner()
+        started = threading.Event()
+        outcome = []
+
+        def slow(context):
+            started.set()
+            while True:
+                context.check_cancelled()
+                time.sleep(0.001)
+
+        def broken(context):
+            raise ValueError("kaputt")
+
+        task = runner.submit(slow, on_cancelled=lambda: outcome.append("abgebrochen"))
+        runner.submit(broken, on_error=lambda e: outcome.append(str(e)))
+        assert started.wait(5)
+        task.cancel()
+
+        assert process_events_until(lambda: len(outcome) == 2)
+        assert sorted(outcome) == ["abgebrochen", "kaputt"]
+
+    def test_debouncer(self, app):
+        """Test: Schnell wiederholte Auslösungen feuern nur einmal"""
+        debouncer = Debouncer(delay_ms=20)
+        fired = []
+        debouncer.fired.connect(lambda: fired.append(1))
+        for _ in range(5):
+            debouncer.trigger()
+
+        assert process_events_until(lambda: fired)
+        time.sleep(0.05)
+        QtCore.QCoreApplication.processEvents()
+        assert fired == [1]